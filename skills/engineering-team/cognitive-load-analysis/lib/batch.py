@@ -0,0 +1,365 @@
+"""Repository-wide D1-D8 normalization and CLI aggregation in one call.
+
+Takes per-file raw metrics for a whole repository and returns every
+dimension score plus the compute_cli_score aggregate per file. With NumPy
+installed, each dimension is computed in a few vectorized passes over all
+files (ragged per-file lists are flattened once and reduced per segment);
+without it, the scalar functions in dimensions.py are applied file by file.
+The vectorized path takes its sigmoid parameters and weights from
+dimensions.py too, and both paths agree within float tolerance. The
+normalize-batch calculator command is built on normalize_files.
+"""
+
+from itertools import chain
+
+from aggregation import (
+    INTERACTION_PAIRS,
+    INTERACTION_PENALTY_PER_PAIR,
+    RATING_THRESHOLDS,
+    WEIGHTS,
+    compute_cli_score,
+)
+from dimensions import (
+    D1_SIGMOID,
+    D1_WEIGHTS,
+    D2_SIGMOID,
+    D2_WEIGHTS,
+    D3_CLASS_SIGMOID,
+    D3_FILE_SIGMOID,
+    D3_FUNC_SIGMOID,
+    D3_PARAMS_SIGMOID,
+    D3_WEIGHTS,
+    D4_FALLBACK_WEIGHTS,
+    D4_LLM_WEIGHTS,
+    D4_SINGLE_CHAR_SIGMOID,
+    D4_STATIC_WEIGHTS,
+    D5_EFFERENT_SIGMOID,
+    D5_EPSILON,
+    D5_IMPORTS_SIGMOID,
+    D5_INSTABILITY_SIGMOID,
+    D5_WEIGHTS,
+    D6_CLASS_SIGMOID,
+    D6_MODULE_SIGMOID,
+    D7_SIGMOID,
+    D8_DENSITY_SIGMOID,
+    D8_DEPTH_SIGMOID,
+    D8_VARIANCE_SIGMOID,
+    D8_WEIGHTS,
+    normalize_d1,
+    normalize_d2,
+    normalize_d3,
+    normalize_d4_fallback,
+    normalize_d4_static,
+    normalize_d4_with_llm,
+    normalize_d5,
+    normalize_d6_class,
+    normalize_d6_module,
+    normalize_d7,
+    normalize_d8,
+)
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+    HAS_NUMPY = False
+
+
+DIMENSIONS = list(WEIGHTS)  # ["D1", ..., "D8"]
+
+
+def normalize_files(files: dict[str, dict], use_numpy: bool | None = None) -> dict[str, dict]:
+    """Normalize D1-D8 and aggregate the CLI score for many files.
+
+    Args:
+        files: {path: {"d1": {...}, ..., "d8": {...}}}. Each section has the
+            same fields as the matching normalize-* calculator command and may
+            be omitted. D4 uses the fallback formula when dictionary_coverage
+            is given and the LLM blend when llm_score is given; D6 uses the
+            class form when lcom_values is given.
+        use_numpy: Force (True) or disable (False) the vectorized path.
+            Defaults to vectorized when NumPy is installed.
+
+    Returns:
+        {path: {"dimensions": {"D1": float, ...}, "cli": {...}}}, where "cli"
+        holds the compute_cli_score fields and is present only for files with
+        all eight dimensions.
+
+    Raises:
+        KeyError: A section is missing a required field or is not d1-d8.
+    """
+    for sections in files.values():
+        for key in sections:
+            if key.upper() not in WEIGHTS:
+                raise KeyError(key)
+
+    if use_numpy is None:
+        use_numpy = HAS_NUMPY
+    if use_numpy and not HAS_NUMPY:
+        raise ImportError("NumPy is not installed")
+    if use_numpy:
+        return _normalize_files_numpy(files)
+    return _normalize_files_python(files)
+
+
+# --- Pure Python path ---
+
+
+def _score_section_python(key: str, section: dict) -> float:
+    if key == "d1":
+        return normalize_d1(section["complexity_scores"])["d1"]
+    if key == "d2":
+        return normalize_d2(section["nesting_depths"])["d2"]
+    if key == "d3":
+        return normalize_d3(
+            section["func_locs"], section["file_locs"], section["param_counts"], section["methods_per_class"]
+        )["d3"]
+    if key == "d4":
+        naming = (
+            section["short_name_proportion"],
+            section["abbreviation_density"],
+            section["single_char_per_100loc"],
+            section["consistency_ratio"],
+        )
+        if "dictionary_coverage" in section:
+            return normalize_d4_fallback(*naming, section["dictionary_coverage"])["d4_fallback"]
+        d4_static = normalize_d4_static(*naming)["d4_static"]
+        if "llm_score" in section:
+            return normalize_d4_with_llm(d4_static, section["llm_score"])["d4"]
+        return d4_static
+    if key == "d5":
+        return normalize_d5(
+            section["efferent_couplings"], section["imports_per_file"], section["afferent_couplings"]
+        )["d5"]
+    if key == "d6":
+        if "lcom_values" in section:
+            return normalize_d6_class(section["lcom_values"])["d6"]
+        return normalize_d6_module(section["avg_exports_used_together"], section["total_exports"])["d6"]
+    if key == "d7":
+        return normalize_d7(section["duplication_pct"])["d7"]
+    return normalize_d8(section["max_directory_depth"], section["files_per_directory"], section["file_sizes"])["d8"]
+
+
+def _normalize_files_python(files: dict[str, dict]) -> dict[str, dict]:
+    results = {}
+    for path, sections in files.items():
+        dimensions = {key.upper(): _score_section_python(key, section) for key, section in sections.items()}
+        entry = {"dimensions": dimensions}
+        if len(dimensions) == len(WEIGHTS):
+            entry["cli"] = compute_cli_score(dimensions)._asdict()
+        results[path] = entry
+    return results
+
+
+# --- NumPy path ---
+
+
+class _Ragged:
+    """Per-file value lists flattened into one array with segment ids."""
+
+    def __init__(self, lists: list[list[float]]):
+        self.count = len(lists)
+        self.lengths = np.fromiter(map(len, lists), dtype=np.int64, count=self.count)
+        total = int(self.lengths.sum())
+        self.values = np.fromiter(chain.from_iterable(lists), dtype=np.float64, count=total)
+        self.segments = np.repeat(np.arange(self.count), self.lengths)
+        self.starts = np.cumsum(self.lengths) - self.lengths
+        self.empty = self.lengths == 0
+
+    def mean(self, values=None):
+        """Mean per segment of self.values (or of another array aligned with it)."""
+        sums = np.bincount(self.segments, weights=self.values if values is None else values, minlength=self.count)
+        return np.divide(sums, self.lengths, out=np.zeros(self.count), where=~self.empty)
+
+    def p90(self):
+        """90th percentile per segment, interpolated exactly as core.p90."""
+        if not len(self.values):
+            return np.zeros(self.count)
+        # Sort within segments: one global argsort, then an integer sort on
+        # (segment, global rank), which is much cheaper than np.lexsort
+        n = len(self.values)
+        order = np.argsort(self.values)
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.arange(n)
+        ordered = self.values[order][np.sort(self.segments * n + rank) % n]
+        idx = 0.9 * np.maximum(self.lengths - 1, 0)
+        lo = np.floor(idx).astype(np.int64)
+        hi = np.ceil(idx).astype(np.int64)
+        last = len(ordered) - 1
+        lo_vals = ordered[np.minimum(self.starts + lo, last)]
+        hi_vals = ordered[np.minimum(self.starts + hi, last)]
+        return np.where(self.empty, 0.0, lo_vals + (idx - lo) * (hi_vals - lo_vals))
+
+    def coefficient_of_variation(self):
+        m = self.mean()
+        variance = self.mean((self.values - m[self.segments]) ** 2)
+        return np.divide(np.sqrt(variance), m, out=np.zeros(self.count), where=m != 0)
+
+
+def _sigmoid(x, midpoint: float, steepness: float):
+    """Vectorized core.sigmoid with the same overflow clamps."""
+    z = -steepness * (np.asarray(x, dtype=np.float64) - midpoint)
+    with np.errstate(over="ignore"):
+        s = 1.0 / (1.0 + np.exp(np.clip(z, -500, 500)))
+    return np.where(z > 500, 0.0, np.where(z < -500, 1.0, s))
+
+
+def _column(sections: list[dict], field: str, default: float | None = None):
+    if default is None:
+        return np.array([s[field] for s in sections], dtype=np.float64)
+    return np.array([s.get(field, default) for s in sections], dtype=np.float64)
+
+
+def _ragged(sections: list[dict], field: str) -> _Ragged:
+    return _Ragged([s[field] for s in sections])
+
+
+def _score_d1(sections):
+    r = _ragged(sections, "complexity_scores")
+    return np.where(r.empty, 0.0, _sigmoid(D1_WEIGHTS[0] * r.mean() + D1_WEIGHTS[1] * r.p90(), *D1_SIGMOID))
+
+
+def _score_d2(sections):
+    r = _ragged(sections, "nesting_depths")
+    return np.where(r.empty, 0.0, _sigmoid(D2_WEIGHTS[0] * r.mean() + D2_WEIGHTS[1] * r.p90(), *D2_SIGMOID))
+
+
+def _score_d3(sections):
+    func, file_, params, methods = (
+        _ragged(sections, f) for f in ("func_locs", "file_locs", "param_counts", "methods_per_class")
+    )
+    size_func = np.where(func.empty, 0.0, _sigmoid(func.p90(), *D3_FUNC_SIGMOID))
+    size_file = np.where(file_.empty, 0.0, _sigmoid(file_.p90(), *D3_FILE_SIGMOID))
+    size_params = np.where(params.empty, 0.0, _sigmoid(params.mean(), *D3_PARAMS_SIGMOID))
+    size_class = np.where(methods.empty, 0.0, _sigmoid(methods.p90(), *D3_CLASS_SIGMOID))
+    w_func, w_file, w_params, w_class = D3_WEIGHTS
+    return w_func * size_func + w_file * size_file + w_params * size_params + w_class * size_class
+
+
+def _score_d4(sections):
+    short = _column(sections, "short_name_proportion")
+    abbrev = _column(sections, "abbreviation_density")
+    single_char = _sigmoid(_column(sections, "single_char_per_100loc"), *D4_SINGLE_CHAR_SIGMOID)
+    consistency = 1.0 - _column(sections, "consistency_ratio")
+    w_short, w_abbrev, w_single_char, w_consistency = D4_STATIC_WEIGHTS
+    static = w_short * short + w_abbrev * abbrev + w_single_char * single_char + w_consistency * consistency
+    with_llm = D4_LLM_WEIGHTS[0] * static + D4_LLM_WEIGHTS[1] * _column(sections, "llm_score", 0.0)
+    f_short, f_abbrev, f_single_char, f_consistency, f_dict = D4_FALLBACK_WEIGHTS
+    fallback = (
+        f_short * short
+        + f_abbrev * abbrev
+        + f_single_char * single_char
+        + f_consistency * consistency
+        + f_dict * (1.0 - _column(sections, "dictionary_coverage", 0.0))
+    )
+    is_fallback = np.array(["dictionary_coverage" in s for s in sections], dtype=bool)
+    is_llm = np.array(["llm_score" in s for s in sections], dtype=bool)
+    return np.where(is_fallback, fallback, np.where(is_llm, with_llm, static))
+
+
+def _score_d5(sections):
+    efferent = _ragged(sections, "efferent_couplings")
+    imports = _ragged(sections, "imports_per_file")
+    ce_mean = efferent.mean()
+    coupling_efferent = _sigmoid(ce_mean, *D5_EFFERENT_SIGMOID)
+    coupling_imports = np.where(imports.empty, 0.0, _sigmoid(imports.mean(), *D5_IMPORTS_SIGMOID))
+
+    # Pair-wise instability over the first min(len(Ce), len(Ca)) modules of each file
+    # (zero when either list is empty, as in the scalar path)
+    n_pairs = [min(len(s["efferent_couplings"]), len(s["afferent_couplings"])) for s in sections]
+    ce = _Ragged([s["efferent_couplings"][:n] for s, n in zip(sections, n_pairs)])
+    ca = _Ragged([s["afferent_couplings"][:n] for s, n in zip(sections, n_pairs)])
+    instability_risk = ce.mean(ce.values / (ca.values + ce.values + D5_EPSILON)) * ce_mean
+
+    instability_sigmoid = _sigmoid(instability_risk, *D5_INSTABILITY_SIGMOID)
+    w_efferent, w_imports, w_instability = D5_WEIGHTS
+    return w_efferent * coupling_efferent + w_imports * coupling_imports + w_instability * instability_sigmoid
+
+
+def _score_d6(sections):
+    is_class = np.array(["lcom_values" in s for s in sections], dtype=bool)
+    lcom = _Ragged([s.get("lcom_values", []) for s in sections])
+    class_score = np.where(lcom.empty, 0.0, _sigmoid(lcom.mean(), *D6_CLASS_SIGMOID))
+
+    used = np.array([0.0 if c else s["avg_exports_used_together"] for s, c in zip(sections, is_class)])
+    total = np.array([0.0 if c else s["total_exports"] for s, c in zip(sections, is_class)])
+    cohesion = 1.0 - np.divide(used, total, out=np.zeros(len(sections)), where=total != 0)
+    module_score = np.where(total == 0, 0.0, _sigmoid(cohesion, *D6_MODULE_SIGMOID))
+    return np.where(is_class, class_score, module_score)
+
+
+def _score_d7(sections):
+    return _sigmoid(_column(sections, "duplication_pct") * 100, *D7_SIGMOID)
+
+
+def _score_d8(sections):
+    nav_depth = _sigmoid(_column(sections, "max_directory_depth"), *D8_DEPTH_SIGMOID)
+    per_dir = _ragged(sections, "files_per_directory")
+    nav_density = np.where(per_dir.empty, 0.0, _sigmoid(per_dir.p90(), *D8_DENSITY_SIGMOID))
+    nav_variance = _sigmoid(_ragged(sections, "file_sizes").coefficient_of_variation(), *D8_VARIANCE_SIGMOID)
+    w_depth, w_density, w_variance = D8_WEIGHTS
+    return w_depth * nav_depth + w_density * nav_density + w_variance * nav_variance
+
+
+_VECTOR_SCORERS = {
+    "D1": _score_d1,
+    "D2": _score_d2,
+    "D3": _score_d3,
+    "D4": _score_d4,
+    "D5": _score_d5,
+    "D6": _score_d6,
+    "D7": _score_d7,
+    "D8": _score_d8,
+}
+
+
+def _normalize_files_numpy(files: dict[str, dict]) -> dict[str, dict]:
+    paths = list(files)
+    n = len(paths)
+    scores = np.zeros((n, len(DIMENSIONS)))
+    present = np.zeros((n, len(DIMENSIONS)), dtype=bool)
+
+    for col, dim in enumerate(DIMENSIONS):
+        key = dim.lower()
+        rows = [i for i, path in enumerate(paths) if key in files[path]]
+        if rows:
+            scores[rows, col] = _VECTOR_SCORERS[dim]([files[paths[i]][key] for i in rows])
+            present[rows, col] = True
+
+    weights = np.array([WEIGHTS[d] for d in DIMENSIONS])
+    cli_raw = scores @ weights
+    penalty = np.zeros(n)
+    for d_a, d_b in INTERACTION_PAIRS:
+        a, b = DIMENSIONS.index(d_a), DIMENSIONS.index(d_b)
+        penalty += np.where((scores[:, a] > 0.6) & (scores[:, b] > 0.6), INTERACTION_PENALTY_PER_PAIR, 0.0)
+    cli_score = np.minimum(999, np.round((cli_raw + penalty) * 1000)).astype(np.int64)
+    thresholds = np.array([t for t, _ in RATING_THRESHOLDS])
+    rating_idx = np.minimum(np.searchsorted(thresholds, cli_score, side="left"), len(thresholds) - 1)
+    weighted = np.round(scores * weights, 6)
+
+    # Convert to Python scalars once, not per element
+    rows = zip(
+        paths,
+        scores.tolist(),
+        present.tolist(),
+        cli_score.tolist(),
+        rating_idx.tolist(),
+        cli_raw.tolist(),
+        penalty.tolist(),
+        weighted.tolist(),
+    )
+    results = {}
+    for path, row, row_present, score, rating, raw, row_penalty, row_weighted in rows:
+        entry = {"dimensions": {dim: v for dim, v, p in zip(DIMENSIONS, row, row_present) if p}}
+        if all(row_present):
+            entry["cli"] = {
+                "cli_score": score,
+                "rating": RATING_THRESHOLDS[rating][1],
+                "cli_raw": raw,
+                "interaction_penalty": row_penalty,
+                "weighted_components": dict(zip(DIMENSIONS, row_weighted)),
+            }
+        results[path] = entry
+    return results
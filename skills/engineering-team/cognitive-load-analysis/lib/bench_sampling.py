@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""Microbenchmark for the versioned sampling algorithms in sampling.py.
+
+Times select_files and select_identifiers_for_file for each algorithm on
+synthetic data, plus the pre-heap full-sort identifier selection as a
+baseline. Output is JSON to stdout.
+
+Usage:
+    python bench_sampling.py
+    python bench_sampling.py --files 200000 --identifiers 500000 --repeat 5
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+
+_lib_dir = str(Path(__file__).resolve().parent)
+if _lib_dir not in sys.path:
+    sys.path.insert(0, _lib_dir)
+
+from sampling import SAMPLING_ALGORITHMS, select_files, select_identifiers_for_file, sha256_seed  # noqa: E402
+
+
+def _full_sort_identifiers(file_path, identifiers, count=20):
+    """Original selection: hash every identifier, sort all, take count."""
+    seed = sha256_seed(file_path)
+    decorated = [(hashlib.sha256(f"{seed}:{ident}".encode()).hexdigest(), ident) for ident in identifiers]
+    decorated.sort()
+    return [ident for _, ident in decorated[:count]]
+
+
+def _best_of(repeat, func, *args, **kwargs):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args, **kwargs)
+        best = min(best, time.perf_counter() - start)
+    return round(best * 1000, 2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cognitive-load sampling algorithms")
+    parser.add_argument("--files", type=int, default=100_000, help="Synthetic file paths (default: 100000)")
+    parser.add_argument("--identifiers", type=int, default=200_000, help="Identifiers in one file (default: 200000)")
+    parser.add_argument("--count", type=int, default=20, help="Identifiers to select (default: 20)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement, best is reported (default: 3)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    paths = [f"src/pkg{i % 500}/module_{i}.py" for i in range(args.files)]
+    file_locs = {path: rng.randrange(600) for path in paths}
+    identifiers = [f"name_{rng.randrange(10**9):x}" for _ in range(args.identifiers)]
+
+    results = {
+        "files": args.files,
+        "identifiers": args.identifiers,
+        "select_files_ms": {},
+        "select_identifiers_ms": {
+            "full-sort (pre-heap sha256-v1)": _best_of(args.repeat, _full_sort_identifiers, "src/a.py", identifiers, args.count)
+        },
+    }
+    for algorithm in SAMPLING_ALGORITHMS:
+        results["select_files_ms"][algorithm] = _best_of(
+            args.repeat, select_files, paths, file_locs=file_locs, algorithm=algorithm
+        )
+        results["select_identifiers_ms"][algorithm] = _best_of(
+            args.repeat, select_identifiers_for_file, "src/a.py", identifiers, args.count, algorithm=algorithm
+        )
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
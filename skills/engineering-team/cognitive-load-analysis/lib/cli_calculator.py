@@ -4,10 +4,17 @@
 All output is JSON to stdout. Errors go to stderr.
 Invoked by the alf-cognitive-load-analyzer agent via Bash.
 
+The JSON argument may be "-" (read from stdin) or "@path" (read from a file)
+for payloads too large for the command line. The serve command keeps one
+process alive and answers newline-delimited JSON requests from stdin.
+
 Usage:
     python cli_calculator.py normalize-d1 '{"complexity_scores": [5, 10, 15]}'
     python cli_calculator.py aggregate '{"D1": 0.45, "D2": 0.32, ...}'
     python cli_calculator.py sample-files '{"file_paths": [...], "file_locs": {...}}'
+    python cli_calculator.py sample-files @payload.json
+    python cli_calculator.py normalize-batch '{"files": {"a.py": {"d1": {...}, ...}}}'
+    python cli_calculator.py serve < requests.ndjson > results.ndjson
 """
 
 import json
@@ -27,6 +34,7 @@ if _lib_dir not in sys.path:
     sys.path.insert(0, _lib_dir)
 
 from aggregation import aggregate_polyglot, compute_cli_score, get_rating  # noqa: E402
+from batch import DIMENSIONS, normalize_files  # noqa: E402
 from dimensions import (  # noqa: E402
     normalize_d1,
     normalize_d2,
@@ -40,7 +48,7 @@ from dimensions import (  # noqa: E402
     normalize_d7,
     normalize_d8,
 )
-from sampling import select_files, select_identifiers_for_file  # noqa: E402
+from sampling import DEFAULT_SAMPLING_ALGORITHM, select_files, select_identifiers_for_file  # noqa: E402
 
 
 def _ok(result):
@@ -152,28 +160,74 @@ def cmd_aggregate_polyglot(data):
 
 
 def cmd_sample_files(data):
+    algorithm = data.get("algorithm", DEFAULT_SAMPLING_ALGORITHM)
     selected = select_files(
         data["file_paths"],
         sample_pct=data.get("sample_pct", 30),
         min_loc=data.get("min_loc", 200),
         file_locs=data.get("file_locs"),
+        algorithm=algorithm,
     )
-    return _ok({"selected_files": selected, "count": len(selected)})
+    return _ok({"selected_files": selected, "count": len(selected), "algorithm": algorithm})
 
 
 def cmd_sample_identifiers(data):
+    algorithm = data.get("algorithm", DEFAULT_SAMPLING_ALGORITHM)
     selected = select_identifiers_for_file(
         data["file_path"],
         data["identifiers"],
         count=data.get("count", 20),
+        algorithm=algorithm,
     )
-    return _ok({"selected_identifiers": selected, "count": len(selected)})
+    return _ok({"selected_identifiers": selected, "count": len(selected), "algorithm": algorithm})
 
 
 def cmd_rating(data):
     return _ok({"rating": get_rating(data["score"])})
 
 
+# Section names accepted per file by normalize-batch
+BATCH_SECTIONS = [dim.lower() for dim in DIMENSIONS]
+
+
+def cmd_normalize_batch(data):
+    """Normalize D1-D8 for many files in one call, via batch.normalize_files.
+
+    data["files"] maps a file path to sections "d1".."d8", each shaped like the
+    matching normalize-* payload. D4 uses the fallback formula when
+    dictionary_coverage is given and the LLM blend when llm_score is given;
+    D6 uses the class form when lcom_values is given. A failing file is
+    reported in place without affecting the others.
+    """
+    files = {}
+    valid = {}
+    for path, sections in data["files"].items():
+        unknown = [key for key in sections if key not in BATCH_SECTIONS]
+        if unknown:
+            files[path] = _err(f"Unknown section '{unknown[0]}'. Available: {', '.join(BATCH_SECTIONS)}")
+        else:
+            valid[path] = sections
+
+    try:
+        scored = normalize_files(valid)
+    except Exception:
+        # Some file is invalid: score them one at a time to find which
+        scored = {}
+        for path, sections in valid.items():
+            try:
+                scored.update(normalize_files({path: sections}))
+            except KeyError as e:
+                files[path] = _err(f"Missing required field: {e}")
+            except Exception as e:
+                files[path] = _err(f"Calculation error: {e}")
+    for path, entry in scored.items():
+        files[path] = {"ok": True, **entry}
+
+    files = {path: files[path] for path in data["files"]}
+    failed = sum(not entry["ok"] for entry in files.values())
+    return _ok({"files": files, "count": len(files), "failed": failed})
+
+
 COMMANDS = {
     "normalize-d1": cmd_normalize_d1,
     "normalize-d2": cmd_normalize_d2,
@@ -191,19 +245,69 @@ COMMANDS = {
     "sample-files": cmd_sample_files,
     "sample-identifiers": cmd_sample_identifiers,
     "rating": cmd_rating,
+    "normalize-batch": cmd_normalize_batch,
 }
 
 
+def run_command(command, data):
+    """Run one command and return its response, reporting errors in the response."""
+    if command not in COMMANDS:
+        return _err(f"Unknown command: {command}. Available: {', '.join(sorted(COMMANDS))}")
+    try:
+        return COMMANDS[command](data)
+    except KeyError as e:
+        return _err(f"Missing required field: {e}")
+    except Exception as e:
+        return _err(f"Calculation error: {e}")
+
+
+def serve(stream_in, stream_out):
+    """Answer NDJSON requests until EOF, one response line per request line.
+
+    Each request is {"id": any, "command": str, "data": {...}}; the id is
+    echoed back so callers can pipeline requests.
+    """
+    for line_no, line in enumerate(stream_in, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError as e:
+            response = _err(f"Invalid JSON on line {line_no}: {e}")
+        else:
+            if not isinstance(request, dict) or "command" not in request:
+                response = _err('Request must be an object with "command" and "data"')
+            else:
+                response = run_command(request["command"], request.get("data", {}))
+            if isinstance(request, dict) and "id" in request:
+                response = {"id": request["id"], **response}
+        stream_out.write(json.dumps(response) + "\n")
+        stream_out.flush()
+
+
+def _read_payload(arg):
+    """Return the JSON text for a payload argument: literal, "-" for stdin, or "@path"."""
+    if arg == "-":
+        return sys.stdin.read()
+    if arg.startswith("@"):
+        return Path(arg[1:]).read_text(encoding="utf-8")
+    return arg
+
+
 def main():
+    if len(sys.argv) == 2 and sys.argv[1] == "serve":
+        serve(sys.stdin, sys.stdout)
+        return
+
     if len(sys.argv) < 3:
         print(
-            json.dumps(_err(f"Usage: {sys.argv[0]} <command> '<json_data>'")),
+            json.dumps(_err(f"Usage: {sys.argv[0]} <command> '<json_data>' | - | @file, or {sys.argv[0]} serve")),
             file=sys.stdout,
         )
         sys.exit(1)
 
     command = sys.argv[1]
-    json_str = sys.argv[2]
 
     if command not in COMMANDS:
         print(
@@ -212,6 +316,12 @@ def main():
         )
         sys.exit(1)
 
+    try:
+        json_str = _read_payload(sys.argv[2])
+    except OSError as e:
+        print(json.dumps(_err(f"Cannot read payload: {e}")), file=sys.stdout)
+        sys.exit(1)
+
     try:
         data = json.loads(json_str)
     except json.JSONDecodeError as e:
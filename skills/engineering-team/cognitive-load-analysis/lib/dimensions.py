@@ -1,12 +1,48 @@
 """D1-D8 dimension normalization functions for the Cognitive Load Index.
 
 Each function takes raw metrics and returns a normalized score in (0, 1).
-All sigmoid parameters match cli-dimensions-and-formulas.md.
+All sigmoid parameters match cli-dimensions-and-formulas.md. Sigmoids are
+(midpoint, steepness) pairs and weights are given in formula order; batch.py
+imports both.
 """
 
 from core import coefficient_of_variation, mean, p90, sigmoid
 
 
+D1_SIGMOID = (15, 0.15)
+D1_WEIGHTS = (0.4, 0.6)  # mean, p90
+
+D2_SIGMOID = (4, 0.5)
+D2_WEIGHTS = (0.3, 0.7)  # mean, p90
+
+D3_FUNC_SIGMOID = (30, 0.05)
+D3_FILE_SIGMOID = (300, 0.005)
+D3_PARAMS_SIGMOID = (4, 0.5)
+D3_CLASS_SIGMOID = (15, 0.1)
+D3_WEIGHTS = (0.35, 0.25, 0.20, 0.20)  # func, file, params, class
+
+D4_SINGLE_CHAR_SIGMOID = (2, 0.5)
+D4_STATIC_WEIGHTS = (0.30, 0.25, 0.25, 0.20)  # short, abbrev, single_char, consistency
+D4_LLM_WEIGHTS = (0.60, 0.40)  # static, llm
+D4_FALLBACK_WEIGHTS = (0.35, 0.30, 0.15, 0.10, 0.10)  # short, abbrev, single_char, consistency, dictionary
+
+D5_EFFERENT_SIGMOID = (8, 0.2)
+D5_IMPORTS_SIGMOID = (10, 0.15)
+D5_INSTABILITY_SIGMOID = (5, 0.2)
+D5_WEIGHTS = (0.40, 0.35, 0.25)  # efferent, imports, instability
+D5_EPSILON = 1e-9
+
+D6_CLASS_SIGMOID = (0.5, 4)
+D6_MODULE_SIGMOID = (0.4, 4)
+
+D7_SIGMOID = (5, 0.3)
+
+D8_DEPTH_SIGMOID = (5, 0.4)
+D8_DENSITY_SIGMOID = (15, 0.1)
+D8_VARIANCE_SIGMOID = (1.5, 0.8)
+D8_WEIGHTS = (0.35, 0.35, 0.30)  # depth, density, variance
+
+
 # --- D1: Structural Complexity (20%) ---
 
 
@@ -23,8 +59,8 @@ def normalize_d1(complexity_scores: list[float]) -> dict:
         return {"d1": 0.0, "raw": 0.0, "mean": 0.0, "p90": 0.0}
     m = mean(complexity_scores)
     p = p90(complexity_scores)
-    raw = 0.4 * m + 0.6 * p
-    return {"d1": sigmoid(raw, midpoint=15, steepness=0.15), "raw": raw, "mean": m, "p90": p}
+    raw = D1_WEIGHTS[0] * m + D1_WEIGHTS[1] * p
+    return {"d1": sigmoid(raw, *D1_SIGMOID), "raw": raw, "mean": m, "p90": p}
 
 
 # --- D2: Nesting Depth (15%) ---
@@ -43,8 +79,8 @@ def normalize_d2(nesting_depths: list[float]) -> dict:
         return {"d2": 0.0, "raw": 0.0, "mean": 0.0, "p90": 0.0}
     m = mean(nesting_depths)
     p = p90(nesting_depths)
-    raw = 0.3 * m + 0.7 * p
-    return {"d2": sigmoid(raw, midpoint=4, steepness=0.5), "raw": raw, "mean": m, "p90": p}
+    raw = D2_WEIGHTS[0] * m + D2_WEIGHTS[1] * p
+    return {"d2": sigmoid(raw, *D2_SIGMOID), "raw": raw, "mean": m, "p90": p}
 
 
 # --- D3: Volume and Size (12%) ---
@@ -68,11 +104,12 @@ def normalize_d3(
         {"d3": float, "size_func": float, "size_file": float,
          "size_params": float, "size_class": float}
     """
-    size_func = sigmoid(p90(func_locs), midpoint=30, steepness=0.05) if func_locs else 0.0
-    size_file = sigmoid(p90(file_locs), midpoint=300, steepness=0.005) if file_locs else 0.0
-    size_params = sigmoid(mean(param_counts), midpoint=4, steepness=0.5) if param_counts else 0.0
-    size_class = sigmoid(p90(methods_per_class), midpoint=15, steepness=0.1) if methods_per_class else 0.0
-    d3 = 0.35 * size_func + 0.25 * size_file + 0.20 * size_params + 0.20 * size_class
+    size_func = sigmoid(p90(func_locs), *D3_FUNC_SIGMOID) if func_locs else 0.0
+    size_file = sigmoid(p90(file_locs), *D3_FILE_SIGMOID) if file_locs else 0.0
+    size_params = sigmoid(mean(param_counts), *D3_PARAMS_SIGMOID) if param_counts else 0.0
+    size_class = sigmoid(p90(methods_per_class), *D3_CLASS_SIGMOID) if methods_per_class else 0.0
+    w_func, w_file, w_params, w_class = D3_WEIGHTS
+    d3 = w_func * size_func + w_file * size_file + w_params * size_params + w_class * size_class
     return {
         "d3": d3,
         "size_func": size_func,
@@ -105,13 +142,14 @@ def normalize_d4_static(
     """
     naming_short = short_name_proportion
     naming_abbrev = abbreviation_density
-    naming_single_char = sigmoid(single_char_per_100loc, midpoint=2, steepness=0.5)
+    naming_single_char = sigmoid(single_char_per_100loc, *D4_SINGLE_CHAR_SIGMOID)
     naming_consistency = 1.0 - consistency_ratio
+    w_short, w_abbrev, w_single_char, w_consistency = D4_STATIC_WEIGHTS
     d4_static = (
-        0.30 * naming_short
-        + 0.25 * naming_abbrev
-        + 0.25 * naming_single_char
-        + 0.20 * naming_consistency
+        w_short * naming_short
+        + w_abbrev * naming_abbrev
+        + w_single_char * naming_single_char
+        + w_consistency * naming_consistency
     )
     return {
         "d4_static": d4_static,
@@ -132,7 +170,7 @@ def normalize_d4_with_llm(d4_static: float, llm_score: float) -> dict:
     Returns:
         {"d4": float, "d4_static": float, "llm_score": float}
     """
-    d4 = 0.60 * d4_static + 0.40 * llm_score
+    d4 = D4_LLM_WEIGHTS[0] * d4_static + D4_LLM_WEIGHTS[1] * llm_score
     return {"d4": d4, "d4_static": d4_static, "llm_score": llm_score}
 
 
@@ -157,15 +195,16 @@ def normalize_d4_fallback(
     """
     naming_short = short_name_proportion
     naming_abbrev = abbreviation_density
-    naming_single_char = sigmoid(single_char_per_100loc, midpoint=2, steepness=0.5)
+    naming_single_char = sigmoid(single_char_per_100loc, *D4_SINGLE_CHAR_SIGMOID)
     naming_consistency = 1.0 - consistency_ratio
     dict_penalty = 1.0 - dictionary_coverage
+    w_short, w_abbrev, w_single_char, w_consistency, w_dict = D4_FALLBACK_WEIGHTS
     d4_fallback = (
-        0.35 * naming_short
-        + 0.30 * naming_abbrev
-        + 0.15 * naming_single_char
-        + 0.10 * naming_consistency
-        + 0.10 * dict_penalty
+        w_short * naming_short
+        + w_abbrev * naming_abbrev
+        + w_single_char * naming_single_char
+        + w_consistency * naming_consistency
+        + w_dict * dict_penalty
     )
     return {
         "d4_fallback": d4_fallback,
@@ -196,12 +235,9 @@ def normalize_d5(
         {"d5": float, "coupling_efferent": float, "coupling_imports": float,
          "instability_risk": float, "instability_sigmoid": float}
     """
-    epsilon = 1e-9
     ce_mean = mean(efferent_couplings) if efferent_couplings else 0.0
-    coupling_efferent = sigmoid(ce_mean, midpoint=8, steepness=0.2)
-    coupling_imports = (
-        sigmoid(mean(imports_per_file), midpoint=10, steepness=0.15) if imports_per_file else 0.0
-    )
+    coupling_efferent = sigmoid(ce_mean, *D5_EFFERENT_SIGMOID)
+    coupling_imports = sigmoid(mean(imports_per_file), *D5_IMPORTS_SIGMOID) if imports_per_file else 0.0
 
     # Instability risk: mean(Ce / (Ca + Ce + epsilon)) * mean(Ce)
     if efferent_couplings and afferent_couplings:
@@ -209,13 +245,14 @@ def normalize_d5(
         ce_list = efferent_couplings
         # Pair-wise instability for each module
         n = min(len(ce_list), len(ca_list))
-        instabilities = [ce_list[i] / (ca_list[i] + ce_list[i] + epsilon) for i in range(n)]
+        instabilities = [ce_list[i] / (ca_list[i] + ce_list[i] + D5_EPSILON) for i in range(n)]
         instability_risk = mean(instabilities) * ce_mean
     else:
         instability_risk = 0.0
 
-    instability_sigmoid = sigmoid(instability_risk, midpoint=5, steepness=0.2)
-    d5 = 0.40 * coupling_efferent + 0.35 * coupling_imports + 0.25 * instability_sigmoid
+    instability_sigmoid = sigmoid(instability_risk, *D5_INSTABILITY_SIGMOID)
+    w_efferent, w_imports, w_instability = D5_WEIGHTS
+    d5 = w_efferent * coupling_efferent + w_imports * coupling_imports + w_instability * instability_sigmoid
     return {
         "d5": d5,
         "coupling_efferent": coupling_efferent,
@@ -240,7 +277,7 @@ def normalize_d6_class(lcom_values: list[float]) -> dict:
     if not lcom_values:
         return {"d6": 0.0, "mean_lcom": 0.0}
     m = mean(lcom_values)
-    return {"d6": sigmoid(m, midpoint=0.5, steepness=4), "mean_lcom": m}
+    return {"d6": sigmoid(m, *D6_CLASS_SIGMOID), "mean_lcom": m}
 
 
 def normalize_d6_module(
@@ -259,7 +296,7 @@ def normalize_d6_module(
     if total_exports == 0:
         return {"d6": 0.0, "module_cohesion": 0.0}
     module_cohesion = 1.0 - (avg_exports_used_together / total_exports)
-    return {"d6": sigmoid(module_cohesion, midpoint=0.4, steepness=4), "module_cohesion": module_cohesion}
+    return {"d6": sigmoid(module_cohesion, *D6_MODULE_SIGMOID), "module_cohesion": module_cohesion}
 
 
 # --- D7: Duplication (8%) ---
@@ -276,7 +313,7 @@ def normalize_d7(duplication_pct: float) -> dict:
         {"d7": float, "duplication_pct_100": float}
     """
     pct_100 = duplication_pct * 100
-    return {"d7": sigmoid(pct_100, midpoint=5, steepness=0.3), "duplication_pct_100": pct_100}
+    return {"d7": sigmoid(pct_100, *D7_SIGMOID), "duplication_pct_100": pct_100}
 
 
 # --- D8: Navigability (8%) ---
@@ -297,9 +334,10 @@ def normalize_d8(
     Returns:
         {"d8": float, "nav_depth": float, "nav_density": float, "nav_variance": float}
     """
-    nav_depth = sigmoid(max_directory_depth, midpoint=5, steepness=0.4)
-    nav_density = sigmoid(p90(files_per_directory), midpoint=15, steepness=0.1) if files_per_directory else 0.0
+    nav_depth = sigmoid(max_directory_depth, *D8_DEPTH_SIGMOID)
+    nav_density = sigmoid(p90(files_per_directory), *D8_DENSITY_SIGMOID) if files_per_directory else 0.0
     cv = coefficient_of_variation(file_sizes) if file_sizes else 0.0
-    nav_variance = sigmoid(cv, midpoint=1.5, steepness=0.8)
-    d8 = 0.35 * nav_depth + 0.35 * nav_density + 0.30 * nav_variance
+    nav_variance = sigmoid(cv, *D8_VARIANCE_SIGMOID)
+    w_depth, w_density, w_variance = D8_WEIGHTS
+    d8 = w_depth * nav_depth + w_density * nav_density + w_variance * nav_variance
     return {"d8": d8, "nav_depth": nav_depth, "nav_density": nav_density, "nav_variance": nav_variance}
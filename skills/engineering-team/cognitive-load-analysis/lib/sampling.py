@@ -1,9 +1,29 @@
 """Deterministic file and identifier selection for large codebase sampling.
 
-Uses SHA-256 hashing to ensure identical selection across runs.
+Uses stable hashing to ensure identical selection across runs. Two sampling
+algorithms are versioned so earlier reports stay reproducible:
+
+- "sha256-v1" (default): SHA-256 hex digests of every path, as in all
+  earlier reports.
+- "blake2b-v2": 8-byte BLAKE2b digests, computed only for paths not already
+  selected by LOC. Cheaper, but selects a different (equally uniform) sample.
+
+Both use heap-based top-k selection for identifiers; v1 output is unchanged.
 """
 
 import hashlib
+import heapq
+
+
+SAMPLING_V1 = "sha256-v1"
+SAMPLING_V2 = "blake2b-v2"
+SAMPLING_ALGORITHMS = (SAMPLING_V1, SAMPLING_V2)
+DEFAULT_SAMPLING_ALGORITHM = SAMPLING_V1
+
+
+def _check_algorithm(algorithm: str) -> None:
+    if algorithm not in SAMPLING_ALGORITHMS:
+        raise ValueError(f"Unknown sampling algorithm: {algorithm}. Available: {', '.join(SAMPLING_ALGORITHMS)}")
 
 
 def sha256_seed(file_path: str) -> int:
@@ -18,35 +38,49 @@ def sha256_seed(file_path: str) -> int:
     return int(hashlib.sha256(file_path.encode()).hexdigest()[:8], 16)
 
 
+def blake2b_seed(file_path: str) -> int:
+    """Compute a deterministic 64-bit integer from a file path with BLAKE2b."""
+    return int.from_bytes(hashlib.blake2b(file_path.encode(), digest_size=8).digest(), "big")
+
+
 def select_files(
     paths: list[str],
     sample_pct: int = 30,
     min_loc: int = 200,
     file_locs: dict[str, int] | None = None,
+    algorithm: str = DEFAULT_SAMPLING_ALGORITHM,
 ) -> list[str]:
     """Select a deterministic subset of files for analysis.
 
-    Uses SHA-256 hash modulo 100 to select ~sample_pct% of files.
-    Additionally includes all files exceeding min_loc lines.
+    Files in file_locs exceeding min_loc lines are selected first, under
+    either algorithm. Then a stable hash modulo 100 selects ~sample_pct% of
+    paths: v1 hashes every path, v2 only those not already selected.
 
     Args:
         paths: List of file paths to sample from.
         sample_pct: Target percentage of files to select (default 30).
         min_loc: Always include files exceeding this LOC threshold (default 200).
         file_locs: Optional dict mapping file path to LOC count.
+        algorithm: Sampling algorithm version (see SAMPLING_ALGORITHMS).
 
     Returns:
         Sorted list of selected file paths.
     """
+    _check_algorithm(algorithm)
     selected = set()
-    sorted_paths = sorted(paths)
-    for path in sorted_paths:
-        if sha256_seed(path) % 100 < sample_pct:
-            selected.add(path)
     if file_locs:
         for path, loc in file_locs.items():
             if loc > min_loc:
                 selected.add(path)
+
+    if algorithm == SAMPLING_V1:
+        for path in paths:
+            if sha256_seed(path) % 100 < sample_pct:
+                selected.add(path)
+    else:
+        for path in paths:
+            if path not in selected and blake2b_seed(path) % 100 < sample_pct:
+                selected.add(path)
     return sorted(selected)
 
 
@@ -54,23 +88,34 @@ def select_identifiers_for_file(
     file_path: str,
     identifiers: list[str],
     count: int = 20,
+    algorithm: str = DEFAULT_SAMPLING_ALGORITHM,
 ) -> list[str]:
     """Deterministically select identifiers from a file for D4 assessment.
 
-    Uses SHA-256 of file path as seed for consistent selection.
+    Uses a hash of the file path as seed for consistent selection, and keeps
+    the count identifiers with the smallest seeded hashes.
 
     Args:
         file_path: Path used as seed for deterministic selection.
         identifiers: List of identifiers to sample from.
         count: Number of identifiers to select (default 20).
+        algorithm: Sampling algorithm version (see SAMPLING_ALGORITHMS).
 
     Returns:
         List of selected identifiers (up to count).
     """
+    _check_algorithm(algorithm)
     if len(identifiers) <= count:
         return list(identifiers)
-    seed = sha256_seed(file_path)
-    # Deterministic shuffle using hash-based sorting
-    decorated = [(hashlib.sha256(f"{seed}:{ident}".encode()).hexdigest(), ident) for ident in identifiers]
-    decorated.sort()
-    return [ident for _, ident in decorated[:count]]
+
+    if algorithm == SAMPLING_V1:
+        seed = sha256_seed(file_path)
+        # Deterministic shuffle using hash-based ordering; ties broken by identifier
+        decorated = ((hashlib.sha256(f"{seed}:{ident}".encode()).hexdigest(), ident) for ident in identifiers)
+        return [ident for _, ident in heapq.nsmallest(count, decorated)]
+
+    # Seed prefix instead of a BLAKE2b key: keyed construction is slower in CPython
+    prefix = hashlib.blake2b(file_path.encode(), digest_size=16).digest()
+    blake2b = hashlib.blake2b
+    decorated = ((blake2b(prefix + ident.encode(), digest_size=8).digest(), ident) for ident in identifiers)
+    return [ident for _, ident in heapq.nsmallest(count, decorated)]
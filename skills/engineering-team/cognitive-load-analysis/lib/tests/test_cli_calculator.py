@@ -0,0 +1,38 @@
+"""Tests for cli_calculator.py"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cli_calculator import run_command
+
+
+class TestNormalizeBatch:
+    """Test the normalize-batch command."""
+
+    def test_unknown_section(self):
+        """Test a section other than d1-d8 is reported by name, not as a missing field."""
+        response = run_command("normalize-batch", {"files": {
+            "a.py": {"d1": {"complexity_scores": [5, 10]}, "d9": {}},
+            "b.py": {"d7": {"duplication_pct": 0.05}},
+        }})
+
+        files = response["result"]["files"]
+        assert files["a.py"]["ok"] is False
+        assert files["a.py"]["error"].startswith("Unknown section 'd9'")
+        assert files["b.py"]["ok"] is True
+        assert response["result"]["failed"] == 1
+
+    def test_missing_field(self):
+        """Test a section without a required field names the field."""
+        response = run_command("normalize-batch", {"files": {"a.py": {"d7": {}}}})
+
+        assert response["result"]["files"]["a.py"]["error"] == "Missing required field: 'duplication_pct'"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -2,19 +2,557 @@
 """
 Database backup and restore tool for MongoDB and PostgreSQL.
 Supports compression, scheduling, and verification.
+
+PostgreSQL backups can also use directory format: a parallel pg_dump whose
+output is split into content-defined chunks, checksummed and compressed
+in-process, and stored once in a chunk store shared by every backup in the
+backup directory.
 """
 
 import argparse
 import gzip
+import hashlib
 import json
 import os
+import re
 import shutil
 import subprocess
 import sys
-from dataclasses import dataclass
+import tarfile
+import threading
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
+from itertools import accumulate
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import BinaryIO, Dict, Iterator, List, Optional, Set, Tuple
+from urllib.parse import urlsplit, urlunsplit
+
+try:
+    import zstandard
+    HAS_ZSTD = True
+except ImportError:
+    zstandard = None
+    HAS_ZSTD = False
+
+
+MANIFEST_FORMAT = "pg-directory-chunked/1"
+CHUNK_DIR = "chunks"
+CHUNK_MIN_SIZE = 512 * 1024
+CHUNK_MAX_SIZE = 8 * 1024 * 1024
+CHUNK_MASK_BITS = 10  # A line ends a chunk when these bits of its Adler-32 high half are zero
+CHUNK_GRACE_SECONDS = 24 * 3600  # Recently written or reused chunks survive pruning
+READ_SIZE = 4 * 1024 * 1024
+PIPE_WRITE_SIZE = 64 * 1024
+
+# pg_dump --verbose lines showing a table file is complete, in parallel and serial dumps
+PG_DUMP_ITEM_DONE = re.compile(r"finished item (\d+) TABLE DATA")
+PG_DUMP_TABLE_START = re.compile(r'dumping contents of table "')
+
+# Restore log lines used to time tables during a test restore
+PG_RESTORE_ITEM = re.compile(r"(launching|finished) item (\d+) TABLE DATA (\S+)")
+PG_RESTORE_SERIAL = re.compile(r'processing data for table "([^"]+)"')
+MONGORESTORE_START = re.compile(r"restoring (?:to namespace )?'?([^\s']+)'? from")
+MONGORESTORE_DONE = re.compile(r"finished restoring '?([^\s']+)'? \((\d+) documents?")
+
+
+def iter_chunks(
+    stream: BinaryIO,
+    min_size: int = CHUNK_MIN_SIZE,
+    max_size: int = CHUNK_MAX_SIZE,
+    mask_bits: int = CHUNK_MASK_BITS
+) -> Iterator[bytes]:
+    """
+    Split a byte stream into content-defined chunks at line ends.
+
+    A line ends a chunk when its Adler-32 checksum has mask_bits zero bits in
+    its high half (about one line in 2**mask_bits) and the chunk holds at
+    least min_size bytes. Boundaries depend only on the lines around them, so
+    an inserted or deleted row changes the chunks near it and later chunks
+    line up with the previous backup again. Chunks are cut at max_size when no
+    line qualifies, e.g. in binary data without newlines.
+
+    Args:
+        stream: Binary file object to read
+        min_size: Smallest chunk, except the last
+        max_size: Largest chunk
+        mask_bits: Average number of lines between candidate boundaries, as a power of two
+
+    Yields:
+        Chunks whose concatenation is the stream
+    """
+    mask = ((1 << mask_bits) - 1) << 16
+    adler32 = zlib.adler32
+    current = bytearray()
+    leftover = b""
+
+    while True:
+        block = stream.read(READ_SIZE)
+        if not block:
+            break
+        buffer = leftover + block
+        lines = buffer.split(b"\n")
+        leftover = lines.pop()
+        # Per-line work stays in C: checksum, mask, then list.index() for the zeros
+        flags = list(map(mask.__and__, map(adler32, lines)))
+        ends = list(accumulate(map(len, lines)))
+        start, i = 0, -1
+        while True:
+            try:
+                i = flags.index(0, i + 1)
+            except ValueError:
+                break
+            end = ends[i] + i + 1
+            if len(current) + end - start < min_size:
+                continue
+            current += buffer[start:end]
+            start = end
+            while len(current) > max_size:
+                yield bytes(current[:max_size])
+                del current[:max_size]
+            yield bytes(current)
+            current = bytearray()
+        current += buffer[start:len(buffer) - len(leftover)]
+        if len(leftover) >= max_size:
+            current += leftover
+            leftover = b""
+        while len(current) >= max_size:
+            yield bytes(current[:max_size])
+            del current[:max_size]
+
+    current += leftover
+    while current:
+        yield bytes(current[:max_size])
+        del current[:max_size]
+
+
+class ChunkStore:
+    """
+    Content-addressed store of compressed chunks shared by all backups.
+
+    Chunks are named by the SHA-256 of their uncompressed bytes, so a chunk
+    stored by an earlier backup is referenced rather than written again.
+    Compression is zstd when the zstandard package is installed, zlib
+    otherwise; chunks written with either codec can be read back.
+    """
+
+    SUFFIXES = {"zstd": ".zst", "zlib": ".zz"}
+
+    def __init__(self, root: Path, level: int = 3):
+        """
+        Initialize chunk store.
+
+        Args:
+            root: Store directory
+            level: Compression level (zstd 1-22; zlib uses min(level, 9))
+        """
+        self.root = Path(root)
+        self.level = level
+        self.codec = "zstd" if HAS_ZSTD else "zlib"
+        self._compressor = None
+        self._decompressor = None
+
+    def find(self, digest: str) -> Optional[Path]:
+        """Path of a stored chunk, whichever codec wrote it."""
+        for suffix in self.SUFFIXES.values():
+            path = self.root / digest[:2] / f"{digest}{suffix}"
+            if path.exists():
+                return path
+        return None
+
+    def put(self, data: bytes) -> Tuple[str, int]:
+        """
+        Store a chunk unless an identical one is already stored.
+
+        Returns:
+            (SHA-256 hex digest, compressed bytes written; 0 when deduplicated)
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        existing = self.find(digest)
+        if existing:
+            os.utime(existing)  # Marks the chunk as in use for prune()
+            return digest, 0
+
+        if self.codec == "zstd":
+            if self._compressor is None:
+                self._compressor = zstandard.ZstdCompressor(level=self.level)
+            compressed = self._compressor.compress(data)
+        else:
+            compressed = zlib.compress(data, min(self.level, 9))
+
+        path = self.root / digest[:2] / f"{digest}{self.SUFFIXES[self.codec]}"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        return digest, len(compressed)
+
+    def get(self, digest: str) -> bytes:
+        """
+        Read and decompress a chunk, checking it against its digest.
+
+        Raises:
+            ValueError: If the chunk is missing, unreadable or corrupt
+        """
+        path = self.find(digest)
+        if path is None:
+            raise ValueError(f"Missing chunk {digest}")
+        zstd = path.suffix == self.SUFFIXES["zstd"]
+        if zstd and not HAS_ZSTD:
+            raise ValueError(f"Chunk {digest} is zstd-compressed: install zstandard to read it")
+        with open(path, "rb") as f:
+            compressed = f.read()
+        try:
+            if zstd:
+                if self._decompressor is None:
+                    self._decompressor = zstandard.ZstdDecompressor()
+                data = self._decompressor.decompress(compressed)
+            else:
+                data = zlib.decompress(compressed)
+        except Exception as e:  # zlib.error or zstandard.ZstdError
+            raise ValueError(f"Unreadable chunk {digest}: {e}")
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Corrupt chunk {digest}: checksum mismatch")
+        return data
+
+    def prune(self, keep: Set[str], dry_run: bool = False) -> Tuple[int, int]:
+        """
+        Remove chunks no manifest references.
+
+        Chunks modified within CHUNK_GRACE_SECONDS are kept: a backup that is
+        still running may have written or reused them without a manifest yet.
+
+        Returns:
+            (chunks removed, bytes freed)
+        """
+        cutoff = time.time() - CHUNK_GRACE_SECONDS
+        removed = freed = 0
+        for path in self.root.glob("*/*"):
+            digest = path.name.split(".", 1)[0]
+            if digest in keep:
+                continue
+            stat = path.stat()
+            if stat.st_mtime >= cutoff:
+                continue
+            if not dry_run:
+                path.unlink()
+            removed += 1
+            freed += stat.st_size
+        return removed, freed
+
+
+def _store_file(path: str, name: str, store_root: str, level: int) -> Dict:
+    """
+    Chunk, checksum and compress one dump file into the store, then delete it.
+
+    Module-level so it can run in a worker process.
+
+    Returns:
+        Manifest entry with the file's size, SHA-256 and chunk list
+    """
+    store = ChunkStore(Path(store_root), level)
+    file_hash = hashlib.sha256()
+    chunks = []
+    size = new_bytes = 0
+    with open(path, "rb") as f:
+        for chunk in iter_chunks(f):
+            file_hash.update(chunk)
+            digest, written = store.put(chunk)
+            chunks.append([digest, len(chunk)])
+            size += len(chunk)
+            new_bytes += written
+    os.unlink(path)
+    return {"name": name, "size": size, "sha256": file_hash.hexdigest(), "chunks": chunks,
+            "new_bytes": new_bytes}
+
+
+def _restore_file(entry: Dict, store_root: str, target_dir: Optional[str]) -> Dict:
+    """
+    Rebuild one dump file from the store, verifying chunk and file checksums.
+
+    With target_dir None the file is only streamed and checked. Rows are
+    counted for table data files (NNNN.dat) as they stream.
+
+    Returns:
+        Dict with name, bytes, rows (None for non-data files) and seconds
+
+    Raises:
+        ValueError: If a chunk is missing or corrupt, or the size or checksum differs
+    """
+    started = time.monotonic()
+    store = ChunkStore(Path(store_root))
+    out = None
+    if target_dir is not None:
+        path = Path(target_dir) / entry["name"]
+        path.parent.mkdir(parents=True, exist_ok=True)
+        out = open(path, "wb")
+    file_hash = hashlib.sha256()
+    size = newlines = 0
+    tail = b""
+    try:
+        for digest, length in entry["chunks"]:
+            data = store.get(digest)
+            if len(data) != length:
+                raise ValueError(f"Chunk {digest} of {entry['name']} has {len(data)} bytes, manifest says {length}")
+            file_hash.update(data)
+            size += len(data)
+            newlines += data.count(b"\n")
+            tail = (tail + data)[-8:]
+            if out:
+                out.write(data)
+    finally:
+        if out:
+            out.close()
+    if size != entry["size"]:
+        raise ValueError(f"Size mismatch for {entry['name']}: {size} bytes, manifest says {entry['size']}")
+    if file_hash.hexdigest() != entry["sha256"]:
+        raise ValueError(f"Checksum mismatch for {entry['name']}")
+    is_data = entry["name"].endswith(".dat") and entry["name"] != "toc.dat"
+    return {"name": entry["name"], "bytes": size, "rows": _copy_data_rows(newlines, tail) if is_data else None,
+            "seconds": time.monotonic() - started}
+
+
+def _copy_data_rows(newlines: int, tail: bytes) -> int:
+    """
+    Rows in COPY data from its newline count and last bytes.
+
+    The \\. terminator and the blank lines pg_dump writes after it are not rows.
+    """
+    body = tail.rstrip(b"\n")
+    if body == b"\\." or body.endswith(b"\n\\."):
+        return newlines - (len(tail) - len(body))
+    return newlines
+
+
+class _CopyRowCounter:
+    """
+    Count COPY rows per table in a plain SQL dump fed in arbitrary blocks.
+
+    Records when each table's data starts and ends in the stream, which
+    times the tables when the same blocks are being piped into psql. Each
+    block is scanned once: only the last bytes of COPY data (to find a
+    terminator split across blocks) and the start of a line that may be a
+    COPY statement are carried over. A table's counts cover its data up to
+    the last newline seen, which may yet turn out to start the terminator.
+    """
+
+    COPY_END = b"\n\\.\n"
+
+    def __init__(self):
+        self.tables: Dict[str, Dict] = {}
+        self._table: Optional[Dict] = None
+        self._tail = b""  # Last bytes of COPY data seen
+        self._pending = 0  # COPY data bytes from the last newline on, not yet counted
+        self._line: Optional[bytes] = b""  # Current line so far; None once it cannot be a COPY
+
+    @property
+    def in_copy(self) -> bool:
+        """True while inside a COPY block, i.e. if the dump stopped mid-table."""
+        return self._table is not None
+
+    def feed(self, block: bytes):
+        """Consume the next block of the dump."""
+        pos = 0
+        while pos < len(block):
+            if self._table is None:
+                pos = self._feed_statements(block, pos)
+            else:
+                pos = self._feed_copy_data(block, pos)
+
+    def _feed_statements(self, block: bytes, pos: int) -> int:
+        """Scan SQL lines from pos; return where COPY data or the block starts."""
+        nl = block.find(b"\n", pos)
+        stop = len(block) if nl < 0 else nl
+        if self._line is not None and b"COPY ".startswith((self._line + block[pos:min(stop, pos + 5)])[:5]):
+            if nl < 0:
+                self._line += block[pos:]
+                return len(block)
+            line, self._line = self._line + block[pos:nl], b""
+            if line.startswith(b"COPY "):
+                name = line.split(b" ", 2)[1].decode("utf-8", "replace")
+                self._table = self.tables.setdefault(
+                    name, {"rows": 0, "bytes": 0, "start": time.monotonic(), "end": None})
+                self._tail, self._pending = b"", 0
+                return nl  # COPY data starts on the newline ending the statement
+            return nl + 1
+        if nl < 0:
+            self._line = None
+            return len(block)
+        self._line = b""
+        return nl + 1
+
+    def _feed_copy_data(self, block: bytes, pos: int) -> int:
+        """Count COPY rows from pos; return where the data ended or the block does."""
+        table = self._table
+        tail = self._tail
+        start = (tail + block[pos:pos + 3]).find(self.COPY_END) if tail else -1
+        if 0 <= start < len(tail):
+            # The terminator starts on the pending newline, so nothing more to count
+            return self._end_table(pos + start + len(self.COPY_END) - len(tail))
+
+        end = block.find(self.COPY_END, pos)
+        last = end if end >= 0 else block.rfind(b"\n", pos)
+        if last >= 0:
+            table["rows"] += int(self._pending > 0) + block.count(b"\n", pos, last)
+            table["bytes"] += self._pending + last - pos
+            self._pending = 0
+            pos = last
+        if end >= 0:
+            return self._end_table(end + len(self.COPY_END))
+        self._pending += len(block) - pos
+        self._tail = (tail + block[pos:])[-3:]
+        return len(block)
+
+    def _end_table(self, pos: int) -> int:
+        self._table["end"] = time.monotonic()
+        self._table = None
+        self._tail = b""
+        self._line = b""
+        return pos
+
+
+class _HashingReader:
+    """File wrapper that hashes everything read through it."""
+
+    def __init__(self, f: BinaryIO):
+        self._f = f
+        self.hash = hashlib.sha256()
+        self.bytes = 0
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._f.read(size)
+        self.hash.update(data)
+        self.bytes += len(data)
+        return data
+
+    def drain(self) -> str:
+        """Read and hash the rest of the file; return the hex digest."""
+        while self.read(READ_SIZE):
+            pass
+        return self.hash.hexdigest()
+
+
+def _count_bson_documents(stream: BinaryIO) -> Tuple[int, int]:
+    """
+    Count documents in a mongodump .bson stream by walking their length prefixes.
+
+    Returns:
+        (documents, bytes)
+
+    Raises:
+        ValueError: If the stream ends inside a document
+    """
+    documents = size = 0
+    while True:
+        header = stream.read(4)
+        if not header:
+            return documents, size
+        if len(header) < 4:
+            raise ValueError("truncated BSON document header")
+        length = int.from_bytes(header, "little")
+        if length < 5:
+            raise ValueError(f"invalid BSON document length {length}")
+        remaining = length - 4
+        while remaining:
+            data = stream.read(min(remaining, READ_SIZE))
+            if not data:
+                raise ValueError("truncated BSON document")
+            remaining -= len(data)
+        documents += 1
+        size += length
+
+
+def _sql_blocks(stream: BinaryIO, compressed: bool) -> Iterator[bytes]:
+    """
+    Yield a plain SQL dump in blocks, decompressing gzip in-process.
+
+    Raises:
+        ValueError: If the gzip data is corrupt (CRC or framing) or truncated
+    """
+    if not compressed:
+        while True:
+            block = stream.read(READ_SIZE)
+            if not block:
+                return
+            yield block
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    pending = False  # A gzip member has started but not reached its trailer
+    while True:
+        raw = stream.read(READ_SIZE)
+        if not raw:
+            break
+        while raw:
+            pending = True
+            try:
+                block = decompressor.decompress(raw)
+            except zlib.error as e:
+                raise ValueError(f"Corrupt gzip data: {e}")
+            if block:
+                yield block
+            raw = b""
+            if decompressor.eof:
+                pending = False
+                raw = decompressor.unused_data
+                decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    if pending:
+        raise ValueError("Truncated gzip data")
+
+
+def _time_restore_log(lines: Iterator[str], tool: str) -> Tuple[Dict[str, Dict], List[str]]:
+    """
+    Timestamp pg_restore --verbose or mongorestore -v output as it arrives.
+
+    pg_restore -j reports "launching item"/"finished item" per table, keyed
+    by dump id. Serial pg_restore only reports when a table's data starts, so
+    the table ends at the next line. mongorestore reports start and finish
+    per namespace.
+
+    Returns:
+        (items keyed by dump id or namespace with start/end/rows, last output lines)
+    """
+    items: Dict[str, Dict] = {}
+    open_serial: Optional[Dict] = None
+    recent: List[str] = []
+    for line in lines:
+        now = time.monotonic()
+        line = line.rstrip()
+        recent = (recent + [line])[-20:]
+        if open_serial is not None:
+            open_serial["end"] = now
+            open_serial = None
+        if tool == "pg_restore":
+            match = PG_RESTORE_ITEM.search(line)
+            if match:
+                item = items.setdefault(match.group(2), {"name": match.group(3), "start": now, "end": None})
+                if match.group(1) == "finished":
+                    item["end"] = now
+                continue
+            match = PG_RESTORE_SERIAL.search(line)
+            if match:
+                open_serial = items.setdefault(match.group(1), {"name": match.group(1), "start": now, "end": None})
+        else:
+            match = MONGORESTORE_DONE.search(line)
+            if match:
+                item = items.setdefault(match.group(1), {"name": match.group(1), "start": now, "end": None})
+                item["end"] = now
+                item["rows"] = int(match.group(2))
+                continue
+            match = MONGORESTORE_START.search(line)
+            if match:
+                items.setdefault(match.group(1), {"name": match.group(1), "start": now, "end": None})
+    return items, recent
+
+
+def _with_database(uri: str, database: str) -> str:
+    """Point a connection URI or libpq keyword string at another database."""
+    if "://" not in uri:
+        return f"{uri} dbname={database}"
+    parts = urlsplit(uri)
+    return urlunsplit(parts._replace(path=f"/{database}"))
 
 
 @dataclass
@@ -28,6 +566,38 @@ class BackupInfo:
     size_bytes: int
     compressed: bool
     verified: bool = False
+    sha256: Optional[str] = None  # Checksum of the backup file (the manifest for directory format)
+    logical_bytes: Optional[int] = None  # Directory-format backups: uncompressed dump size
+
+
+@dataclass
+class TableTiming:
+    """Per-table result of a verify run."""
+
+    name: str
+    bytes: int
+    rows: Optional[int] = None
+    seconds: Optional[float] = None  # Test restore only
+
+
+@dataclass
+class VerifyReport:
+    """Result of streaming a backup and optionally test-restoring it."""
+
+    filename: str
+    database_type: str
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    checked_bytes: int = 0  # Uncompressed bytes streamed and checked
+    rows: int = 0
+    verify_seconds: float = 0.0
+    restore_seconds: Optional[float] = None  # Time spent in pg_restore, psql or mongorestore
+    rto_seconds: Optional[float] = None  # Whole test restore, including rebuilding or extracting files
+    tables: List[TableTiming] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
 
 
 class BackupManager:
@@ -50,7 +620,10 @@ class BackupManager:
         uri: str,
         database: Optional[str] = None,
         compress: bool = True,
-        verify: bool = True
+        verify: bool = True,
+        directory: bool = False,
+        jobs: int = 0,
+        compression_level: int = 3
     ) -> Optional[BackupInfo]:
         """
         Create database backup.
@@ -60,6 +633,9 @@ class BackupManager:
             database: Database name (optional for MongoDB)
             compress: Compress backup file
             verify: Verify backup after creation
+            directory: PostgreSQL only: parallel directory-format dump into the chunk store
+            jobs: Parallel dump and compression jobs for directory format (0 = CPU count)
+            compression_level: zstd level for directory format (1-22)
 
         Returns:
             BackupInfo if successful, None otherwise
@@ -67,6 +643,13 @@ class BackupManager:
         timestamp = datetime.now()
         date_str = timestamp.strftime("%Y%m%d_%H%M%S")
 
+        if directory:
+            if self.db_type != "postgres":
+                print("Error: Directory format is only supported for PostgreSQL")
+                return None
+            return self._backup_postgres_directory(
+                uri, database, date_str, verify, jobs or os.cpu_count() or 1, compression_level
+            )
         if self.db_type == "mongodb":
             return self._backup_mongodb(uri, database, date_str, compress, verify)
         elif self.db_type == "postgres":
@@ -118,7 +701,8 @@ class BackupManager:
                 database_name=db_name,
                 timestamp=datetime.now(),
                 size_bytes=size_bytes,
-                compressed=compress
+                compressed=compress,
+                sha256=self._file_sha256(backup_path) if backup_path.is_file() else None
             )
 
             if verify:
@@ -184,7 +768,8 @@ class BackupManager:
                 database_name=database,
                 timestamp=datetime.now(),
                 size_bytes=size_bytes,
-                compressed=compress
+                compressed=compress,
+                sha256=self._file_sha256(backup_path)
             )
 
             if verify:
@@ -199,7 +784,138 @@ class BackupManager:
             print(f"Error creating PostgreSQL backup: {e}")
             return None
 
-    def restore_backup(self, filename: str, uri: str, dry_run: bool = False) -> bool:
+    def _backup_postgres_directory(
+        self,
+        uri: str,
+        database: str,
+        date_str: str,
+        verify: bool,
+        jobs: int,
+        compression_level: int
+    ) -> Optional[BackupInfo]:
+        """
+        Create PostgreSQL backup with a parallel directory-format pg_dump.
+
+        pg_dump -Fd -j writes uncompressed table files to a staging directory.
+        Each file is chunked, checksummed and compressed in a worker process
+        as soon as pg_dump's verbose log shows it is complete, and deleted
+        once stored, so staging holds only tables not yet stored rather than
+        the whole dump. Chunks already in the store are referenced rather
+        than written again. The backup itself is a manifest listing every
+        file's chunks and SHA-256.
+        """
+        if not database:
+            print("Error: Database name required for PostgreSQL backup")
+            return None
+
+        filename = f"postgres_{database}_{date_str}.manifest"
+        staging = self.backup_dir / f".staging_{database}_{date_str}"
+        store = ChunkStore(self.backup_dir / CHUNK_DIR, compression_level)
+
+        try:
+            cmd = ["pg_dump", "--format=directory", f"--jobs={jobs}", "--compress=0", "--verbose",
+                   "--file", str(staging), uri]
+
+            print(f"Creating PostgreSQL directory backup: {filename} ({jobs} jobs, "
+                  f"{store.codec} level {compression_level})")
+            started = time.monotonic()
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                futures = {}
+
+                def submit(path: Path):
+                    name = path.relative_to(staging).as_posix()
+                    if name not in futures and path.is_file():
+                        futures[name] = executor.submit(_store_file, str(path), name, str(store.root),
+                                                        compression_level)
+
+                process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+                recent: List[str] = []
+                complete: List[Path] = []
+                for line in process.stderr:
+                    recent = (recent + [line.rstrip()])[-5:]
+                    item = PG_DUMP_ITEM_DONE.search(line)
+                    if item:
+                        # Parallel dump: a worker has closed this table's file
+                        submit(staging / f"{item.group(1)}.dat")
+                    elif jobs == 1 and PG_DUMP_TABLE_START.search(line):
+                        # Serial dump: every file present at the previous table's start is closed
+                        for path in complete:
+                            submit(path)
+                        complete = [p for p in staging.glob("*.dat") if p.name != "toc.dat"]
+                process.wait()
+
+                if process.returncode != 0:
+                    executor.shutdown(cancel_futures=True)
+                    print("Error: " + "\n".join(recent))
+                    return None
+                dumped = time.monotonic()
+
+                # The rest (toc.dat, large objects, anything not logged), largest first
+                rest = [p for p in staging.rglob("*") if p.relative_to(staging).as_posix() not in futures]
+                rest = sorted((p for p in rest if p.is_file()), key=lambda p: -p.stat().st_size)
+                for path in rest:
+                    submit(path)
+                entries = [future.result() for future in futures.values()]
+            entries.sort(key=lambda entry: entry["name"])
+
+            new_bytes = sum(entry.pop("new_bytes") for entry in entries)
+            logical_bytes = sum(entry["size"] for entry in entries)
+            manifest = {
+                "format": MANIFEST_FORMAT,
+                "database": database,
+                "created": datetime.now().isoformat(),
+                "codec": store.codec,
+                "compression_level": compression_level,
+                "jobs": jobs,
+                "chunking": {"min_size": CHUNK_MIN_SIZE, "max_size": CHUNK_MAX_SIZE, "mask_bits": CHUNK_MASK_BITS},
+                "total_bytes": logical_bytes,
+                "files": entries
+            }
+            manifest_bytes = json.dumps(manifest, indent=1).encode("utf-8")
+            backup_path = self.backup_dir / filename
+            tmp_path = backup_path.with_name(f"{filename}.tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(manifest_bytes)
+            os.replace(tmp_path, backup_path)
+
+            backup_info = BackupInfo(
+                filename=filename,
+                database_type="postgres",
+                database_name=database,
+                timestamp=datetime.now(),
+                size_bytes=new_bytes,
+                compressed=True,
+                sha256=hashlib.sha256(manifest_bytes).hexdigest(),
+                logical_bytes=logical_bytes
+            )
+
+            if verify:
+                backup_info.verified = self._verify_backup(backup_info)
+
+            self._save_metadata(backup_info)
+            saved = 100 * (1 - new_bytes / logical_bytes) if logical_bytes else 0.0
+            print(f"✓ Backup created: {filename} ({self._format_size(logical_bytes)} dumped in "
+                  f"{dumped - started:.1f}s, {self._format_size(new_bytes)} new in store, "
+                  f"{saved:.1f}% saved, {time.monotonic() - started:.1f}s total)")
+
+            return backup_info
+
+        except Exception as e:
+            print(f"Error creating PostgreSQL directory backup: {e}")
+            return None
+
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def _load_manifest(self, backup_path: Path) -> Dict:
+        """Load a directory-format backup manifest."""
+        with open(backup_path) as f:
+            manifest = json.load(f)
+        if manifest.get("format") != MANIFEST_FORMAT:
+            raise ValueError(f"{backup_path.name}: unsupported manifest format {manifest.get('format')!r}")
+        return manifest
+
+    def restore_backup(self, filename: str, uri: str, dry_run: bool = False, jobs: int = 0) -> bool:
         """
         Restore database from backup.
 
@@ -207,6 +923,7 @@ class BackupManager:
             filename: Backup filename
             uri: Database connection string
             dry_run: If True, only show what would be done
+            jobs: Parallel restore jobs for directory-format and MongoDB backups (0 = CPU count)
 
         Returns:
             True if successful, False otherwise
@@ -218,7 +935,7 @@ class BackupManager:
             return False
 
         # Load metadata
-        metadata_path = backup_path.with_suffix(".json")
+        metadata_path = self.backup_dir / f"{filename}.json"
         if metadata_path.exists():
             with open(metadata_path) as f:
                 metadata = json.load(f)
@@ -230,10 +947,13 @@ class BackupManager:
             return True
 
         print(f"Restoring backup: {filename}")
+        jobs = jobs or os.cpu_count() or 1
 
         try:
             if self.db_type == "mongodb":
-                return self._restore_mongodb(backup_path, uri)
+                return self._restore_mongodb(backup_path, uri, jobs)
+            elif self.db_type == "postgres" and backup_path.suffix == ".manifest":
+                return self._restore_postgres_directory(backup_path, uri, jobs)
             elif self.db_type == "postgres":
                 return self._restore_postgres(backup_path, uri)
             else:
@@ -244,7 +964,7 @@ class BackupManager:
             print(f"Error restoring backup: {e}")
             return False
 
-    def _restore_mongodb(self, backup_path: Path, uri: str) -> bool:
+    def _restore_mongodb(self, backup_path: Path, uri: str, jobs: int = 1) -> bool:
         """Restore MongoDB backup using mongorestore."""
         try:
             # Extract if compressed
@@ -255,7 +975,7 @@ class BackupManager:
                 shutil.unpack_archive(backup_path, extract_path)
                 restore_path = extract_path
 
-            cmd = ["mongorestore", "--uri", uri, str(restore_path)]
+            cmd = ["mongorestore", "--uri", uri, f"--numParallelCollections={jobs}", str(restore_path)]
 
             result = subprocess.run(cmd, capture_output=True, text=True)
 
@@ -308,6 +1028,422 @@ class BackupManager:
             print(f"Error restoring PostgreSQL: {e}")
             return False
 
+    def _restore_postgres_directory(self, backup_path: Path, uri: str, jobs: int) -> bool:
+        """Rebuild a directory-format dump from the chunk store and restore it with pg_restore -j."""
+        target = self.backup_dir / f".restore_{backup_path.stem}"
+        try:
+            manifest = self._load_manifest(backup_path)
+            print(f"Rebuilding {len(manifest['files'])} files ({self._format_size(manifest['total_bytes'])})...")
+            errors: List[str] = []
+            self._rebuild_files(manifest, str(target), jobs, errors)
+            if errors:
+                for error in errors:
+                    print(f"Error: {error}")
+                return False
+
+            cmd = ["pg_restore", f"--jobs={jobs}", "--dbname", uri, str(target)]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+
+            if result.returncode != 0:
+                print(f"Error: {result.stderr}")
+                return False
+
+            print("✓ Restore completed")
+            return True
+
+        except Exception as e:
+            print(f"Error restoring PostgreSQL: {e}")
+            return False
+
+        finally:
+            shutil.rmtree(target, ignore_errors=True)
+
+    def _rebuild_files(self, manifest: Dict, target_dir: Optional[str], jobs: int, errors: List[str]) -> List[Dict]:
+        """
+        Stream every file of a manifest from the chunk store in parallel, checking checksums.
+
+        Args:
+            manifest: Loaded manifest
+            target_dir: Directory to write the files to, or None to only check them
+            jobs: Worker processes
+            errors: Receives one message per file that fails its checks
+
+        Returns:
+            _restore_file results for the files that passed
+        """
+        store_root = str(self.backup_dir / CHUNK_DIR)
+        entries = sorted(manifest["files"], key=lambda entry: -entry["size"])
+        results = []
+        if jobs > 1 and len(entries) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                futures = [executor.submit(_restore_file, entry, store_root, target_dir) for entry in entries]
+                for future in as_completed(futures):
+                    try:
+                        results.append(future.result())
+                    except (OSError, ValueError) as e:
+                        errors.append(str(e))
+        else:
+            for entry in entries:
+                try:
+                    results.append(_restore_file(entry, store_root, target_dir))
+                except (OSError, ValueError) as e:
+                    errors.append(str(e))
+        return results
+
+    def verify_backup(self, filename: str, jobs: int = 0, target_uri: Optional[str] = None) -> VerifyReport:
+        """
+        Stream a backup end to end and check it, optionally test-restoring it.
+
+        Checks the backup file against the SHA-256 in its metadata, every chunk
+        and file checksum of a directory-format manifest, and gzip/tar framing
+        of compressed backups, counting COPY rows or BSON documents per table
+        as the data streams. With target_uri the backup is also restored into a
+        throwaway database on that server, timed per table, then dropped.
+
+        Args:
+            filename: Backup filename
+            jobs: Parallel jobs for checking and test restore (0 = CPU count)
+            target_uri: Server to test-restore into (PostgreSQL: a database to
+                connect to for CREATE/DROP DATABASE); None skips the test restore
+
+        Returns:
+            VerifyReport
+        """
+        jobs = jobs or os.cpu_count() or 1
+        report = VerifyReport(filename=filename, database_type=self.db_type)
+        backup_path = self.backup_dir / filename
+
+        if not backup_path.exists():
+            report.errors.append(f"Backup not found: {filename}")
+            return report
+
+        expected_sha256 = None
+        metadata_path = self.backup_dir / f"{filename}.json"
+        if metadata_path.exists():
+            with open(metadata_path) as f:
+                expected_sha256 = json.load(f).get("sha256")
+        if expected_sha256 is None:
+            report.warnings.append("No checksum recorded for this backup; file checksum not checked")
+
+        work_dir = self.backup_dir / f".verify_{backup_path.stem}"
+        try:
+            if backup_path.suffix == ".manifest":
+                self._verify_manifest(backup_path, expected_sha256, report, jobs, target_uri, work_dir)
+            elif self.db_type == "postgres":
+                self._verify_sql(backup_path, expected_sha256, report, target_uri)
+            else:
+                self._verify_mongodb(backup_path, expected_sha256, report, jobs, target_uri, work_dir)
+        except Exception as e:
+            report.errors.append(f"{type(e).__name__}: {e}")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        report.rows = sum(table.rows or 0 for table in report.tables)
+        return report
+
+    def _check_sha256(self, report: VerifyReport, actual: str, expected: Optional[str]):
+        """Record a checksum mismatch against the metadata."""
+        if expected is not None and actual != expected:
+            report.errors.append(f"Backup checksum mismatch: {actual}, metadata says {expected}")
+
+    def _verify_manifest(
+        self,
+        backup_path: Path,
+        expected_sha256: Optional[str],
+        report: VerifyReport,
+        jobs: int,
+        target_uri: Optional[str],
+        work_dir: Path
+    ):
+        """Check a directory-format backup, rebuilding it into work_dir when test-restoring."""
+        started = time.monotonic()
+        manifest_bytes = backup_path.read_bytes()
+        self._check_sha256(report, hashlib.sha256(manifest_bytes).hexdigest(), expected_sha256)
+        manifest = json.loads(manifest_bytes)
+        if manifest.get("format") != MANIFEST_FORMAT:
+            report.errors.append(f"Unsupported manifest format {manifest.get('format')!r}")
+            return
+        for entry in manifest["files"]:
+            if sum(length for _, length in entry["chunks"]) != entry["size"]:
+                report.errors.append(f"Manifest chunk lengths of {entry['name']} do not add up to its size")
+        if sum(entry["size"] for entry in manifest["files"]) != manifest["total_bytes"]:
+            report.errors.append("Manifest file sizes do not add up to total_bytes")
+        if not any(entry["name"] == "toc.dat" for entry in manifest["files"]):
+            report.errors.append("Manifest has no toc.dat")
+
+        results = self._rebuild_files(manifest, str(work_dir) if target_uri else None, jobs, report.errors)
+        report.verify_seconds = time.monotonic() - started
+        report.checked_bytes = sum(result["bytes"] for result in results)
+
+        if not target_uri:
+            # pg_restore --list only needs the table of contents
+            toc = [entry for entry in manifest["files"] if entry["name"] == "toc.dat"]
+            if toc and report.ok:
+                _restore_file(toc[0], str(self.backup_dir / CHUNK_DIR), str(work_dir))
+        names = self._pg_table_names(work_dir)
+        by_id = {}
+        for result in sorted(results, key=lambda result: result["name"]):
+            if result["rows"] is not None:
+                dump_id = result["name"].split(".", 1)[0]
+                by_id[dump_id] = TableTiming(names.get(dump_id, result["name"]), result["bytes"], result["rows"])
+        report.tables = list(by_id.values())
+
+        if target_uri and report.ok:
+            items = self._test_restore(
+                report, target_uri, "pg_restore",
+                lambda uri: ["pg_restore", "--verbose", f"--jobs={jobs}", "--no-owner", "--no-privileges",
+                             "--exit-on-error", "--dbname", uri, str(work_dir)]
+            )
+            by_name = {table.name: table for table in report.tables}
+            for key, item in items.items():
+                table = by_id.get(key) or by_name.get(key)
+                if table and item["end"] is not None:
+                    table.seconds = item["end"] - item["start"]
+            if report.restore_seconds is not None:
+                report.rto_seconds = report.verify_seconds + report.restore_seconds
+
+    def _pg_table_names(self, dump_dir: Path) -> Dict[str, str]:
+        """Map dump ids to schema.table using pg_restore --list; empty if unavailable."""
+        if not (dump_dir / "toc.dat").exists() or not shutil.which("pg_restore"):
+            return {}
+        result = subprocess.run(["pg_restore", "--list", str(dump_dir)], capture_output=True, text=True)
+        if result.returncode != 0:
+            return {}
+        names = {}
+        for line in result.stdout.splitlines():
+            match = re.match(r"(\d+); \d+ \d+ TABLE DATA (\S+) (\S+) ", line)
+            if match:
+                names[match.group(1)] = f"{match.group(2)}.{match.group(3)}"
+        return names
+
+    def _verify_sql(self, backup_path: Path, expected_sha256: Optional[str], report: VerifyReport,
+                    target_uri: Optional[str]):
+        """Check a plain SQL dump, test-restoring it through psql when target_uri is set."""
+        started = time.monotonic()
+        compressed = backup_path.suffix == ".gz"
+        counter = _CopyRowCounter()
+        tail = b""
+        with open(backup_path, "rb") as f:
+            reader = _HashingReader(f)
+            try:
+                for block in _sql_blocks(reader, compressed):
+                    counter.feed(block)
+                    report.checked_bytes += len(block)
+                    tail = (tail + block)[-256:]
+            except ValueError as e:
+                report.errors.append(str(e))
+            self._check_sha256(report, reader.drain(), expected_sha256)
+        report.verify_seconds = time.monotonic() - started
+
+        if report.ok and counter.in_copy:
+            report.errors.append("Dump ends inside COPY data")
+        elif report.ok and b"PostgreSQL database dump complete" not in tail:
+            report.errors.append("Dump is incomplete: pg_dump's completion marker is missing")
+        report.tables = [TableTiming(name, table["bytes"], table["rows"]) for name, table in counter.tables.items()]
+
+        if target_uri and report.ok:
+            timing = _CopyRowCounter()
+
+            def feed(stdin):
+                with open(backup_path, "rb") as f:
+                    for block in _sql_blocks(f, compressed):
+                        # Small writes so the pipe, not the block size, bounds timing error
+                        for i in range(0, len(block), PIPE_WRITE_SIZE):
+                            piece = block[i:i + PIPE_WRITE_SIZE]
+                            timing.feed(piece)
+                            stdin.write(piece)
+
+            self._test_restore(
+                report, target_uri, "psql",
+                lambda uri: ["psql", "--quiet", "--no-psqlrc", "-v", "ON_ERROR_STOP=1", uri],
+                feed=feed
+            )
+            # Blocks are timed as psql consumes them, to within one pipe buffer
+            for table in report.tables:
+                item = timing.tables.get(table.name)
+                if item and item["end"] is not None:
+                    table.seconds = item["end"] - item["start"]
+            report.rto_seconds = report.restore_seconds
+
+    def _verify_mongodb(
+        self,
+        backup_path: Path,
+        expected_sha256: Optional[str],
+        report: VerifyReport,
+        jobs: int,
+        target_uri: Optional[str],
+        work_dir: Path
+    ):
+        """Check a mongodump directory or .tar.gz archive, counting documents per collection."""
+        started = time.monotonic()
+        if backup_path.is_dir():
+            for bson_path in sorted(backup_path.rglob("*.bson")):
+                with open(bson_path, "rb") as f:
+                    self._check_bson(report, bson_path.relative_to(backup_path).as_posix(), f)
+        else:
+            with open(backup_path, "rb") as f:
+                reader = _HashingReader(f)
+                try:
+                    with tarfile.open(fileobj=reader, mode="r|gz") as tar:
+                        for member in tar:
+                            if member.isfile() and member.name.endswith(".bson"):
+                                self._check_bson(report, member.name, tar.extractfile(member))
+                except (tarfile.TarError, EOFError, OSError, zlib.error) as e:
+                    report.errors.append(f"Corrupt archive: {e}")
+                self._check_sha256(report, reader.drain(), expected_sha256)
+        report.verify_seconds = time.monotonic() - started
+        report.checked_bytes = sum(table.bytes for table in report.tables)
+        if not report.tables:
+            report.errors.append("No collections found in backup")
+
+        if target_uri and report.ok:
+            restore_started = time.monotonic()
+            restore_path = backup_path
+            if backup_path.is_file():
+                shutil.unpack_archive(backup_path, work_dir, "gztar")
+                restore_path = work_dir
+            prefix = self._scratch_database_name()
+            items = self._test_restore(
+                report, target_uri, "mongorestore",
+                lambda uri: ["mongorestore", "-v", "--uri", uri, f"--numParallelCollections={jobs}",
+                             "--nsExclude=admin.*", "--nsFrom=$db$.$coll$", f"--nsTo={prefix}_$db$.$coll$",
+                             str(restore_path)],
+                databases=[f"{prefix}_{db}" for db in sorted({t.name.split(".", 1)[0] for t in report.tables})]
+            )
+            by_name = {table.name: table for table in report.tables}
+            for namespace, item in items.items():
+                table = by_name.get(namespace[len(prefix) + 1:])
+                if table is None:
+                    continue
+                if item["end"] is not None:
+                    table.seconds = item["end"] - item["start"]
+                if item.get("rows") is not None and item["rows"] != table.rows:
+                    report.errors.append(f"{table.name}: restored {item['rows']} documents, backup has {table.rows}")
+            if report.restore_seconds is not None:
+                report.rto_seconds = time.monotonic() - restore_started
+
+    def _check_bson(self, report: VerifyReport, name: str, stream: BinaryIO):
+        """Count one collection's documents, recording truncation as an error."""
+        parts = Path(name).parts
+        namespace = f"{parts[-2]}.{Path(parts[-1]).stem}" if len(parts) > 1 else Path(name).stem
+        try:
+            documents, size = _count_bson_documents(stream)
+        except ValueError as e:
+            report.errors.append(f"{namespace}: {e}")
+            return
+        report.tables.append(TableTiming(namespace, size, documents))
+
+    def _scratch_database_name(self) -> str:
+        """Name for a throwaway test-restore database."""
+        return f"verify_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+
+    def _test_restore(self, report: VerifyReport, target_uri: str, tool: str, command, feed=None,
+                      databases: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Restore into a throwaway database, timing the restore tool's output, then drop it.
+
+        Args:
+            report: Receives restore_seconds and any errors
+            target_uri: Server to restore into
+            tool: "pg_restore", "psql" or "mongorestore"
+            command: Builds the restore command from the throwaway database's URI
+            feed: Writes the dump to the tool's stdin (psql)
+            databases: MongoDB databases the restore creates, dropped afterwards
+
+        Returns:
+            Timed restore items from _time_restore_log
+        """
+        if tool == "mongorestore":
+            uri = target_uri
+            drops = [["mongosh", target_uri, "--quiet", "--eval", f'db.getSiblingDB("{db}").dropDatabase()']
+                     for db in databases or []]
+        else:
+            database = self._scratch_database_name()
+            uri = _with_database(target_uri, database)
+            result = subprocess.run(["psql", target_uri, "-v", "ON_ERROR_STOP=1", "-c",
+                                     f'CREATE DATABASE "{database}"'], capture_output=True, text=True)
+            if result.returncode != 0:
+                report.errors.append(f"Could not create test database {database}: {result.stderr.strip()}")
+                return {}
+            drops = [["psql", target_uri, "-c", f'DROP DATABASE IF EXISTS "{database}"']]
+
+        print(f"Test restore with {tool}...")
+        started = time.monotonic()
+        try:
+            proc = subprocess.Popen(command(uri), stdin=subprocess.PIPE if feed else subprocess.DEVNULL,
+                                    stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=feed is None)
+            log: Dict = {}
+            if feed:
+                # psql's stderr is drained on a thread so a chatty restore cannot block the feed
+                reader = threading.Thread(target=lambda: log.update(
+                    zip(("items", "recent"), _time_restore_log(
+                        (line.decode("utf-8", "replace") for line in proc.stderr), tool))))
+                reader.start()
+                try:
+                    feed(proc.stdin)
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass  # psql stopped on an error; its exit code reports it
+                reader.join()
+            else:
+                log.update(zip(("items", "recent"), _time_restore_log(proc.stderr, tool)))
+            proc.wait()
+            report.restore_seconds = time.monotonic() - started
+            if proc.returncode != 0:
+                report.errors.append(f"{tool} failed (exit {proc.returncode}): " + "\n".join(log.get("recent", [])[-5:]))
+            return log.get("items", {})
+        finally:
+            for cmd in drops:
+                try:
+                    result = subprocess.run(cmd, capture_output=True, text=True)
+                    error = result.stderr.strip() if result.returncode != 0 else None
+                except OSError as e:
+                    error = str(e)
+                if error:
+                    report.warnings.append(f"Could not drop test database: {error}")
+
+    def print_verify_report(self, report: VerifyReport, limit: int = 20):
+        """Print verify results with throughput and the slowest tables."""
+        def rate(amount: float, seconds: Optional[float]) -> float:
+            return amount / seconds if seconds else 0.0
+
+        mb = 1024 * 1024
+        print("=" * 80)
+        print(f"Verify: {report.filename}")
+        print("=" * 80)
+        print(f"Status: {'✓ OK' if report.ok else '✗ FAILED'}")
+        print(f"Checked: {self._format_size(report.checked_bytes)}, {report.rows:,} rows in "
+              f"{len(report.tables)} tables, {report.verify_seconds:.1f}s "
+              f"({rate(report.checked_bytes / mb, report.verify_seconds):.1f} MB/s)")
+        if report.rto_seconds is not None:
+            print(f"Test restore: {report.rto_seconds:.1f}s total, {report.restore_seconds:.1f}s in the restore tool")
+            print(f"Restore throughput: {rate(report.checked_bytes / mb, report.rto_seconds):.1f} MB/s, "
+                  f"{rate(report.rows, report.rto_seconds):,.0f} rows/s")
+
+        tables = sorted(report.tables, key=lambda t: (t.seconds is None, -(t.seconds or 0), -t.bytes))
+        if tables:
+            print(f"\n{'Table':<40} {'Rows':>14} {'Size':>12} {'Restore':>9} {'Rows/s':>12}")
+            for table in tables[:limit]:
+                seconds = f"{table.seconds:.1f}s" if table.seconds is not None else "-"
+                rows_per_sec = f"{rate(table.rows or 0, table.seconds):,.0f}" if table.seconds else "-"
+                rows = f"{table.rows:,}" if table.rows is not None else "-"
+                print(f"{table.name[:40]:<40} {rows:>14} {self._format_size(table.bytes):>12} "
+                      f"{seconds:>9} {rows_per_sec:>12}")
+            if len(tables) > limit:
+                print(f"... {len(tables) - limit} more")
+
+        for warning in report.warnings:
+            print(f"\nWarning: {warning}")
+        for error in report.errors:
+            print(f"\nError: {error}")
+
+    def save_verify_report(self, report: VerifyReport, filename: str):
+        """Save verify results to a JSON file."""
+        with open(filename, "w") as f:
+            json.dump({**asdict(report), "ok": report.ok}, f, indent=2)
+
+        print(f"\nReport saved to: {filename}")
+
     def list_backups(self) -> List[BackupInfo]:
         """
         List all backups.
@@ -329,7 +1465,9 @@ class BackupManager:
                     timestamp=datetime.fromisoformat(data["timestamp"]),
                     size_bytes=data["size_bytes"],
                     compressed=data["compressed"],
-                    verified=data.get("verified", False)
+                    verified=data.get("verified", False),
+                    sha256=data.get("sha256"),
+                    logical_bytes=data.get("logical_bytes")
                 )
                 backups.append(backup_info)
             except Exception as e:
@@ -350,25 +1488,59 @@ class BackupManager:
         """
         cutoff = datetime.now().timestamp() - (retention_days * 24 * 3600)
         removed = 0
+        removed_manifests = False
 
         for backup_file in self.backup_dir.glob("*"):
             if backup_file.suffix == ".json":
                 continue
+            # The chunk store is pruned below; dot-directories are in-progress staging
+            if backup_file.name == CHUNK_DIR or backup_file.name.startswith("."):
+                continue
 
             if backup_file.stat().st_mtime < cutoff:
                 if dry_run:
                     print(f"Would remove: {backup_file.name}")
                 else:
                     print(f"Removing: {backup_file.name}")
-                    backup_file.unlink()
+                    if backup_file.is_dir():
+                        shutil.rmtree(backup_file)
+                    else:
+                        backup_file.unlink()
                     # Remove metadata
-                    metadata_file = backup_file.with_suffix(".json")
+                    metadata_file = self.backup_dir / f"{backup_file.name}.json"
                     if metadata_file.exists():
                         metadata_file.unlink()
+                removed_manifests = removed_manifests or backup_file.suffix == ".manifest"
                 removed += 1
 
+        if removed_manifests:
+            self._prune_chunks(dry_run)
+
         return removed
 
+    def _prune_chunks(self, dry_run: bool = False) -> int:
+        """
+        Remove chunks that no remaining manifest references.
+
+        Returns:
+            Number of chunks removed
+        """
+        keep: Set[str] = set()
+        for manifest_path in self.backup_dir.glob("*.manifest"):
+            try:
+                manifest = self._load_manifest(manifest_path)
+            except (OSError, ValueError) as e:
+                print(f"Error: not pruning chunks, cannot read {manifest_path.name}: {e}")
+                return 0
+            for entry in manifest["files"]:
+                keep.update(digest for digest, _ in entry["chunks"])
+
+        count, freed = ChunkStore(self.backup_dir / CHUNK_DIR).prune(keep, dry_run)
+        if count:
+            action = "Would remove" if dry_run else "Removed"
+            print(f"{action} {count} unreferenced chunk(s) ({self._format_size(freed)})")
+        return count
+
     def _verify_backup(self, backup_info: BackupInfo) -> bool:
         """
         Verify backup integrity.
@@ -388,9 +1560,26 @@ class BackupManager:
         if backup_path.stat().st_size == 0:
             return False
 
+        # Directory format: the manifest parses and every chunk it lists is stored
+        if backup_path.suffix == ".manifest":
+            try:
+                manifest = self._load_manifest(backup_path)
+            except (OSError, ValueError):
+                return False
+            store = ChunkStore(self.backup_dir / CHUNK_DIR)
+            return all(store.find(digest) for entry in manifest["files"] for digest, _ in entry["chunks"])
+
         # Could add more verification here (checksums, test restore, etc.)
         return True
 
+    def _file_sha256(self, path: Path) -> str:
+        """SHA-256 of a file, streamed."""
+        file_hash = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(READ_SIZE), b""):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+
     def _get_size(self, path: Path) -> int:
         """Get total size of file or directory."""
         if path.is_file():
@@ -424,6 +1613,10 @@ class BackupManager:
             "compressed": backup_info.compressed,
             "verified": backup_info.verified
         }
+        if backup_info.sha256:
+            metadata["sha256"] = backup_info.sha256
+        if backup_info.logical_bytes is not None:
+            metadata["logical_bytes"] = backup_info.logical_bytes
 
         with open(metadata_path, "w") as f:
             json.dump(metadata, f, indent=2)
@@ -447,6 +1640,13 @@ def main():
                               help="Disable compression")
     backup_parser.add_argument("--no-verify", action="store_true",
                               help="Skip verification")
+    backup_parser.add_argument("--format", choices=["plain", "directory"], default="plain",
+                              help="PostgreSQL: plain SQL (default) or parallel directory dump "
+                                   "into the deduplicating chunk store")
+    backup_parser.add_argument("--jobs", "-j", type=int, default=0,
+                              help="Directory format: parallel dump/compression jobs (default: 0 = CPU count)")
+    backup_parser.add_argument("--compression-level", type=int, default=3, choices=range(1, 23),
+                              metavar="1-22", help="Directory format: zstd level (default: 3)")
 
     # Restore command
     restore_parser = subparsers.add_parser("restore", help="Restore backup")
@@ -454,6 +1654,19 @@ def main():
     restore_parser.add_argument("--uri", required=True, help="Database connection string")
     restore_parser.add_argument("--dry-run", action="store_true",
                                help="Show what would be done")
+    restore_parser.add_argument("--jobs", "-j", type=int, default=0,
+                               help="Directory format: parallel restore jobs (default: 0 = CPU count)")
+
+    # Verify command
+    verify_parser = subparsers.add_parser(
+        "verify", help="Stream a backup, check checksums and manifest, optionally test-restore it")
+    verify_parser.add_argument("filename", help="Backup filename")
+    verify_parser.add_argument("--test-restore", metavar="URI",
+                              help="Also restore into a throwaway database on this server (dropped afterwards) "
+                                   "and time it; PostgreSQL: any database to connect to, e.g. .../postgres")
+    verify_parser.add_argument("--jobs", "-j", type=int, default=0,
+                              help="Parallel check and restore jobs (default: 0 = CPU count)")
+    verify_parser.add_argument("--output", help="Save report to JSON file")
 
     # List command
     subparsers.add_parser("list", help="List backups")
@@ -474,14 +1687,24 @@ def main():
             args.uri,
             args.database,
             compress=not args.no_compress,
-            verify=not args.no_verify
+            verify=not args.no_verify,
+            directory=args.format == "directory",
+            jobs=args.jobs,
+            compression_level=args.compression_level
         )
         sys.exit(0 if backup_info else 1)
 
     elif args.command == "restore":
-        success = manager.restore_backup(args.filename, args.uri, args.dry_run)
+        success = manager.restore_backup(args.filename, args.uri, args.dry_run, args.jobs)
         sys.exit(0 if success else 1)
 
+    elif args.command == "verify":
+        report = manager.verify_backup(args.filename, args.jobs, args.test_restore)
+        manager.print_verify_report(report)
+        if args.output:
+            manager.save_verify_report(report, args.output)
+        sys.exit(0 if report.ok else 1)
+
     elif args.command == "list":
         backups = manager.list_backups()
         print(f"Total backups: {len(backups)}\n")
@@ -490,7 +1713,11 @@ def main():
             print(f"[{verified_str}] {backup.filename}")
             print(f"    Database: {backup.database_name}")
             print(f"    Created: {backup.timestamp}")
-            print(f"    Size: {manager._format_size(backup.size_bytes)}")
+            if backup.logical_bytes is not None:
+                print(f"    Size: {manager._format_size(backup.size_bytes)} new in chunk store "
+                      f"({manager._format_size(backup.logical_bytes)} dumped)")
+            else:
+                print(f"    Size: {manager._format_size(backup.size_bytes)}")
             print()
 
     elif args.command == "cleanup":
@@ -11,7 +11,8 @@ import pytest
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from db_backup import BackupInfo, BackupManager
+from db_backup import (BackupInfo, BackupManager, ChunkStore, _CopyRowCounter, _time_restore_log,
+                       iter_chunks)
 
 
 @pytest.fixture
@@ -333,7 +334,420 @@ class TestBackupManager:
 
 
 # Import os for cleanup test
+import gzip
+import hashlib
+import io
 import os
+import shutil
+import struct
+import time
+
+
+def _copy_rows(start, count):
+    """Generate COPY-format table rows."""
+    return b"".join(f"{i}\tuser_{i}\tuser{i}@example.com\t{i * 7 % 1000}\n".encode()
+                    for i in range(start, start + count))
+
+
+def _fake_pg_dump(tables, serial=False):
+    """subprocess.Popen side effect for pg_dump -Fd --verbose.
+
+    Table files are written as the log is read, each followed by the line
+    parallel pg_dump logs when it closes one (or, with serial, preceded by
+    the line serial pg_dump logs when it starts one); toc.dat comes last.
+    """
+    def popen(cmd, **kwargs):
+        out = Path(cmd[cmd.index("--file") + 1])
+
+        def log():
+            out.mkdir(parents=True)
+            for name, data in tables.items():
+                dump_id = name.split(".")[0]
+                if serial:
+                    yield f'pg_dump: dumping contents of table "public.t{dump_id}"\n'
+                (out / name).write_bytes(data)
+                if not serial:
+                    yield f"pg_dump: finished item {dump_id} TABLE DATA t{dump_id}\n"
+            (out / "toc.dat").write_bytes(b"PGDMP toc")
+
+        return Mock(stderr=log(), returncode=0, wait=Mock(return_value=0))
+    return popen
+
+
+class TestChunking:
+    """Test content-defined chunking."""
+
+    def test_round_trip(self):
+        """Test chunks concatenate back to the input."""
+        data = _copy_rows(0, 20000)
+        chunks = list(iter_chunks(io.BytesIO(data), min_size=4096, max_size=65536, mask_bits=4))
+
+        assert b"".join(chunks) == data
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 65536 for chunk in chunks)
+        assert all(chunk.endswith(b"\n") for chunk in chunks[:-1])
+
+    def test_insert_resyncs(self):
+        """Test inserted rows only change nearby chunks."""
+        before = _copy_rows(0, 20000)
+        after = _copy_rows(0, 10000) + _copy_rows(50000, 5) + _copy_rows(10000, 10000)
+        options = dict(min_size=4096, max_size=65536, mask_bits=4)
+
+        old = set(iter_chunks(io.BytesIO(before), **options))
+        new = list(iter_chunks(io.BytesIO(after), **options))
+
+        changed = [chunk for chunk in new if chunk not in old]
+        assert 0 < len(changed) <= 3
+
+    def test_max_size_without_newlines(self):
+        """Test data without line ends is cut at max_size."""
+        data = os.urandom(100000).replace(b"\n", b"x")
+        chunks = list(iter_chunks(io.BytesIO(data), min_size=1024, max_size=16384))
+
+        assert b"".join(chunks) == data
+        assert [len(chunk) for chunk in chunks[:-1]] == [16384] * (len(chunks) - 1)
+
+
+class TestChunkStore:
+    """Test the content-addressed chunk store."""
+
+    def test_put_get_dedup(self, tmp_path):
+        """Test stored chunks read back and duplicates are not written."""
+        store = ChunkStore(tmp_path / "chunks")
+        data = _copy_rows(0, 1000)
+
+        digest, written = store.put(data)
+        assert written > 0
+        assert store.get(digest) == data
+        assert store.put(data) == (digest, 0)
+
+    def test_corrupt_chunk(self, tmp_path):
+        """Test a damaged chunk is rejected."""
+        store = ChunkStore(tmp_path / "chunks")
+        digest, _ = store.put(_copy_rows(0, 1000))
+        store.find(digest).write_bytes(b"garbage")
+
+        with pytest.raises(ValueError):
+            store.get(digest)
+        with pytest.raises(ValueError):
+            store.get("0" * 64)
+
+    def test_prune(self, tmp_path):
+        """Test pruning removes old unreferenced chunks only."""
+        store = ChunkStore(tmp_path / "chunks")
+        kept, _ = store.put(b"kept")
+        old, _ = store.put(b"old")
+        recent, _ = store.put(b"recent")
+        old_time = datetime.now().timestamp() - (3 * 24 * 3600)
+        for digest in (kept, old):
+            os.utime(store.find(digest), (old_time, old_time))
+
+        removed, freed = store.prune({kept})
+
+        assert removed == 1 and freed > 0
+        assert store.find(kept) and store.find(recent)
+        assert store.find(old) is None
+
+
+class TestDirectoryBackup:
+    """Test directory-format PostgreSQL backups."""
+
+    def test_backup_and_dedup(self, temp_backup_dir):
+        """Test a second backup of unchanged data stores nothing new."""
+        tables = {"3001.dat": _copy_rows(0, 50000), "3002.dat": _copy_rows(90000, 2000)}
+        manager = BackupManager("postgres", temp_backup_dir)
+
+        with patch("subprocess.Popen", side_effect=_fake_pg_dump(tables)) as mock_popen:
+            first = manager.create_backup("postgresql://localhost/app", "app", directory=True, jobs=2)
+        cmd = mock_popen.call_args[0][0]
+        assert "--format=directory" in cmd and "--jobs=2" in cmd and "--verbose" in cmd
+
+        assert first.filename.endswith(".manifest")
+        assert first.verified
+        assert first.size_bytes > 0
+        assert first.logical_bytes == sum(len(data) for data in tables.values()) + len(b"PGDMP toc")
+
+        manifest_path = Path(temp_backup_dir) / first.filename
+        manifest = json.loads(manifest_path.read_text())
+        assert {entry["name"] for entry in manifest["files"]} == {"toc.dat", "3001.dat", "3002.dat"}
+        metadata = json.loads((Path(temp_backup_dir) / f"{first.filename}.json").read_text())
+        assert metadata["sha256"] == hashlib.sha256(manifest_path.read_bytes()).hexdigest()
+        assert not list(Path(temp_backup_dir).glob(".staging_*"))
+
+        with patch("db_backup.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2030, 1, 1)
+            with patch("subprocess.Popen", side_effect=_fake_pg_dump(tables)):
+                second = manager.create_backup("postgresql://localhost/app", "app", directory=True, jobs=1)
+        assert second.filename != first.filename
+        assert second.size_bytes == 0
+
+    def test_files_stored_while_dumping(self, temp_backup_dir):
+        """Test a table file is stored and removed from staging before pg_dump exits."""
+        manager = BackupManager("postgres", temp_backup_dir)
+        for serial, jobs in ((False, 2), (True, 1)):
+            tables = {"3001.dat": _copy_rows(0, 5000), "3002.dat": _copy_rows(5000, 5000),
+                      "3003.dat": _copy_rows(10000, 5000)}
+            popen = _fake_pg_dump(tables, serial=serial)
+            stored_early = []
+
+            def watched_popen(cmd, **kwargs):
+                process = popen(cmd, **kwargs)
+                first = Path(cmd[cmd.index("--file") + 1]) / "3001.dat"
+
+                def log(lines):
+                    for line in lines:
+                        yield line
+                        deadline = time.monotonic() + 10
+                        while first.exists() and "3003" in line and time.monotonic() < deadline:
+                            time.sleep(0.01)
+                    stored_early.append(not first.exists())
+
+                process.stderr = log(process.stderr)
+                return process
+
+            with patch("db_backup.datetime") as mock_datetime:
+                mock_datetime.now.return_value = datetime(2030 + jobs, 1, 1)
+                with patch("subprocess.Popen", side_effect=watched_popen):
+                    info = manager.create_backup("postgresql://localhost/app", "app", directory=True, jobs=jobs)
+
+            assert stored_early == [True]
+            assert info.verified
+
+    def test_restore(self, temp_backup_dir):
+        """Test restore rebuilds the dump and runs pg_restore."""
+        tables = {"3001.dat": _copy_rows(0, 5000)}
+        manager = BackupManager("postgres", temp_backup_dir)
+        with patch("subprocess.Popen", side_effect=_fake_pg_dump(tables)):
+            info = manager.create_backup("postgresql://localhost/app", "app", directory=True, jobs=1)
+
+        restored = {}
+
+        def fake_pg_restore(cmd, **kwargs):
+            source = Path(cmd[-1])
+            restored.update({p.name: p.read_bytes() for p in source.iterdir()})
+            return Mock(returncode=0, stderr="")
+
+        with patch("subprocess.run", side_effect=fake_pg_restore) as mock_run:
+            assert manager.restore_backup(info.filename, "postgresql://localhost/copy", jobs=4)
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[0] == "pg_restore" and "--jobs=4" in cmd
+        assert restored["3001.dat"] == tables["3001.dat"]
+        assert not list(Path(temp_backup_dir).glob(".restore_*"))
+
+    def test_restore_detects_corruption(self, temp_backup_dir):
+        """Test restore fails before pg_restore when a chunk is damaged."""
+        manager = BackupManager("postgres", temp_backup_dir)
+        with patch("subprocess.Popen", side_effect=_fake_pg_dump({"3001.dat": _copy_rows(0, 5000)})):
+            info = manager.create_backup("postgresql://localhost/app", "app", directory=True, jobs=1)
+        for chunk in (Path(temp_backup_dir) / "chunks").glob("*/*"):
+            chunk.write_bytes(b"garbage")
+
+        with patch("subprocess.run") as mock_run:
+            assert not manager.restore_backup(info.filename, "postgresql://localhost/copy", jobs=1)
+        mock_run.assert_not_called()
+
+    def test_mongodb_directory_rejected(self, temp_backup_dir):
+        """Test directory format is PostgreSQL only."""
+        manager = BackupManager("mongodb", temp_backup_dir)
+
+        assert manager.create_backup("mongodb://localhost", "testdb", directory=True) is None
+
+    def test_cleanup_prunes_chunks(self, temp_backup_dir):
+        """Test removing an expired manifest frees chunks only it used."""
+        manager = BackupManager("postgres", temp_backup_dir)
+        with patch("subprocess.Popen", side_effect=_fake_pg_dump({"3001.dat": _copy_rows(0, 5000)})):
+            old = manager.create_backup("postgresql://localhost/app", "app", directory=True, jobs=1)
+        with patch("db_backup.datetime") as mock_datetime:
+            mock_datetime.now.return_value = datetime(2030, 1, 1)
+            with patch("subprocess.Popen", side_effect=_fake_pg_dump({"3001.dat": _copy_rows(7000, 5000)})):
+                new = manager.create_backup("postgresql://localhost/app", "app", directory=True, jobs=1)
+
+        backup_dir = Path(temp_backup_dir)
+        old_time = datetime.now().timestamp() - (10 * 24 * 3600)
+        for path in [backup_dir / old.filename, *(backup_dir / "chunks").glob("*/*")]:
+            os.utime(path, (old_time, old_time))
+
+        manager.cleanup_old_backups(retention_days=7)
+
+        assert not (backup_dir / old.filename).exists()
+        assert not (backup_dir / f"{old.filename}.json").exists()
+        assert (backup_dir / "chunks").is_dir()
+        assert manager._verify_backup(new)
+        assert len(list((backup_dir / "chunks").glob("*/*"))) == 2  # new table file and toc.dat
+
+
+def _plain_dump(rows):
+    """A plain pg_dump with one table of COPY rows and one empty table."""
+    return (b"SET statement_timeout = 0;\nCOPY public.users (id, name, email, score) FROM stdin;\n" + rows +
+            b"\\.\n\nCOPY public.empty (id) FROM stdin;\n\\.\n\n-- PostgreSQL database dump complete\n\n")
+
+
+def _bson(count):
+    """Concatenated minimal BSON documents, as in a mongodump .bson file."""
+    body = b"\x10a\x00\x01\x00\x00\x00\x00"
+    return (struct.pack("<i", len(body) + 4) + body) * count
+
+
+class TestVerify:
+    """Test the verify command."""
+
+    def _directory_backup(self, temp_backup_dir):
+        manager = BackupManager("postgres", temp_backup_dir)
+        tables = {"3001.dat": _copy_rows(0, 5000) + b"\\.\n\n\n", "3002.dat": b"\\.\n\n\n"}
+        with patch("subprocess.Popen", side_effect=_fake_pg_dump(tables)):
+            info = manager.create_backup("postgresql://localhost/app", "app", directory=True, jobs=1)
+        return manager, info
+
+    def test_verify_directory_backup(self, temp_backup_dir):
+        """Test a directory backup streams clean and rows are counted per table file."""
+        manager, info = self._directory_backup(temp_backup_dir)
+
+        with patch("shutil.which", return_value=None):
+            report = manager.verify_backup(info.filename, jobs=2)
+
+        assert report.ok, report.errors
+        assert report.rows == 5000
+        assert {table.name: table.rows for table in report.tables} == {"3001.dat": 5000, "3002.dat": 0}
+        assert report.checked_bytes == info.logical_bytes
+        assert not list(Path(temp_backup_dir).glob(".verify_*"))
+
+    def test_verify_detects_corrupt_chunk(self, temp_backup_dir):
+        """Test a damaged chunk fails verification."""
+        manager, info = self._directory_backup(temp_backup_dir)
+        chunk = max((Path(temp_backup_dir) / "chunks").glob("*/*"), key=lambda p: p.stat().st_size)
+        chunk.write_bytes(b"garbage")
+
+        report = manager.verify_backup(info.filename, jobs=1)
+
+        assert not report.ok
+        assert any("chunk" in error for error in report.errors)
+
+    def test_verify_detects_manifest_change(self, temp_backup_dir):
+        """Test an edited manifest no longer matches the checksum in its metadata."""
+        manager, info = self._directory_backup(temp_backup_dir)
+        manifest_path = Path(temp_backup_dir) / info.filename
+        manifest_path.write_text(manifest_path.read_text().replace('"jobs": 1', '"jobs": 2'))
+
+        report = manager.verify_backup(info.filename, jobs=1)
+
+        assert any("checksum mismatch" in error for error in report.errors)
+
+    def test_verify_plain_gzip(self, temp_backup_dir):
+        """Test a gzip plain dump: rows per table, truncation and missing end marker."""
+        manager = BackupManager("postgres", temp_backup_dir)
+        backup_dir = Path(temp_backup_dir)
+        dump = _plain_dump(_copy_rows(0, 20000))
+        (backup_dir / "good.sql.gz").write_bytes(gzip.compress(dump))
+        (backup_dir / "truncated.sql.gz").write_bytes(gzip.compress(dump)[:-30])
+        (backup_dir / "partial.sql").write_bytes(dump[:len(dump) // 2])
+
+        report = manager.verify_backup("good.sql.gz")
+        assert report.ok, report.errors
+        assert {table.name: table.rows for table in report.tables} == {"public.users": 20000, "public.empty": 0}
+
+        assert not manager.verify_backup("truncated.sql.gz").ok
+        report = manager.verify_backup("partial.sql")
+        assert report.errors == ["Dump ends inside COPY data"]
+
+    def test_verify_plain_checksum(self, temp_backup_dir):
+        """Test plain backups record a checksum that verify checks."""
+        manager = BackupManager("postgres", temp_backup_dir)
+        backup_path = Path(temp_backup_dir) / "postgres_app.sql"
+        backup_path.write_bytes(_plain_dump(_copy_rows(0, 10)))
+        manager._save_metadata(BackupInfo(
+            filename=backup_path.name, database_type="postgres", database_name="app",
+            timestamp=datetime.now(), size_bytes=backup_path.stat().st_size, compressed=False,
+            sha256=manager._file_sha256(backup_path)
+        ))
+
+        assert manager.verify_backup(backup_path.name).ok
+        backup_path.write_bytes(_plain_dump(_copy_rows(1, 10)))
+        assert not manager.verify_backup(backup_path.name).ok
+
+    def test_verify_mongodb_archive(self, temp_backup_dir):
+        """Test documents are counted per collection in a mongodump archive."""
+        manager = BackupManager("mongodb", temp_backup_dir)
+        dump_dir = Path(temp_backup_dir) / "mongodb_app"
+        (dump_dir / "app").mkdir(parents=True)
+        (dump_dir / "app" / "users.bson").write_bytes(_bson(300))
+        (dump_dir / "app" / "users.metadata.json").write_text("{}")
+        (dump_dir / "app" / "orders.bson").write_bytes(_bson(7)[:-2])
+        shutil.make_archive(str(dump_dir), "gztar", dump_dir)
+
+        report = manager.verify_backup("mongodb_app.tar.gz")
+
+        assert {table.name: table.rows for table in report.tables} == {"app.users": 300}
+        assert report.errors == ["app.orders: truncated BSON document"]
+
+    def test_test_restore_directory(self, temp_backup_dir):
+        """Test a test restore creates, loads and drops a scratch database and times tables."""
+        manager, info = self._directory_backup(temp_backup_dir)
+        log = ["pg_restore: launching item 3001 TABLE DATA users\n",
+               "pg_restore: launching item 3002 TABLE DATA empty\n",
+               "pg_restore: finished item 3002 TABLE DATA empty\n",
+               "pg_restore: finished item 3001 TABLE DATA users\n"]
+        listing = "3001; 0 16390 TABLE DATA public users app\n3002; 0 16391 TABLE DATA public empty app\n"
+        restored = []
+
+        def fake_popen(cmd, **kwargs):
+            restored.append(cmd)
+            assert (Path(cmd[-1]) / "3001.dat").exists()
+            return Mock(stderr=iter(log), returncode=0, wait=Mock(return_value=0))
+
+        with patch("subprocess.run", return_value=Mock(returncode=0, stdout=listing, stderr="")) as mock_run, \
+                patch("subprocess.Popen", side_effect=fake_popen), \
+                patch("shutil.which", return_value="/usr/bin/pg_restore"):
+            report = manager.verify_backup(info.filename, jobs=2, target_uri="postgresql://localhost/postgres")
+
+        assert report.ok, report.errors
+        assert restored[0][0] == "pg_restore" and "--jobs=2" in restored[0]
+        scratch = restored[0][restored[0].index("--dbname") + 1]
+        assert scratch.startswith("postgresql://localhost/verify_")
+        commands = [" ".join(call_args[0][0]) for call_args in mock_run.call_args_list]
+        assert any("CREATE DATABASE" in command for command in commands)
+        assert "DROP DATABASE" in commands[-1]
+        assert {table.name for table in report.tables} == {"public.users", "public.empty"}
+        assert all(table.seconds is not None for table in report.tables)
+        assert report.rto_seconds >= report.restore_seconds
+
+    def test_copy_row_counter_block_boundaries(self):
+        """Test COPY row counts do not depend on how the stream is split."""
+        dump = _plain_dump(_copy_rows(0, 300))
+        whole = _CopyRowCounter()
+        whole.feed(dump)
+        split = _CopyRowCounter()
+        for i in range(0, len(dump), 7):
+            split.feed(dump[i:i + 7])
+
+        assert whole.tables["public.users"]["rows"] == 300
+        assert {name: t["rows"] for name, t in split.tables.items()} == \
+            {name: t["rows"] for name, t in whole.tables.items()}
+        assert not split.in_copy
+
+    def test_copy_row_counter_long_row(self):
+        """Test a multi-megabyte row is counted without carrying it between blocks."""
+        row = b"x" * (8 * 1024 * 1024)
+        dump = b"COPY public.blobs (data) FROM stdin;\n" + row + b"\n\\.\n"
+        counter = _CopyRowCounter()
+        for i in range(0, len(dump), 64 * 1024):
+            counter.feed(dump[i:i + 64 * 1024])
+            assert len(counter._tail) <= 3
+
+        assert counter.tables["public.blobs"]["rows"] == 1
+        assert counter.tables["public.blobs"]["bytes"] == len(row) + 1
+        assert not counter.in_copy
+
+    def test_time_restore_log_mongorestore(self):
+        """Test mongorestore output is parsed into timed namespaces with document counts."""
+        lines = ["2026-01-01T00:00:00.000+0000\trestoring verify_x_app.users from /d/app/users.bson",
+                 "2026-01-01T00:00:01.000+0000\tfinished restoring verify_x_app.users (300 documents, 0 failures)"]
+
+        items, recent = _time_restore_log(iter(lines), "mongorestore")
+
+        assert items["verify_x_app.users"]["rows"] == 300
+        assert items["verify_x_app.users"]["end"] is not None
+        assert recent == lines
 
 
 if __name__ == "__main__":
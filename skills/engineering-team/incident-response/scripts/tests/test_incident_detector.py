@@ -0,0 +1,95 @@
+"""Tests for incident_detector.py"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from incident_detector import IncidentDetector, create_parser, non_negative_int
+
+
+def _failed_ssh(day, count, start=0):
+    """Auth log lines for failed SSH logins from one address, one second apart."""
+    return "".join(
+        f"Jan {day:2d} 10:00:{start + i:02d} web1 sshd[4242]: "
+        f"Failed password for root from 10.0.0.5 port 22 ssh2\n"
+        for i in range(count)
+    )
+
+
+class TestStreamingWindows:
+    """Test windowed correlation in streaming mode."""
+
+    def test_files_out_of_time_order_do_not_combine(self, tmp_path):
+        """Test events days apart in separate files do not form one incident."""
+        (tmp_path / "a_auth.log").write_text(_failed_ssh(20, 6))
+        (tmp_path / "b_auth.log").write_text(_failed_ssh(10, 6))
+
+        report = IncidentDetector().run_streaming(str(tmp_path))
+
+        assert report["incidents"] == []
+
+    def test_out_of_order_events_within_timeframe(self, tmp_path):
+        """Test events in the same timeframe still correlate when a newer file sorts first."""
+        (tmp_path / "a_auth.log").write_text(_failed_ssh(20, 6, start=30))
+        (tmp_path / "b_auth.log").write_text(_failed_ssh(20, 6))
+
+        report = IncidentDetector().run_streaming(str(tmp_path))
+
+        assert len(report["incidents"]) == 1
+        assert report["incidents"][0]["event_count"] == 12
+
+    def test_late_events_match_batch(self, tmp_path):
+        """Test events older than the newest seen still open the incident batch mode finds."""
+        (tmp_path / "a_auth.log").write_text(
+            "Jan 20 10:09:00 web1 sshd[4242]: "
+            "Failed password for root from 10.0.0.5 port 22 ssh2\n"
+        )
+        (tmp_path / "b_auth.log").write_text(_failed_ssh(20, 10))
+
+        batch = IncidentDetector().run(str(tmp_path))
+        report = IncidentDetector().run_streaming(str(tmp_path))
+
+        assert len(batch["incidents"]) == 1
+        assert len(report["incidents"]) == 1
+        assert report["incidents"][0]["event_count"] == 11
+
+    def test_below_threshold(self, tmp_path):
+        """Test fewer events than the threshold raise nothing."""
+        (tmp_path / "auth.log").write_text(_failed_ssh(20, 9))
+
+        report = IncidentDetector().run_streaming(str(tmp_path))
+
+        assert report["incidents"] == []
+
+
+class TestThroughput:
+    """Test per-parser throughput stats."""
+
+    def test_many_small_files(self, tmp_path):
+        """Test sub-millisecond per-file parse times still add up."""
+        for i in range(300):
+            (tmp_path / f"{i:03d}_auth.log").write_text(_failed_ssh(20, 1))
+
+        report = IncidentDetector().run(str(tmp_path))
+
+        entry = report["scan_stats"]["parsers"]["AuthLogParser"]
+        assert entry["lines"] == 300
+        assert entry["lines_per_sec"] > 0
+
+
+class TestCLI:
+    """Test argument validation."""
+
+    def test_negative_jobs_rejected(self):
+        """Test --jobs must be zero or more."""
+        with pytest.raises(SystemExit):
+            create_parser().parse_args(["--input", "x", "--jobs", "-1"])
+        assert non_negative_int("0") == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
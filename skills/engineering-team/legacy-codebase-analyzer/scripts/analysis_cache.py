@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Analysis Cache - Incremental per-file findings store
+
+Shared by the legacy-codebase-analyzer scripts so that repeated runs only
+analyze files that changed since the previous run. Each analyzer keeps one
+JSON cache file per settings combination under the cache directory. Entries
+are keyed by path and validated by (size, mtime, content hash); the whole
+file is discarded when the analyzer version or settings change.
+
+Lookup order for a file:
+  1. size and mtime match the entry      -> hit, file is not read
+  2. content hash matches the entry      -> hit, entry is re-stamped
+  3. otherwise                           -> miss, caller analyzes the file
+
+Part of the legacy-codebase-analyzer skill package.
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout of the cache file changes
+CACHE_FORMAT = 1
+
+# Read size used when hashing file contents
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def content_digest(data: bytes) -> str:
+    """Return the content hash used to validate cache entries"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_digest(file_path: Path) -> str:
+    """Hash a file's contents without loading it all into memory"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """On-disk cache of per-file findings for one analyzer"""
+
+    def __init__(self, cache_dir: str, analyzer: str, version: str,
+                 settings: Optional[Dict[str, Any]] = None, rebuild: bool = False):
+        self.cache_dir = Path(cache_dir)
+        self.analyzer = analyzer
+        self.version = version
+        self.settings = settings or {}
+        self.cache_file = self.cache_dir / f"{analyzer}-{self._settings_key()}.json"
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.seen: set = set()
+        self.hits = 0
+        self.misses = 0
+        # Stat/hash observed by get(), reused by put() for the same file
+        self._observed: Dict[str, Tuple[int, int, Optional[str]]] = {}
+
+        if not rebuild:
+            self._load()
+
+    def _settings_key(self) -> str:
+        """Short stable key for the settings that shape per-file findings"""
+        encoded = json.dumps(self.settings, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()[:12]
+
+    def _load(self) -> None:
+        """Load entries from disk, discarding them on version mismatch"""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable cache {self.cache_file}: {e}")
+            return
+
+        if (payload.get('format') != CACHE_FORMAT
+                or payload.get('analyzer') != self.analyzer
+                or payload.get('version') != self.version):
+            logger.debug(f"Discarding stale cache {self.cache_file}")
+            return
+
+        self.entries = payload.get('entries', {})
+
+    def get(self, file_path: Path) -> Optional[Any]:
+        """Return cached findings for file_path, or None on a miss"""
+        key = str(file_path)
+        self.seen.add(key)
+
+        try:
+            stat = file_path.stat()
+        except OSError:
+            self.misses += 1
+            return None
+
+        size, mtime_ns = stat.st_size, stat.st_mtime_ns
+        entry = self.entries.get(key)
+        if entry is None:
+            self._observed[key] = (size, mtime_ns, None)
+            self.misses += 1
+            return None
+
+        if entry['size'] == size and entry['mtime_ns'] == mtime_ns:
+            self.hits += 1
+            return entry['data']
+
+        digest = None
+        if entry['size'] == size:
+            try:
+                digest = file_digest(file_path)
+            except OSError:
+                digest = None
+            if digest == entry['sha256']:
+                entry['mtime_ns'] = mtime_ns
+                self.hits += 1
+                return entry['data']
+
+        self._observed[key] = (size, mtime_ns, digest)
+        self.misses += 1
+        return None
+
+    def put(self, file_path: Path, data: Any, content: Optional[bytes] = None) -> None:
+        """Store findings for file_path; content avoids re-reading the file"""
+        key = str(file_path)
+        self.seen.add(key)
+
+        observed = self._observed.pop(key, None)
+        try:
+            if observed is None:
+                stat = file_path.stat()
+                observed = (stat.st_size, stat.st_mtime_ns, None)
+            size, mtime_ns, digest = observed
+            if content is not None:
+                digest = content_digest(content)
+            elif digest is None:
+                digest = file_digest(file_path)
+        except OSError:
+            return
+
+        self.entries[key] = {
+            'size': size,
+            'mtime_ns': mtime_ns,
+            'sha256': digest,
+            'data': data
+        }
+
+    def save(self) -> None:
+        """Atomically write entries, dropping files that no longer exist"""
+        entries = {
+            key: value for key, value in self.entries.items()
+            if key in self.seen or os.path.exists(key)
+        }
+        payload = {
+            'format': CACHE_FORMAT,
+            'analyzer': self.analyzer,
+            'version': self.version,
+            'settings': self.settings,
+            'entries': entries
+        }
+
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix(f".tmp.{os.getpid()}")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, separators=(',', ':'), default=str)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Could not write cache {self.cache_file}: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for reporting"""
+        return {'hits': self.hits, 'misses': self.misses}
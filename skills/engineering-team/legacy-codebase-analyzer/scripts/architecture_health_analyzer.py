@@ -23,6 +23,8 @@ import logging
 import os
 import sys
 
+from analysis_cache import AnalysisCache
+
 
 # Configure logging
 logging.basicConfig(
@@ -31,6 +33,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+VERSION = '1.2.0'
+
 # Output formatting constants
 OUTPUT_WIDTH = 80  # Standard terminal width for separators
 
@@ -80,6 +84,7 @@ class CircularDependency:
     """Circular dependency chain"""
     cycle: List[str]
     severity: str  # "high", "medium", "low"
+    component: List[str] = field(default_factory=list)  # modules of the enclosing SCC
 
     def to_dict(self) -> dict:
         """Convert to dictionary for JSON serialization"""
@@ -195,14 +200,23 @@ class PythonImportExtractor(ast.NodeVisitor):
 class ArchitectureHealthAnalyzer:
     """Analyze codebase architecture and structural health"""
 
-    def __init__(self, root_path: Path, verbose: bool = False):
+    def __init__(self, root_path: Path, verbose: bool = False,
+                 cache_dir: Optional[str] = None, rebuild_cache: bool = False,
+                 max_cycles_per_component: int = 0):
         self.root_path = root_path.resolve()
         self.verbose = verbose
+        self.max_cycles_per_component = max(0, max_cycles_per_component)
         if verbose:
             logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("ArchitectureHealthAnalyzer initialized")
         self.modules: Dict[str, ModuleInfo] = {}
         self.dependency_graph: Dict[str, Set[str]] = defaultdict(set)
+        # Module names and layers are relative to the root, so it is part of the key
+        self.cache = AnalysisCache(
+            cache_dir, 'architecture_health_analyzer', VERSION,
+            settings={'root': str(self.root_path)},
+            rebuild=rebuild_cache
+        ) if cache_dir else None
 
         # Layer detection patterns
         self.layer_patterns = {
@@ -284,6 +298,20 @@ class ArchitectureHealthAnalyzer:
             self.log(f"Error processing {file_path}: {e}")
             return None
 
+    def extract_module_info_cached(self, file_path: Path) -> Optional[ModuleInfo]:
+        """Extract module information, reusing the cached result for unchanged files"""
+        if not self.cache:
+            return self.extract_module_info(file_path)
+
+        cached = self.cache.get(file_path)
+        if cached is not None:
+            return ModuleInfo(**dict(cached, layer=LayerType(cached['layer'])))
+
+        module_info = self.extract_module_info(file_path)
+        if module_info:
+            self.cache.put(file_path, module_info.to_dict())
+        return module_info
+
     def _filter_project_imports(self, imports: List[str]) -> List[str]:
         """Filter imports to only include project modules"""
         # Filter out standard library and third-party imports
@@ -355,61 +383,172 @@ class ArchitectureHealthAnalyzer:
 
         return None
 
-    def detect_circular_dependencies(self) -> List[CircularDependency]:
-        """Detect circular dependencies using DFS"""
-        self.log("Detecting circular dependencies...")
+    def find_strongly_connected_components(self) -> List[List[str]]:
+        """
+        Find dependency cycles as strongly connected components (iterative Tarjan).
 
-        cycles = []
-        visited = set()
-        rec_stack = []
-
-        def dfs(node: str) -> None:
-            """Depth-first search for cycles"""
-            visited.add(node)
-            rec_stack.append(node)
-
-            for neighbor in self.dependency_graph.get(node, []):
-                if neighbor not in visited:
-                    dfs(neighbor)
-                elif neighbor in rec_stack:
-                    # Found a cycle
-                    cycle_start = rec_stack.index(neighbor)
-                    cycle = rec_stack[cycle_start:] + [neighbor]
-
-                    # Determine severity based on cycle length
-                    if len(cycle) == 2:
-                        severity = "high"
-                    elif len(cycle) <= 4:
-                        severity = "medium"
-                    else:
-                        severity = "low"
+        Returns every component with more than one module, plus single modules
+        that import themselves. Runs in O(V + E) without recursion, so deep
+        import chains cannot hit the interpreter recursion limit.
+        """
+        graph = self.dependency_graph
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        on_stack: Set[str] = set()
+        stack: List[str] = []
+        components: List[List[str]] = []
+        counter = 0
+
+        for root in sorted(graph.keys()):
+            if root in index:
+                continue
 
-                    cycles.append(CircularDependency(
-                        cycle=cycle,
-                        severity=severity
-                    ))
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(sorted(graph.get(root, ()))))]
+
+            while work:
+                node, neighbors = work[-1]
+                descended = False
+                for neighbor in neighbors:
+                    if neighbor not in index:
+                        index[neighbor] = lowlink[neighbor] = counter
+                        counter += 1
+                        stack.append(neighbor)
+                        on_stack.add(neighbor)
+                        work.append((neighbor, iter(sorted(graph.get(neighbor, ())))))
+                        descended = True
+                        break
+                    if neighbor in on_stack:
+                        lowlink[node] = min(lowlink[node], index[neighbor])
+                if descended:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in graph.get(node, ()):
+                        components.append(sorted(component))
+
+        return sorted(components, key=lambda c: (-len(c), c[0]))
+
+    def _shortest_cycle(self, start: str, members: Set[str]) -> List[str]:
+        """Shortest cycle through start using only edges inside its component"""
+        parents: Dict[str, Optional[str]] = {start: None}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            for neighbor in sorted(self.dependency_graph.get(node, ())):
+                if neighbor == start:
+                    path = [node]
+                    while parents[path[-1]] is not None:
+                        path.append(parents[path[-1]])
+                    return path[::-1] + [start]
+                if neighbor in members and neighbor not in parents:
+                    parents[neighbor] = node
+                    queue.append(neighbor)
+        return [start, start]
+
+    def _elementary_cycles(self, component: List[str], limit: int) -> List[List[str]]:
+        """
+        Enumerate up to limit elementary cycles of one component (Johnson's algorithm).
 
-            rec_stack.pop()
+        Each cycle is rooted at its smallest module, so it is reported once.
+        Iterative, with blocking so work stays proportional to cycles found.
+        """
+        rank = {node: i for i, node in enumerate(component)}
+        cycles: List[List[str]] = []
+
+        for start in component:
+            def successors(node: str) -> List[str]:
+                return sorted(
+                    n for n in self.dependency_graph.get(node, ())
+                    if n in rank and rank[n] >= rank[start]
+                )
 
-        for node in self.dependency_graph.keys():
-            if node not in visited:
-                dfs(node)
+            path = [start]
+            blocked = {start}
+            closed: Set[str] = set()
+            blocked_by: Dict[str, Set[str]] = defaultdict(set)
+            work = [(start, iter(successors(start)))]
+
+            while work:
+                node, neighbors = work[-1]
+                for neighbor in neighbors:
+                    if neighbor == start:
+                        cycles.append(path + [start])
+                        closed.update(path)
+                        if len(cycles) >= limit:
+                            return cycles
+                    elif neighbor not in blocked:
+                        path.append(neighbor)
+                        work.append((neighbor, iter(successors(neighbor))))
+                        closed.discard(neighbor)
+                        blocked.add(neighbor)
+                        break
+                else:
+                    if node in closed:
+                        pending = {node}
+                        while pending:
+                            member = pending.pop()
+                            if member in blocked:
+                                blocked.discard(member)
+                                pending.update(blocked_by[member])
+                                blocked_by[member].clear()
+                    else:
+                        for neighbor in successors(node):
+                            blocked_by[neighbor].add(node)
+                    work.pop()
+                    path.pop()
+
+        return cycles
+
+    @staticmethod
+    def _cycle_severity(cycle: List[str]) -> str:
+        """Severity from cycle length (cycle lists repeat the first module at the end)"""
+        if len(cycle) == 2:
+            return "high"
+        if len(cycle) <= 4:
+            return "medium"
+        return "low"
 
-        # Remove duplicates (same cycle detected from different entry points)
-        unique_cycles = []
-        seen_cycles = set()
+    def detect_circular_dependencies(self) -> List[CircularDependency]:
+        """
+        Detect circular dependencies, reporting each strongly connected component once.
 
-        for cycle_obj in cycles:
-            # Normalize cycle (rotate to start with smallest element)
-            cycle = cycle_obj.cycle
-            min_idx = cycle.index(min(cycle[:-1]))  # Exclude last element (duplicate)
-            normalized = tuple(cycle[min_idx:-1] + cycle[:min_idx] + [cycle[min_idx]])
+        By default each component is represented by its shortest cycle through
+        its smallest module. With max_cycles_per_component > 0, up to that many
+        elementary cycles are listed per component instead.
+        """
+        self.log("Detecting circular dependencies...")
 
-            if normalized not in seen_cycles:
-                seen_cycles.add(normalized)
-                unique_cycles.append(cycle_obj)
+        circular = []
+        for component in self.find_strongly_connected_components():
+            if self.max_cycles_per_component:
+                cycles = self._elementary_cycles(component, self.max_cycles_per_component)
+            else:
+                cycles = [self._shortest_cycle(component[0], set(component))]
 
-        return unique_cycles
+            for cycle in cycles:
+                circular.append(CircularDependency(
+                    cycle=cycle,
+                    severity=self._cycle_severity(cycle),
+                    component=component
+                ))
+
+        return circular
 
     def calculate_coupling_metrics(self) -> List[CouplingMetrics]:
         """Calculate coupling metrics for all modules"""
@@ -645,10 +784,14 @@ class ArchitectureHealthAnalyzer:
         self.log(f"Found {len(python_files)} Python files")
 
         for file_path in python_files:
-            module_info = self.extract_module_info(file_path)
+            module_info = self.extract_module_info_cached(file_path)
             if module_info:
                 self.modules[module_info.name] = module_info
 
+        if self.cache:
+            self.cache.save()
+            self.log(f"Cache: {self.cache.hits} reused, {self.cache.misses} re-parsed")
+
         self.log(f"Processed {len(self.modules)} modules")
 
         # Build dependency graph
@@ -693,6 +836,9 @@ class ArchitectureHealthAnalyzer:
         # Calculate health score
         analysis.summary['health_score'] = self.calculate_health_score(analysis)
 
+        if self.cache:
+            analysis.summary['cache'] = self.cache.stats()
+
         return analysis
 
 
@@ -714,6 +860,9 @@ def format_text_output(analysis: ArchitectureAnalysis) -> str:
     lines.append(f"Anti-Patterns Detected:     {analysis.summary['anti_patterns_count']}")
     lines.append(f"Layer Violations:           {analysis.summary['layer_violations_count']}")
     lines.append(f"Architecture Health Score:  {analysis.summary['health_score']:.1f}/100")
+    if analysis.summary.get('cache'):
+        cache = analysis.summary['cache']
+        lines.append(f"Cache:                      {cache['hits']} reused, {cache['misses']} re-parsed")
     lines.append("")
 
     # Health rating
@@ -738,6 +887,8 @@ def format_text_output(analysis: ArchitectureAnalysis) -> str:
         for i, cd in enumerate(analysis.circular_dependencies[:10], 1):
             lines.append(f"{i}. Severity: {cd.severity.upper()}")
             lines.append(f"   Cycle: {' -> '.join(cd.cycle)}")
+            if len(cd.component) > len(cd.cycle) - 1:
+                lines.append(f"   Component: {len(cd.component)} mutually dependent modules")
             lines.append("")
         if len(analysis.circular_dependencies) > 10:
             lines.append(f"... and {len(analysis.circular_dependencies) - 10} more")
@@ -834,6 +985,8 @@ Examples:
   %(prog)s -i /path/to/codebase --output json --diagram
   %(prog)s -i . --file report.json --verbose
   %(prog)s -i src/ --output csv --file metrics.csv
+  %(prog)s -i . --cache-dir .analyzer-cache
+  %(prog)s -i . --max-cycles 20
 
 Output Formats:
   text - Human-readable report with architecture health score
@@ -872,10 +1025,29 @@ Output Formats:
         help='Enable verbose logging'
     )
 
+    parser.add_argument(
+        '--max-cycles',
+        type=int,
+        default=0,
+        help='List up to N elementary cycles per dependency cycle group '
+             '(default: 0, one shortest cycle per group)'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        help='Reuse per-module results cached in this directory; only changed files are re-parsed'
+    )
+
+    parser.add_argument(
+        '--rebuild-cache',
+        action='store_true',
+        help='Ignore cached results and rewrite the cache (e.g. for a nightly full run)'
+    )
+
     parser.add_argument(
         '--version',
         action='version',
-        version='%(prog)s 1.0.0'
+        version=f'%(prog)s {VERSION}'
     )
 
     args = parser.parse_args()
@@ -892,7 +1064,13 @@ Output Formats:
 
     # Run analysis
     try:
-        analyzer = ArchitectureHealthAnalyzer(input_path, verbose=args.verbose)
+        analyzer = ArchitectureHealthAnalyzer(
+            input_path,
+            verbose=args.verbose,
+            cache_dir=args.cache_dir,
+            rebuild_cache=args.rebuild_cache,
+            max_cycles_per_component=args.max_cycles
+        )
         analysis = analyzer.analyze(generate_diagram=args.diagram)
 
         # Format output
@@ -7,7 +7,7 @@ and documentation coverage using Python's AST module.
 
 Features:
 - Cyclomatic complexity calculation per function
-- Token-based code duplication detection
+- Multi-line clone detection (Rabin-Karp rolling hashes over token windows)
 - Function length and parameter count analysis
 - Nesting depth measurement
 - Documentation coverage assessment
@@ -20,16 +20,22 @@ Usage:
     python code_quality_analyzer.py -i ./src --threshold-complexity 15 --verbose
 """
 
-from collections import defaultdict
+from array import array
+from collections import defaultdict, deque
 from dataclasses import dataclass, asdict, field
 from pathlib import Path
 from typing import List, Dict, Any, Set, Tuple, Optional
 import argparse
 import ast
+import base64
 import json
 import logging
 import os
+import re
 import sys
+import zlib
+
+from analysis_cache import AnalysisCache
 
 
 # Configure logging
@@ -39,6 +45,11 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+VERSION = '1.2.1'
+
+# Tokens per rolling-hash window used for clone fingerprints
+CLONE_KGRAM_TOKENS = 20
+
 @dataclass
 class ComplexityResult:
     """Function complexity measurement"""
@@ -108,6 +119,7 @@ class AnalysisResult:
     duplicate_blocks: List[DuplicationBlock] = field(default_factory=list)
     code_smells: List[CodeSmell] = field(default_factory=list)
     high_complexity_functions: List[Dict[str, Any]] = field(default_factory=list)
+    cache_stats: Optional[Dict[str, int]] = None
 
 
 class ComplexityCalculator(ast.NodeVisitor):
@@ -218,14 +230,225 @@ class FunctionAnalyzer(ast.NodeVisitor):
         self.results.append(result)
 
 
+class CloneIndex:
+    """
+    Multi-line clone detector over normalized token windows.
+
+    Each file is reduced to a compact array of token hashes (blank and comment
+    lines dropped, whitespace ignored) plus the source line of every token.
+    Rabin-Karp rolling hashes of every ``kgram``-token window are winnowed to
+    the rightmost minimum of each run of ``winnow`` windows, which guarantees
+    that any clone of at least ``kgram + winnow - 1`` tokens shares a
+    fingerprint. When a fingerprint repeats, the match is extended over the
+    token arrays to its exact extent, so no source text has to be kept or
+    re-read except short snippets of the clones found. Files restored from the
+    cache pass in the stripped lines stored with their tokens.
+    """
+
+    TOKEN_PATTERN = re.compile(r'[A-Za-z_]\w*|\d[\w.]*|\S')
+    MODULUS = (1 << 61) - 1
+    BASE = 1_000_003
+    POSITION_MASK = 0xFFFFFFFF
+    MAX_SNIPPET_LINES = 10
+
+    def __init__(self, kgram: int, winnow: int, min_tokens: int):
+        self.kgram = kgram
+        self.winnow = winnow
+        self.min_tokens = min_tokens
+        self.files: List[str] = []
+        self.line_counts = array('I')
+        self.tokens: List[array] = []
+        self.token_lines: List[array] = []
+        # fingerprint hash -> packed (file index, token position) of first sighting
+        self.first_seen: Dict[int, int] = {}
+        # (file, start, end) of the first copy -> {(file, start)} of later copies
+        self.clones: Dict[Tuple[int, int, int], Set[Tuple[int, int]]] = defaultdict(set)
+        self.snippets: Dict[Tuple[int, int, int], str] = {}
+        # (first file, other file, offset) -> first-copy token ranges already extended
+        self._covered: Dict[Tuple[int, int, int], List[Tuple[int, int]]] = defaultdict(list)
+
+    def tokenize(self, lines: List[str]) -> Tuple[array, array]:
+        """Return (token hashes, token line numbers) for normalized source lines"""
+        tokens = array('I')
+        token_lines = array('I')
+        for line_number, line in enumerate(lines, 1):
+            normalized = line.strip()
+            if not normalized or normalized.startswith('#'):
+                continue
+            for token in self.TOKEN_PATTERN.findall(normalized):
+                tokens.append(zlib.crc32(token.encode('utf-8')))
+                token_lines.append(line_number)
+        return tokens, token_lines
+
+    def fingerprint(self, tokens: array) -> Tuple[array, array]:
+        """Return (hashes, token positions) of the winnowed k-gram windows"""
+        hashes, positions = array('q'), array('I')
+        k = self.kgram
+        if len(tokens) < k:
+            return hashes, positions
+
+        modulus, base = self.MODULUS, self.BASE
+        high = pow(base, k - 1, modulus)
+        rolling = 0
+        for token in tokens[:k]:
+            rolling = (rolling * base + token) % modulus
+        windows = [rolling]
+        for i in range(k, len(tokens)):
+            rolling = ((rolling - tokens[i - k] * high) * base + tokens[i]) % modulus
+            windows.append(rolling)
+
+        # Winnowing: rightmost minimum of each run of `winnow` windows
+        span = min(self.winnow, len(windows))
+        candidates: deque = deque()
+        last_selected = -1
+        for i, value in enumerate(windows):
+            while candidates and windows[candidates[-1]] >= value:
+                candidates.pop()
+            candidates.append(i)
+            if candidates[0] <= i - span:
+                candidates.popleft()
+            if i >= span - 1 and candidates[0] != last_selected:
+                last_selected = candidates[0]
+                hashes.append(windows[last_selected])
+                positions.append(last_selected)
+
+        return hashes, positions
+
+    def add_file(self, file_path: str, line_count: int, tokens: array, token_lines: array,
+                 fingerprints: Tuple[array, array], lines: Optional[List[str]] = None) -> None:
+        """Register a file and extend every fingerprint it shares with earlier files"""
+        hashes, positions = fingerprints
+        if not hashes:
+            return
+
+        file_index = len(self.files)
+        self.files.append(file_path)
+        self.line_counts.append(line_count)
+        self.tokens.append(tokens)
+        self.token_lines.append(token_lines)
+
+        for fp_hash, position in zip(hashes, positions):
+            first = self.first_seen.get(fp_hash)
+            if first is None:
+                self.first_seen[fp_hash] = (file_index << 32) | position
+                continue
+            self._extend_match(first >> 32, first & self.POSITION_MASK,
+                               file_index, position, lines)
+
+    def _extend_match(self, first_file: int, first_pos: int,
+                      other_file: int, other_pos: int,
+                      lines: Optional[List[str]]) -> None:
+        """Grow a shared fingerprint into the maximal identical token run"""
+        covered = self._covered[(first_file, other_file, other_pos - first_pos)]
+        if any(start <= first_pos < end for start, end in covered):
+            return
+
+        first_tokens = self.tokens[first_file]
+        other_tokens = self.tokens[other_file]
+        before = 0
+        while (first_pos - before > 0 and other_pos - before > 0
+               and first_tokens[first_pos - before - 1] == other_tokens[other_pos - before - 1]):
+            before += 1
+        after = 0
+        while (first_pos + after < len(first_tokens) and other_pos + after < len(other_tokens)
+               and first_tokens[first_pos + after] == other_tokens[other_pos + after]):
+            after += 1
+
+        start, end = first_pos - before, first_pos + after
+        covered.append((start, end))
+        length = end - start
+        # Overlapping runs inside one file are repetition, not copies
+        if length < self.min_tokens or (first_file == other_file and abs(other_pos - first_pos) < length):
+            return
+
+        key = (first_file, start, end)
+        other_start = other_pos - before
+        self.clones[key].add((other_file, other_start))
+
+        if lines is not None and key not in self.snippets:
+            other_lines = self.token_lines[other_file]
+            first_line = other_lines[other_start]
+            last_line = min(other_lines[other_start + length - 1],
+                            first_line + self.MAX_SNIPPET_LINES - 1)
+            self.snippets[key] = '\n'.join(line.strip() for line in lines[first_line - 1:last_line])
+
+    def _line_span(self, file_index: int, start: int, length: int) -> Dict[str, Any]:
+        """Map a token range to a {file, line, end_line} location"""
+        token_lines = self.token_lines[file_index]
+        return {
+            'file': self.files[file_index],
+            'line': token_lines[start],
+            'end_line': token_lines[start + length - 1]
+        }
+
+    def blocks(self, min_occurrences: int) -> List[Dict[str, Any]]:
+        """Return clone blocks with at least min_occurrences copies"""
+        results = []
+        for (first_file, start, end), others in self.clones.items():
+            if len(others) + 1 < min_occurrences:
+                continue
+            length = end - start
+            locations = [self._line_span(first_file, start, length)]
+            locations.extend(
+                self._line_span(other_file, other_start, length)
+                for other_file, other_start in sorted(others)
+            )
+            results.append({
+                'key': (first_file, start, end),
+                'tokens': length,
+                'locations': locations
+            })
+        return results
+
+    def duplicated_line_count(self, blocks: List[Dict[str, Any]]) -> int:
+        """Count distinct source lines covered by any clone occurrence"""
+        file_indexes = {path: index for index, path in enumerate(self.files)}
+        covered: Dict[int, bytearray] = {}
+        for block in blocks:
+            for location in block['locations']:
+                index = file_indexes[location['file']]
+                marks = covered.get(index)
+                if marks is None:
+                    marks = covered[index] = bytearray(self.line_counts[index] + 1)
+                span = location['end_line'] - location['line'] + 1
+                marks[location['line']:location['end_line'] + 1] = b'\x01' * span
+        return sum(marks.count(1) for marks in covered.values())
+
+
+def _pack_array(values: array) -> str:
+    """Encode an integer array compactly for the JSON cache"""
+    return base64.b64encode(values.tobytes()).decode('ascii')
+
+
+def _unpack_array(typecode: str, encoded: str) -> array:
+    """Decode an integer array written by _pack_array"""
+    values = array(typecode)
+    values.frombytes(base64.b64decode(encoded))
+    return values
+
+
+def _pack_lines(lines: List[str]) -> str:
+    """Compress stripped source lines for the JSON cache"""
+    text = '\n'.join(line.strip() for line in lines)
+    return base64.b64encode(zlib.compress(text.encode('utf-8'))).decode('ascii')
+
+
+def _unpack_lines(encoded: str) -> List[str]:
+    """Decode source lines written by _pack_lines"""
+    return zlib.decompress(base64.b64decode(encoded)).decode('utf-8').split('\n')
+
+
 class CodeQualityAnalyzer:
     """Main analyzer for code quality metrics"""
 
     def __init__(self, input_path: str, threshold_complexity: int = 10,
-                 threshold_duplication: int = 5, verbose: bool = False):
+                 threshold_duplication: int = 2, verbose: bool = False,
+                 cache_dir: Optional[str] = None, rebuild_cache: bool = False,
+                 min_clone_tokens: int = 50):
         self.input_path = Path(input_path)
         self.threshold_complexity = threshold_complexity
         self.threshold_duplication = threshold_duplication
+        self.min_clone_tokens = max(min_clone_tokens, 1)
         self.verbose = verbose
         if verbose:
             logging.getLogger().setLevel(logging.DEBUG)
@@ -236,9 +459,23 @@ class CodeQualityAnalyzer:
         self.metrics = QualityMetrics()
 
         # For duplication detection
-        self.line_hashes: Dict[int, List[Tuple[str, int]]] = defaultdict(list)
+        kgram = min(CLONE_KGRAM_TOKENS, self.min_clone_tokens)
+        self.clone_index = CloneIndex(
+            kgram=kgram,
+            winnow=self.min_clone_tokens - kgram + 1,
+            min_tokens=self.min_clone_tokens
+        )
         self.duplicate_blocks: List[DuplicationBlock] = []
 
+        self.cache = AnalysisCache(
+            cache_dir, 'code_quality_analyzer', VERSION,
+            settings={
+                'threshold_complexity': threshold_complexity,
+                'min_clone_tokens': self.min_clone_tokens
+            },
+            rebuild=rebuild_cache
+        ) if cache_dir else None
+
     def analyze(self) -> AnalysisResult:
         """Run complete code quality analysis"""
         if self.verbose:
@@ -261,6 +498,9 @@ class CodeQualityAnalyzer:
             file_lines = self._analyze_file(file_path)
             total_lines += file_lines
 
+        if self.cache:
+            self.cache.save()
+
         # Calculate metrics
         self.metrics.total_files = len(source_files)
         self.metrics.total_lines = total_lines
@@ -307,7 +547,8 @@ class CodeQualityAnalyzer:
             complexity_results=self.complexity_results,
             duplicate_blocks=self.duplicate_blocks,
             code_smells=self.code_smells,
-            high_complexity_functions=high_complexity
+            high_complexity_functions=high_complexity,
+            cache_stats=self.cache.stats() if self.cache else None
         )
 
     def _find_python_files(self) -> List[str]:
@@ -336,6 +577,11 @@ class CodeQualityAnalyzer:
 
     def _analyze_file(self, file_path: str) -> int:
         """Analyze a single Python file"""
+        if self.cache:
+            cached = self.cache.get(Path(file_path))
+            if cached is not None:
+                return self._restore_cached_file(file_path, cached)
+
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
@@ -347,6 +593,10 @@ class CodeQualityAnalyzer:
             except SyntaxError as e:
                 if self.verbose:
                     print(f"    Warning: Syntax error in {file_path}: {e}")
+                if self.cache:
+                    self.cache.put(Path(file_path), {
+                        'lines': len(lines), 'functions': [], 'smells': [], 'clone_data': None
+                    })
                 return len(lines)
 
             # Analyze functions
@@ -355,10 +605,27 @@ class CodeQualityAnalyzer:
             self.complexity_results.extend(analyzer.results)
 
             # Detect code smells
+            first_smell = len(self.code_smells)
             self._detect_code_smells(analyzer.results)
 
-            # Store line hashes for duplication detection
-            self._hash_lines(file_path, lines)
+            # Tokenize and fingerprint for clone detection
+            tokens, token_lines = self.clone_index.tokenize(lines)
+            fingerprints = self.clone_index.fingerprint(tokens)
+            self.clone_index.add_file(file_path, len(lines), tokens, token_lines, fingerprints, lines)
+
+            if self.cache:
+                self.cache.put(Path(file_path), {
+                    'lines': len(lines),
+                    'functions': [asdict(r) for r in analyzer.results],
+                    'smells': [asdict(smell) for smell in self.code_smells[first_smell:]],
+                    'clone_data': {
+                        'tokens': _pack_array(tokens),
+                        'token_lines': _pack_array(token_lines),
+                        'hashes': _pack_array(fingerprints[0]),
+                        'positions': _pack_array(fingerprints[1]),
+                        'lines': _pack_lines(lines)
+                    }
+                })
 
             return len(lines)
 
@@ -367,51 +634,47 @@ class CodeQualityAnalyzer:
                 print(f"    Error analyzing {file_path}: {e}")
             return 0
 
-    def _hash_lines(self, file_path: str, lines: List[str]):
-        """Hash lines for duplication detection"""
-        for i, line in enumerate(lines, 1):
-            # Normalize: strip whitespace and ignore comments/empty lines
-            normalized = line.strip()
-            if normalized and not normalized.startswith('#'):
-                line_hash = hash(normalized)
-                self.line_hashes[line_hash].append((file_path, i))
+    def _restore_cached_file(self, file_path: str, cached: Dict[str, Any]) -> int:
+        """Merge a file's cached analysis into the run and return its line count"""
+        self.complexity_results.extend(ComplexityResult(**r) for r in cached['functions'])
+        self.code_smells.extend(CodeSmell(**smell) for smell in cached['smells'])
+        clone_data = cached['clone_data']
+        if clone_data:
+            self.clone_index.add_file(
+                file_path, cached['lines'],
+                _unpack_array('I', clone_data['tokens']),
+                _unpack_array('I', clone_data['token_lines']),
+                (_unpack_array('q', clone_data['hashes']), _unpack_array('I', clone_data['positions'])),
+                _unpack_lines(clone_data['lines'])
+            )
+        return cached['lines']
 
     def _detect_duplication(self):
-        """Detect duplicate code blocks"""
-        # Find lines that appear multiple times
-        duplicates = {
-            h: locations for h, locations in self.line_hashes.items()
-            if len(locations) >= self.threshold_duplication
-        }
+        """Detect duplicated multi-line blocks from clone fingerprints"""
+        blocks = self.clone_index.blocks(self.threshold_duplication)
 
-        if not duplicates:
+        if not blocks:
             self.metrics.duplication_percentage = 0.0
             return
 
-        # Group into blocks
-        for line_hash, locations in duplicates.items():
-            # Get the actual line content from first occurrence
-            file_path, line_num = locations[0]
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                    content = lines[line_num - 1].strip() if line_num <= len(lines) else "Unknown"
-            except Exception:
-                content = "Unknown"
-
-            block = DuplicationBlock(
-                content=content,
-                occurrences=len(locations),
-                file_locations=[
-                    {"file": loc[0], "line": loc[1]} for loc in locations
-                ],
-                line_count=1
+        for block in blocks:
+            first = block['locations'][0]
+            line_count = first['end_line'] - first['line'] + 1
+            content = self.clone_index.snippets.get(
+                block['key'], f"{first['file']}:{first['line']}-{first['end_line']}"
             )
-            self.duplicate_blocks.append(block)
+            self.duplicate_blocks.append(DuplicationBlock(
+                content=content,
+                occurrences=len(block['locations']),
+                file_locations=block['locations'],
+                line_count=line_count
+            ))
+
+        self.duplicate_blocks.sort(key=lambda b: b.line_count * b.occurrences, reverse=True)
 
         # Calculate duplication percentage
         total_lines = self.metrics.total_lines
-        duplicate_lines = sum(block.occurrences for block in self.duplicate_blocks)
+        duplicate_lines = self.clone_index.duplicated_line_count(blocks)
         self.metrics.duplication_percentage = (duplicate_lines / total_lines * 100) if total_lines > 0 else 0.0
 
     def _detect_code_smells(self, results: List[ComplexityResult]):
@@ -577,6 +840,11 @@ class OutputFormatter:
         lines.append(f"Documentation Coverage:   {result.metrics.documentation_coverage:.2f}%")
         lines.append(f"Test Coverage Estimate:   {result.metrics.test_coverage_estimate:.2f}%")
         lines.append(f"Code Duplication:         {result.metrics.duplication_percentage:.2f}%")
+        if result.cache_stats:
+            lines.append(
+                f"Cache:                    {result.cache_stats['hits']} reused, "
+                f"{result.cache_stats['misses']} re-analyzed"
+            )
         lines.append("")
 
         # High Complexity Functions
@@ -616,10 +884,10 @@ class OutputFormatter:
             lines.append(f"CODE DUPLICATION ({len(result.duplicate_blocks)} blocks)")
             lines.append("-" * 80)
             for i, block in enumerate(result.duplicate_blocks[:5], 1):
-                lines.append(f"Block {i}: {block.occurrences} occurrences")
+                lines.append(f"Block {i}: {block.line_count} lines, {block.occurrences} occurrences")
                 if verbose:
                     for loc in block.file_locations[:3]:
-                        lines.append(f"  - {loc['file']}:{loc['line']}")
+                        lines.append(f"  - {loc['file']}:{loc['line']}-{loc['end_line']}")
                     if len(block.file_locations) > 3:
                         lines.append(f"  ... and {len(block.file_locations) - 3} more")
             if len(result.duplicate_blocks) > 5:
@@ -640,6 +908,8 @@ class OutputFormatter:
             "code_smells": [asdict(smell) for smell in result.code_smells],
             "duplicate_blocks": [asdict(block) for block in result.duplicate_blocks]
         }
+        if result.cache_stats:
+            data["cache"] = result.cache_stats
         return json.dumps(data, indent=2)
 
     @staticmethod
@@ -675,6 +945,9 @@ Examples:
 
   # Generate CSV of function metrics
   python code_quality_analyzer.py -i ./src --output csv --file metrics.csv
+
+  # Incremental run: only re-analyze files changed since the last run
+  python code_quality_analyzer.py -i ./src --cache-dir .analyzer-cache
         """
     )
 
@@ -706,8 +979,15 @@ Examples:
     parser.add_argument(
         '--threshold-duplication',
         type=int,
-        default=5,
-        help='Minimum occurrences to flag duplication (default: 5)'
+        default=2,
+        help='Minimum occurrences to flag a duplicated block (default: 2)'
+    )
+
+    parser.add_argument(
+        '--min-clone-tokens',
+        type=int,
+        default=50,
+        help='Minimum normalized tokens for a duplicated block (default: 50)'
     )
 
     parser.add_argument(
@@ -716,10 +996,21 @@ Examples:
         help='Enable verbose output'
     )
 
+    parser.add_argument(
+        '--cache-dir',
+        help='Reuse per-file results cached in this directory; only changed files are re-analyzed'
+    )
+
+    parser.add_argument(
+        '--rebuild-cache',
+        action='store_true',
+        help='Ignore cached results and rewrite the cache (e.g. for a nightly full run)'
+    )
+
     parser.add_argument(
         '--version',
         action='version',
-        version='%(prog)s 1.0.0'
+        version=f'%(prog)s {VERSION}'
     )
 
     args = parser.parse_args()
@@ -735,7 +1026,10 @@ Examples:
             input_path=args.input,
             threshold_complexity=args.threshold_complexity,
             threshold_duplication=args.threshold_duplication,
-            verbose=args.verbose
+            min_clone_tokens=args.min_clone_tokens,
+            verbose=args.verbose,
+            cache_dir=args.cache_dir,
+            rebuild_cache=args.rebuild_cache
         )
 
         result = analyzer.analyze()
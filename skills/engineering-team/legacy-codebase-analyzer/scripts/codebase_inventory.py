@@ -9,7 +9,7 @@ tool provides the baseline data that all other legacy analysis tools consume.
 Part of the legacy-codebase-analyzer skill package.
 """
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from io import StringIO
 from pathlib import Path
@@ -22,6 +22,8 @@ import os
 import re
 import sys
 
+from analysis_cache import AnalysisCache
+
 
 # Configure logging
 logging.basicConfig(
@@ -30,6 +32,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+VERSION = '1.1.0'
+
 @dataclass
 class FileInfo:
     """Information about a single source file"""
@@ -236,7 +240,8 @@ class CodebaseInventory:
     }
 
     def __init__(self, target_path: str, exclude_patterns: List[str] = None,
-                 max_depth: int = None, verbose: bool = False):
+                 max_depth: int = None, verbose: bool = False,
+                 cache_dir: Optional[str] = None, rebuild_cache: bool = False):
         self.target_path = Path(target_path).resolve()
         self.exclude_patterns = exclude_patterns or []
         self.max_depth = max_depth
@@ -250,6 +255,9 @@ class CodebaseInventory:
         self.frameworks: List[Framework] = []
         self.dependencies: List[Dependency] = []
         self.results: Dict = {}
+        self.cache = AnalysisCache(
+            cache_dir, 'codebase_inventory', VERSION, rebuild=rebuild_cache
+        ) if cache_dir else None
 
     def discover_files(self) -> List[Path]:
         """Recursively find source files to catalog"""
@@ -354,7 +362,31 @@ class CodebaseInventory:
         return total, max(0, code), comments, blank
 
     def analyze_file(self, file_path: Path) -> Optional[FileInfo]:
-        """Analyze a single file"""
+        """Analyze a single file, reusing cached line counts when unchanged"""
+        if not self.cache:
+            return self._analyze_file_uncached(file_path)
+
+        cached = self.cache.get(file_path)
+        if cached is not None:
+            try:
+                stat = file_path.stat()
+            except OSError:
+                return None
+            # Path and stat-derived fields are refreshed; line counts are reused
+            return FileInfo(**dict(
+                cached,
+                path=str(file_path.relative_to(self.target_path)),
+                size_bytes=stat.st_size,
+                last_modified=datetime.fromtimestamp(stat.st_mtime).isoformat()
+            ))
+
+        file_info = self._analyze_file_uncached(file_path)
+        if file_info:
+            self.cache.put(file_path, asdict(file_info))
+        return file_info
+
+    def _analyze_file_uncached(self, file_path: Path) -> Optional[FileInfo]:
+        """Read and count lines of a single file"""
         try:
             stat = file_path.stat()
             language = self.detect_language(file_path)
@@ -691,6 +723,9 @@ class CodebaseInventory:
             if file_info:
                 self.files.append(file_info)
 
+        if self.cache:
+            self.cache.save()
+
         # Calculate language statistics
         self.languages = self.calculate_language_stats()
 
@@ -766,6 +801,7 @@ class CodebaseInventory:
                 for dep in self.dependencies
             ],
             'age_analysis': age_analysis,
+            'cache': self.cache.stats() if self.cache else None,
             'files': [
                 {
                     'path': f.path,
@@ -821,6 +857,9 @@ class CodebaseInventory:
         lines.append(f"  Languages:         {summary.get('languages_detected', 0)}")
         lines.append(f"  Frameworks:        {summary.get('frameworks_detected', 0)}")
         lines.append(f"  Dependencies:      {summary.get('dependencies_count', 0)}")
+        cache = self.results.get('cache')
+        if cache:
+            lines.append(f"  Cache:             {cache['hits']:,} reused, {cache['misses']:,} re-analyzed")
         lines.append("")
 
         # Languages
@@ -901,6 +940,7 @@ Examples:
   %(prog)s --input ./src --output json --file inventory.json
   %(prog)s --input . --exclude "*.test.js" --exclude "docs/*" -v
   %(prog)s --input ./project --depth 5 --output csv
+  %(prog)s --input . --cache-dir .analyzer-cache
 
 Output Formats:
   text  - Human-readable summary (default)
@@ -933,11 +973,19 @@ Output Formats:
         '--verbose', '-v', action='store_true',
         help='Enable verbose output'
     )
+    parser.add_argument(
+        '--cache-dir',
+        help='Reuse per-file results cached in this directory; only changed files are re-read'
+    )
+    parser.add_argument(
+        '--rebuild-cache', action='store_true',
+        help='Ignore cached results and rewrite the cache (e.g. for a nightly full run)'
+    )
 
     parser.add_argument(
         '--version',
         action='version',
-        version='%(prog)s 1.0.0'
+        version=f'%(prog)s {VERSION}'
     )
 
     args = parser.parse_args()
@@ -946,7 +994,9 @@ Output Formats:
         target_path=args.input,
         exclude_patterns=args.exclude,
         max_depth=args.depth,
-        verbose=args.verbose
+        verbose=args.verbose,
+        cache_dir=args.cache_dir,
+        rebuild_cache=args.rebuild_cache
     )
 
     results = inventory.run()
@@ -9,10 +9,11 @@ cryptographic weaknesses, and sensitive data exposure.
 Part of the legacy-codebase-analyzer skill package.
 """
 
-from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
-from io import StringIO
+from io import BytesIO, StringIO, TextIOWrapper
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 import argparse
@@ -23,6 +24,8 @@ import os
 import re
 import sys
 
+from analysis_cache import AnalysisCache
+
 
 # Configure logging
 logging.basicConfig(
@@ -31,9 +34,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+VERSION = '1.1.0'
+
 # Output formatting constants
 OUTPUT_WIDTH = 80  # Standard terminal width for separators
 
+# Bytes inspected for NUL when deciding whether a file is binary
+BINARY_SNIFF_BYTES = 512
+
+# Files handed to a worker process per dispatch in --jobs mode
+FILES_PER_CHUNK = 16
+
 
 class Severity(Enum):
     """Security issue severity levels"""
@@ -130,19 +141,36 @@ class SecurityVulnerabilityScanner:
     }
 
     def __init__(self, target_path: str, min_severity: str = 'LOW',
-                 verbose: bool = False):
+                 verbose: bool = False, jobs: int = 1,
+                 cache_dir: Optional[str] = None, rebuild_cache: bool = False):
         self.target_path = Path(target_path)
         self.min_severity = Severity[min_severity.upper()]
         self.verbose = verbose
+        self.jobs = max(1, jobs)
         if verbose:
             logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("SecurityVulnerabilityScanner initialized")
         self.secret_patterns = self._load_secret_patterns()
         self.vulnerability_patterns = self._load_vulnerability_patterns()
+        self.active_secret_patterns = self._compile_patterns(self.secret_patterns)
+        self.active_vulnerability_patterns = self._compile_patterns(self.vulnerability_patterns)
         self.secret_findings: List[SecretFinding] = []
         self.vulnerability_findings: List[VulnerabilityFinding] = []
         self.files_analyzed = 0
         self.results: Dict = {}
+        self.cache = AnalysisCache(
+            cache_dir, 'security_vulnerability_scanner', VERSION,
+            settings={'min_severity': self.min_severity.name},
+            rebuild=rebuild_cache
+        ) if cache_dir else None
+
+    def _compile_patterns(self, patterns: List[Pattern]) -> List[Tuple[Pattern, re.Pattern]]:
+        """Filter patterns by minimum severity and compile them once"""
+        return [
+            (pattern, re.compile(pattern.regex, re.MULTILINE))
+            for pattern in patterns
+            if pattern.severity.value >= self.min_severity.value
+        ]
 
     def _load_secret_patterns(self) -> List[Pattern]:
         """Load patterns for detecting hardcoded secrets"""
@@ -497,11 +525,25 @@ class SecurityVulnerabilityScanner:
         else:
             self._scan_directory(self.target_path)
 
+        if self.cache:
+            self.cache.save()
+
         self._generate_results()
         return self.results
 
     def _scan_directory(self, directory: Path):
         """Recursively scan directory for security issues"""
+        file_paths = list(self._iter_candidate_files(directory))
+
+        if self.jobs > 1 and len(file_paths) > 1:
+            self._scan_parallel(file_paths)
+            return
+
+        for file_path in file_paths:
+            self._scan_file(file_path, sniff_binary=True)
+
+    def _iter_candidate_files(self, directory: Path):
+        """Yield files under directory that are not skipped by directory or extension"""
         for root, dirs, files in os.walk(directory):
             # Remove skip directories from traversal
             dirs[:] = [d for d in dirs if d not in self.SKIP_DIRS]
@@ -513,53 +555,169 @@ class SecurityVulnerabilityScanner:
                 if file_path.suffix.lower() in self.SKIP_EXTENSIONS:
                     continue
 
-                # Check if it's a text file
-                if not self._is_text_file(file_path):
-                    continue
+                yield file_path
 
-                self._scan_file(file_path)
+    def _scan_parallel(self, file_paths: List[Path]):
+        """Shard files across a process pool, merging findings in walk order"""
+        cached = {}
+        if self.cache:
+            for file_path in file_paths:
+                entry = self.cache.get(file_path)
+                if entry is not None:
+                    cached[file_path] = self._outcome_from_cache(entry)
+        pending = [file_path for file_path in file_paths if file_path not in cached]
 
-    def _scan_file(self, file_path: Path):
+        if self.verbose:
+            print(f"  Scanning {len(pending)} files with {self.jobs} workers "
+                  f"({len(cached)} cached)...")
+
+        with ProcessPoolExecutor(
+            max_workers=self.jobs,
+            initializer=_init_worker,
+            initargs=(self.min_severity.name,)
+        ) as executor:
+            scanned = dict(zip(
+                pending,
+                executor.map(_scan_file_in_worker, pending, chunksize=FILES_PER_CHUNK)
+            ))
+
+        for file_path in file_paths:
+            if file_path in cached:
+                self._record_outcome(file_path, cached[file_path])
+            else:
+                outcome = scanned[file_path]
+                self._cache_outcome(file_path, outcome)
+                self._record_outcome(file_path, outcome)
+
+    def _scan_file(self, file_path: Path, sniff_binary: bool = False):
         """Scan single file for security issues"""
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
+        if self.cache:
+            entry = self.cache.get(file_path)
+            if entry is not None:
+                self._record_outcome(file_path, self._outcome_from_cache(entry))
+                return
+
+        outcome = self._analyze_file(file_path, sniff_binary)
+        self._cache_outcome(file_path, outcome)
+        self._record_outcome(file_path, outcome)
+
+    def _cache_outcome(self, file_path: Path, outcome):
+        """Store a freshly analyzed file's findings in the cache"""
+        if not self.cache or isinstance(outcome, Exception):
+            return
+        if outcome is None:
+            self.cache.put(file_path, {'binary': True})
+            return
+
+        secrets, vulnerabilities = outcome
+        self.cache.put(file_path, {
+            'secrets': [
+                dict(asdict(f), severity=f.severity.name) for f in secrets
+            ],
+            'vulnerabilities': [
+                dict(asdict(f), severity=f.severity.name) for f in vulnerabilities
+            ]
+        })
+
+    @staticmethod
+    def _outcome_from_cache(entry: Dict):
+        """Rebuild an _analyze_file outcome from a cache entry"""
+        if entry.get('binary'):
+            return None
+        secrets = [
+            SecretFinding(**dict(f, severity=Severity[f['severity']]))
+            for f in entry['secrets']
+        ]
+        vulnerabilities = [
+            VulnerabilityFinding(**dict(f, severity=Severity[f['severity']]))
+            for f in entry['vulnerabilities']
+        ]
+        return secrets, vulnerabilities
+
+    def _record_outcome(self, file_path: Path, outcome):
+        """Merge the result of analyzing one file into the scanner state"""
+        if isinstance(outcome, Exception):
+            if self.verbose:
+                print(f"  Error scanning {file_path}: {outcome}")
+            return
+        if outcome is None:
+            return
+
+        secrets, vulnerabilities = outcome
+        self.files_analyzed += 1
+        self.secret_findings.extend(secrets)
+        self.vulnerability_findings.extend(vulnerabilities)
+
+        if self.verbose and self.files_analyzed % 100 == 0:
+            print(f"  Analyzed {self.files_analyzed} files...")
 
-            self.files_analyzed += 1
+    def _analyze_file(self, file_path: Path, sniff_binary: bool = False):
+        """
+        Analyze one file and return (secrets, vulnerabilities).
+
+        The file is read once as bytes; the binary sniff and the scan both use
+        that buffer. Returns None for binary files and the exception when the
+        file cannot be read or scanned.
+        """
+        try:
+            raw = file_path.read_bytes()
+            if sniff_binary and not self._is_text_buffer(raw):
+                return None
+
+            content = raw.decode('utf-8', errors='ignore')
+            lines = TextIOWrapper(BytesIO(raw), encoding='utf-8', errors='ignore').readlines()
+
+            # A pattern that matches nowhere in the file cannot match any line
+            secret_patterns = [
+                (pattern, regex) for pattern, regex in self.active_secret_patterns
+                if regex.search(content)
+            ]
+            vulnerability_patterns = [
+                (pattern, regex) for pattern, regex in self.active_vulnerability_patterns
+                if regex.search(content)
+            ]
+
+            secrets: List[SecretFinding] = []
+            vulnerabilities: List[VulnerabilityFinding] = []
+            if not secret_patterns and not vulnerability_patterns:
+                return secrets, vulnerabilities
 
             for line_num, line in enumerate(lines, start=1):
                 # Check for hardcoded secrets
-                for pattern in self.secret_patterns:
-                    if pattern.severity.value >= self.min_severity.value:
-                        self._check_secret_pattern(pattern, file_path, line_num, line)
+                for pattern, regex in secret_patterns:
+                    finding = self._check_secret_pattern(pattern, regex, file_path, line_num, line)
+                    if finding:
+                        secrets.append(finding)
 
                 # Check for vulnerabilities
-                for pattern in self.vulnerability_patterns:
-                    if pattern.severity.value >= self.min_severity.value:
-                        self._check_vulnerability_pattern(pattern, file_path, line_num, line)
+                for pattern, regex in vulnerability_patterns:
+                    finding = self._check_vulnerability_pattern(pattern, regex, file_path, line_num, line)
+                    if finding:
+                        vulnerabilities.append(finding)
 
-            if self.verbose and self.files_analyzed % 100 == 0:
-                print(f"  Analyzed {self.files_analyzed} files...")
+            return secrets, vulnerabilities
 
         except Exception as e:
-            if self.verbose:
-                print(f"  Error scanning {file_path}: {e}")
+            return e
 
     def _is_text_file(self, file_path: Path) -> bool:
         """Check if file is text file"""
         try:
             with open(file_path, 'rb') as f:
-                chunk = f.read(512)
-                if b'\x00' in chunk:  # Binary file indicator
-                    return False
-            return True
+                return self._is_text_buffer(f.read(BINARY_SNIFF_BYTES))
         except Exception:
             return False
 
-    def _check_secret_pattern(self, pattern: Pattern, file_path: Path,
-                              line_num: int, line: str):
+    @staticmethod
+    def _is_text_buffer(data: bytes) -> bool:
+        """Check if a buffer looks like text (no NUL in its leading bytes)"""
+        return b'\x00' not in data[:BINARY_SNIFF_BYTES]
+
+    def _check_secret_pattern(self, pattern: Pattern, regex: re.Pattern,
+                              file_path: Path, line_num: int,
+                              line: str) -> Optional[SecretFinding]:
         """Check line for hardcoded secrets"""
-        match = re.search(pattern.regex, line)
+        match = regex.search(line)
         if match:
             # Redact the actual secret value
             redacted_line = self._redact_secret(line, match)
@@ -572,12 +730,14 @@ class SecurityVulnerabilityScanner:
                 severity=pattern.severity,
                 recommendation=pattern.recommendation
             )
-            self.secret_findings.append(finding)
+            return finding
+        return None
 
-    def _check_vulnerability_pattern(self, pattern: Pattern, file_path: Path,
-                                     line_num: int, line: str):
+    def _check_vulnerability_pattern(self, pattern: Pattern, regex: re.Pattern,
+                                     file_path: Path, line_num: int,
+                                     line: str) -> Optional[VulnerabilityFinding]:
         """Check line for security vulnerabilities"""
-        if re.search(pattern.regex, line):
+        if regex.search(line):
             finding = VulnerabilityFinding(
                 pattern_id=pattern.id,
                 file_path=str(file_path),
@@ -590,7 +750,8 @@ class SecurityVulnerabilityScanner:
                 cwe_id=pattern.cwe_id,
                 owasp=pattern.owasp
             )
-            self.vulnerability_findings.append(finding)
+            return finding
+        return None
 
     def _redact_secret(self, line: str, match) -> str:
         """Redact sensitive data from line"""
@@ -641,7 +802,8 @@ class SecurityVulnerabilityScanner:
             },
             'secrets': [self._secret_to_dict(f) for f in self.secret_findings],
             'vulnerabilities': [self._vulnerability_to_dict(f) for f in self.vulnerability_findings],
-            'recommendations': self._generate_recommendations()
+            'recommendations': self._generate_recommendations(),
+            'cache': self.cache.stats() if self.cache else None
         }
 
     def _calculate_security_score(self, critical: int, high: int,
@@ -805,6 +967,11 @@ class OutputFormatter:
         output.append(f"Timestamp: {results['timestamp']}")
         output.append(f"Target: {results['target']}")
         output.append(f"Files Analyzed: {results['files_analyzed']}")
+        if results.get('cache'):
+            output.append(
+                f"Cache: {results['cache']['hits']} reused, "
+                f"{results['cache']['misses']} re-analyzed"
+            )
         output.append("")
 
         # Summary
@@ -905,6 +1072,21 @@ class OutputFormatter:
         return output.getvalue()
 
 
+# Per-process scanner used by --jobs workers, built once by _init_worker
+_worker_scanner: Optional[SecurityVulnerabilityScanner] = None
+
+
+def _init_worker(min_severity: str):
+    """Process-pool initializer: compile patterns once per worker"""
+    global _worker_scanner
+    _worker_scanner = SecurityVulnerabilityScanner('.', min_severity=min_severity)
+
+
+def _scan_file_in_worker(file_path: Path):
+    """Process-pool task: analyze one file with the worker's scanner"""
+    return _worker_scanner._analyze_file(file_path, sniff_binary=True)
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -927,6 +1109,12 @@ Examples:
   # Verbose output with detailed progress
   %(prog)s --input /path/to/codebase --verbose
 
+  # Shard a full-repo sweep across 8 worker processes
+  %(prog)s --input /path/to/codebase --jobs 8
+
+  # Incremental run: only re-scan files changed since the last run
+  %(prog)s --input /path/to/codebase --cache-dir .analyzer-cache
+
 Severity Levels:
   CRITICAL - Immediate security risk (data breach, RCE)
   HIGH     - Significant security risk (auth bypass, injection)
@@ -963,6 +1151,21 @@ Detection Categories:
         default='LOW',
         help='Minimum severity to report (default: LOW)'
     )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Worker processes for directory scans (default: 1, 0 = all CPUs)'
+    )
+    parser.add_argument(
+        '--cache-dir',
+        help='Reuse per-file findings cached in this directory; only changed files are re-scanned'
+    )
+    parser.add_argument(
+        '--rebuild-cache',
+        action='store_true',
+        help='Ignore cached findings and rewrite the cache (e.g. for a nightly full run)'
+    )
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
@@ -972,7 +1175,7 @@ Detection Categories:
     parser.add_argument(
         '--version',
         action='version',
-        version='%(prog)s 1.0.0'
+        version=f'%(prog)s {VERSION}'
     )
 
     args = parser.parse_args()
@@ -987,7 +1190,10 @@ Detection Categories:
         scanner = SecurityVulnerabilityScanner(
             target_path=args.input,
             min_severity=args.min_severity,
-            verbose=args.verbose
+            verbose=args.verbose,
+            jobs=args.jobs if args.jobs > 0 else (os.cpu_count() or 1),
+            cache_dir=args.cache_dir,
+            rebuild_cache=args.rebuild_cache
         )
 
         results = scanner.scan()
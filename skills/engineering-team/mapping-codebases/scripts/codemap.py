@@ -3,14 +3,21 @@
 codemap.py - Generate _MAP.md files for each directory in a codebase.
 Extracts exports/imports via tree-sitter. No LLM, deterministic, fast.
 Updated to support symbol hierarchy (Classes -> Methods) and Kinds.
+Regenerates only directories whose source files changed since the last run,
+optionally parsing in a process pool. With --index, also maintains a SQLite
+symbol index queried by symbol_index.py.
 Requires Python 3.10+ and tree-sitter-language-pack.
 """
 
+import hashlib
+import json
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass, field
 from tree_sitter_language_pack import get_parser
+from symbol_index import INDEX_NAME, update_index
 
 # Language detection by extension
 EXT_TO_LANG = {
@@ -29,12 +36,22 @@ EXT_TO_LANG = {
 # Default directories to skip
 DEFAULT_SKIP_DIRS = {'.git', 'node_modules', '__pycache__', '.venv', 'venv', 'dist', 'build', '.next'}
 
+# Per-directory file hashes from the last run, kept at the root of the mapped tree
+MANIFEST_NAME = '.codemap-manifest.json'
+# Bump when extractor output changes so every map is regenerated
+MANIFEST_VERSION = 1
+
+# One parser per language per process (workers each build their own)
+_PARSERS = {}
+
 @dataclass
 class Symbol:
     name: str
     kind: str  # 'class', 'function', 'method', 'variable', 'interface'
     signature: str | None = None
     children: list['Symbol'] = field(default_factory=list)
+    line_start: int | None = None
+    line_end: int | None = None
 
 @dataclass
 class FileInfo:
@@ -46,9 +63,23 @@ class FileInfo:
 def get_language(filepath: Path) -> str | None:
     return EXT_TO_LANG.get(filepath.suffix.lower())
 
+def get_cached_parser(lang: str):
+    """Return this process's parser for lang, creating it on first use."""
+    parser = _PARSERS.get(lang)
+    if parser is None:
+        parser = _PARSERS[lang] = get_parser(lang)
+    return parser
+
 def get_node_text(node, source: bytes) -> str:
     return source[node.start_byte:node.end_byte].decode()
 
+def span(node, line_offset: int = 0) -> dict:
+    """1-based inclusive line span of a node, as Symbol keyword arguments."""
+    return {
+        'line_start': node.start_point[0] + 1 + line_offset,
+        'line_end': node.end_point[0] + 1 + line_offset,
+    }
+
 def extract_python(tree, source: bytes) -> FileInfo:
     """Extract exports and imports from Python AST."""
     symbols = []
@@ -77,7 +108,7 @@ def extract_python(tree, source: bytes) -> FileInfo:
                 break
 
         signature = get_signature(node)
-        return Symbol(name=name, kind=kind, signature=signature)
+        return Symbol(name=name, kind=kind, signature=signature, **span(node))
 
     def process_class(node) -> Symbol:
         name = ""
@@ -87,7 +118,7 @@ def extract_python(tree, source: bytes) -> FileInfo:
                 break
 
         children = visit_class_body(node)
-        return Symbol(name=name, kind='class', children=children)
+        return Symbol(name=name, kind='class', children=children, **span(node))
 
     def visit(node):
         # Imports
@@ -145,7 +176,7 @@ def extract_typescript(tree, source: bytes) -> FileInfo:
             if child.type in ('property_identifier', 'method_definition'):
                  name = get_node_text(child, source)
                  break
-        return Symbol(name=name, kind='method') # Signature extraction is harder in TS due to complexity
+        return Symbol(name=name, kind='method', **span(node)) # Signature extraction is harder in TS due to complexity
 
     def process_class_body(node) -> list[Symbol]:
         members = []
@@ -160,7 +191,7 @@ def extract_typescript(tree, source: bytes) -> FileInfo:
                                 name = get_node_text(part, source)
                                 break
                         if name:
-                            members.append(Symbol(name=name, kind='method'))
+                            members.append(Symbol(name=name, kind='method', **span(subchild)))
         return members
 
     def visit(node):
@@ -181,7 +212,7 @@ def extract_typescript(tree, source: bytes) -> FileInfo:
                             name = get_node_text(subchild, source)
                             break
                     if name:
-                        symbols.append(Symbol(name=name, kind='function'))
+                        symbols.append(Symbol(name=name, kind='function', **span(child)))
 
                 elif child.type == 'class_declaration':
                     name = ""
@@ -191,7 +222,7 @@ def extract_typescript(tree, source: bytes) -> FileInfo:
                             break
                     if name:
                         members = process_class_body(child)
-                        symbols.append(Symbol(name=name, kind='class', children=members))
+                        symbols.append(Symbol(name=name, kind='class', children=members, **span(child)))
 
         # TODO: Handle non-exported top-level items if desired, or `export default`
         
@@ -216,7 +247,7 @@ def extract_go(tree, source: bytes) -> FileInfo:
                 if child.type == 'identifier':
                     name = get_node_text(child, source)
                     if name[0].isupper():
-                        symbols.append(Symbol(name=name, kind='func' if node.type == 'function_declaration' else 'type'))
+                        symbols.append(Symbol(name=name, kind='func' if node.type == 'function_declaration' else 'type', **span(node)))
                     break
         for child in node.children:
             visit(child)
@@ -258,7 +289,7 @@ def extract_rust(tree, source: bytes) -> FileInfo:
                          break
                  if name:
                     kind = node.type.replace('_item', '')
-                    symbols.append(Symbol(name=name, kind=kind))
+                    symbols.append(Symbol(name=name, kind=kind, **span(node)))
 
         for child in node.children:
             visit(child)
@@ -290,7 +321,7 @@ def extract_ruby(tree, source: bytes) -> FileInfo:
             for child in node.children:
                 if child.type in ('identifier', 'constant'):
                     name = get_node_text(child, source)
-                    symbols.append(Symbol(name=name, kind=node.type))
+                    symbols.append(Symbol(name=name, kind=node.type, **span(node)))
                     break
         
         for child in node.children:
@@ -325,7 +356,7 @@ def extract_java(tree, source: bytes) -> FileInfo:
                     if child.type == 'identifier':
                         name = get_node_text(child, source)
                         kind = node.type.replace('_declaration', '')
-                        symbols.append(Symbol(name=name, kind=kind))
+                        symbols.append(Symbol(name=name, kind=kind, **span(node)))
                         break
         
         for child in node.children:
@@ -363,7 +394,7 @@ def extract_html_javascript(tree, source: bytes) -> FileInfo:
                     # This is inline JavaScript code
                     js_code = get_node_text(child, source)
                     if js_code.strip():
-                        script_contents.append(js_code)
+                        script_contents.append((js_code, child.start_point[0]))
 
         for child in node.children:
             script_contents.extend(find_script_elements(child))
@@ -376,8 +407,8 @@ def extract_html_javascript(tree, source: bytes) -> FileInfo:
     # Parse each script block as JavaScript
     if script_contents:
         try:
-            js_parser = get_parser('javascript')
-            for script_code in script_contents:
+            js_parser = get_cached_parser('javascript')
+            for script_code, line_offset in script_contents:
                 js_tree = js_parser.parse(script_code.encode())
 
                 # Extract function declarations
@@ -392,7 +423,7 @@ def extract_html_javascript(tree, source: bytes) -> FileInfo:
                         for child in node.children:
                             if child.type == 'identifier':
                                 func_name = get_js_text(child)
-                                symbols.append(Symbol(name=func_name, kind='function'))
+                                symbols.append(Symbol(name=func_name, kind='function', **span(node, line_offset)))
                                 break
 
                     # Variable declarations with functions: const foo = function() {}
@@ -406,7 +437,7 @@ def extract_html_javascript(tree, source: bytes) -> FileInfo:
                             elif child.type in ('function', 'arrow_function', 'function_expression'):
                                 is_function = True
                         if identifier and is_function:
-                             symbols.append(Symbol(name=identifier, kind='function'))
+                             symbols.append(Symbol(name=identifier, kind='function', **span(node, line_offset)))
 
                     # Import statements
                     elif node.type == 'import_statement':
@@ -439,15 +470,16 @@ EXTRACTORS = {
     'html': extract_html_javascript,
 }
 
-def analyze_file(filepath: Path) -> FileInfo | None:
+def analyze_file(filepath: Path, source: bytes | None = None) -> FileInfo | None:
     """Analyze a single file and return its info."""
     lang = get_language(filepath)
     if not lang:
         return None
     
     try:
-        parser = get_parser(lang)
-        source = filepath.read_bytes()
+        parser = get_cached_parser(lang)
+        if source is None:
+            source = filepath.read_bytes()
         tree = parser.parse(source)
         
         extractor = EXTRACTORS.get(lang)
@@ -481,12 +513,10 @@ def format_symbol(symbol: Symbol, indent: int = 0) -> list[str]:
 
     return lines
 
-def generate_map_for_directory(dirpath: Path, skip_dirs: set[str]) -> str | None:
-    """Generate _MAP.md content for a single directory."""
-    files_info = []
+def list_directory(dirpath: Path, skip_dirs: set[str]) -> tuple[list[Path], list[str]]:
+    """Return the source files and subdirectory names shown in a directory's map."""
+    files = []
     subdirs = []
-    
-    # print(f"Processing directory: {dirpath}", file=sys.stderr)
 
     for entry in sorted(dirpath.iterdir()):
         if entry.name.startswith('.') or entry.name == '_MAP.md':
@@ -494,18 +524,22 @@ def generate_map_for_directory(dirpath: Path, skip_dirs: set[str]) -> str | None
         if entry.is_dir():
             if entry.name not in skip_dirs:
                 subdirs.append(entry.name)
-        elif entry.is_file():
-            # print(f"  Analyzing file: {entry}", file=sys.stderr)
-            info = analyze_file(entry)
-            if info:
-                # print(f"    Found info for {entry.name}: {len(info.symbols)} symbols", file=sys.stderr)
-                files_info.append(info)
-            else:
-                # print(f"    No info for {entry.name}", file=sys.stderr)
-                pass
-    
+        elif entry.is_file() and get_language(entry):
+            files.append(entry)
+
+    return files, subdirs
+
+
+def generate_map_for_directory(dirpath: Path, skip_dirs: set[str]) -> str | None:
+    """Generate _MAP.md content for a single directory."""
+    files, subdirs = list_directory(dirpath, skip_dirs)
+    files_info = [info for info in map(analyze_file, files) if info]
+    return render_map(dirpath, files_info, subdirs)
+
+
+def render_map(dirpath: Path, files_info: list[FileInfo], subdirs: list[str]) -> str | None:
+    """Render _MAP.md content from already analyzed files."""
     if not files_info and not subdirs:
-        # print("    No content for map.", file=sys.stderr)
         return None
     
     # Header with stats
@@ -554,16 +588,140 @@ def generate_map_for_directory(dirpath: Path, skip_dirs: set[str]) -> str | None
     return '\n'.join(lines) + '\n'
 
 
-def generate_maps(root: Path, skip_dirs: set[str], dry_run: bool = False):
-    """Walk directory tree and generate _MAP.md files."""
-    count = 0
+def file_sha256(filepath: Path) -> str:
+    return hashlib.sha256(filepath.read_bytes()).hexdigest()
+
+
+def load_manifest(root: Path, skip_dirs: set[str], require_index: bool = False) -> dict:
+    """Load per-directory file hashes from the last run, or {} if unusable."""
+    try:
+        manifest = json.loads((root / MANIFEST_NAME).read_text())
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('skip') != sorted(skip_dirs):
+        return {}
+    # A run without --index leaves the symbol index behind the manifest
+    if require_index and not manifest.get('index'):
+        return {}
+    return manifest.get('dirs', {})
+
+
+def save_manifest(root: Path, skip_dirs: set[str], dirs: dict, indexed: bool = False):
+    """Atomically write the manifest for the next incremental run."""
+    manifest_path = root / MANIFEST_NAME
+    tmp_path = manifest_path.with_name(f"{MANIFEST_NAME}.{os.getpid()}.tmp")
+    payload = {'version': MANIFEST_VERSION, 'skip': sorted(skip_dirs), 'index': indexed, 'dirs': dirs}
+    try:
+        tmp_path.write_text(json.dumps(payload, separators=(',', ':')))
+        os.replace(tmp_path, manifest_path)
+    except OSError as e:
+        print(f"Warning: could not write {manifest_path}: {e}", file=sys.stderr)
+
+
+def directory_changed(dirpath: Path, files: list[Path], subdirs: list[str], entry: dict | None) -> bool:
+    """Compare a directory against its manifest entry, re-stamping touched but unchanged files."""
+    if entry is None or entry['subdirs'] != subdirs:
+        return True
+    if entry['mapped'] and not (dirpath / '_MAP.md').exists():
+        return True
+
+    recorded = entry['files']
+    if len(recorded) != len(files) or any(f.name not in recorded for f in files):
+        return True
+
+    for f in files:
+        size, mtime_ns, digest = recorded[f.name]
+        try:
+            stat = f.stat()
+            if stat.st_size == size and stat.st_mtime_ns == mtime_ns:
+                continue
+            if stat.st_size != size or file_sha256(f) != digest:
+                return True
+        except OSError:
+            return True
+        recorded[f.name] = [size, stat.st_mtime_ns, digest]
+
+    return False
+
+
+def symbol_rows(info: FileInfo, rel_file: str) -> list[tuple]:
+    """Flatten a file's symbol tree into symbol index rows."""
+    rows = []
+
+    def add(symbol: Symbol, parent: str | None):
+        rows.append((symbol.name, symbol.kind, symbol.signature, rel_file,
+                     symbol.line_start, symbol.line_end, parent))
+        for child in symbol.children:
+            add(child, symbol.name)
+
+    for symbol in info.symbols:
+        add(symbol, None)
+    return rows
+
+
+def analyze_with_stamp(filepath: Path) -> tuple[FileInfo | None, list | None]:
+    """Analyze a file and return its info with the [size, mtime_ns, sha256] manifest stamp."""
+    try:
+        stat = filepath.stat()
+        source = filepath.read_bytes()
+    except OSError:
+        return None, None
+    stamp = [stat.st_size, stat.st_mtime_ns, hashlib.sha256(source).hexdigest()]
+    return analyze_file(filepath, source), stamp
+
+
+def analyze_files(paths: list[Path], jobs: int = 1) -> list[tuple[FileInfo | None, list | None]]:
+    """Analyze files in order, using a process pool when jobs > 1."""
+    if jobs > 1 and len(paths) > 1:
+        chunksize = max(1, len(paths) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            return list(executor.map(analyze_with_stamp, paths, chunksize=chunksize))
+    return [analyze_with_stamp(path) for path in paths]
+
+
+def generate_maps(root: Path, skip_dirs: set[str], dry_run: bool = False,
+                  jobs: int = 1, incremental: bool = True, index_path: Path | None = None):
+    """Walk directory tree and generate _MAP.md files (and index rows) for changed directories."""
+    previous = {}
+    if incremental and (index_path is None or index_path.exists()):
+        previous = load_manifest(root, skip_dirs, require_index=index_path is not None)
+    manifest = {}
+    index_rows = {}
+    pending = []
+    unchanged = 0
     
     for dirpath, dirnames, filenames in os.walk(root):
         # Filter out skip dirs in-place
         dirnames[:] = [d for d in dirnames if d not in skip_dirs and not d.startswith('.')]
         
         path = Path(dirpath)
-        content = generate_map_for_directory(path, skip_dirs)
+        rel = path.relative_to(root).as_posix()
+        files, subdirs = list_directory(path, skip_dirs)
+        entry = previous.get(rel)
+        if not directory_changed(path, files, subdirs, entry):
+            manifest[rel] = entry
+            unchanged += 1
+            continue
+        pending.append((path, rel, files, subdirs))
+
+    all_files = [f for _, _, files, _ in pending for f in files]
+    results = iter(analyze_files(all_files, jobs=jobs))
+    count = 0
+
+    for path, rel, files, subdirs in pending:
+        files_info = []
+        stamps = {}
+        rows = index_rows[rel] = []
+        for f in files:
+            info, stamp = next(results)
+            if info:
+                files_info.append(info)
+                rows.extend(symbol_rows(info, (Path(rel) / f.name).as_posix()))
+            if stamp:
+                stamps[f.name] = stamp
+
+        content = render_map(path, files_info, subdirs)
+        manifest[rel] = {'subdirs': subdirs, 'files': stamps, 'mapped': content is not None}
         
         if content:
             map_path = path / '_MAP.md'
@@ -571,10 +729,21 @@ def generate_maps(root: Path, skip_dirs: set[str], dry_run: bool = False):
                 print(f"Would write: {map_path}")
                 print(content)
                 print("---")
-            else:
+            elif not map_path.exists() or map_path.read_text() != content:
                 map_path.write_text(content)
                 print(f"Wrote: {map_path}")
+            else:
+                continue
             count += 1
+
+    if unchanged:
+        print(f"Skipped {unchanged} unchanged directories")
+    if not dry_run:
+        if index_path is not None:
+            removed = [rel for rel in previous if rel not in manifest]
+            update_index(index_path, index_rows, removed, rebuild=not previous)
+            print(f"Indexed {sum(map(len, index_rows.values()))} symbols in {len(index_rows)} directories: {index_path}")
+        save_manifest(root, skip_dirs, manifest, indexed=index_path is not None)
     
     return count
 
@@ -586,6 +755,10 @@ def main():
     parser.add_argument('--dry-run', '-n', action='store_true', help='Print output without writing files')
     parser.add_argument('--clean', action='store_true', help='Remove all _MAP.md files')
     parser.add_argument('--skip', help='Comma-separated list of additional directories to skip (e.g., "locale,migrations,tests")')
+    parser.add_argument('--jobs', '-j', type=int, default=1, help='Parse files in N worker processes (0 = all CPUs)')
+    parser.add_argument('--force', action='store_true', help=f'Ignore {MANIFEST_NAME} and regenerate every map')
+    parser.add_argument('--index', nargs='?', const=INDEX_NAME, metavar='FILE',
+                        help=f'Also write a SQLite symbol index (default: <path>/{INDEX_NAME}); query it with symbol_index.py')
     args = parser.parse_args()
     
     root = Path(args.path).resolve()
@@ -602,10 +775,18 @@ def main():
                 map_file.unlink()
                 print(f"Removed: {map_file}")
                 count += 1
+        for state_file in (MANIFEST_NAME, INDEX_NAME):
+            if (root / state_file).exists():
+                (root / state_file).unlink()
         print(f"Cleaned {count} _MAP.md files")
         return
     
-    count = generate_maps(root, skip_dirs, dry_run=args.dry_run)
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    index_path = None
+    if args.index:
+        index_path = root / args.index if args.index == INDEX_NAME else Path(args.index).resolve()
+    count = generate_maps(root, skip_dirs, dry_run=args.dry_run, jobs=jobs,
+                          incremental=not args.force, index_path=index_path)
     print(f"\nGenerated {count} _MAP.md files")
 
 
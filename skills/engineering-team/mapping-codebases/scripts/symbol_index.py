@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+symbol_index.py - Query the SQLite symbol index written by `codemap.py --index`.
+Answers exact and prefix lookups ("where is X defined") from a B-tree index on
+symbol names, so queries stay in the millisecond range on million-symbol repos.
+Standard library only; does not need tree-sitter.
+
+Usage:
+    python symbol_index.py AuthHandler                 # Exact name
+    python symbol_index.py Auth --prefix               # Names starting with "Auth"
+    python symbol_index.py validate --prefix --kind method --json
+    python symbol_index.py login --index /repo/.codemap-index.sqlite
+"""
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+# Default index file, written at the root of the mapped tree
+INDEX_NAME = '.codemap-index.sqlite'
+# Bump when the table layout changes
+SCHEMA_VERSION = 1
+
+COLUMNS = ('name', 'kind', 'signature', 'file', 'line_start', 'line_end', 'parent')
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS symbols (
+    name TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    signature TEXT,
+    file TEXT NOT NULL,
+    line_start INTEGER,
+    line_end INTEGER,
+    parent TEXT,
+    dir TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS symbols_name ON symbols(name);
+CREATE INDEX IF NOT EXISTS symbols_dir ON symbols(dir);
+PRAGMA user_version = {SCHEMA_VERSION};
+"""
+
+
+def open_index(index_path: Path, create: bool = False) -> sqlite3.Connection:
+    """Open an index, creating the schema (or resetting an outdated one) when create is set."""
+    if not create and not index_path.exists():
+        raise FileNotFoundError(f"No symbol index at {index_path} (run codemap.py --index first)")
+    conn = sqlite3.connect(index_path)
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    if create and version != SCHEMA_VERSION:
+        conn.executescript('DROP TABLE IF EXISTS symbols;' + SCHEMA)
+    elif version != SCHEMA_VERSION:
+        conn.close()
+        raise ValueError(f"{index_path} has schema {version}, expected {SCHEMA_VERSION}; rebuild it")
+    return conn
+
+
+def update_index(index_path: Path, dirs: dict[str, list[tuple]], removed_dirs: list[str] = (),
+                 rebuild: bool = False):
+    """Replace the rows of the given directories in one transaction.
+
+    dirs maps a directory (relative, posix) to its rows, each a tuple in COLUMNS order.
+    """
+    conn = open_index(index_path, create=True)
+    try:
+        with conn:
+            if rebuild:
+                conn.execute('DELETE FROM symbols')
+            for rel in [*dirs, *removed_dirs]:
+                conn.execute('DELETE FROM symbols WHERE dir = ?', (rel,))
+            conn.executemany(
+                'INSERT INTO symbols VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (row + (rel,) for rel, rows in dirs.items() for row in rows)
+            )
+    finally:
+        conn.close()
+
+
+def lookup(conn: sqlite3.Connection, query: str, prefix: bool = False,
+           kind: str | None = None, limit: int = 50) -> list[dict]:
+    """Return symbols named query (or starting with it), ordered by name and location."""
+    if prefix:
+        # Range scan on the name index; LIKE would bypass it for mixed-case text
+        where, params = 'name >= ? AND name < ?', [query, query + '\U0010ffff']
+    else:
+        where, params = 'name = ?', [query]
+    if kind:
+        where += ' AND kind = ?'
+        params.append(kind)
+
+    sql = (f"SELECT {', '.join(COLUMNS)} FROM symbols WHERE {where} "
+           f"ORDER BY name, file, line_start LIMIT ?")
+    return [dict(zip(COLUMNS, row)) for row in conn.execute(sql, [*params, limit])]
+
+
+def format_match(match: dict) -> str:
+    location = match['file']
+    if match['line_start']:
+        location += f":{match['line_start']}-{match['line_end']}"
+    name = f"{match['parent']}.{match['name']}" if match['parent'] else match['name']
+    sig = match['signature'] or ''
+    return f"{location}  {name}{sig} ({match['kind']})"
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='Look up symbols in a codemap symbol index')
+    parser.add_argument('query', help='Symbol name (or prefix with --prefix)')
+    parser.add_argument('--index', default=INDEX_NAME, help=f'Index file (default: ./{INDEX_NAME})')
+    parser.add_argument('--prefix', '-p', action='store_true', help='Match names starting with query')
+    parser.add_argument('--kind', '-k', help='Only return symbols of this kind (e.g., class, method, function)')
+    parser.add_argument('--limit', type=int, default=50, help='Maximum results (default: 50)')
+    parser.add_argument('--json', action='store_true', help='Print matches as JSON lines')
+    args = parser.parse_args()
+
+    try:
+        conn = open_index(Path(args.index))
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        matches = lookup(conn, args.query, prefix=args.prefix, kind=args.kind, limit=args.limit)
+    finally:
+        conn.close()
+
+    for match in matches:
+        print(json.dumps(match) if args.json else format_match(match))
+    if not matches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
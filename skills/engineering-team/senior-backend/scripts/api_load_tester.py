@@ -5,6 +5,15 @@ HTTP load generation tool for performance benchmarking and capacity planning.
 
 Features:
 - Concurrent request handling with configurable user count
+- Open-loop mode: asyncio engine with keep-alive connections that holds a
+  target request rate (with ramp stages) and measures latency from each
+  request's intended start, so a slow server cannot hide its queueing delay
+  (coordinated omission)
+- Scenario files: weighted endpoints and multi-step flows with templated
+  paths, headers and payloads, think times and per-step assertions
+- Distributed runs: a coordinator splits the schedule over forked worker
+  processes and/or worker agents on other hosts (--serve) and merges their
+  interval histograms live
 - Latency percentiles (P50, P95, P99)
 - Throughput measurement (RPS, KB/s)
 - Multiple HTTP methods (GET, POST, PUT, DELETE)
@@ -15,19 +24,33 @@ Standard library only - no external dependencies required.
 """
 
 import argparse
+import asyncio
+import bisect
+import hmac
+import itertools
 import json
 import logging
+import math
+import multiprocessing
+import os
+import queue
+import random
+import re
+import socket
 import ssl
-import statistics
+import string
 import sys
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
+import uuid
+from array import array
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +59,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+__version__ = "1.2.0"
+
+WORKER_START_DELAY = 2.0  # Seconds between handing out worker jobs and their common start
+ARRIVAL_TOLERANCE = 1e-9  # Relative slack on cumulative arrival counts, absorbing float rounding
+TEMPLATE_PATTERN = re.compile(r'\{\{\s*(.*?)\s*\}\}')
+ENV_TEMPLATE_PATTERN = re.compile(r'\{\{\s*env\s+(\S+)\s*\}\}')
+TOKEN_ENV_VAR = 'LOAD_TEST_TOKEN'  # Shared secret between --remote coordinators and --serve agents
+
 
 @dataclass
 class RequestResult:
@@ -65,6 +96,640 @@ class LoadTestMetrics:
     error_rate_percent: float
     status_code_distribution: Dict[int, int] = field(default_factory=dict)
     error_distribution: Dict[str, int] = field(default_factory=dict)
+    # Open-loop runs only: response times above are measured from the intended start
+    target_requests_per_second: float = 0.0
+    p99_service_time_ms: float = 0.0
+    p999_response_time_ms: float = 0.0
+    # Scenario runs only: label -> requests, failed, p50_ms, p95_ms, p99_ms
+    step_stats: Dict[str, Dict[str, float]] = field(default_factory=dict)
+
+
+@dataclass
+class LoadStage:
+    """Open-loop stage: ramp linearly from the previous stage's rate to target_rps over duration_seconds"""
+    duration_seconds: float
+    target_rps: float
+
+
+def parse_duration(value: str) -> float:
+    """Seconds from '90', '90s', '500ms', '5m' or '1h'"""
+    units = {'s': 1, 'm': 60, 'h': 3600}
+    value = value.strip().lower()
+    if value.endswith('ms'):
+        return float(value[:-2]) / 1000
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def parse_stages(spec: str) -> List[LoadStage]:
+    """Parse 'duration:rps,...', e.g. '30s:100,2m:1000,30s:0'"""
+    stages = []
+    for part in spec.split(','):
+        duration, sep, rate = part.strip().partition(':')
+        if not sep:
+            raise ValueError(f"Invalid stage '{part}': expected duration:rps")
+        stage = LoadStage(parse_duration(duration), float(rate))
+        if stage.duration_seconds <= 0 or stage.target_rps < 0:
+            raise ValueError(f"Invalid stage '{part}': duration must be positive and rate non-negative")
+        stages.append(stage)
+    return stages
+
+
+def arrival_offsets(stages: List[LoadStage], start_rps: float = 0.0, phase: float = 0.0) -> Iterator[float]:
+    """Intended send times (seconds from start) for a piecewise-linear request rate.
+
+    Arrivals fall where the cumulative count reaches k + phase. Worker i of n
+    running 1/n of the rate with phase i/n interleaves with the others into
+    exactly the single-process schedule. Counts are compared with a relative
+    tolerance, so an arrival landing on a stage boundary in exact arithmetic is
+    counted the same way whether or not the rate was divided.
+    """
+    elapsed, sent, rate = 0.0, 0.0, start_rps  # sent: cumulative arrivals at stage start
+    next_arrival = phase
+    for stage in stages:
+        duration, target = stage.duration_seconds, stage.target_rps
+        slope = (target - rate) / duration
+        stage_total = rate * duration + slope * duration * duration / 2
+        limit = (sent + stage_total) * (1 - ARRIVAL_TOLERANCE)
+        # Arrival k happens when rate*t + slope*t^2/2 == k - sent; this form is stable for slope == 0
+        while next_arrival < limit:
+            x = next_arrival - sent
+            t = 2 * x / (rate + math.sqrt(max(rate * rate + 2 * slope * x, 0.0))) if x > 0 else 0.0
+            yield elapsed + t
+            next_arrival += 1
+        elapsed += duration
+        sent += stage_total
+        rate = target
+
+
+def scheduled_requests(stages: List[LoadStage], start_rps: float = 0.0, phase: float = 0.0) -> int:
+    """Number of arrivals arrival_offsets() yields for the same stages"""
+    total, rate = 0.0, start_rps
+    for stage in stages:
+        total += (rate + stage.target_rps) / 2 * stage.duration_seconds
+        rate = stage.target_rps
+    return max(0, math.ceil(total * (1 - ARRIVAL_TOLERANCE) - phase))
+
+
+class KeepAliveConnection:
+    """Minimal HTTP/1.1 client connection that is reused across requests"""
+
+    def __init__(self, host: str, port: int, ssl_context: Optional[ssl.SSLContext]):
+        self.host = host
+        self.port = port
+        self.ssl_context = ssl_context
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def _connect(self):
+        self.reader, self.writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl_context, server_hostname=self.host if self.ssl_context else None)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+    async def request(self, data: bytes, head_only: bool = False) -> Tuple[int, bytes]:
+        """Send a prebuilt request and read the response; returns (status, body)"""
+        reused = self.writer is not None
+        if not reused:
+            await self._connect()
+        try:
+            self.writer.write(data)
+            return await self._read_response(head_only)
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            self.close()
+            # The server may drop an idle keep-alive connection: retry once on a fresh one
+            if not reused or (isinstance(e, asyncio.IncompleteReadError) and e.partial):
+                raise
+            await self._connect()
+            self.writer.write(data)
+            return await self._read_response(head_only)
+
+    async def _read_response(self, head_only: bool) -> Tuple[int, bytes]:
+        reader = self.reader
+        status = 100
+        while 100 <= status < 200:  # Skip interim responses
+            head = await reader.readuntil(b'\r\n\r\n')
+            status_line, _, header_block = head.partition(b'\r\n')
+            version, status = status_line[:8], int(status_line.split(b' ', 2)[1])
+        length, chunked, keep_alive = None, False, version == b'HTTP/1.1'
+        for line in header_block.split(b'\r\n'):
+            name, _, value = line.partition(b':')
+            name = name.strip().lower()
+            if name == b'content-length':
+                length = int(value)
+            elif name == b'transfer-encoding':
+                chunked = b'chunked' in value.lower()
+            elif name == b'connection':
+                value = value.lower()
+                keep_alive = b'keep-alive' in value or (keep_alive and b'close' not in value)
+
+        body = b''
+        if head_only or status in (204, 304):
+            pass
+        elif chunked:
+            chunks = []
+            while True:
+                chunk_size = int((await reader.readuntil(b'\r\n')).split(b';', 1)[0], 16)
+                if chunk_size == 0:
+                    while await reader.readuntil(b'\r\n') != b'\r\n':  # Trailers
+                        pass
+                    break
+                chunks.append((await reader.readexactly(chunk_size + 2))[:-2])
+            body = b''.join(chunks)
+        elif length is not None:
+            body = await reader.readexactly(length)
+        else:
+            body = await reader.read()
+            keep_alive = False
+
+        if not keep_alive:
+            self.close()
+        return status, body
+
+
+def build_request(method: str, netloc: str, path: str, headers: Dict[str, str], body: bytes) -> bytes:
+    """Serialize a keep-alive HTTP/1.1 request; headers override the defaults case-insensitively"""
+    defaults = {'Host': netloc, 'User-Agent': 'APILoadTester/1.0', 'Accept': '*/*', 'Connection': 'keep-alive'}
+    if body or method in ('POST', 'PUT', 'PATCH'):
+        defaults['Content-Length'] = str(len(body))
+    if body:
+        defaults['Content-Type'] = 'application/json'
+    overrides = {name.lower() for name in headers}
+    merged = {name: value for name, value in defaults.items() if name.lower() not in overrides}
+    merged.update(headers)
+    head = f"{method} {path} HTTP/1.1\r\n" + "".join(f"{k}: {v}\r\n" for k, v in merged.items()) + "\r\n"
+    return head.encode('latin-1') + body
+
+
+Template = Union[str, Callable[[Dict], str]]
+
+
+def _template_function(expression: str, variables: Dict[str, str]) -> Template:
+    """Compile one {{...}} expression; variables and env lookups resolve once, here"""
+    name, *params = expression.split()
+    if name in variables and not params:
+        return str(variables[name])
+    if name == 'env' and len(params) == 1:
+        return os.environ.get(params[0], '')
+    if name in ('seq', 'worker') and not params:
+        return lambda context: str(context[name])
+    if name == 'uuid' and not params:
+        return lambda context: str(uuid.uuid4())
+    if name == 'timestamp' and not params:
+        return lambda context: str(int(time.time()))
+    if name == 'randint' and len(params) == 2:
+        low, high = int(params[0]), int(params[1])
+        return lambda context: str(random.randint(low, high))
+    if name == 'choice' and params:
+        return lambda context: random.choice(params)
+    if name == 'random_string' and len(params) == 1:
+        length, alphabet = int(params[0]), string.ascii_letters + string.digits
+        return lambda context: ''.join(random.choices(alphabet, k=length))
+    raise ValueError(f"Unknown template expression '{{{{{expression}}}}}'")
+
+
+def compile_template(text: str, variables: Dict[str, str]) -> Template:
+    """Split text into literals and {{...}} functions; plain str when nothing varies per request"""
+    parts: List[Template] = []
+    pos = 0
+    for match in TEMPLATE_PATTERN.finditer(text):
+        parts.extend([text[pos:match.start()], _template_function(match.group(1), variables)])
+        pos = match.end()
+    parts.append(text[pos:])
+    merged: List[Template] = []
+    for part in parts:
+        if isinstance(part, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += part
+        else:
+            merged.append(part)
+    if len(merged) == 1 and isinstance(merged[0], str):
+        return merged[0]
+    return lambda context: ''.join(part if isinstance(part, str) else part(context) for part in merged)
+
+
+def _render(template: Template, context: Dict) -> str:
+    return template if isinstance(template, str) else template(context)
+
+
+def parse_think_time(value) -> Tuple[float, float]:
+    """(min, max) seconds from 2, '500ms' or [1, '3s']; the pause is drawn uniformly between them"""
+    if value is None:
+        return 0.0, 0.0
+    if isinstance(value, (list, tuple)):
+        if len(value) != 2:
+            raise ValueError(f"Invalid think_time {value!r}: expected [min, max]")
+        low, high = (parse_duration(str(v)) for v in value)
+    else:
+        low = high = parse_duration(str(value))
+    if low < 0 or high < low:
+        raise ValueError(f"Invalid think_time {value!r}")
+    return low, high
+
+
+class ScenarioStep:
+    """One request in a scenario flow, with its think time and assertions.
+
+    Path, header values and body may contain {{...}} templates. Steps without
+    any are serialized once and send the same bytes every time.
+    """
+
+    def __init__(self, label: str, method: str, netloc: str, path: str, headers: Dict[str, str],
+                 body: Optional[str] = None, think_time: Tuple[float, float] = (0.0, 0.0),
+                 assertions: Optional[Dict] = None, variables: Optional[Dict[str, str]] = None):
+        assertions = assertions or {}
+        unknown = set(assertions) - {'status', 'max_ms', 'body_contains'}
+        if unknown:
+            raise ValueError(f"{label}: unknown assertions {', '.join(sorted(unknown))}")
+        self.label = label
+        self.method = method.upper()
+        self.head_only = self.method == 'HEAD'
+        self.netloc = netloc
+        self.think_time = think_time
+        status = assertions.get('status')
+        self.expect_status = None if status is None else ([int(status)] if isinstance(status, (int, str)) else
+                                                          [int(code) for code in status])
+        self.max_ms = assertions.get('max_ms')
+        contains = assertions.get('body_contains')
+        self.body_contains = contains.encode('utf-8') if contains is not None else None
+
+        if variables is None:  # Literal request: no templating
+            self.path, self.headers, self.body = path, dict(headers), body
+        else:
+            self.path = compile_template(path, variables)
+            self.headers = {name: compile_template(str(value), variables) for name, value in headers.items()}
+            self.body = compile_template(body, variables) if body is not None else None
+        self.static_request: Optional[bytes] = None
+        if all(t is None or isinstance(t, str) for t in [self.path, self.body, *self.headers.values()]):
+            self.static_request = self.render({})
+
+    def render(self, context: Dict) -> bytes:
+        """Request bytes for one iteration"""
+        if self.static_request is not None:
+            return self.static_request
+        body = _render(self.body, context).encode('utf-8') if self.body is not None else b''
+        headers = {name: _render(value, context) for name, value in self.headers.items()}
+        return build_request(self.method, self.netloc, _render(self.path, context), headers, body)
+
+    def check(self, status: int, body: bytes, service_ms: float) -> Optional[str]:
+        """Error message for a failed response, or None"""
+        if self.expect_status is None:
+            if status >= 400:
+                return f"HTTP {status}"
+        elif status not in self.expect_status:
+            return f"Assertion failed: {self.label}: status {status}"
+        if self.max_ms is not None and service_ms > self.max_ms:
+            return f"Assertion failed: {self.label}: slower than {self.max_ms:g}ms"
+        if self.body_contains is not None and self.body_contains not in body:
+            return f"Assertion failed: {self.label}: body missing {self.body_contains.decode('utf-8')!r}"
+        return None
+
+
+@dataclass
+class ScenarioFlow:
+    """Weighted sequence of steps run back to back on one connection per arrival"""
+    name: str
+    weight: float
+    steps: List[ScenarioStep]
+
+
+class Scenario:
+    """Weighted mix of flows against one base URL.
+
+    Scenario file (JSON):
+        {"base_url": "http://gateway:8080/api",
+         "headers": {"Authorization": "Bearer {{env API_TOKEN}}"},
+         "variables": {"tenant": "acme"},
+         "endpoints": [
+           {"name": "list", "weight": 70, "path": "/users?page={{randint 1 50}}",
+            "assert": {"status": 200, "max_ms": 250}},
+           {"name": "checkout", "weight": 30, "steps": [
+             {"name": "cart", "method": "POST", "path": "/cart",
+              "body": {"sku": "{{choice A1 B2}}", "qty": 1}, "think_time": [0.5, 2]},
+             {"name": "pay", "method": "POST", "path": "/cart/pay", "assert": {"status": [200, 202]}}]}]}
+
+    Each arrival picks one endpoint by weight and runs its steps in order.
+    """
+
+    def __init__(self, base_url: str, flows: List[ScenarioFlow]):
+        if not flows:
+            raise ValueError("Scenario has no endpoints")
+        self.base_url = base_url
+        self.flows = flows
+        self._cumulative = list(itertools.accumulate(flow.weight for flow in flows))
+
+    def pick(self) -> ScenarioFlow:
+        if len(self.flows) == 1:
+            return self.flows[0]
+        return self.flows[bisect.bisect_right(self._cumulative, random.random() * self._cumulative[-1])]
+
+    @staticmethod
+    def _split_url(url: str) -> Tuple[str, str]:
+        parsed = urllib.parse.urlparse(url)
+        if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+            raise ValueError(f"Invalid base URL '{url}': only http and https are allowed")
+        return parsed.netloc, parsed.path.rstrip('/')
+
+    @classmethod
+    def single(cls, url: str, method: str, headers: Dict[str, str], payload: Optional[str]) -> 'Scenario':
+        """One literal request, as given on the command line"""
+        parsed = urllib.parse.urlparse(url)
+        path = (parsed.path or '/') + (f"?{parsed.query}" if parsed.query else '')
+        step = ScenarioStep(f"{method} {path}", method, parsed.netloc, path, headers, payload)
+        return cls(url, [ScenarioFlow(step.label, 1.0, [step])])
+
+    @classmethod
+    def from_dict(cls, data: Dict, base_url: Optional[str] = None,
+                  headers: Optional[Dict[str, str]] = None) -> 'Scenario':
+        """Build from a parsed scenario file; base_url and headers from the command line take precedence"""
+        base_url = base_url or data.get('base_url')
+        if not base_url:
+            raise ValueError("Scenario needs a base_url (or pass the URL argument)")
+        netloc, base_path = cls._split_url(base_url)
+        variables = {name: str(value) for name, value in data.get('variables', {}).items()}
+        common = {**data.get('headers', {}), **(headers or {})}
+
+        flows = []
+        for n, endpoint in enumerate(data.get('endpoints', []), 1):
+            name = endpoint.get('name', f"endpoint {n}")
+            weight = float(endpoint.get('weight', 1))
+            if weight <= 0:
+                raise ValueError(f"{name}: weight must be positive")
+            specs = endpoint.get('steps', [endpoint])
+            steps = []
+            for m, spec in enumerate(specs, 1):
+                path = spec.get('path')
+                if not path or not path.startswith('/'):
+                    raise ValueError(f"{name}: each step needs a path starting with '/'")
+                method = spec.get('method', 'GET').upper()
+                label = name if len(specs) == 1 else f"{name}: {spec.get('name', f'step {m}')}"
+                body = spec.get('body')
+                if body is not None and not isinstance(body, str):
+                    body = json.dumps(body)
+                steps.append(ScenarioStep(label, method, netloc, base_path + path, {**common, **spec.get('headers', {})},
+                                          body, parse_think_time(spec.get('think_time')), spec.get('assert'), variables))
+            flows.append(ScenarioFlow(name, weight, steps))
+        return cls(base_url, flows)
+
+
+def read_scenario_file(filepath: str) -> Dict:
+    """Parsed scenario file; Scenario.from_dict() validates it. Workers receive this dict, not the Scenario"""
+    with open(filepath, 'r') as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{filepath}: expected a JSON object")
+    return data
+
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of latencies, recorded in microseconds.
+
+    Values fall into power-of-two buckets, each split into 1024 linear
+    sub-buckets, so every value is reported to within 0.1% (three significant
+    digits) and memory stays fixed (about 190 KB up to one hour) however many
+    values are recorded. Recording only increments one counter; count, mean,
+    min and max are derived from the counters when read. Histograms with the
+    same range merge by adding counters.
+    """
+
+    SUB_BUCKET_BITS = 11  # 2048 sub-buckets in the first bucket, 1024 in the rest; record() inlines these
+    DEFAULT_HIGHEST_US = 3_600_000_000
+
+    def __init__(self, highest_us: int = DEFAULT_HIGHEST_US):
+        self.highest_us = highest_us
+        self._length = (max(highest_us.bit_length(), self.SUB_BUCKET_BITS) - self.SUB_BUCKET_BITS + 2) << 10
+        self.counts = array('q', bytes(8 * self._length))
+
+    def record(self, value_ms: float):
+        """Record one latency; values above the range are clamped to it"""
+        value_us = int(value_ms * 1000 + 0.5)
+        if value_us > self.highest_us:
+            value_us = self.highest_us
+        elif value_us < 0:
+            value_us = 0
+        bucket = (value_us | 2047).bit_length() - 11
+        self.counts[(bucket << 10) + (value_us >> bucket)] += 1
+
+    @staticmethod
+    def _value_range(index: int) -> Tuple[int, int]:
+        """Lowest and highest microsecond values counted at index"""
+        bucket = max((index >> 10) - 1, 0)
+        lowest = (index - (bucket << 10)) << bucket
+        return lowest, lowest + (1 << bucket) - 1
+
+    def _nonzero(self) -> List[Tuple[int, int]]:
+        return [(i, c) for i, c in enumerate(self.counts) if c]
+
+    @property
+    def total_count(self) -> int:
+        return sum(self.counts)
+
+    def add(self, other: 'LatencyHistogram'):
+        """Merge another histogram's counters into this one"""
+        if other._length != self._length:
+            raise ValueError("Cannot merge histograms with different ranges")
+        counts = self.counts
+        for i, c in other._nonzero():
+            counts[i] += c
+
+    def percentiles(self, *percents: float) -> List[float]:
+        """Latency in ms at each percentile: the highest value equivalent to its bucket"""
+        nonzero = self._nonzero()
+        total = sum(c for _, c in nonzero)
+        if not total:
+            return [0.0] * len(percents)
+        targets = sorted((max(1, math.ceil(p / 100 * total)), n) for n, p in enumerate(percents))
+        results = [0.0] * len(percents)
+        seen, t = 0, 0
+        for i, c in nonzero:
+            seen += c
+            while t < len(targets) and seen >= targets[t][0]:
+                results[targets[t][1]] = min(self._value_range(i)[1], self.highest_us) / 1000
+                t += 1
+        return results
+
+    def summary(self) -> Dict[str, float]:
+        """count, min_ms, max_ms and mean_ms (bucket midpoints) in one pass"""
+        nonzero = self._nonzero()
+        if not nonzero:
+            return {"count": 0, "min_ms": 0.0, "max_ms": 0.0, "mean_ms": 0.0}
+        count = weighted = 0
+        for i, c in nonzero:
+            lowest, highest = self._value_range(i)
+            count += c
+            weighted += c * (lowest + highest) / 2
+        return {"count": count, "min_ms": self._value_range(nonzero[0][0])[0] / 1000,
+                "max_ms": min(self._value_range(nonzero[-1][0])[1], self.highest_us) / 1000,
+                "mean_ms": weighted / count / 1000}
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form with only non-empty counters"""
+        return {"highest_us": self.highest_us, "counts": self._nonzero()}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LatencyHistogram':
+        histogram = cls(data["highest_us"])
+        for i, c in data["counts"]:
+            histogram.counts[i] = c
+        return histogram
+
+
+class RunRecorder:
+    """Request outcomes for a run: latency histograms, counters and interval snapshots.
+
+    Requests are recorded into the current interval; close_interval() hands
+    the interval's histogram back and folds it into the run totals. Scenario
+    runs also keep per-step counts and latencies. Thread-safe, and recorders
+    from separate worker processes merge through to_dict()/merge().
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._interval = LatencyHistogram()
+        self._interval_failed = 0
+        self._last_snapshot = 0.0
+        self.latency = LatencyHistogram()
+        self.service = LatencyHistogram()  # Send to response; open-loop runs only
+        self.failed = 0
+        self.total_bytes = 0
+        self.status_codes: Dict[int, int] = {}
+        self.errors: Dict[str, int] = {}
+        self.steps: Dict[str, List] = {}  # label -> [requests, failed, LatencyHistogram]
+
+    def record(self, latency_ms: float, status: int, size: int, error: Optional[str] = None,
+               service_ms: Optional[float] = None, step: Optional[str] = None):
+        with self._lock:
+            self._interval.record(latency_ms)
+            if service_ms is not None:
+                self.service.record(service_ms)
+            self.status_codes[status] = self.status_codes.get(status, 0) + 1
+            self.total_bytes += size
+            if error:
+                self._interval_failed += 1
+                self.errors[error] = self.errors.get(error, 0) + 1
+            if step is not None:
+                stats = self.steps.get(step) or self.steps.setdefault(step, [0, 0, LatencyHistogram()])
+                stats[0] += 1
+                stats[1] += bool(error)
+                stats[2].record(latency_ms)
+
+    def close_interval(self, elapsed: float) -> Tuple[LatencyHistogram, int, float]:
+        """Fold the interval ending at elapsed seconds into the run; returns (histogram, failed, span)"""
+        with self._lock:
+            interval, failed = self._interval, self._interval_failed
+            self._interval, self._interval_failed = LatencyHistogram(), 0
+            self.latency.add(interval)
+            self.failed += failed
+            span, self._last_snapshot = elapsed - self._last_snapshot, elapsed
+        return interval, failed, span
+
+    def merge(self, other: 'RunRecorder'):
+        """Add another recorder's run totals (after its final snapshot)"""
+        with self._lock:
+            self.latency.add(other.latency)
+            self.service.add(other.service)
+            self.failed += other.failed
+            self.total_bytes += other.total_bytes
+            for code, count in other.status_codes.items():
+                self.status_codes[code] = self.status_codes.get(code, 0) + count
+            for error, count in other.errors.items():
+                self.errors[error] = self.errors.get(error, 0) + count
+            for step, (requests, failed, histogram) in other.steps.items():
+                stats = self.steps.setdefault(step, [0, 0, LatencyHistogram()])
+                stats[0] += requests
+                stats[1] += failed
+                stats[2].add(histogram)
+
+    def to_dict(self) -> Dict:
+        return {"latency": self.latency.to_dict(), "service": self.service.to_dict(), "failed": self.failed,
+                "total_bytes": self.total_bytes, "status_codes": self.status_codes, "errors": self.errors,
+                "steps": {step: {"requests": requests, "failed": failed, "latency": histogram.to_dict()}
+                          for step, (requests, failed, histogram) in self.steps.items()}}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'RunRecorder':
+        recorder = cls()
+        recorder.latency = LatencyHistogram.from_dict(data["latency"])
+        recorder.service = LatencyHistogram.from_dict(data["service"])
+        recorder.failed, recorder.total_bytes = data["failed"], data["total_bytes"]
+        recorder.status_codes = {int(code): count for code, count in data["status_codes"].items()}
+        recorder.errors = dict(data["errors"])
+        recorder.steps = {step: [stats["requests"], stats["failed"], LatencyHistogram.from_dict(stats["latency"])]
+                          for step, stats in data.get("steps", {}).items()}
+        return recorder
+
+    def metrics(self, total_time: float, target_rps: float = 0.0) -> LoadTestMetrics:
+        """Run totals as LoadTestMetrics"""
+        summary = self.latency.summary()
+        count = summary["count"]
+        if not count:
+            return LoadTestMetrics(0, 0, 0, total_time, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        p50, p95, p99, p999 = self.latency.percentiles(50, 95, 99, 99.9)
+        steps = {}
+        for step, (requests, failed, histogram) in self.steps.items():
+            step_p50, step_p95, step_p99 = histogram.percentiles(50, 95, 99)
+            steps[step] = {"requests": requests, "failed": failed, "p50_ms": step_p50, "p95_ms": step_p95,
+                           "p99_ms": step_p99}
+        return LoadTestMetrics(
+            total_requests=count, successful_requests=count - self.failed, failed_requests=self.failed,
+            total_time_seconds=total_time, min_response_time_ms=summary["min_ms"], max_response_time_ms=summary["max_ms"],
+            avg_response_time_ms=summary["mean_ms"], median_response_time_ms=p50,
+            p95_response_time_ms=p95, p99_response_time_ms=p99,
+            requests_per_second=count / total_time if total_time > 0 else 0,
+            throughput_bytes_per_second=self.total_bytes / total_time if total_time > 0 else 0,
+            error_rate_percent=self.failed / count * 100,
+            status_code_distribution=dict(self.status_codes), error_distribution=dict(self.errors),
+            p999_response_time_ms=p999, target_requests_per_second=target_rps,
+            p99_service_time_ms=self.service.percentiles(99)[0], step_stats=steps
+        )
+
+
+def describe_interval(elapsed: float, histogram: LatencyHistogram, failed: int, span: float) -> Dict:
+    """Snapshot line for one closed interval"""
+    p50, p99, p999 = histogram.percentiles(50, 99, 99.9)
+    summary = histogram.summary()
+    count = summary["count"]
+    return {"elapsed_s": round(elapsed, 3), "requests": count, "rps": round(count / span, 1) if span > 0 else 0.0,
+            "errors": failed, "error_rate_percent": round(failed / count * 100, 2) if count else 0.0,
+            "p50_ms": p50, "p99_ms": p99, "p999_ms": p999, "max_ms": summary["max_ms"]}
+
+
+class SnapshotWriter:
+    """Print interval snapshots as they happen and/or append them to a JSONL file"""
+
+    def __init__(self, live: bool = False, path: Optional[str] = None):
+        self.live = live
+        self.file = open(path, 'a') if path else None
+
+    def write_interval(self, elapsed: float, histogram: LatencyHistogram, failed: int, span: float):
+        self.write(describe_interval(elapsed, histogram, failed, span))
+
+    def write(self, snapshot: Dict):
+        if self.live:
+            print(f"[{snapshot['elapsed_s']:7.1f}s] rps={snapshot['rps']:>8.1f}  err={snapshot['error_rate_percent']:5.2f}%  "
+                  f"p50={snapshot['p50_ms']:.2f}ms  p99={snapshot['p99_ms']:.2f}ms  p99.9={snapshot['p999_ms']:.2f}ms  "
+                  f"max={snapshot['max_ms']:.2f}ms", flush=True)
+        if self.file:
+            self.file.write(json.dumps(snapshot) + "\n")
+            self.file.flush()
+
+    def close(self):
+        if self.file:
+            self.file.close()
+
+
+class WorkerChannel:
+    """Snapshot sink for a distributed worker: forwards raw interval histograms to the coordinator"""
+
+    def __init__(self, send: Callable[[Dict], None]):
+        self.send = send
+
+    def write_interval(self, elapsed: float, histogram: LatencyHistogram, failed: int, span: float):
+        self.send({"type": "interval", "elapsed": elapsed, "histogram": histogram.to_dict(), "failed": failed,
+                   "span": span})
 
 
 class APILoadTester:
@@ -72,7 +737,11 @@ class APILoadTester:
 
     def __init__(self, url: str, concurrent_users: int = 10, total_requests: int = 100,
                  method: str = "GET", headers: Optional[Dict[str, str]] = None,
-                 payload: Optional[str] = None, timeout: int = 30, verbose: bool = False):
+                 payload: Optional[str] = None, timeout: int = 30, verbose: bool = False,
+                 stages: Optional[List[LoadStage]] = None, start_rps: float = 0.0, connections: int = 100,
+                 snapshots: Optional[Union[SnapshotWriter, WorkerChannel]] = None, interval: float = 1.0,
+                 scenario: Optional[Scenario] = None, worker_index: int = 0, worker_count: int = 1,
+                 start_at: Optional[float] = None):
         if verbose:
             logging.getLogger().setLevel(logging.DEBUG)
         logger.debug("APILoadTester initialized")
@@ -88,7 +757,16 @@ class APILoadTester:
         self.payload = payload
         self.timeout = timeout
         self.verbose = verbose
-        self.results: List[RequestResult] = []
+        self.stages = stages or []
+        self.start_rps = start_rps
+        self.connections = max(1, connections)
+        self.snapshots = snapshots
+        self.interval = interval
+        self.scenario = scenario
+        self.worker_index = worker_index  # Distributed runs: this worker's share of the schedule
+        self.worker_count = worker_count
+        self.start_at = start_at  # Wall-clock time the schedule starts at, shared by all workers
+        self.recorder = RunRecorder()
         self._ssl_context = ssl.create_default_context()
         self._ssl_context.check_hostname = False
         self._ssl_context.verify_mode = ssl.CERT_NONE
@@ -119,19 +797,23 @@ class APILoadTester:
             logger.error(f"Request exception: {str(e)}")
             return RequestResult(False, 0, (time.perf_counter() - start_time) * 1000, 0, str(e))
 
-    def _worker(self, request_count: int) -> List[RequestResult]:
+    def _worker(self, request_count: int):
         """Worker function to execute multiple requests"""
-        results = []
         for _ in range(request_count):
             result = self._make_request()
-            results.append(result)
+            self.recorder.record(result.response_time_ms, result.status_code, result.response_size_bytes,
+                                 None if result.success else (result.error_message or "Request failed"))
             if self.verbose:
                 status = "OK" if result.success else "FAIL"
                 print(f"  [{status}] {result.response_time_ms:.2f}ms - {result.status_code}")
-        return results
 
     def run(self) -> LoadTestMetrics:
-        """Execute the load test and return metrics"""
+        """Execute the load test and return metrics (open loop when stages are set)"""
+        if self.stages:
+            return asyncio.run(self._run_open_loop())
+        if self.scenario:
+            raise ValueError("Scenarios run in open-loop mode: set a rate or stages")
+
         logger.debug(f"Starting load test: {self.url} with {self.concurrent_users} users, {self.total_requests} requests")
         if self.verbose:
             print(f"Starting load test: {self.url}")
@@ -142,63 +824,132 @@ class APILoadTester:
         work_distribution = [requests_per_worker + (1 if i < extra_requests else 0) for i in range(self.concurrent_users)]
 
         start_time = time.perf_counter()
-        all_results = []
-        with ThreadPoolExecutor(max_workers=self.concurrent_users) as executor:
-            futures = [executor.submit(self._worker, count) for count in work_distribution]
-            for future in as_completed(futures):
-                all_results.extend(future.result())
-
-        self.results = all_results
-        return self._calculate_metrics(time.perf_counter() - start_time)
-
-    def _calculate_metrics(self, total_time: float) -> LoadTestMetrics:
-        """Calculate aggregated metrics from results"""
-        logger.debug("Calculating load test metrics")
-        if not self.results:
-            logger.warning("No results to calculate metrics from")
-            return LoadTestMetrics(0, 0, 0, total_time, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        finished = threading.Event()
 
-        successful = [r for r in self.results if r.success]
-        failed = [r for r in self.results if not r.success]
-        response_times = sorted([r.response_time_ms for r in self.results])
+        def report():
+            ticks = 1
+            while not finished.wait(start_time + ticks * self.interval - time.perf_counter()):
+                self.snapshots.write_interval(ticks * self.interval, *self.recorder.close_interval(ticks * self.interval))
+                ticks += 1
 
-        def percentile(data: List[float], p: float) -> float:
-            if not data:
-                return 0.0
-            k = (len(data) - 1) * (p / 100)
-            f, c = int(k), min(int(k) + 1, len(data) - 1)
-            return data[f] + (k - f) * (data[c] - data[f])
+        reporter = threading.Thread(target=report, daemon=True) if self.snapshots else None
+        if reporter:
+            reporter.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.concurrent_users) as executor:
+                futures = [executor.submit(self._worker, count) for count in work_distribution]
+                for future in as_completed(futures):
+                    future.result()
+        finally:
+            finished.set()
+            if reporter:
+                reporter.join()
+        return self._finish(time.perf_counter() - start_time)
 
-        status_codes: Dict[int, int] = {}
-        for r in self.results:
-            status_codes[r.status_code] = status_codes.get(r.status_code, 0) + 1
+    def _finish(self, total_time: float, target_rps: float = 0.0) -> LoadTestMetrics:
+        """Close the last interval and build run metrics"""
+        histogram, failed, span = self.recorder.close_interval(total_time)
+        if self.snapshots and histogram.total_count:
+            self.snapshots.write_interval(total_time, histogram, failed, span)
+        return self.recorder.metrics(total_time, target_rps)
 
-        errors: Dict[str, int] = {}
-        for r in failed:
-            if r.error_message:
-                errors[r.error_message] = errors.get(r.error_message, 0) + 1
+    async def _run_open_loop(self) -> LoadTestMetrics:
+        """Send requests on the stage schedule over a pool of keep-alive connections.
 
-        total_bytes = sum(r.response_size_bytes for r in self.results)
+        Each free connection takes the next intended send time from the shared
+        schedule, so when the server falls behind, requests queue on the client
+        and the wait counts toward their latency instead of lowering the rate.
+        With a scenario, each arrival runs one weighted flow: its first step is
+        timed from the intended start, later steps from their own send, and
+        think times hold the connection without counting as latency.
+        """
+        parsed = urllib.parse.urlparse(self.scenario.base_url if self.scenario else self.url)
+        https = parsed.scheme == 'https'
+        pool = [KeepAliveConnection(parsed.hostname, parsed.port or (443 if https else 80), self._ssl_context if https else None)
+                for _ in range(self.connections)]
+        scenario = self.scenario or Scenario.single(self.url, self.method, self.headers, self.payload)
+        labelled = self.scenario is not None
+        timeout = self.timeout
+        phase = self.worker_index / self.worker_count
+        arrivals = arrival_offsets(self.stages, self.start_rps, phase)
+        iterations = itertools.count(self.worker_index, self.worker_count)  # {{seq}} is unique across workers
+        record = self.recorder.record
+        loop = asyncio.get_running_loop()
 
-        return LoadTestMetrics(
-            total_requests=len(self.results), successful_requests=len(successful), failed_requests=len(failed),
-            total_time_seconds=total_time, min_response_time_ms=min(response_times), max_response_time_ms=max(response_times),
-            avg_response_time_ms=statistics.mean(response_times), median_response_time_ms=statistics.median(response_times),
-            p95_response_time_ms=percentile(response_times, 95), p99_response_time_ms=percentile(response_times, 99),
-            requests_per_second=len(self.results) / total_time if total_time > 0 else 0,
-            throughput_bytes_per_second=total_bytes / total_time if total_time > 0 else 0,
-            error_rate_percent=(len(failed) / len(self.results) * 100) if self.results else 0,
-            status_code_distribution=status_codes, error_distribution=errors
-        )
+        # Open connections before the clock starts so setup is not measured as latency
+        await asyncio.gather(*(conn._connect() for conn in pool), return_exceptions=True)
+        if self.start_at is not None:
+            await asyncio.sleep(self.start_at - time.time())
+        start = loop.time()
+
+        async def drive(conn: KeepAliveConnection):
+            for offset in arrivals:
+                intended = start + offset
+                delay = intended - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                context = {'seq': next(iterations), 'worker': self.worker_index}
+                begin = intended
+                for step in scenario.pick().steps:
+                    sent = loop.time()
+                    if begin is None:
+                        begin = sent
+                    try:
+                        status, body = await asyncio.wait_for(conn.request(step.render(context), step.head_only), timeout)
+                        done = loop.time()
+                        error = step.check(status, body, (done - sent) * 1000)
+                    except asyncio.TimeoutError:
+                        conn.close()
+                        status, body, error = 0, b'', "Timeout"
+                    except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+                        conn.close()
+                        status, body, error = 0, b'', f"Connection error: {e.__class__.__name__}"
+                    if not status:
+                        done = loop.time()
+                    record((done - begin) * 1000, status, len(body), error, (done - sent) * 1000,
+                           step.label if labelled else None)
+                    if error:
+                        logger.debug(f"Request failed: {error}")
+                        if not status:
+                            break  # Later steps depend on this one; the flow is abandoned
+                    low, high = step.think_time
+                    if high:
+                        await asyncio.sleep(random.uniform(low, high))
+                    begin = None
+
+        async def report():
+            ticks = 1
+            while True:
+                await asyncio.sleep(start + ticks * self.interval - loop.time())
+                self.snapshots.write_interval(ticks * self.interval, *self.recorder.close_interval(ticks * self.interval))
+                ticks += 1
+
+        reporter = asyncio.ensure_future(report()) if self.snapshots else None
+        try:
+            await asyncio.gather(*(drive(conn) for conn in pool))
+        finally:
+            if reporter:
+                reporter.cancel()
+            for conn in pool:
+                conn.close()
+        total_time = loop.time() - start
+
+        scheduled_seconds = sum(stage.duration_seconds for stage in self.stages)
+        scheduled = scheduled_requests(self.stages, self.start_rps, phase)
+        target_rps = scheduled / scheduled_seconds if scheduled_seconds else 0.0
+        return self._finish(total_time, target_rps)
 
 
 def format_text_report(metrics: LoadTestMetrics, url: str, method: str, concurrent_users: int) -> str:
     """Generate human-readable text report"""
+    open_loop = metrics.target_requests_per_second > 0
     lines = [
         "=" * 70, "API LOAD TEST RESULTS", "=" * 70, "",
         "TEST CONFIGURATION", "-" * 40,
         f"  URL:              {url}", f"  Method:           {method}",
-        f"  Concurrent Users: {concurrent_users}", f"  Total Requests:   {metrics.total_requests}",
+        (f"  Connections:      {concurrent_users}" if open_loop else f"  Concurrent Users: {concurrent_users}"),
+        *([f"  Target Rate:      {metrics.target_requests_per_second:.1f} req/s (open loop)"] if open_loop else []),
+        f"  Total Requests:   {metrics.total_requests}",
         f"  Test Duration:    {metrics.total_time_seconds:.2f}s", "",
         "REQUEST STATISTICS", "-" * 40,
         f"  Successful:       {metrics.successful_requests}", f"  Failed:           {metrics.failed_requests}",
@@ -206,11 +957,19 @@ def format_text_report(metrics: LoadTestMetrics, url: str, method: str, concurre
         "RESPONSE TIME (ms)", "-" * 40,
         f"  Min:              {metrics.min_response_time_ms:.2f}", f"  Max:              {metrics.max_response_time_ms:.2f}",
         f"  Average:          {metrics.avg_response_time_ms:.2f}", f"  Median (P50):     {metrics.median_response_time_ms:.2f}",
-        f"  P95:              {metrics.p95_response_time_ms:.2f}", f"  P99:              {metrics.p99_response_time_ms:.2f}", "",
+        f"  P95:              {metrics.p95_response_time_ms:.2f}", f"  P99:              {metrics.p99_response_time_ms:.2f}",
+        f"  P99.9:            {metrics.p999_response_time_ms:.2f}",
+        *([f"  P99 service time: {metrics.p99_service_time_ms:.2f} (excludes client-side queueing)"] if open_loop else []), "",
         "THROUGHPUT", "-" * 40,
         f"  Requests/sec:     {metrics.requests_per_second:.2f}",
         f"  Throughput:       {metrics.throughput_bytes_per_second / 1024:.2f} KB/s", ""
     ]
+    if metrics.step_stats:
+        lines.extend(["STEPS", "-" * 40, f"  {'Step':<34} {'Requests':>9} {'Failed':>7} {'P50 ms':>9} {'P99 ms':>9}"])
+        for label, stats in metrics.step_stats.items():
+            lines.append(f"  {label[:34]:<34} {stats['requests']:>9} {stats['failed']:>7} "
+                         f"{stats['p50_ms']:>9.2f} {stats['p99_ms']:>9.2f}")
+        lines.append("")
     if metrics.status_code_distribution:
         lines.extend(["STATUS CODE DISTRIBUTION", "-" * 40])
         for code, count in sorted(metrics.status_code_distribution.items()):
@@ -228,19 +987,28 @@ def format_text_report(metrics: LoadTestMetrics, url: str, method: str, concurre
 
 def format_json_output(metrics: LoadTestMetrics, url: str, method: str, concurrent_users: int) -> str:
     """Generate JSON output"""
-    return json.dumps({
-        "metadata": {"tool": "api_load_tester", "version": "1.0.0", "timestamp": datetime.now().isoformat(),
+    report = {
+        "metadata": {"tool": "api_load_tester", "version": __version__, "timestamp": datetime.now().isoformat(),
                      "url": url, "method": method, "concurrent_users": concurrent_users},
         "summary": {"total_requests": metrics.total_requests, "successful_requests": metrics.successful_requests,
                     "failed_requests": metrics.failed_requests, "total_time_seconds": round(metrics.total_time_seconds, 3),
                     "error_rate_percent": round(metrics.error_rate_percent, 2)},
         "response_times_ms": {"min": round(metrics.min_response_time_ms, 2), "max": round(metrics.max_response_time_ms, 2),
                               "avg": round(metrics.avg_response_time_ms, 2), "median": round(metrics.median_response_time_ms, 2),
-                              "p95": round(metrics.p95_response_time_ms, 2), "p99": round(metrics.p99_response_time_ms, 2)},
+                              "p95": round(metrics.p95_response_time_ms, 2), "p99": round(metrics.p99_response_time_ms, 2),
+                              "p999": round(metrics.p999_response_time_ms, 2)},
         "throughput": {"requests_per_second": round(metrics.requests_per_second, 2),
                        "kb_per_second": round(metrics.throughput_bytes_per_second / 1024, 2)},
         "status_codes": metrics.status_code_distribution, "errors": metrics.error_distribution
-    }, indent=2)
+    }
+    if metrics.target_requests_per_second > 0:
+        report["open_loop"] = {"target_requests_per_second": round(metrics.target_requests_per_second, 2),
+                               "connections": concurrent_users, "latency_measured_from": "intended_start",
+                               "p99_service_time_ms": round(metrics.p99_service_time_ms, 2)}
+    if metrics.step_stats:
+        report["steps"] = {label: {key: round(value, 2) if key.endswith("_ms") else value for key, value in stats.items()}
+                           for label, stats in metrics.step_stats.items()}
+    return json.dumps(report, indent=2)
 
 
 def format_html_report(metrics: LoadTestMetrics, url: str, method: str, concurrent_users: int) -> str:
@@ -255,6 +1023,12 @@ def format_html_report(metrics: LoadTestMetrics, url: str, method: str, concurre
         error_rows = "".join(f"<tr><td>{error}</td><td>{count}</td></tr>"
                              for error, count in sorted(metrics.error_distribution.items(), key=lambda x: -x[1])[:10])
         error_section = f'<div class="card"><h2>Error Distribution</h2><table><tr><th>Error</th><th>Count</th></tr>{error_rows}</table></div>'
+    if metrics.step_stats:
+        step_rows = "".join(f"<tr><td>{label}</td><td>{stats['requests']}</td><td>{stats['failed']}</td>"
+                            f"<td>{stats['p50_ms']:.2f}</td><td>{stats['p95_ms']:.2f}</td><td>{stats['p99_ms']:.2f}</td></tr>"
+                            for label, stats in metrics.step_stats.items())
+        error_section = (f'<div class="card"><h2>Steps</h2><table><tr><th>Step</th><th>Requests</th><th>Failed</th>'
+                         f'<th>P50 ms</th><th>P95 ms</th><th>P99 ms</th></tr>{step_rows}</table></div>' + error_section)
 
     return f"""<!DOCTYPE html>
 <html><head><meta charset="UTF-8"><title>API Load Test - {timestamp}</title>
@@ -266,7 +1040,7 @@ table{{width:100%;border-collapse:collapse}}th,td{{padding:12px;text-align:left;
 .config-list{{list-style:none;padding:0}}.config-list li{{padding:8px 0;border-bottom:1px solid #eee}}.config-list strong{{display:inline-block;width:150px}}</style></head>
 <body><div class="container"><h1>API Load Test Report</h1><p class="timestamp">Generated: {timestamp}</p>
 <div class="card"><h2>Test Configuration</h2><ul class="config-list"><li><strong>URL:</strong> {url}</li><li><strong>Method:</strong> {method}</li>
-<li><strong>Concurrent Users:</strong> {concurrent_users}</li><li><strong>Total Requests:</strong> {metrics.total_requests}</li>
+<li><strong>{"Connections" if metrics.target_requests_per_second else "Concurrent Users"}:</strong> {concurrent_users}</li>{f"<li><strong>Target Rate:</strong> {metrics.target_requests_per_second:.1f} req/s (open loop)</li>" if metrics.target_requests_per_second else ""}<li><strong>Total Requests:</strong> {metrics.total_requests}</li>
 <li><strong>Test Duration:</strong> {metrics.total_time_seconds:.2f}s</li></ul></div>
 <div class="grid"><div class="card"><h2>Request Summary</h2><div class="grid">
 <div class="metric"><div class="metric-value" style="color:#28a745">{metrics.successful_requests}</div><div class="metric-label">Successful</div></div>
@@ -278,11 +1052,238 @@ table{{width:100%;border-collapse:collapse}}th,td{{padding:12px;text-align:left;
 <div class="card"><h2>Response Time (ms)</h2><table><tr><th>Metric</th><th>Value</th></tr>
 <tr><td>Minimum</td><td>{metrics.min_response_time_ms:.2f}</td></tr><tr><td>Average</td><td>{metrics.avg_response_time_ms:.2f}</td></tr>
 <tr><td>Median (P50)</td><td>{metrics.median_response_time_ms:.2f}</td></tr><tr><td>P95</td><td style="color:{p95_color}">{metrics.p95_response_time_ms:.2f}</td></tr>
-<tr><td>P99</td><td>{metrics.p99_response_time_ms:.2f}</td></tr><tr><td>Maximum</td><td>{metrics.max_response_time_ms:.2f}</td></tr></table></div>
+<tr><td>P99</td><td>{metrics.p99_response_time_ms:.2f}</td></tr><tr><td>P99.9</td><td>{metrics.p999_response_time_ms:.2f}</td></tr><tr><td>Maximum</td><td>{metrics.max_response_time_ms:.2f}</td></tr></table></div>
 <div class="card"><h2>Status Code Distribution</h2><table><tr><th>Status</th><th>Count</th><th>Percentage</th></tr>{status_rows}</table></div>
 {error_section}</div></body></html>"""
 
 
+def save_histogram(path: str, recorder: RunRecorder, metrics: LoadTestMetrics, url: str, method: str, concurrency: int):
+    """Write a run's histograms and counters so runs from several processes can be merged"""
+    with open(path, 'w') as f:
+        json.dump({"tool": "api_load_tester", "version": __version__, "url": url, "method": method,
+                   "concurrency": concurrency, "total_time_seconds": metrics.total_time_seconds,
+                   "target_requests_per_second": metrics.target_requests_per_second,
+                   "recorder": recorder.to_dict()}, f)
+
+
+def merge_histograms(paths: List[str]) -> Tuple[LoadTestMetrics, str, str, int]:
+    """Combine saved runs that ran side by side: counts add, duration is the longest run"""
+    merged = RunRecorder()
+    total_time = target_rps = 0.0
+    urls, methods, concurrency = [], [], 0
+    for path in paths:
+        with open(path, 'r') as f:
+            run = json.load(f)
+        merged.merge(RunRecorder.from_dict(run["recorder"]))
+        total_time = max(total_time, run["total_time_seconds"])
+        target_rps += run["target_requests_per_second"]
+        concurrency += run["concurrency"]
+        urls.append(run["url"])
+        methods.append(run["method"])
+    url = urls[0] if len(set(urls)) == 1 else "multiple"
+    method = methods[0] if len(set(methods)) == 1 else "multiple"
+    return merged.metrics(total_time, target_rps), url, method, concurrency
+
+
+def parse_address(value: str, default_host: str = '127.0.0.1') -> Tuple[str, int]:
+    """(host, port) from 'host:port' or 'port'"""
+    host, sep, port = value.rpartition(':')
+    if not port.isdigit():
+        raise ValueError(f"Invalid address '{value}': expected [host:]port")
+    return (host.strip('[]') if sep and host else default_host), int(port)
+
+
+def _map_strings(value, function: Callable[[str], str]):
+    """Copy of a JSON value with function applied to every string in it"""
+    if isinstance(value, str):
+        return function(value)
+    if isinstance(value, dict):
+        return {key: _map_strings(item, function) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_map_strings(item, function) for item in value]
+    return value
+
+
+def resolve_env_templates(value):
+    """Copy of a JSON value with {{env NAME}} replaced from this process's environment"""
+    return _map_strings(value, lambda text: ENV_TEMPLATE_PATTERN.sub(
+        lambda match: os.environ.get(match.group(1), ''), text))
+
+
+def _reject_env_templates(text: str) -> str:
+    match = ENV_TEMPLATE_PATTERN.search(text)
+    if match:
+        raise ValueError(f"Job contains unresolved '{match.group(0)}'; agents do not read their environment")
+    return text
+
+
+def split_job(job: Dict, index: int, workers: int) -> Dict:
+    """Worker index's share of a job: 1/workers of the rate and connections, phase-shifted
+    so the workers' arrivals interleave into the single-process schedule. {{env NAME}}
+    templates are resolved here, on the coordinator, so workers never read their own environment"""
+    share = dict(job)
+    share.update(worker_index=index, worker_count=workers,
+                 headers=resolve_env_templates(job["headers"]), scenario=resolve_env_templates(job["scenario"]),
+                 stages=[[duration, rate / workers] for duration, rate in job["stages"]],
+                 start_rps=job["start_rps"] / workers,
+                 connections=max(1, job["connections"] // workers + (index < job["connections"] % workers)))
+    return share
+
+
+def run_worker_job(job: Dict, send: Callable[[Dict], None]):
+    """Run one worker's share of a distributed test, streaming interval histograms and then its totals"""
+    random.seed()  # Forked workers would otherwise share the parent's random state
+    try:
+        scenario = Scenario.from_dict(job["scenario"], job["url"], job["headers"]) if job["scenario"] else None
+        tester = APILoadTester(job["url"], method=job["method"], headers=job["headers"], payload=job["payload"],
+                               timeout=job["timeout"], stages=[LoadStage(d, r) for d, r in job["stages"]],
+                               start_rps=job["start_rps"], connections=job["connections"],
+                               snapshots=WorkerChannel(send), interval=job["interval"], scenario=scenario,
+                               worker_index=job["worker_index"], worker_count=job["worker_count"],
+                               start_at=job["start_at"])
+        metrics = tester.run()
+    except Exception as e:
+        send({"type": "error", "message": f"{e.__class__.__name__}: {e}"})
+        return
+    send({"type": "done", "recorder": tester.recorder.to_dict(), "total_time": metrics.total_time_seconds,
+          "target_rps": metrics.target_requests_per_second})
+
+
+def _local_worker(job: Dict, sender):
+    try:
+        run_worker_job(job, sender.send)
+    finally:
+        sender.close()
+
+
+def serve_worker(address: str, token: str):
+    """Worker agent for distributed runs: run jobs from a coordinator one at a time, forever.
+
+    Jobs must carry the shared token, and may not contain {{env NAME}}
+    templates, which the coordinator resolves before sending. Jobs carry their
+    start as a delay rather than a wall-clock time, so hosts need not have
+    synchronized clocks. The token is sent in clear and a job can point this
+    host at any URL: listen on a trusted network only.
+    """
+    if not token:
+        raise ValueError(f"agents need a shared token: pass --token or set {TOKEN_ENV_VAR}")
+    host, port = parse_address(address)
+    with socket.create_server((host, port)) as server:
+        logger.info(f"Load test worker listening on {host}:{port}")
+        while True:
+            conn, peer = server.accept()
+            with conn, conn.makefile('rwb') as stream:
+                def send(message: Dict):
+                    stream.write(json.dumps(message).encode('utf-8') + b"\n")
+                    stream.flush()
+                try:
+                    job = json.loads(stream.readline())
+                    if not hmac.compare_digest(str(job.pop("token", "")).encode('utf-8'), token.encode('utf-8')):
+                        logger.warning(f"Rejected job from {peer[0]}: invalid token")
+                        send({"type": "error", "message": "invalid token"})
+                        continue
+                    try:
+                        _map_strings([job["headers"], job["scenario"]], _reject_env_templates)
+                    except ValueError as e:
+                        logger.warning(f"Rejected job from {peer[0]}: {e}")
+                        send({"type": "error", "message": str(e)})
+                        continue
+                    job["start_at"] = time.time() + job.pop("start_in")
+                    logger.info(f"Running job {job['worker_index'] + 1}/{job['worker_count']} from {peer[0]}")
+                    run_worker_job(job, send)
+                except (OSError, ValueError, KeyError) as e:
+                    logger.warning(f"Job from {peer[0]} failed: {e}")
+
+
+def _pump_pipe(index: int, receiver, messages: queue.Queue):
+    try:
+        while True:
+            messages.put((index, receiver.recv()))
+    except (EOFError, OSError):
+        messages.put((index, None))
+
+
+def _pump_socket(index: int, conn: socket.socket, messages: queue.Queue):
+    try:
+        with conn, conn.makefile('rb') as stream:
+            for line in stream:
+                messages.put((index, json.loads(line)))
+    except (OSError, ValueError):
+        pass
+    messages.put((index, None))
+
+
+def run_distributed(job: Dict, local_workers: int, remote: List[str],
+                    snapshots: Optional[SnapshotWriter] = None,
+                    token: Optional[str] = None) -> Tuple[RunRecorder, float, float, List[str]]:
+    """Split an open-loop job over forked worker processes and remote --serve agents and merge their results.
+
+    Every worker streams each interval's raw histogram; an interval is
+    reported once all still-running workers have sent it, so live percentiles
+    cover the whole run rather than one process. Returns the merged recorder,
+    run time, target rate and any worker failures. Remote agents are sent token.
+    """
+    workers = local_workers + len(remote)
+    messages: queue.Queue = queue.Queue()
+    start_at = time.time() + WORKER_START_DELAY
+
+    # Connect to remote agents first so an unreachable host fails before anything starts
+    sockets = [socket.create_connection(parse_address(address), timeout=10) for address in remote]
+    for offset, conn in enumerate(sockets):
+        share = split_job(job, local_workers + offset, workers)
+        share["start_in"] = start_at - time.time()
+        share["token"] = token or ""
+        conn.sendall(json.dumps(share).encode('utf-8') + b"\n")
+        conn.settimeout(None)
+        threading.Thread(target=_pump_socket, args=(local_workers + offset, conn, messages), daemon=True).start()
+    processes = []
+    for index in range(local_workers):
+        receiver, sender = multiprocessing.Pipe(duplex=False)
+        share = split_job(job, index, workers)
+        share["start_at"] = start_at
+        process = multiprocessing.Process(target=_local_worker, args=(share, sender), daemon=True)
+        process.start()
+        sender.close()
+        processes.append(process)
+        threading.Thread(target=_pump_pipe, args=(index, receiver, messages), daemon=True).start()
+
+    merged = RunRecorder()
+    total_time = target_rps = 0.0
+    failures: List[str] = []
+    running = set(range(workers))
+    intervals: Dict[int, List] = {}  # tick -> [histogram, failed, workers reported, elapsed, span]
+    while running:
+        index, message = messages.get()
+        if message is not None and message["type"] == "interval":
+            tick = max(1, math.ceil(message["elapsed"] / job["interval"] - 1e-6))
+            slot = intervals.setdefault(tick, [LatencyHistogram(), 0, set(), 0.0, 0.0])
+            slot[0].add(LatencyHistogram.from_dict(message["histogram"]))
+            slot[1] += message["failed"]
+            slot[2].add(index)
+            slot[3], slot[4] = max(slot[3], message["elapsed"]), max(slot[4], message["span"])
+        elif index in running:
+            running.discard(index)
+            if message is None:
+                failures.append(f"worker {index + 1}: connection lost")
+            elif message["type"] == "error":
+                failures.append(f"worker {index + 1}: {message['message']}")
+            else:
+                merged.merge(RunRecorder.from_dict(message["recorder"]))
+                total_time = max(total_time, message["total_time"])
+                target_rps += message["target_rps"]
+        for tick in sorted(intervals):
+            histogram, failed, reported, elapsed, span = intervals[tick]
+            if not running <= reported:
+                break
+            del intervals[tick]
+            if snapshots and histogram.total_count:
+                snapshots.write_interval(elapsed, histogram, failed, span)
+
+    for process in processes:
+        process.join(timeout=5)
+    return merged, total_time, target_rps, failures
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="API Load Tester - HTTP load generation and performance benchmarking",
@@ -295,6 +1296,21 @@ Examples:
   %(prog)s http://localhost:3000/api/users --method POST --data '{"name":"test"}'
   %(prog)s http://localhost:3000/api/posts --format html --save report.html
 
+Open loop (constant arrival rate, keep-alive, latency from intended start):
+  %(prog)s http://localhost:3000/api/users --rate 2000 --duration 60s
+  %(prog)s http://localhost:3000/api/users --stages 30s:1000,2m:10000,30s:0 --connections 500
+
+Live reporting and merging:
+  %(prog)s http://localhost:3000/api/users --rate 500 --duration 1h --live --live-file soak.jsonl
+  %(prog)s http://localhost:3000/api/users --rate 2000 --duration 5m --histogram-out worker1.json
+  %(prog)s --merge worker1.json worker2.json --format json
+
+Scenarios and distributed runs:
+  %(prog)s --scenario gateway.json --rate 5000 --duration 5m --live
+  %(prog)s --scenario gateway.json --rate 20000 --duration 5m --workers 4 -c 400
+  %(prog)s --serve 0.0.0.0:7070 --token SECRET     (on each load host)
+  %(prog)s --scenario gateway.json --stages 1m:50000,5m:50000 --remote lg1:7070,lg2:7070 --token SECRET
+
 Performance Targets:
   - P95 latency < 200ms for typical endpoints
   - Error rate < 1%% under normal load
@@ -311,11 +1327,47 @@ Performance Targets:
     parser.add_argument('--format', '-f', choices=['text', 'json', 'html'], default='text', help='Output format')
     parser.add_argument('--save', '-s', help='Save report to file')
     parser.add_argument('--verbose', '-v', action='store_true', help='Show progress')
-    parser.add_argument('--version', action='version', version='%(prog)s 1.0.0')
+    parser.add_argument('--rate', '-R', type=float, help='Open loop: target requests/sec (constant, or start rate for --stages)')
+    parser.add_argument('--duration', help='Open loop: run time at --rate, e.g. 60s or 5m (default: requests / rate)')
+    parser.add_argument('--stages', help="Open loop: ramp stages 'duration:rps,...', e.g. '30s:500,2m:5000,30s:0'")
+    parser.add_argument('--connections', '-c', type=int, default=100, help='Open loop: keep-alive connections (default: 100)')
+    parser.add_argument('--live', action='store_true', help='Print per-interval RPS, error rate and p50/p99/p99.9 while running')
+    parser.add_argument('--live-file', help='Append per-interval snapshots to this JSONL file')
+    parser.add_argument('--interval', type=float, default=1.0, help='Snapshot interval in seconds (default: 1)')
+    parser.add_argument('--histogram-out', help='Save latency histograms and counters as JSON for --merge')
+    parser.add_argument('--merge', nargs='+', metavar='FILE', help='Report on saved --histogram-out files instead of running')
+    parser.add_argument('--scenario', help='Open loop: JSON scenario of weighted endpoints and flows (URL argument overrides base_url)')
+    parser.add_argument('--workers', '-w', type=int,
+                        help='Open loop: split the load over this many local processes, 0 = one per CPU '
+                             '(default: run in-process, or none with --remote)')
+    parser.add_argument('--remote', help='Open loop: also split the load over --serve agents at HOST:PORT[,HOST:PORT...]')
+    parser.add_argument('--serve', metavar='[HOST:]PORT', help='Run as a worker agent for --remote coordinators (default host 127.0.0.1)')
+    parser.add_argument('--token', default=os.environ.get(TOKEN_ENV_VAR),
+                        help=f'Shared secret that --serve agents require from --remote coordinators (default: ${TOKEN_ENV_VAR})')
+    parser.add_argument('--version', action='version', version=f'%(prog)s {__version__}')
 
     args = parser.parse_args()
 
-    if not args.url:
+    if args.serve:
+        try:
+            serve_worker(args.serve, args.token)
+        except (OSError, ValueError) as e:
+            print(f"Error: cannot serve on {args.serve}: {e}")
+            sys.exit(1)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    if args.merge:
+        try:
+            metrics, url, method, concurrency = merge_histograms(args.merge)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error: cannot merge histograms: {e}")
+            sys.exit(1)
+        emit_report(args, metrics, url, method, concurrency)
+        return
+
+    if not args.url and not args.scenario:
         parser.print_help()
         print("\nError: URL argument is required")
         sys.exit(1)
@@ -336,20 +1388,80 @@ Performance Targets:
         else:
             payload = args.data
 
-    tester = APILoadTester(args.url, args.concurrent_users, args.total_requests, args.method, headers, payload, args.timeout, args.verbose)
+    stages, start_rps = [], 0.0
+    try:
+        if args.stages:
+            stages, start_rps = parse_stages(args.stages), args.rate or 0.0
+        elif args.rate:
+            duration = parse_duration(args.duration) if args.duration else args.total_requests / args.rate
+            stages, start_rps = [LoadStage(duration, args.rate)], args.rate
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
 
+    remote = [address.strip() for address in args.remote.split(',') if address.strip()] if args.remote else []
+    scenario_data, scenario = None, None
     try:
-        metrics = tester.run()
+        if args.scenario:
+            scenario_data = read_scenario_file(args.scenario)
+            scenario = Scenario.from_dict(scenario_data, args.url, headers)
+        if (scenario or remote or args.workers is not None) and not stages:
+            raise ValueError("--scenario, --workers and --remote run open loop: pass --rate or --stages")
+        for address in remote:
+            parse_address(address)
+        if remote and not args.token:
+            raise ValueError(f"--remote needs the agents' shared token: pass --token or set {TOKEN_ENV_VAR}")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    local_workers = (os.cpu_count() or 1) if args.workers == 0 else (args.workers or 0)
+    url = scenario.base_url if scenario else args.url
+    method = f"scenario {os.path.basename(args.scenario)}" if scenario else args.method
+    concurrency = args.connections if stages else args.concurrent_users
+
+    snapshots = SnapshotWriter(args.live, args.live_file) if (args.live or args.live_file) else None
+    try:
+        if remote or local_workers > 1:
+            job = {"url": url, "method": args.method, "headers": headers, "payload": payload, "timeout": args.timeout,
+                   "stages": [[stage.duration_seconds, stage.target_rps] for stage in stages], "start_rps": start_rps,
+                   "connections": args.connections, "interval": args.interval, "scenario": scenario_data}
+            recorder, total_time, target_rps, failures = run_distributed(job, local_workers, remote, snapshots,
+                                                                         token=args.token)
+            for failure in failures:
+                logger.error(f"Load test {failure}")
+            if len(failures) == local_workers + len(remote):
+                sys.exit(1)
+            metrics = recorder.metrics(total_time, target_rps)
+        else:
+            tester = APILoadTester(args.url or url, args.concurrent_users, args.total_requests, args.method, headers,
+                                   payload, args.timeout, args.verbose, stages=stages, start_rps=start_rps,
+                                   connections=args.connections, snapshots=snapshots, interval=args.interval,
+                                   scenario=scenario)
+            metrics = tester.run()
+            recorder = tester.recorder
+    except OSError as e:
+        print(f"Error: cannot start workers: {e}")
+        sys.exit(1)
     except KeyboardInterrupt:
         print("\nTest interrupted")
         sys.exit(130)
+    finally:
+        if snapshots:
+            snapshots.close()
+
+    if args.histogram_out:
+        save_histogram(args.histogram_out, recorder, metrics, url, method, concurrency)
+    emit_report(args, metrics, url, method, concurrency)
+
 
+def emit_report(args: argparse.Namespace, metrics: LoadTestMetrics, url: str, method: str, concurrency: int):
+    """Print or save the report and exit non-zero when most requests failed"""
     if args.format == 'json':
-        output = format_json_output(metrics, args.url, args.method, args.concurrent_users)
+        output = format_json_output(metrics, url, method, concurrency)
     elif args.format == 'html':
-        output = format_html_report(metrics, args.url, args.method, args.concurrent_users)
+        output = format_html_report(metrics, url, method, concurrency)
     else:
-        output = format_text_report(metrics, args.url, args.method, args.concurrent_users)
+        output = format_text_report(metrics, url, method, concurrency)
 
     if args.save:
         with open(args.save, 'w') as f:
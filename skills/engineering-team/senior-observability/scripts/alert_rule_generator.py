@@ -11,20 +11,35 @@ Features:
 - Runbook link generation
 - Inhibition rules to reduce alert noise
 - NRQL-based alert conditions for New Relic
+- Backtesting: replay historical metrics through the generated rules to see
+  when each would have fired, detection latency and false positives
 
-Standard library only - no external dependencies required.
+Standard library only - no external dependencies required. When NumPy is
+installed, backtests run vectorized.
 """
 
 import argparse
+import bisect
+import csv
 import json
 import logging
+import operator
+import re
 import sys
 from dataclasses import dataclass, field
-from datetime import datetime
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from itertools import accumulate
+from typing import Any, Dict, List, Optional, Tuple
 
-__version__ = "1.0.0"
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+    HAS_NUMPY = False
+
+__version__ = "1.1.0"
 
 # Configure logging
 logging.basicConfig(
@@ -817,6 +832,485 @@ def format_output(config: Dict[str, Any], output_format: str, platform: str) ->
         return "\n".join(lines)
 
 
+# Backtesting: history columns accepted for each signal, in order of preference.
+# Latency columns are in milliseconds, as in slo_calculator.py input.
+HISTORY_COLUMNS = {
+    "total": ("total_requests", "total", "requests"),
+    "errors": ("failed_requests", "errors", "5xx"),
+    "success": ("successful_requests", "success", "2xx"),
+    "latency_p99": ("latency_p99", "p99"),
+    "latency_p95": ("latency_p95", "p95"),
+    "cpu_percent": ("cpu_percent", "cpu"),
+    "memory_percent": ("memory_percent", "memory"),
+    "active_requests": ("active_requests", "in_flight"),
+    "up": ("up",),
+    "incident": ("incident",),
+}
+COUNT_SIGNALS = ("total", "errors", "success")
+TIMESTAMP_FIELDS = ("timestamp", "time", "date")
+
+# Without labelled incidents, an incident is a run of at least INCIDENT_MIN_SECONDS
+# where the error ratio over INCIDENT_WINDOW_SECONDS burns budget at the given rate
+INCIDENT_WINDOW_SECONDS = 300
+INCIDENT_MIN_SECONDS = 300
+DEFAULT_INCIDENT_BURN_RATE = 6.0
+# A firing that starts up to this long after an incident ends still counts for it
+MATCH_GRACE_SECONDS = 3600
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+
+def parse_duration(value: str) -> float:
+    """Seconds in a Prometheus duration such as 30s, 5m, 1h or 3d"""
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)([smhdw])', value.strip())
+    if not match:
+        raise ValueError(f"Invalid duration: {value}")
+    return float(match.group(1)) * DURATION_UNITS[match.group(2)]
+
+
+def parse_epoch_seconds(value: Any) -> Optional[float]:
+    """Epoch seconds from an ISO-8601 string or a numeric epoch (s or ms); naive times are UTC"""
+    if isinstance(value, (int, float)) or (isinstance(value, str) and value.replace('.', '', 1).isdigit()):
+        seconds = float(value)
+        return seconds / 1000 if seconds > 1e11 else seconds
+    try:
+        ts = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+@dataclass
+class MetricHistory:
+    """Historical samples for one service, column-wise and in time order"""
+    timestamps: List[float]  # Epoch seconds
+    columns: Dict[str, List[float]]
+
+    @staticmethod
+    def load(filepath: str, service: Optional[str] = None) -> 'MetricHistory':
+        """Load CSV or JSON history; rows for other services are skipped when a service column exists"""
+        if filepath.endswith('.json'):
+            with open(filepath, 'r') as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                data = data.get('metrics', data.get('data', data.get('records', [])))
+            records = [r for r in data if isinstance(r, dict)]
+        else:
+            with open(filepath, 'r', newline='') as f:
+                records = list(csv.DictReader(f))
+        if not records:
+            raise ValueError(f"No samples in {filepath}")
+
+        keys = records[0].keys()
+        ts_field = next((k for k in TIMESTAMP_FIELDS if k in keys), None)
+        if ts_field is None:
+            raise ValueError(f"{filepath} has no timestamp column ({', '.join(TIMESTAMP_FIELDS)})")
+        fields = {signal: next((c for c in names if c in keys), None) for signal, names in HISTORY_COLUMNS.items()}
+        fields = {signal: column for signal, column in fields.items() if column}
+        filter_service = service if 'service' in keys else None
+
+        timestamps: List[float] = []
+        columns: Dict[str, List[float]] = {signal: [] for signal in fields}
+        nan = float('nan')
+        for record in records:
+            if filter_service is not None and record.get('service') != filter_service:
+                continue
+            ts = parse_epoch_seconds(record.get(ts_field))
+            if ts is None:
+                continue
+            timestamps.append(ts)
+            for signal, column in fields.items():
+                try:
+                    value = float(record.get(column))
+                except (TypeError, ValueError):
+                    value = 0.0 if signal in COUNT_SIGNALS else nan
+                columns[signal].append(value)
+
+        if not timestamps:
+            raise ValueError(f"No samples for service {service} in {filepath}")
+
+        if any(b < a for a, b in zip(timestamps, timestamps[1:])):
+            order = sorted(range(len(timestamps)), key=timestamps.__getitem__)
+            timestamps = [timestamps[i] for i in order]
+            columns = {signal: [values[i] for i in order] for signal, values in columns.items()}
+
+        if 'errors' not in columns and 'total' in columns and 'success' in columns:
+            columns['errors'] = [t - s for t, s in zip(columns['total'], columns['success'])]
+
+        return MetricHistory(timestamps=timestamps, columns=columns)
+
+
+@dataclass
+class BacktestRule:
+    """An alert rule reduced to a condition over history columns"""
+    name: str
+    severity: Severity
+    signal: str  # History column, or "error_ratio" for burn rate rules
+    operator: str  # ">", "<" or "=="
+    threshold: float
+    for_seconds: float
+    windows: List[float] = field(default_factory=list)  # Burn rate rules: every window must breach
+
+
+@dataclass
+class BacktestResult:
+    """How one rule would have behaved over the history"""
+    rule: BacktestRule
+    firings: List[Tuple[float, float]]  # (first, last) firing sample, epoch seconds
+    true_positives: int
+    false_positives: int
+    detected_incidents: int
+    missed_incidents: int
+    detection_latencies: List[float]  # Seconds from incident start to first firing
+    firing_seconds: float
+
+
+@dataclass
+class BacktestReport:
+    """Backtest of a service's alert rules"""
+    service: str
+    slo_target: float
+    start: float
+    end: float
+    samples: int
+    incident_source: str
+    incidents: List[Tuple[float, float]]
+    results: List[BacktestResult]
+    skipped: Dict[str, str]  # Rule name -> reason
+
+
+class AlertBacktester:
+    """
+    Replay metric history through generated alert rules.
+
+    Rules are reduced to conditions over history columns the same way the
+    New Relic generator translates them: burn rate rules become error-ratio
+    thresholds over each of their windows, the rest compare one signal with
+    the threshold in their expression. Windows are time-based (samples in
+    (t - w, t]) and computed from prefix sums, and `for:` needs the condition
+    to hold for that long, as in Prometheus. Runs vectorized when NumPy is
+    installed and in pure Python otherwise, with the same results.
+    """
+
+    def __init__(self, history: MetricHistory, slo_target: float,
+                 incidents: Optional[List[Tuple[float, float]]] = None,
+                 incident_burn_rate: float = DEFAULT_INCIDENT_BURN_RATE,
+                 grace_seconds: float = MATCH_GRACE_SECONDS):
+        self.history = history
+        self.slo_target = slo_target
+        self.incident_burn_rate = incident_burn_rate
+        self.grace_seconds = grace_seconds
+        self.ts = np.asarray(history.timestamps, dtype=np.float64) if HAS_NUMPY else history.timestamps
+        self._prefix_sums: Dict[str, Any] = {}
+        self.incident_source = "provided"
+        self.incidents = sorted(incidents) if incidents is not None else self._find_incidents()
+
+    @staticmethod
+    def compile_rule(rule: AlertRule) -> BacktestRule:
+        """Reduce an AlertRule to a condition; ValueError if it has no history equivalent"""
+        for_seconds = parse_duration(rule.duration)
+        threshold = NewRelicAlertGenerator.extract_threshold(rule.expression)
+        if rule.alert_type == AlertType.BURN_RATE:
+            budget = (100 - float(rule.labels["slo"])) / 100
+            windows = sorted({parse_duration(w) for w in re.findall(r'\[(\d+[smhdw])\]', rule.expression)})
+            return BacktestRule(rule.name, rule.severity, "error_ratio", ">",
+                                float(rule.labels["burn_rate"]) * budget, for_seconds, windows)
+        if rule.alert_type == AlertType.LATENCY:
+            signal = f"latency_p{rule.labels.get('percentile', '99')}"
+            return BacktestRule(rule.name, rule.severity, signal, ">", threshold * 1000, for_seconds)
+        if rule.alert_type == AlertType.RESOURCE:
+            return BacktestRule(rule.name, rule.severity, f"{rule.labels.get('resource')}_percent", ">",
+                                threshold, for_seconds)
+        if rule.alert_type == AlertType.SATURATION:
+            return BacktestRule(rule.name, rule.severity, "active_requests", ">", threshold, for_seconds)
+        if rule.alert_type == AlertType.AVAILABILITY and "up{" in rule.expression:
+            return BacktestRule(rule.name, rule.severity, "up", "==", threshold, for_seconds)
+        raise ValueError(f"no backtest equivalent for {rule.alert_type.value} rule")
+
+    def _prefix_sum(self, signal: str):
+        prefix = self._prefix_sums.get(signal)
+        if prefix is None:
+            values = self.history.columns[signal]
+            if HAS_NUMPY:
+                prefix = np.concatenate(([0.0], np.cumsum(values, dtype=np.float64)))
+            else:
+                prefix = [0.0, *accumulate(values)]
+            self._prefix_sums[signal] = prefix
+        return prefix
+
+    def error_ratio(self, window_seconds: float):
+        """errors / total over the samples in (t - window, t] at every sample"""
+        errors, total = self._prefix_sum("errors"), self._prefix_sum("total")
+        ts = self.ts
+        if HAS_NUMPY:
+            start = np.searchsorted(ts, ts - window_seconds, side='right')
+            bad = errors[1:] - errors[start]
+            count = total[1:] - total[start]
+            return np.divide(bad, count, out=np.zeros_like(bad), where=count > 0)
+
+        ratios = []
+        start = 0
+        for i, t in enumerate(ts):
+            limit = t - window_seconds
+            while ts[start] <= limit:
+                start += 1
+            count = total[i + 1] - total[start]
+            ratios.append((errors[i + 1] - errors[start]) / count if count > 0 else 0.0)
+        return ratios
+
+    def condition(self, rule: BacktestRule):
+        """Whether the rule's expression holds at each sample"""
+        if rule.signal == "error_ratio":
+            series = [self.error_ratio(w) for w in rule.windows]
+        else:
+            series = [self.history.columns[rule.signal]]
+
+        compare = {">": operator.gt, "<": operator.lt, "==": operator.eq}[rule.operator]
+        if HAS_NUMPY:
+            result = np.ones(len(self.ts), dtype=bool)
+            for values in series:
+                result &= compare(np.asarray(values, dtype=np.float64), rule.threshold)
+            return result
+
+        result = [True] * len(self.ts)
+        for values in series:
+            result = [held and compare(v, rule.threshold) for held, v in zip(result, values)]
+        return result
+
+    def firing_intervals(self, condition, for_seconds: float) -> List[Tuple[float, float]]:
+        """(first, last) sample times of each firing, once condition has held for_seconds"""
+        ts = self.ts
+        if HAS_NUMPY:
+            n = len(ts)
+            if n == 0:
+                return []
+            index = np.arange(n)
+            run_start = np.maximum.accumulate(np.where(condition, -1, index)) + 1
+            firing = condition & (ts - ts[np.minimum(run_start, n - 1)] >= for_seconds)
+            edges = np.diff(np.concatenate(([0], firing.view(np.int8), [0])))
+            starts = np.flatnonzero(edges == 1)
+            ends = np.flatnonzero(edges == -1) - 1
+            return list(zip(ts[starts].tolist(), ts[ends].tolist()))
+
+        intervals = []
+        run_start = fire_start = last = None
+        for t, held in zip(ts, condition):
+            if held:
+                if run_start is None:
+                    run_start = t
+                if fire_start is None and t - run_start >= for_seconds:
+                    fire_start = t
+                last = t
+            else:
+                if fire_start is not None:
+                    intervals.append((fire_start, last))
+                run_start = fire_start = None
+        if fire_start is not None:
+            intervals.append((fire_start, last))
+        return intervals
+
+    def _find_incidents(self) -> List[Tuple[float, float]]:
+        """Incidents from an incident column, else from sustained error budget burn"""
+        columns = self.history.columns
+        if "incident" in columns:
+            self.incident_source = "incident column"
+            condition = (np.asarray(columns["incident"]) > 0) if HAS_NUMPY else [v > 0 for v in columns["incident"]]
+            return self.firing_intervals(condition, 0)
+
+        if "errors" not in columns or "total" not in columns:
+            self.incident_source = "none (no error counts)"
+            return []
+
+        budget = (100 - self.slo_target) / 100
+        self.incident_source = (f"error ratio over {INCIDENT_WINDOW_SECONDS // 60}m at "
+                                f">= {self.incident_burn_rate}x budget burn")
+        rule = BacktestRule("incident", Severity.INFO, "error_ratio", ">",
+                            self.incident_burn_rate * budget, 0, [INCIDENT_WINDOW_SECONDS])
+        runs = self.firing_intervals(self.condition(rule), 0)
+        return [(start, end) for start, end in runs if end - start >= INCIDENT_MIN_SECONDS]
+
+    def score(self, rule: BacktestRule, firings: List[Tuple[float, float]]) -> BacktestResult:
+        """Match firings against incidents"""
+        grace = self.grace_seconds
+        incidents = self.incidents
+        incident_starts = [start for start, _ in incidents]
+
+        def overlaps(start: float, end: float, incident: Tuple[float, float]) -> bool:
+            return start <= incident[1] + grace and end >= incident[0]
+
+        true_positives = 0
+        for start, end in firings:
+            # Only incidents starting before the firing ends can overlap it
+            candidates = incidents[:bisect.bisect_right(incident_starts, end)]
+            if any(overlaps(start, end, incident) for incident in reversed(candidates)):
+                true_positives += 1
+
+        latencies = []
+        firing_ends = [end for _, end in firings]
+        for incident in incidents:
+            # First firing still active at or after the incident start
+            i = bisect.bisect_left(firing_ends, incident[0])
+            if i < len(firings) and overlaps(*firings[i], incident):
+                latencies.append(max(firings[i][0], incident[0]) - incident[0])
+
+        return BacktestResult(
+            rule=rule,
+            firings=firings,
+            true_positives=true_positives,
+            false_positives=len(firings) - true_positives,
+            detected_incidents=len(latencies),
+            missed_incidents=len(incidents) - len(latencies),
+            detection_latencies=latencies,
+            firing_seconds=sum(end - start for start, end in firings)
+        )
+
+    def run(self, config: AlertConfig) -> BacktestReport:
+        """Backtest every rule in config that the history has data for"""
+        results = []
+        skipped = {}
+        for alert_rule in config.rules:
+            try:
+                rule = self.compile_rule(alert_rule)
+            except (ValueError, KeyError) as e:
+                skipped[alert_rule.name] = str(e)
+                continue
+            needed = ["errors", "total"] if rule.signal == "error_ratio" else [rule.signal]
+            missing = [signal for signal in needed if signal not in self.history.columns]
+            if missing:
+                skipped[alert_rule.name] = f"no history column for {', '.join(missing)}"
+                continue
+            firings = self.firing_intervals(self.condition(rule), rule.for_seconds)
+            results.append(self.score(rule, firings))
+
+        timestamps = self.history.timestamps
+        return BacktestReport(
+            service=config.service,
+            slo_target=config.slo_target,
+            start=timestamps[0],
+            end=timestamps[-1],
+            samples=len(timestamps),
+            incident_source=self.incident_source,
+            incidents=self.incidents,
+            results=results,
+            skipped=skipped
+        )
+
+
+def load_incidents(filepath: str) -> List[Tuple[float, float]]:
+    """Labelled incidents from CSV (start,end columns) or a JSON list of {start, end}"""
+    if filepath.endswith('.json'):
+        with open(filepath, 'r') as f:
+            records = json.load(f)
+        if isinstance(records, dict):
+            records = records.get('incidents', [])
+    else:
+        with open(filepath, 'r', newline='') as f:
+            records = list(csv.DictReader(f))
+
+    incidents = []
+    for record in records:
+        start = parse_epoch_seconds(record.get('start'))
+        end = parse_epoch_seconds(record.get('end') or record.get('start'))
+        if start is None or end is None:
+            logger.warning(f"Skipping incident without start/end: {record}")
+            continue
+        incidents.append((start, end))
+    return sorted(incidents)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def format_timestamp(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=timezone.utc).strftime('%Y-%m-%d %H:%M')
+
+
+def backtest_to_dict(report: BacktestReport, max_firings: int = 50) -> Dict[str, Any]:
+    """JSON/YAML form of a backtest report; firing lists are capped at max_firings"""
+    iso = lambda epoch: datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
+    rules = []
+    for result in report.results:
+        latencies = result.detection_latencies
+        fired = len(result.firings)
+        rules.append({
+            "rule": result.rule.name,
+            "severity": result.rule.severity.value,
+            "condition": f"{result.rule.signal} {result.rule.operator} {result.rule.threshold:g}",
+            "for_seconds": result.rule.for_seconds,
+            "fired": fired,
+            "true_positives": result.true_positives,
+            "false_positives": result.false_positives,
+            "precision": round(result.true_positives / fired, 3) if fired else None,
+            "detected_incidents": result.detected_incidents,
+            "missed_incidents": result.missed_incidents,
+            "detection_latency_seconds": {
+                "median": percentile(latencies, 50),
+                "p90": percentile(latencies, 90),
+                "max": max(latencies)
+            } if latencies else None,
+            "firing_minutes": round(result.firing_seconds / 60, 1),
+            "firings": [{"start": iso(s), "end": iso(e)} for s, e in result.firings[:max_firings]]
+        })
+    return {
+        "service": report.service,
+        "slo_target": report.slo_target,
+        "history": {"start": iso(report.start), "end": iso(report.end), "samples": report.samples},
+        "incidents": {
+            "source": report.incident_source,
+            "count": len(report.incidents),
+            "periods": [{"start": iso(s), "end": iso(e)} for s, e in report.incidents[:max_firings]]
+        },
+        "rules": rules,
+        "skipped": report.skipped
+    }
+
+
+def format_backtest(report: BacktestReport, output_format: str) -> str:
+    """Format a backtest report"""
+    if output_format in ("json", "yaml"):
+        return format_output(backtest_to_dict(report), output_format, "prometheus")
+
+    def minutes(seconds: float) -> str:
+        return f"{seconds / 60:.0f}m"
+
+    lines = [
+        "=" * 78,
+        f"Alert Backtest: {report.service} (SLO {report.slo_target}%)",
+        "=" * 78,
+        f"History:   {format_timestamp(report.start)} to {format_timestamp(report.end)} UTC "
+        f"({report.samples:,} samples)",
+        f"Incidents: {len(report.incidents)} ({report.incident_source})",
+        "",
+        f"{'Rule':<36} {'Fired':>5} {'TP':>4} {'FP':>4} {'Det':>4} {'Miss':>4}  Latency p50/max",
+        "-" * 78
+    ]
+    for result in report.results:
+        latencies = result.detection_latencies
+        latency = f"{minutes(percentile(latencies, 50))}/{minutes(max(latencies))}" if latencies else "-"
+        lines.append(f"{result.rule.name[:36]:<36} {len(result.firings):>5} {result.true_positives:>4} "
+                     f"{result.false_positives:>4} {result.detected_incidents:>4} {result.missed_incidents:>4}  "
+                     f"{latency}")
+
+    noisy = [r for r in report.results if r.false_positives > r.true_positives]
+    if noisy:
+        lines.extend(["", "Noisiest rules (more false than true positives):"])
+        for result in sorted(noisy, key=lambda r: -r.false_positives)[:5]:
+            first = ", ".join(format_timestamp(s) for s, _ in result.firings[:3])
+            lines.append(f"  {result.rule.name}: {result.false_positives} false positives (first: {first})")
+
+    if report.skipped:
+        lines.extend(["", "Not backtested:"])
+        for name, reason in report.skipped.items():
+            lines.append(f"  {name}: {reason}")
+
+    lines.append("=" * 78)
+    return "\n".join(lines)
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -839,6 +1333,12 @@ Examples:
   # Include runbook links
   %(prog)s --service payment-api --runbook-url https://runbooks.example.com --output yaml
 
+  # Backtest the rules against three months of per-minute history
+  %(prog)s --service payment-api --severity critical,warning,info --backtest history.csv --output text
+
+  # Backtest against labelled incidents (CSV with start,end columns)
+  %(prog)s --service payment-api --backtest history.csv --incidents incidents.csv --output json
+
 Alert Types Generated:
   - Service down (critical)
   - Multi-burn-rate SLO alerts (critical/warning)
@@ -899,6 +1399,27 @@ Platforms:
         help="Base URL for runbook links"
     )
 
+    parser.add_argument(
+        "--backtest",
+        metavar="HISTORY",
+        help="Replay metric history (CSV or JSON) through the rules and report firings instead of "
+             "emitting them"
+    )
+
+    parser.add_argument(
+        "--incidents",
+        help="Labelled incidents for --backtest (CSV with start,end columns, or JSON list); "
+             "default: an incident column in the history, else sustained error budget burn"
+    )
+
+    parser.add_argument(
+        "--incident-burn-rate",
+        type=float,
+        default=DEFAULT_INCIDENT_BURN_RATE,
+        help=f"Burn rate over {INCIDENT_WINDOW_SECONDS // 60}m that counts as an incident when none are "
+             f"labelled (default: {DEFAULT_INCIDENT_BURN_RATE})"
+    )
+
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -939,6 +1460,20 @@ Platforms:
             runbook_base=args.runbook_url
         )
 
+        if args.backtest:
+            history = MetricHistory.load(args.backtest, service=args.service)
+            incidents = load_incidents(args.incidents) if args.incidents else None
+            backtester = AlertBacktester(history, args.slo_target, incidents=incidents,
+                                         incident_burn_rate=args.incident_burn_rate)
+            output = format_backtest(backtester.run(config), args.output)
+            if args.file:
+                with open(args.file, "w") as f:
+                    f.write(output)
+                logger.info(f"Backtest report written to {args.file}")
+            else:
+                print(output)
+            return 0
+
         # Generate platform-specific output
         platform = Platform(args.platform)
         if platform == Platform.PROMETHEUS:
@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+"""
+Catalog Generator
+Generate dashboards and alert rules for every service in a service inventory.
+
+Features:
+- YAML or CSV service inventory (one entry per service)
+- Any mix of dashboard platforms (Grafana, DataDog, CloudWatch, New Relic)
+  and alert platforms (Prometheus, DataDog, CloudWatch, PagerDuty, New Relic)
+- Worker pool across services
+- Incremental: services whose inventory entry, options and generator code are
+  unchanged since the last run are skipped
+- Atomic writes, and files whose content is unchanged are not rewritten, so
+  regenerating the fleet only touches files that actually differ
+
+Uses dashboard_generator.py and alert_rule_generator.py from this directory.
+Standard library only; PyYAML is used for YAML inventories when installed,
+otherwise a built-in reader handles the inventory format shown below.
+
+Inventory (YAML):
+    services:
+      - name: payment-api
+        type: api
+        slo_target: 99.95
+        dashboards: [grafana, datadog]
+        alerts: [prometheus]
+      - name: orders-db
+        type: database
+
+Inventory (CSV, list fields separated by ';'):
+    name,type,slo_target,dashboards,alerts
+    payment-api,api,99.95,grafana;datadog,prometheus
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import alert_rule_generator as alerts
+import dashboard_generator as dashboards
+
+try:
+    import yaml
+    HAS_YAML = True
+except ImportError:  # pragma: no cover - exercised when PyYAML is absent
+    yaml = None
+    HAS_YAML = False
+
+__version__ = "1.0.0"
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+# Manifest of generated files and input hashes, kept in the output directory
+MANIFEST_NAME = ".catalog-manifest.json"
+# Bump when the manifest layout changes
+MANIFEST_FORMAT = 1
+
+# Services handed to a worker process per dispatch
+SERVICES_PER_CHUNK = 16
+
+# Inventory fields that hold lists of platforms or severities
+LIST_FIELDS = ("dashboards", "alerts", "severity")
+
+# Service names become directory names
+SERVICE_NAME_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]*$')
+
+ALERT_GENERATORS = {
+    alerts.Platform.PROMETHEUS: alerts.PrometheusAlertGenerator,
+    alerts.Platform.DATADOG: alerts.DataDogAlertGenerator,
+    alerts.Platform.CLOUDWATCH: alerts.CloudWatchAlertGenerator,
+    alerts.Platform.PAGERDUTY: alerts.PagerDutyAlertGenerator,
+    alerts.Platform.NEWRELIC: alerts.NewRelicAlertGenerator,
+}
+
+
+@dataclass
+class ServiceEntry:
+    """One service from the inventory, with defaults applied"""
+    name: str
+    service_type: str = "api"
+    slo_target: float = 99.9
+    dashboards: List[str] = field(default_factory=lambda: ["grafana"])
+    alerts: List[str] = field(default_factory=lambda: ["prometheus"])
+    severity: List[str] = field(default_factory=lambda: ["critical", "warning"])
+    namespace: str = ""
+    runbook_url: str = ""
+
+    def outputs(self) -> List[str]:
+        """Paths of the files generated for this service, relative to the output directory"""
+        files = [f"{self.name}/dashboard-{platform}.json" for platform in self.dashboards]
+        for platform in self.alerts:
+            extension = "yaml" if platform == alerts.Platform.PROMETHEUS.value else "json"
+            files.append(f"{self.name}/alerts-{platform}.{extension}")
+        return files
+
+    def fingerprint(self, generator_digest: str) -> str:
+        """Hash of everything the generated files depend on"""
+        payload = json.dumps([generator_digest, self.__dict__], sort_keys=True).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+
+@dataclass
+class CatalogResult:
+    """Summary of a catalog run"""
+    services: int = 0
+    generated: int = 0
+    skipped: int = 0
+    files_written: int = 0
+    files_unchanged: int = 0
+    files_removed: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+
+def _parse_scalar(value: str) -> Any:
+    """Scalar or flow list from the built-in YAML reader"""
+    value = value.strip()
+    if value.startswith('[') and value.endswith(']'):
+        return [_parse_scalar(item) for item in value[1:-1].split(',') if item.strip()]
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+        return value[1:-1]
+    try:
+        return float(value) if '.' in value else int(value)
+    except ValueError:
+        return value
+
+
+def parse_simple_yaml(text: str) -> List[Dict[str, Any]]:
+    """
+    Read an inventory without PyYAML: a list of flat mappings, optionally under
+    a top-level `services:` key. Values may be scalars, flow lists ([a, b]) or
+    block lists (indented `- item` lines under an empty key).
+    """
+    entries: List[Dict[str, Any]] = []
+    current: Optional[Dict[str, Any]] = None
+    list_key = None
+    item_indent = None
+
+    for lineno, raw in enumerate(text.splitlines(), 1):
+        line = raw.split(' #', 1)[0].rstrip() if not raw.lstrip().startswith('#') else ''
+        if not line.strip():
+            continue
+        indent = len(line) - len(line.lstrip())
+        content = line.strip()
+
+        if indent == 0 and content.endswith(':') and content[:-1] in ('services', 'catalog'):
+            continue
+
+        if content.startswith('- ') or content == '-':
+            body = content[1:].strip()
+            if list_key is not None and current is not None and indent > item_indent:
+                current[list_key].append(_parse_scalar(body))
+                continue
+            current = {}
+            entries.append(current)
+            item_indent = indent
+            list_key = None
+            if not body:
+                continue
+            content = body
+
+        if current is None or ':' not in content:
+            raise ValueError(f"Line {lineno}: expected 'key: value' inside a service entry")
+        key, _, value = content.partition(':')
+        key = key.strip()
+        if value.strip():
+            current[key] = _parse_scalar(value)
+            list_key = None
+        else:
+            current[key] = []
+            list_key = key
+
+    return entries
+
+
+def load_inventory(filepath: str) -> List[Dict[str, Any]]:
+    """Load raw inventory entries from YAML, JSON or CSV"""
+    with open(filepath, 'r', newline='') as f:
+        text = f.read()
+
+    if filepath.endswith('.csv'):
+        return [dict(row) for row in csv.DictReader(text.splitlines())]
+    if filepath.endswith('.json'):
+        data = json.loads(text)
+    elif HAS_YAML:
+        data = yaml.safe_load(text)
+    else:
+        return parse_simple_yaml(text)
+
+    if isinstance(data, dict):
+        data = data.get('services', data.get('catalog', []))
+    if not isinstance(data, list):
+        raise ValueError(f"{filepath}: expected a list of services")
+    return data
+
+
+def build_entry(raw: Dict[str, Any], defaults: ServiceEntry) -> ServiceEntry:
+    """Validate one raw inventory entry and fill in defaults"""
+    name = str(raw.get('name') or raw.get('service') or '').strip()
+    if not SERVICE_NAME_PATTERN.match(name):
+        raise ValueError(f"invalid service name {name!r}")
+
+    values: Dict[str, Any] = {}
+    for key in LIST_FIELDS:
+        value = raw.get(key)
+        if value in (None, ''):
+            continue
+        if isinstance(value, str):
+            value = re.split(r'[;\s,]+', value.strip())
+        values[key] = [str(item).strip().lower() for item in value if str(item).strip()]
+
+    entry = ServiceEntry(
+        name=name,
+        service_type=str(raw.get('type') or defaults.service_type).lower(),
+        slo_target=float(raw.get('slo_target') or defaults.slo_target),
+        dashboards=values.get('dashboards', defaults.dashboards),
+        alerts=values.get('alerts', defaults.alerts),
+        severity=values.get('severity', defaults.severity),
+        namespace=str(raw.get('namespace') or defaults.namespace),
+        runbook_url=str(raw.get('runbook_url') or defaults.runbook_url)
+    )
+
+    # Fail here rather than in a worker so errors name the inventory entry
+    dashboards.ServiceType(entry.service_type)
+    for platform in entry.dashboards:
+        dashboards.Platform(platform)
+    for platform in entry.alerts:
+        alerts.Platform(platform)
+    for severity in entry.severity:
+        alerts.Severity(severity)
+    if not 0 < entry.slo_target < 100:
+        raise ValueError(f"slo_target must be between 0 and 100, got {entry.slo_target}")
+    return entry
+
+
+def generator_digest() -> str:
+    """Hash of the generator sources, so code changes regenerate every service"""
+    digest = hashlib.sha256(__version__.encode('utf-8'))
+    for module in (dashboards, alerts):
+        with open(module.__file__, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def render_service(entry: ServiceEntry) -> Dict[str, str]:
+    """Generate every file for a service: relative path -> content"""
+    rendered = {}
+    files = iter(entry.outputs())
+
+    for platform in entry.dashboards:
+        builder = dashboards.DashboardBuilder(
+            service=entry.name,
+            service_type=dashboards.ServiceType(entry.service_type),
+            platform=dashboards.Platform(platform)
+        )
+        builder.build_for_service_type(entry.namespace)
+        rendered[next(files)] = dashboards.format_output(builder.generate(), "json") + "\n"
+
+    if entry.alerts:
+        config = alerts.generate_all_alerts(
+            service=entry.name,
+            slo_target=entry.slo_target,
+            severities=[alerts.Severity(s) for s in entry.severity],
+            runbook_base=entry.runbook_url
+        )
+        for platform in entry.alerts:
+            platform_enum = alerts.Platform(platform)
+            output_format = "yaml" if platform_enum == alerts.Platform.PROMETHEUS else "json"
+            output_config = ALERT_GENERATORS[platform_enum].generate_config(config)
+            rendered[next(files)] = alerts.format_output(output_config, output_format, platform) + "\n"
+
+    return rendered
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """Atomically replace path with content unless it already holds it; True if written"""
+    data = content.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_file = path.with_name(f".{path.name}.tmp.{os.getpid()}")
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, path)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+    return True
+
+
+def generate_service(entry: ServiceEntry, output_dir: str) -> Tuple[str, int, int, Optional[str]]:
+    """Worker task: render and write one service; (name, written, unchanged, error)"""
+    try:
+        written = unchanged = 0
+        for relpath, content in render_service(entry).items():
+            if write_if_changed(Path(output_dir) / relpath, content):
+                written += 1
+            else:
+                unchanged += 1
+        return entry.name, written, unchanged, None
+    except Exception as e:
+        return entry.name, 0, 0, f"{type(e).__name__}: {e}"
+
+
+def load_manifest(output_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """Per-service fingerprints and files from the previous run"""
+    try:
+        with open(output_dir / MANIFEST_NAME, 'r') as f:
+            payload = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable manifest: {e}")
+        return {}
+    if payload.get('format') != MANIFEST_FORMAT:
+        return {}
+    return payload.get('services', {})
+
+
+def save_manifest(output_dir: Path, services: Dict[str, Dict[str, Any]]) -> None:
+    """Atomically write the manifest"""
+    payload = {'format': MANIFEST_FORMAT, 'generator': __version__,
+               'services': dict(sorted(services.items()))}
+    write_if_changed(output_dir / MANIFEST_NAME, json.dumps(payload, indent=1) + "\n")
+
+
+def remove_outputs(output_dir: Path, relpaths: List[str]) -> int:
+    """Delete generated files (and service directories left empty); number removed"""
+    removed = 0
+    for relpath in relpaths:
+        path = output_dir / relpath
+        try:
+            path.unlink()
+            removed += 1
+        except FileNotFoundError:
+            continue
+        try:
+            path.parent.rmdir()
+        except OSError:
+            pass
+    return removed
+
+
+def run_catalog(entries: List[ServiceEntry], output_dir: str, jobs: int = 1,
+                force: bool = False, prune: bool = False, retain: Tuple[str, ...] = ()) -> CatalogResult:
+    """
+    Generate outputs for every entry, skipping services whose inputs are unchanged.
+    With prune, outputs of services missing from entries are deleted, except those
+    named in retain (e.g. inventory entries that failed validation).
+    """
+    started = time.perf_counter()
+    out = Path(output_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    result = CatalogResult(services=len(entries))
+
+    previous = load_manifest(out)
+    digest = generator_digest()
+    manifest: Dict[str, Dict[str, Any]] = {}
+    pending: List[ServiceEntry] = []
+
+    for entry in entries:
+        fingerprint = entry.fingerprint(digest)
+        files = entry.outputs()
+        manifest[entry.name] = {'hash': fingerprint, 'files': files}
+        old = previous.get(entry.name)
+        if (not force and old and old.get('hash') == fingerprint
+                and all((out / relpath).is_file() for relpath in files)):
+            result.skipped += 1
+        else:
+            pending.append(entry)
+
+    if jobs > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            outcomes = list(executor.map(generate_service, pending, [output_dir] * len(pending),
+                                         chunksize=SERVICES_PER_CHUNK))
+    else:
+        outcomes = [generate_service(entry, output_dir) for entry in pending]
+
+    for name, written, unchanged, error in outcomes:
+        if error:
+            result.errors[name] = error
+            # Keep the old entry so the next run retries this service
+            if name in previous:
+                manifest[name] = {**previous[name], 'hash': None}
+            else:
+                del manifest[name]
+            continue
+        result.generated += 1
+        result.files_written += written
+        result.files_unchanged += unchanged
+        stale = set(previous.get(name, {}).get('files', [])) - set(manifest[name]['files'])
+        result.files_removed += remove_outputs(out, sorted(stale))
+
+    removed_services = [name for name in previous if name not in manifest and name not in retain]
+    for name in retain:
+        if name in previous and name not in manifest:
+            manifest[name] = {**previous[name], 'hash': None}
+    if prune:
+        for name in removed_services:
+            result.files_removed += remove_outputs(out, previous[name].get('files', []))
+    else:
+        # Still tracked so a later --prune can remove them
+        for name in removed_services:
+            manifest[name] = {**previous[name], 'hash': None}
+
+    save_manifest(out, manifest)
+    result.elapsed_seconds = time.perf_counter() - started
+    return result
+
+
+def format_result(result: CatalogResult, output_format: str) -> str:
+    """Format the run summary"""
+    if output_format == "json":
+        return json.dumps(result.__dict__, indent=2)
+
+    lines = [
+        "=" * 60,
+        "Catalog Generation",
+        "=" * 60,
+        f"Services:        {result.services}",
+        f"Regenerated:     {result.generated}",
+        f"Unchanged:       {result.skipped} (inputs identical to last run)",
+        f"Files written:   {result.files_written}",
+        f"Files identical: {result.files_unchanged}",
+        f"Files removed:   {result.files_removed}",
+        f"Elapsed:         {result.elapsed_seconds:.2f}s",
+    ]
+    if result.errors:
+        lines.extend(["", f"Errors ({len(result.errors)}):"])
+        for name, error in sorted(result.errors.items()):
+            lines.append(f"  {name}: {error}")
+    lines.append("=" * 60)
+    return "\n".join(lines)
+
+
+def split_list(value: str) -> List[str]:
+    return [item.strip().lower() for item in value.split(",") if item.strip()]
+
+
+def main():
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        description="Generate dashboards and alert rules for every service in an inventory",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Grafana dashboards and Prometheus alerts for every service
+  %(prog)s --inventory services.yaml --output-dir generated/
+
+  # Dashboards for three platforms, alerts for two, 8 workers
+  %(prog)s --inventory services.csv --output-dir generated/ \\
+      --dashboards grafana,datadog,cloudwatch --alerts prometheus,datadog --jobs 8
+
+  # Regenerate everything and delete outputs of services no longer in the inventory
+  %(prog)s --inventory services.yaml --output-dir generated/ --force --prune
+
+Output layout:
+  <output-dir>/<service>/dashboard-<platform>.json
+  <output-dir>/<service>/alerts-prometheus.yaml
+  <output-dir>/<service>/alerts-<platform>.json
+  <output-dir>/.catalog-manifest.json   (input hashes for incremental runs)
+
+Inventory fields (all but name optional; defaults from the flags below):
+  name, type, slo_target, dashboards, alerts, severity, namespace, runbook_url
+        """
+    )
+
+    parser.add_argument(
+        "--inventory", "-i",
+        required=True,
+        help="Service inventory (YAML, JSON or CSV)"
+    )
+
+    parser.add_argument(
+        "--output-dir", "-d",
+        required=True,
+        help="Directory for generated files"
+    )
+
+    parser.add_argument(
+        "--dashboards",
+        default="grafana",
+        help="Default comma-separated dashboard platforms (default: grafana)"
+    )
+
+    parser.add_argument(
+        "--alerts",
+        default="prometheus",
+        help="Default comma-separated alert platforms (default: prometheus)"
+    )
+
+    parser.add_argument(
+        "--severity",
+        default="critical,warning",
+        help="Default comma-separated alert severities (default: critical,warning)"
+    )
+
+    parser.add_argument(
+        "--slo-target",
+        type=float,
+        default=99.9,
+        help="Default SLO target percentage (default: 99.9)"
+    )
+
+    parser.add_argument(
+        "--runbook-url",
+        default="",
+        help="Default base URL for runbook links"
+    )
+
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=0,
+        help="Worker processes (default: 0 = one per CPU)"
+    )
+
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate every service even if its inputs are unchanged"
+    )
+
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="Delete outputs of services no longer in the inventory"
+    )
+
+    parser.add_argument(
+        "--output", "-o",
+        choices=["text", "json"],
+        default="text",
+        help="Summary format (default: text)"
+    )
+
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Enable verbose output"
+    )
+
+    parser.add_argument(
+        "--version",
+        action="version",
+        version=f"%(prog)s {__version__}"
+    )
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    try:
+        defaults = ServiceEntry(
+            name="",
+            slo_target=args.slo_target,
+            dashboards=split_list(args.dashboards),
+            alerts=split_list(args.alerts),
+            severity=split_list(args.severity),
+            runbook_url=args.runbook_url
+        )
+
+        entries = []
+        invalid = {}
+        seen = set()
+        for index, raw in enumerate(load_inventory(args.inventory), 1):
+            label = str(raw.get('name') or raw.get('service') or f"entry {index}")
+            try:
+                entry = build_entry(raw, defaults)
+            except (ValueError, TypeError) as e:
+                invalid[label] = str(e)
+                continue
+            if entry.name in seen:
+                invalid[label] = "duplicate service name"
+                continue
+            seen.add(entry.name)
+            entries.append(entry)
+
+        jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+        logger.info(f"Generating outputs for {len(entries)} services with {jobs} workers")
+        result = run_catalog(entries, args.output_dir, jobs=jobs, force=args.force, prune=args.prune,
+                             retain=tuple(invalid))
+        result.errors.update(invalid)
+
+        print(format_result(result, args.output))
+        return 1 if result.errors else 0
+
+    except Exception as e:
+        logger.error(f"Error generating catalog: {e}")
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
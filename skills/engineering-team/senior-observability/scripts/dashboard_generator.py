@@ -981,25 +981,25 @@ class DashboardBuilder:
         ]
         return self
 
-    def build_for_service_type(self) -> "DashboardBuilder":
-        """Add panels appropriate for the service type"""
+    def build_for_service_type(self, namespace: str = "") -> "DashboardBuilder":
+        """Add panels appropriate for the service type, optionally filtered to a namespace"""
         self.add_standard_variables()
 
         if self.service_type == ServiceType.API:
-            self.add_red_panels()
-            self.add_use_panels()
+            self.add_red_panels(namespace)
+            self.add_use_panels(namespace)
         elif self.service_type == ServiceType.DATABASE:
-            self.add_use_panels()
+            self.add_use_panels(namespace)
             self.add_database_panels()
         elif self.service_type == ServiceType.QUEUE:
-            self.add_use_panels()
+            self.add_use_panels(namespace)
             self.add_queue_panels()
         elif self.service_type == ServiceType.CACHE:
-            self.add_use_panels()
+            self.add_use_panels(namespace)
             self.add_cache_panels()
         elif self.service_type == ServiceType.WEB:
-            self.add_red_panels()
-            self.add_use_panels()
+            self.add_red_panels(namespace)
+            self.add_use_panels(namespace)
 
         return self
 
@@ -1211,7 +1211,7 @@ Platforms:
             platform=Platform(args.platform)
         )
 
-        builder.build_for_service_type()
+        builder.build_for_service_type(args.namespace)
         dashboard = builder.generate()
 
         # Format output
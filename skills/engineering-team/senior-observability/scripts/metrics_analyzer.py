@@ -9,24 +9,44 @@ Features:
 - Trend analysis (increasing, decreasing, stable, seasonal)
 - Correlation analysis between metrics
 - Cardinality analysis for high-cardinality metric optimization
+- Online mode: anomaly detection on an unbounded stream (stdin or a growing
+  file) with O(1) memory per series (Welford, EWMA, P-square quantiles)
 - Actionable recommendations
 
-Standard library only - no external dependencies required.
+Series are stored column-wise: epoch-nanosecond timestamps in an int64 array
+and values in a float64 array. Standard library only - no external
+dependencies required. When NumPy is installed, statistics and anomaly
+detection run vectorized over the same buffers without copying.
 """
 
 import argparse
+import bisect
 import csv
+import hashlib
+import heapq
 import json
 import logging
 import math
+import operator
+import os
+import re
 import sys
-from collections import defaultdict
+import time
+from array import array
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
 
-__version__ = "1.0.0"
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:  # pragma: no cover - exercised when NumPy is absent
+    np = None
+    HAS_NUMPY = False
+
+__version__ = "1.1.0"
 
 # Configure logging
 logging.basicConfig(
@@ -61,14 +81,59 @@ class AnomalySeverity(Enum):
     LOW = "low"
 
 
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def datetime_to_ns(ts: datetime) -> int:
+    """Convert a datetime to epoch nanoseconds; naive datetimes are taken as UTC"""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ((ts - EPOCH) // ONE_MICROSECOND) * 1000
+
+
+def ns_to_datetime(ns: int) -> datetime:
+    """Convert epoch nanoseconds to a UTC datetime"""
+    return EPOCH + timedelta(microseconds=ns // 1000)
+
+
+def parse_timestamp_ns(value: Any) -> Optional[int]:
+    """Parse an ISO 8601 timestamp to epoch nanoseconds (None if unparseable)"""
+    try:
+        return datetime_to_ns(datetime.fromisoformat(str(value).replace('Z', '+00:00')))
+    except (ValueError, TypeError):
+        return None
+
+
 @dataclass
 class MetricData:
-    """Single metric time series"""
+    """
+    Single metric time series, stored column-wise.
+
+    timestamps holds epoch nanoseconds (array 'q'), values holds floats
+    (array 'd'). Lists of datetimes/floats are converted on construction.
+    """
     name: str
-    timestamps: List[datetime]
-    values: List[float]
+    timestamps: array
+    values: array
     labels: Dict[str, str] = field(default_factory=dict)
 
+    def __post_init__(self):
+        if not isinstance(self.timestamps, array):
+            self.timestamps = array('q', (
+                datetime_to_ns(ts) if isinstance(ts, datetime) else int(ts)
+                for ts in self.timestamps
+            ))
+        if not isinstance(self.values, array):
+            self.values = array('d', self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def timestamp_at(self, index: int) -> datetime:
+        """Timestamp of one sample as a UTC datetime"""
+        return ns_to_datetime(self.timestamps[index])
+
 
 @dataclass
 class BaselineStats:
@@ -130,6 +195,8 @@ class CardinalityAnalysis:
     high_cardinality_labels: List[str]
     estimated_memory_mb: float
     recommendations: List[str]
+    # (label, value, series) for the label values behind the most series
+    top_label_values: List[Tuple[str, str, int]] = field(default_factory=list)
 
 
 @dataclass
@@ -144,47 +211,100 @@ class AnalysisReport:
     cardinality: List[CardinalityAnalysis]
     recommendations: List[str]
     generated_at: datetime
+    # Whole-input totals from streaming cardinality analysis
+    cardinality_summary: Dict[str, Any] = field(default_factory=dict)
 
 
 class MetricsParser:
-    """Parse metrics from various file formats"""
+    """Parse metrics from various file formats into columnar series"""
+
+    TIMESTAMP_FIELDS = ('timestamp', 'time', 'date')
+
+    @staticmethod
+    def _parse_timestamps(raw: Iterable[Any]) -> array:
+        """Parse a timestamp column, converting each distinct string once"""
+        cache: Dict[Any, int] = {}
+        out = array('q')
+        for value in raw:
+            ns = cache.get(value)
+            if ns is None:
+                ns = parse_timestamp_ns(value)
+                if ns is None:
+                    ns = time.time_ns()  # Unparseable: stamp with the read time, uncached
+                else:
+                    cache[value] = ns
+            out.append(ns)
+        return out
+
+    @staticmethod
+    def _numeric_column(name: str, timestamps: array, raw: Sequence[Any],
+                        labels: Optional[Dict[str, str]] = None) -> Optional[Tuple[int, MetricData]]:
+        """
+        Convert one raw column to (first numeric row, series), or None if it has no numeric cells.
+
+        Whole columns convert in one pass; columns with blank or non-numeric
+        cells fall back to per-cell conversion that drops those samples.
+        """
+        try:
+            values = array('d', map(float, raw))
+            if values:
+                return 0, MetricData(name=name, timestamps=timestamps, values=values, labels=labels or {})
+            return None
+        except (ValueError, TypeError):
+            pass
+
+        first_row = None
+        kept_ts = array('q')
+        values = array('d')
+        for row, (ts, cell) in enumerate(zip(timestamps, raw)):
+            try:
+                val = float(cell)
+            except (ValueError, TypeError):
+                continue
+            if first_row is None:
+                first_row = row
+            kept_ts.append(ts)
+            values.append(val)
+
+        if first_row is None:
+            return None
+        return first_row, MetricData(name=name, timestamps=kept_ts, values=values, labels=labels or {})
 
     @staticmethod
     def parse_csv(filepath: str) -> List[MetricData]:
-        """Parse metrics from CSV file"""
-        metrics_dict: Dict[str, MetricData] = {}
+        """Parse metrics from CSV file (one column per metric)"""
+        with open(filepath, 'r', newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if not header:
+                return []
+            rows = [row for row in reader if row]
+
+        # Transpose to columns, padding short rows like csv.DictReader does
+        width = len(header)
+        for row in rows:
+            if len(row) < width:
+                row.extend([None] * (width - len(row)))
+        columns = list(zip(*rows)) if rows else [()] * width
+
+        ts_index = next(
+            (header.index(name) for name in MetricsParser.TIMESTAMP_FIELDS if name in header),
+            None
+        )
+        timestamps = MetricsParser._parse_timestamps(
+            columns[ts_index] if ts_index is not None else [''] * len(rows)
+        )
 
-        with open(filepath, 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                # Get timestamp
-                ts_str = row.get('timestamp', row.get('time', row.get('date', '')))
-                try:
-                    ts = datetime.fromisoformat(ts_str.replace('Z', '+00:00'))
-                except (ValueError, TypeError):
-                    ts = datetime.now()
-
-                # Process each numeric column as a metric
-                for key, value in row.items():
-                    if key in ('timestamp', 'time', 'date'):
-                        continue
-
-                    try:
-                        val = float(value)
-                    except (ValueError, TypeError):
-                        continue
-
-                    if key not in metrics_dict:
-                        metrics_dict[key] = MetricData(
-                            name=key,
-                            timestamps=[],
-                            values=[]
-                        )
-
-                    metrics_dict[key].timestamps.append(ts)
-                    metrics_dict[key].values.append(val)
-
-        return list(metrics_dict.values())
+        # Series are ordered by the first row with a numeric cell, then by column
+        metrics = []
+        for index, key in enumerate(header):
+            if key in MetricsParser.TIMESTAMP_FIELDS:
+                continue
+            converted = MetricsParser._numeric_column(key, timestamps, columns[index])
+            if converted is not None:
+                metrics.append((converted[0], index, converted[1]))
+        metrics.sort(key=lambda item: item[:2])
+        return [metric for _, _, metric in metrics]
 
     @staticmethod
     def parse_json(filepath: str) -> List[MetricData]:
@@ -192,8 +312,6 @@ class MetricsParser:
         with open(filepath, 'r') as f:
             data = json.load(f)
 
-        metrics_dict: Dict[str, MetricData] = {}
-
         # Handle different JSON formats
         if isinstance(data, list):
             records = data
@@ -202,36 +320,33 @@ class MetricsParser:
         else:
             records = []
 
-        for record in records:
-            # Get timestamp
-            ts_str = record.get('timestamp', record.get('time', ''))
-            try:
-                ts = datetime.fromisoformat(str(ts_str).replace('Z', '+00:00'))
-            except (ValueError, TypeError):
-                ts = datetime.now()
+        # Gather raw columns keyed by field, then convert each in bulk
+        raw_ts = [record.get('timestamp', record.get('time', '')) for record in records]
+        timestamps = MetricsParser._parse_timestamps(raw_ts)
+        columns: Dict[str, Tuple[array, list, list]] = {}
 
-            # Process each numeric field
+        for index, (ts, record) in enumerate(zip(timestamps, records)):
             for key, value in record.items():
                 if key in ('timestamp', 'time', 'date', 'labels'):
                     continue
-
-                try:
-                    val = float(value)
-                except (ValueError, TypeError):
-                    continue
-
-                if key not in metrics_dict:
-                    metrics_dict[key] = MetricData(
-                        name=key,
-                        timestamps=[],
-                        values=[],
-                        labels=record.get('labels', {})
-                    )
-
-                metrics_dict[key].timestamps.append(ts)
-                metrics_dict[key].values.append(val)
-
-        return list(metrics_dict.values())
+                column = columns.get(key)
+                if column is None:
+                    column = columns[key] = (array('q'), [], [])
+                column[0].append(ts)
+                column[1].append(value)
+                column[2].append(index)
+
+        # Series take the labels of, and are ordered by, their first numeric record
+        metrics = []
+        for key, (column_ts, raw, record_indices) in columns.items():
+            converted = MetricsParser._numeric_column(key, column_ts, raw)
+            if converted is not None:
+                first_row, metric = converted
+                first_record = records[record_indices[first_row]]
+                metric.labels = first_record.get('labels', {})
+                metrics.append((record_indices[first_row], list(first_record).index(key), metric))
+        metrics.sort(key=lambda item: item[:2])
+        return [metric for _, _, metric in metrics]
 
     @staticmethod
     def parse_file(filepath: str) -> List[MetricData]:
@@ -242,64 +357,85 @@ class MetricsParser:
             return MetricsParser.parse_csv(filepath)
 
 
+def as_numpy(values: Sequence[float]):
+    """View a float64 array as a NumPy array without copying"""
+    if isinstance(values, array) and values.typecode == 'd':
+        return np.frombuffer(values, dtype=np.float64)
+    return np.asarray(values, dtype=np.float64)
+
+
 class StatisticsCalculator:
-    """Calculate statistical measures"""
+    """Calculate statistical measures over float sequences or arrays"""
 
     @staticmethod
-    def mean(values: List[float]) -> float:
+    def mean(values: Sequence[float]) -> float:
         """Calculate mean"""
-        if not values:
+        if not len(values):
             return 0.0
+        if HAS_NUMPY:
+            return float(as_numpy(values).mean())
         return sum(values) / len(values)
 
     @staticmethod
-    def median(values: List[float]) -> float:
+    def median(values: Sequence[float]) -> float:
         """Calculate median"""
-        if not values:
+        if not len(values):
             return 0.0
-        sorted_vals = sorted(values)
-        n = len(sorted_vals)
-        mid = n // 2
-        if n % 2 == 0:
-            return (sorted_vals[mid - 1] + sorted_vals[mid]) / 2
-        return sorted_vals[mid]
+        return StatisticsCalculator.percentile_sorted(StatisticsCalculator.sort(values), 50)
 
     @staticmethod
-    def std_dev(values: List[float], mean: float = None) -> float:
+    def std_dev(values: Sequence[float], mean: float = None) -> float:
         """Calculate standard deviation"""
         if len(values) < 2:
             return 0.0
         if mean is None:
             mean = StatisticsCalculator.mean(values)
+        if HAS_NUMPY:
+            deltas = as_numpy(values) - mean
+            return math.sqrt(float(deltas @ deltas) / (len(values) - 1))
         variance = sum((x - mean) ** 2 for x in values) / (len(values) - 1)
         return math.sqrt(variance)
 
     @staticmethod
-    def percentile(values: List[float], p: float) -> float:
-        """Calculate percentile (0-100)"""
-        if not values:
+    def sort(values: Sequence[float]) -> Sequence[float]:
+        """Return values sorted ascending (a NumPy array when available)"""
+        if HAS_NUMPY:
+            return np.sort(as_numpy(values))
+        return sorted(values)
+
+    @staticmethod
+    def percentile_sorted(sorted_vals: Sequence[float], p: float) -> float:
+        """Percentile (0-100) of already sorted values, linearly interpolated"""
+        if not len(sorted_vals):
             return 0.0
-        sorted_vals = sorted(values)
         k = (len(sorted_vals) - 1) * (p / 100)
         f = math.floor(k)
         c = math.ceil(k)
         if f == c:
-            return sorted_vals[int(k)]
+            return float(sorted_vals[int(k)])
         d0 = sorted_vals[int(f)] * (c - k)
         d1 = sorted_vals[int(c)] * (k - f)
-        return d0 + d1
+        return float(d0 + d1)
+
+    @staticmethod
+    def percentile(values: Sequence[float], p: float) -> float:
+        """Calculate percentile (0-100)"""
+        if not len(values):
+            return 0.0
+        return StatisticsCalculator.percentile_sorted(StatisticsCalculator.sort(values), p)
 
     @staticmethod
-    def iqr(values: List[float]) -> float:
+    def iqr(values: Sequence[float]) -> float:
         """Calculate interquartile range"""
-        q75 = StatisticsCalculator.percentile(values, 75)
-        q25 = StatisticsCalculator.percentile(values, 25)
+        sorted_vals = StatisticsCalculator.sort(values)
+        q75 = StatisticsCalculator.percentile_sorted(sorted_vals, 75)
+        q25 = StatisticsCalculator.percentile_sorted(sorted_vals, 25)
         return q75 - q25
 
     @staticmethod
-    def coefficient_of_variation(values: List[float]) -> float:
+    def coefficient_of_variation(values: Sequence[float]) -> float:
         """Calculate coefficient of variation (volatility)"""
-        if not values:
+        if not len(values):
             return 0.0
         mean = StatisticsCalculator.mean(values)
         if mean == 0:
@@ -316,7 +452,7 @@ class BaselineCalculator:
         """Calculate baseline statistics for a metric"""
         values = metric.values
 
-        if not values:
+        if not len(values):
             return BaselineStats(
                 metric_name=metric.name,
                 count=0,
@@ -335,19 +471,24 @@ class BaselineCalculator:
         mean = StatisticsCalculator.mean(values)
         std_dev = StatisticsCalculator.std_dev(values, mean)
 
+        # Sort once and read every order statistic from the sorted copy
+        sorted_vals = StatisticsCalculator.sort(values)
+        pct = StatisticsCalculator.percentile_sorted
+        p50 = pct(sorted_vals, 50)
+
         return BaselineStats(
             metric_name=metric.name,
             count=len(values),
             mean=round(mean, 4),
-            median=round(StatisticsCalculator.median(values), 4),
+            median=round(p50, 4),
             std_dev=round(std_dev, 4),
-            min_val=round(min(values), 4),
-            max_val=round(max(values), 4),
-            p50=round(StatisticsCalculator.percentile(values, 50), 4),
-            p90=round(StatisticsCalculator.percentile(values, 90), 4),
-            p95=round(StatisticsCalculator.percentile(values, 95), 4),
-            p99=round(StatisticsCalculator.percentile(values, 99), 4),
-            iqr=round(StatisticsCalculator.iqr(values), 4)
+            min_val=round(float(sorted_vals[0]), 4),
+            max_val=round(float(sorted_vals[-1]), 4),
+            p50=round(p50, 4),
+            p90=round(pct(sorted_vals, 90), 4),
+            p95=round(pct(sorted_vals, 95), 4),
+            p99=round(pct(sorted_vals, 99), 4),
+            iqr=round(pct(sorted_vals, 75) - pct(sorted_vals, 25), 4)
         )
 
 
@@ -369,22 +510,30 @@ class AnomalyDetector:
         if std_dev == 0:
             return anomalies
 
-        for i, (ts, val) in enumerate(zip(metric.timestamps, values)):
-            z_score = abs(val - mean) / std_dev
-            if z_score >= threshold:
-                severity = AnomalySeverity.HIGH if z_score >= threshold * 2 else \
-                           AnomalySeverity.MEDIUM if z_score >= threshold * 1.5 else \
-                           AnomalySeverity.LOW
-
-                anomalies.append(Anomaly(
-                    metric_name=metric.name,
-                    timestamp=ts,
-                    value=round(val, 4),
-                    expected_value=round(mean, 4),
-                    deviation=round(z_score, 2),
-                    severity=severity,
-                    method="zscore"
-                ))
+        if HAS_NUMPY:
+            z_scores = np.abs(as_numpy(values) - mean) / std_dev
+            indices = np.flatnonzero(z_scores >= threshold)
+            outliers = zip(indices.tolist(), z_scores[indices].tolist())
+        else:
+            outliers = (
+                (i, z) for i, z in enumerate(abs(val - mean) / std_dev for val in values)
+                if z >= threshold
+            )
+
+        for i, z_score in outliers:
+            severity = AnomalySeverity.HIGH if z_score >= threshold * 2 else \
+                       AnomalySeverity.MEDIUM if z_score >= threshold * 1.5 else \
+                       AnomalySeverity.LOW
+
+            anomalies.append(Anomaly(
+                metric_name=metric.name,
+                timestamp=metric.timestamp_at(i),
+                value=round(values[i], 4),
+                expected_value=round(mean, 4),
+                deviation=round(z_score, 2),
+                severity=severity,
+                method="zscore"
+            ))
 
         return anomalies
 
@@ -397,8 +546,9 @@ class AnomalyDetector:
         if len(values) < 4:
             return anomalies
 
-        q25 = StatisticsCalculator.percentile(values, 25)
-        q75 = StatisticsCalculator.percentile(values, 75)
+        sorted_vals = StatisticsCalculator.sort(values)
+        q25 = StatisticsCalculator.percentile_sorted(sorted_vals, 25)
+        q75 = StatisticsCalculator.percentile_sorted(sorted_vals, 75)
         iqr = q75 - q25
 
         if iqr == 0:
@@ -406,28 +556,244 @@ class AnomalyDetector:
 
         lower_bound = q25 - multiplier * iqr
         upper_bound = q75 + multiplier * iqr
-        median = StatisticsCalculator.median(values)
-
-        for ts, val in zip(metric.timestamps, values):
-            if val < lower_bound or val > upper_bound:
-                deviation = abs(val - median) / iqr if iqr > 0 else 0
-                severity = AnomalySeverity.HIGH if deviation >= 3 else \
-                           AnomalySeverity.MEDIUM if deviation >= 2 else \
-                           AnomalySeverity.LOW
-
-                anomalies.append(Anomaly(
-                    metric_name=metric.name,
-                    timestamp=ts,
-                    value=round(val, 4),
-                    expected_value=round(median, 4),
-                    deviation=round(deviation, 2),
-                    severity=severity,
-                    method="iqr"
-                ))
+        median = StatisticsCalculator.percentile_sorted(sorted_vals, 50)
+
+        if HAS_NUMPY:
+            arr = as_numpy(values)
+            indices = np.flatnonzero((arr < lower_bound) | (arr > upper_bound))
+            outliers = zip(indices.tolist(), (np.abs(arr[indices] - median) / iqr).tolist())
+        else:
+            outliers = (
+                (i, abs(val - median) / iqr)
+                for i, val in enumerate(values) if val < lower_bound or val > upper_bound
+            )
+
+        for i, deviation in outliers:
+            severity = AnomalySeverity.HIGH if deviation >= 3 else \
+                       AnomalySeverity.MEDIUM if deviation >= 2 else \
+                       AnomalySeverity.LOW
+
+            anomalies.append(Anomaly(
+                metric_name=metric.name,
+                timestamp=metric.timestamp_at(i),
+                value=round(values[i], 4),
+                expected_value=round(median, 4),
+                deviation=round(deviation, 2),
+                severity=severity,
+                method="iqr"
+            ))
 
         return anomalies
 
 
+class P2Quantile:
+    """
+    Streaming quantile estimate using the P-square algorithm (Jain & Chlamtac).
+
+    Tracks five markers whose heights converge on the min, p/2, p, (1+p)/2
+    and max quantiles, so memory is constant regardless of stream length.
+    """
+
+    __slots__ = ('p', 'heights', 'positions', 'desired', 'increments')
+
+    def __init__(self, p: float):
+        self.p = p
+        self.heights: List[float] = []
+        self.positions = [1, 2, 3, 4, 5]
+        self.desired = [1.0, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5.0]
+        self.increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, x: float) -> None:
+        """Add one observation"""
+        q = self.heights
+        if len(q) < 5:
+            bisect.insort(q, x)
+            return
+
+        n = self.positions
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = bisect.bisect_right(q, x) - 1
+
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        # Move the middle markers toward their desired positions
+        for i in (1, 2, 3):
+            d = self.desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = q[i] + step / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+                    + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+                )
+                if not q[i - 1] < candidate < q[i + 1]:
+                    # Parabolic estimate left the bracket; fall back to linear
+                    candidate = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = candidate
+                n[i] += step
+
+    def value(self) -> float:
+        """Current estimate (exact while fewer than five observations)"""
+        if len(self.heights) < 5:
+            return StatisticsCalculator.percentile_sorted(self.heights, self.p * 100)
+        return self.heights[2]
+
+
+class OnlineSeries:
+    """Constant-memory running baseline for one series"""
+
+    QUANTILES = (25, 50, 75, 90, 95, 99)
+
+    __slots__ = ('count', 'mean', 'm2', 'ewma', 'ewm_var', 'min_val', 'max_val', 'quantiles')
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0  # Welford sum of squared deviations
+        self.ewma = 0.0
+        self.ewm_var = 0.0
+        self.min_val = math.inf
+        self.max_val = -math.inf
+        self.quantiles = {q: P2Quantile(q / 100) for q in OnlineSeries.QUANTILES}
+
+    def update(self, value: float, alpha: float) -> None:
+        """Fold one sample into every estimator"""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        if self.count == 1:
+            self.ewma = value
+        else:
+            diff = value - self.ewma
+            incr = alpha * diff
+            self.ewma += incr
+            self.ewm_var = (1 - alpha) * (self.ewm_var + diff * incr)
+
+        self.min_val = min(self.min_val, value)
+        self.max_val = max(self.max_val, value)
+        for estimator in self.quantiles.values():
+            estimator.add(value)
+
+    @property
+    def std_dev(self) -> float:
+        return math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def quantile(self, q: int) -> float:
+        return self.quantiles[q].value()
+
+
+class OnlineAnomalyDetector:
+    """
+    Detect anomalies sample by sample against running per-series baselines.
+
+    Each sample is scored against the baseline built from earlier samples and
+    then folded in. Methods: "zscore" (Welford mean/std over all history),
+    "ewma" (exponentially weighted mean/std, adapts to drift) and "iqr"
+    (P-square quartiles). Nothing is scored until a series has warmup samples.
+    """
+
+    METHODS = ("zscore", "ewma", "iqr")
+
+    def __init__(self, method: str = "zscore", threshold: float = 3.0, alpha: float = 0.1,
+                 warmup: int = 30, iqr_multiplier: float = 1.5):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown method: {method}. Available: {', '.join(self.METHODS)}")
+        self.method = method
+        self.threshold = threshold
+        self.alpha = alpha
+        self.warmup = max(warmup, 2)
+        self.iqr_multiplier = iqr_multiplier
+        self.series: Dict[str, OnlineSeries] = {}
+        self.samples = 0
+        self.anomaly_count = 0
+
+    def observe(self, name: str, timestamp_ns: int, value: float) -> Optional[Anomaly]:
+        """Score one sample, update its series, and return an Anomaly if it is one"""
+        state = self.series.get(name)
+        if state is None:
+            state = self.series[name] = OnlineSeries()
+
+        anomaly = None
+        if state.count >= self.warmup:
+            anomaly = self._score(name, timestamp_ns, value, state)
+
+        state.update(value, self.alpha)
+        self.samples += 1
+        if anomaly:
+            self.anomaly_count += 1
+        return anomaly
+
+    def _score(self, name: str, timestamp_ns: int, value: float,
+               state: OnlineSeries) -> Optional[Anomaly]:
+        if self.method == "iqr":
+            q25, median, q75 = state.quantile(25), state.quantile(50), state.quantile(75)
+            iqr = q75 - q25
+            if iqr <= 0:
+                return None
+            lower = q25 - self.iqr_multiplier * iqr
+            upper = q75 + self.iqr_multiplier * iqr
+            if lower <= value <= upper:
+                return None
+            expected = median
+            deviation = abs(value - median) / iqr
+            severity = AnomalySeverity.HIGH if deviation >= 3 else \
+                       AnomalySeverity.MEDIUM if deviation >= 2 else \
+                       AnomalySeverity.LOW
+        else:
+            if self.method == "ewma":
+                expected, std_dev = state.ewma, math.sqrt(state.ewm_var)
+            else:
+                expected, std_dev = state.mean, state.std_dev
+            if std_dev == 0:
+                return None
+            deviation = abs(value - expected) / std_dev
+            if deviation < self.threshold:
+                return None
+            severity = AnomalySeverity.HIGH if deviation >= self.threshold * 2 else \
+                       AnomalySeverity.MEDIUM if deviation >= self.threshold * 1.5 else \
+                       AnomalySeverity.LOW
+
+        return Anomaly(
+            metric_name=name,
+            timestamp=ns_to_datetime(timestamp_ns),
+            value=round(value, 4),
+            expected_value=round(expected, 4),
+            deviation=round(deviation, 2),
+            severity=severity,
+            method=self.method
+        )
+
+    def baselines(self) -> List[BaselineStats]:
+        """Current running baselines, one per series"""
+        results = []
+        for name, state in self.series.items():
+            results.append(BaselineStats(
+                metric_name=name,
+                count=state.count,
+                mean=round(state.mean, 4),
+                median=round(state.quantile(50), 4),
+                std_dev=round(state.std_dev, 4),
+                min_val=round(state.min_val, 4),
+                max_val=round(state.max_val, 4),
+                p50=round(state.quantile(50), 4),
+                p90=round(state.quantile(90), 4),
+                p95=round(state.quantile(95), 4),
+                p99=round(state.quantile(99), 4),
+                iqr=round(state.quantile(75) - state.quantile(25), 4)
+            ))
+        return results
+
+
 class TrendAnalyzer:
     """Analyze metric trends"""
 
@@ -449,19 +815,32 @@ class TrendAnalyzer:
             )
 
         # Simple linear regression
-        x_vals = list(range(n))
-        x_mean = sum(x_vals) / n
-        y_mean = sum(values) / n
+        if HAS_NUMPY:
+            y_mean = float(as_numpy(values).mean())
+            x_dev = np.arange(n, dtype=np.float64) - (n - 1) / 2
+            y_dev = as_numpy(values) - y_mean
+            numerator = float(x_dev @ y_dev)
+            denominator = float(x_dev @ x_dev)
+            slope = numerator / denominator if denominator != 0 else 0
+
+            # R-squared calculation
+            residuals = y_dev - slope * x_dev
+            ss_res = float(residuals @ residuals)
+            ss_tot = float(y_dev @ y_dev)
+        else:
+            x_vals = list(range(n))
+            x_mean = sum(x_vals) / n
+            y_mean = sum(values) / n
 
-        numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_vals, values))
-        denominator = sum((x - x_mean) ** 2 for x in x_vals)
+            numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_vals, values))
+            denominator = sum((x - x_mean) ** 2 for x in x_vals)
 
-        slope = numerator / denominator if denominator != 0 else 0
+            slope = numerator / denominator if denominator != 0 else 0
 
-        # R-squared calculation
-        y_pred = [y_mean + slope * (x - x_mean) for x in x_vals]
-        ss_res = sum((y - yp) ** 2 for y, yp in zip(values, y_pred))
-        ss_tot = sum((y - y_mean) ** 2 for y in values)
+            # R-squared calculation
+            y_pred = [y_mean + slope * (x - x_mean) for x in x_vals]
+            ss_res = sum((y - yp) ** 2 for y, yp in zip(values, y_pred))
+            ss_tot = sum((y - y_mean) ** 2 for y in values)
         r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
 
         # Change percentage
@@ -533,6 +912,12 @@ class TrendAnalyzer:
         if n != len(y) or n < 2:
             return 0.0
 
+        if HAS_NUMPY:
+            x_dev = as_numpy(x) - as_numpy(x).mean()
+            y_dev = as_numpy(y) - as_numpy(y).mean()
+            denom = math.sqrt(float(x_dev @ x_dev)) * math.sqrt(float(y_dev @ y_dev))
+            return float(x_dev @ y_dev) / denom if denom != 0 else 0.0
+
         x_mean = sum(x) / n
         y_mean = sum(y) / n
 
@@ -547,65 +932,358 @@ class TrendAnalyzer:
 
 
 class CorrelationAnalyzer:
-    """Analyze correlations between metrics"""
+    """
+    Analyze correlations between metrics.
+
+    Every series is aligned once onto the union of all timestamps. When all
+    series cover the whole grid, the Pearson matrix is one standardized matrix
+    product; otherwise masked products give each pair's correlation over the
+    timestamps both series share. The matrix is produced in row blocks so
+    top-k/threshold selection never holds all N^2 pairs.
+    """
+
+    # Matrix cells computed per row block (bounds working memory)
+    BLOCK_CELLS = 4_000_000
+    # Pairs need at least this many shared timestamps
+    MIN_OVERLAP = 3
 
     @staticmethod
-    def analyze(metrics: List[MetricData]) -> List[CorrelationResult]:
-        """Analyze correlations between all metric pairs"""
-        results = []
+    def analyze(metrics: List[MetricData], top_k: Optional[int] = None,
+                min_correlation: float = 0.0) -> List[CorrelationResult]:
+        """
+        Analyze correlations between all metric pairs.
 
-        for i, metric_a in enumerate(metrics):
-            for metric_b in metrics[i+1:]:
-                # Align time series
-                aligned_a, aligned_b = CorrelationAnalyzer._align_series(metric_a, metric_b)
+        Without top_k, pairs are returned in (a, b) input order. With top_k,
+        only the k pairs with the largest |r| are kept, strongest first.
+        Pairs with |r| below min_correlation are dropped.
+        """
+        if top_k is not None and top_k <= 0:
+            raise ValueError(f"top_k must be at least 1, got {top_k}")
+        if len(metrics) < 2:
+            return []
 
-                if len(aligned_a) < 3:
-                    continue
+        if HAS_NUMPY:
+            candidates = CorrelationAnalyzer._numpy_pairs(metrics, top_k, min_correlation)
+        else:
+            candidates = CorrelationAnalyzer._python_pairs(metrics, min_correlation)
 
-                corr = TrendAnalyzer._simple_correlation(aligned_a, aligned_b)
+        if top_k is None:
+            pairs = list(candidates)
+        else:
+            # Min-heap keyed by |r|; ties keep the earlier pair
+            heap: List[Tuple[float, int, int, float]] = []
+            for i, j, corr in candidates:
+                item = (abs(corr), -i, -j, corr)
+                if len(heap) < top_k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+            pairs = [(-i, -j, corr) for _, i, j, corr in sorted(heap, reverse=True)]
+
+        return [CorrelationAnalyzer._result(metrics[i], metrics[j], corr) for i, j, corr in pairs]
 
-                # Determine strength
-                abs_corr = abs(corr)
-                if abs_corr >= 0.7:
-                    strength = "strong"
-                elif abs_corr >= 0.4:
-                    strength = "moderate"
-                elif abs_corr >= 0.2:
-                    strength = "weak"
-                else:
-                    strength = "none"
+    @staticmethod
+    def _result(metric_a: MetricData, metric_b: MetricData, corr: float) -> CorrelationResult:
+        """Classify one correlation coefficient"""
+        # Determine strength
+        abs_corr = abs(corr)
+        if abs_corr >= 0.7:
+            strength = "strong"
+        elif abs_corr >= 0.4:
+            strength = "moderate"
+        elif abs_corr >= 0.2:
+            strength = "weak"
+        else:
+            strength = "none"
 
-                direction = "positive" if corr > 0 else "negative"
+        direction = "positive" if corr > 0 else "negative"
 
-                results.append(CorrelationResult(
-                    metric_a=metric_a.name,
-                    metric_b=metric_b.name,
-                    correlation=round(corr, 4),
-                    strength=strength,
-                    direction=direction
-                ))
+        return CorrelationResult(
+            metric_a=metric_a.name,
+            metric_b=metric_b.name,
+            correlation=round(corr, 4),
+            strength=strength,
+            direction=direction
+        )
 
-        return results
+    @staticmethod
+    def _python_pairs(metrics: List[MetricData],
+                      min_correlation: float) -> Iterable[Tuple[int, int, float]]:
+        """Yield (i, j, r) per pair without NumPy, aligning each series once"""
+        series = [dict(zip(m.timestamps, m.values)) for m in metrics]
+        keys = [s.keys() for s in series]
+        count = len(metrics)
+
+        if all(k == keys[0] for k in keys):
+            # Shared grid: correlation is the dot product of unit-norm deviations
+            if len(keys[0]) < CorrelationAnalyzer.MIN_OVERLAP:
+                return
+            grid = list(keys[0])
+            unit = []
+            for s in series:
+                vals = [s[ts] for ts in grid]
+                mean = sum(vals) / len(vals)
+                devs = [v - mean for v in vals]
+                norm = math.sqrt(sum(d * d for d in devs))
+                unit.append([d / norm for d in devs] if norm and max(vals) != min(vals) else None)
+            for i in range(count):
+                for j in range(i + 1, count):
+                    if unit[i] is None or unit[j] is None:
+                        corr = 0.0
+                    else:
+                        corr = max(-1.0, min(1.0, sum(map(operator.mul, unit[i], unit[j]))))
+                    if abs(corr) >= min_correlation:
+                        yield i, j, corr
+            return
+
+        for i in range(count):
+            for j in range(i + 1, count):
+                common = keys[i] & keys[j]
+                if len(common) < CorrelationAnalyzer.MIN_OVERLAP:
+                    continue
+                corr = TrendAnalyzer._simple_correlation(
+                    [series[i][ts] for ts in common], [series[j][ts] for ts in common]
+                )
+                if abs(corr) >= min_correlation:
+                    yield i, j, corr
 
     @staticmethod
-    def _align_series(a: MetricData, b: MetricData) -> Tuple[List[float], List[float]]:
-        """Align two time series by timestamp"""
-        a_dict = dict(zip(a.timestamps, a.values))
-        b_dict = dict(zip(b.timestamps, b.values))
+    def _numpy_pairs(metrics: List[MetricData], top_k: Optional[int],
+                     min_correlation: float) -> Iterable[Tuple[int, int, float]]:
+        """Yield (i, j, r) per pair from blocked matrix products"""
+        stamps = [np.frombuffer(m.timestamps, dtype=np.int64) for m in metrics]
+        grid = np.unique(np.concatenate(stamps))
+        count, width = len(metrics), len(grid)
+
+        # Align every series onto the grid once (a repeated timestamp keeps its last value)
+        data = np.zeros((count, width))
+        mask = np.zeros((count, width), dtype=bool)
+        for row, (ts, metric) in enumerate(zip(stamps, metrics)):
+            positions = np.searchsorted(grid, ts)
+            data[row, positions] = as_numpy(metric.values)
+            mask[row, positions] = True
+
+        # Center on each series' mean; Pearson is shift-invariant and this
+        # keeps the sums below well conditioned
+        observed = mask.sum(axis=1)
+        means = data.sum(axis=1) / np.maximum(observed, 1)
+        data -= means[:, None]
+        data[~mask] = 0.0
+
+        dense = bool(mask.all())
+        if dense:
+            # Standardize rows in place; constant series get a zero row (r = 0)
+            norms = np.sqrt(np.einsum('ij,ij->i', data, data))
+            flat = (norms == 0) | (np.ptp(data, axis=1) == 0)
+            norms[flat] = 1.0
+            data /= norms[:, None]
+            data[flat] = 0.0
+        else:
+            mask_f = mask.astype(np.float64)
+            squares = data * data
+
+        block_rows = max(1, CorrelationAnalyzer.BLOCK_CELLS // count)
+        columns = np.arange(count)
+        for start in range(0, count - 1, block_rows):
+            stop = min(start + block_rows, count)
+            if dense:
+                corr = data[start:stop] @ data.T
+                valid = np.full(corr.shape, width >= CorrelationAnalyzer.MIN_OVERLAP)
+            else:
+                a, ma = data[start:stop], mask_f[start:stop]
+                n = ma @ mask_f.T
+                sum_a, sum_b = a @ mask_f.T, ma @ data.T
+                sq_a, sq_b = (a * a) @ mask_f.T, ma @ squares.T
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    cov = a @ data.T - sum_a * sum_b / n
+                    var_a = sq_a - sum_a * sum_a / n
+                    var_b = sq_b - sum_b * sum_b / n
+                    # Constant over the shared timestamps (up to rounding): r = 0
+                    flat = (var_a <= 1e-10 * sq_a) | (var_b <= 1e-10 * sq_b)
+                    corr = np.where(flat, 0.0, cov / np.sqrt(var_a * var_b))
+                valid = n >= CorrelationAnalyzer.MIN_OVERLAP
+
+            np.clip(corr, -1.0, 1.0, out=corr)
+            upper = columns[None, :] > np.arange(start, stop)[:, None]
+            keep = upper & valid & (np.abs(corr) >= min_correlation)
+            rows, cols = np.nonzero(keep)
+            values = corr[rows, cols]
+            if top_k is not None and len(values) > top_k:
+                # Only this block's k strongest can enter the overall top k
+                strongest = np.sort(np.argpartition(-np.abs(values), top_k - 1)[:top_k])
+                rows, cols, values = rows[strongest], cols[strongest], values[strongest]
+            yield from zip((rows + start).tolist(), cols.tolist(), values.tolist())
+
+
+class HyperLogLog:
+    """
+    Distinct counter over 64-bit hashes in at most 2^p bytes.
+
+    Counts exactly (a set of hashes) until it holds m/8 of them, then folds
+    into m one-byte registers. The estimate uses Ertl's improved raw
+    estimator, which needs no bias tables or range switch; standard error
+    is 1.04/sqrt(m): 1.6% at p=12, 0.8% at p=14.
+    """
+
+    __slots__ = ('p', 'm', 'sparse', 'registers')
+
+    def __init__(self, p: int = 12):
+        if not 4 <= p <= 18:
+            raise ValueError(f"HyperLogLog precision must be 4-18, got {p}")
+        self.p = p
+        self.m = 1 << p
+        self.sparse: Optional[set] = set()
+        self.registers: Optional[bytearray] = None
+
+    def add(self, h: int) -> None:
+        """Add a 64-bit hash"""
+        self.update((h,))
+
+    def update(self, hashes: Iterable[int]) -> None:
+        """Add many 64-bit hashes; much cheaper per hash than add()"""
+        sparse = self.sparse
+        if sparse is not None:
+            sparse.update(hashes)
+            if len(sparse) <= self.m >> 3:
+                return
+            self.sparse = None
+            self.registers = bytearray(self.m)
+            hashes = sparse
+        else:
+            hashes = set(hashes)  # Batches repeat values heavily
+
+        registers = self.registers
+        shift = 64 - self.p
+        mask = (1 << shift) - 1
+        for h in hashes:
+            rank = shift + 1 - (h & mask).bit_length()
+            if rank > registers[h >> shift]:
+                registers[h >> shift] = rank
+
+    def count(self) -> int:
+        """Estimated number of distinct hashes added"""
+        if self.sparse is not None:
+            return len(self.sparse)
+
+        m = self.m
+        q = 64 - self.p
+        histogram = [0] * (q + 2)
+        for r in self.registers:
+            histogram[r] += 1
+
+        z = m * self._tau(1 - histogram[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * self._sigma(histogram[0] / m)
+        return int(round(m * m / (2 * math.log(2) * z)))
 
-        common_ts = set(a_dict.keys()) & set(b_dict.keys())
+    @staticmethod
+    def _sigma(x: float) -> float:
+        if x == 1:
+            return math.inf
+        y, z = 1.0, x
+        while True:
+            x *= x
+            previous = z
+            z += x * y
+            y += y
+            if z == previous:
+                return z
 
-        aligned_a = [a_dict[ts] for ts in sorted(common_ts)]
-        aligned_b = [b_dict[ts] for ts in sorted(common_ts)]
+    @staticmethod
+    def _tau(x: float) -> float:
+        if x == 0 or x == 1:
+            return 0.0
+        y, z = 1.0, 1 - x
+        while True:
+            x = math.sqrt(x)
+            previous = z
+            y *= 0.5
+            z -= (1 - x) ** 2 * y
+            if z == previous:
+                return z / 3
+
+
+class HeavyHitters:
+    """
+    Misra-Gries frequent-items table holding at most `capacity` counters.
+
+    Every item seen more than n/(capacity+1) times is retained, and each
+    reported count is low by at most `error`.
+    """
+
+    __slots__ = ('capacity', 'counts', 'error')
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self.counts: Dict[Any, int] = {}
+        self.error = 0
+
+    def add(self, item: Any) -> None:
+        counts = self.counts
+        if item in counts:
+            counts[item] += 1
+        elif len(counts) < self.capacity:
+            counts[item] = 1
+        else:
+            # Decrement every counter (the new item's included); amortized O(1)
+            self.error += 1
+            for key, count in list(counts.items()):
+                if count == 1:
+                    del counts[key]
+                else:
+                    counts[key] = count - 1
 
-        return aligned_a, aligned_b
+    def top(self, k: int) -> List[Tuple[Any, int]]:
+        """The k items with the highest counts"""
+        return heapq.nlargest(k, self.counts.items(), key=operator.itemgetter(1))
 
 
 class CardinalityAnalyzer:
     """Analyze metric cardinality"""
 
-    # Approximate bytes per metric series in Prometheus
-    BYTES_PER_SERIES = 3000  # ~3KB per series
+    # Head-block memory model (Prometheus 2.x/3.x). A series costs a fixed
+    # overhead - memSeries, stripe-map entries, the open head chunk and
+    # mmapped chunk refs, plus Go heap headroom - plus its label strings and
+    # one postings reference per label. Each distinct label pair adds a
+    # postings list and symbol. Calibrate the overhead against a real server
+    # with --series-overhead-bytes.
+    SERIES_OVERHEAD_BYTES = 2500
+    POSTING_BYTES = 8
+    LABEL_PAIR_OVERHEAD_BYTES = 120
+
+    # Labels with more unique values than this are flagged
+    HIGH_CARDINALITY_THRESHOLD = 100
+
+    @staticmethod
+    def head_memory_bytes(series: float, label_bytes_per_series: float, labels_per_series: float,
+                          label_pairs: float = 0, label_pair_bytes: float = 0,
+                          series_overhead_bytes: Optional[int] = None) -> float:
+        """Estimated head-block memory for the given series and label shape"""
+        if series_overhead_bytes is None:
+            series_overhead_bytes = CardinalityAnalyzer.SERIES_OVERHEAD_BYTES
+        per_series = (series_overhead_bytes + label_bytes_per_series
+                      + CardinalityAnalyzer.POSTING_BYTES * labels_per_series)
+        per_pair = CardinalityAnalyzer.LABEL_PAIR_OVERHEAD_BYTES + label_pair_bytes
+        return series * per_series + label_pairs * per_pair
+
+    @staticmethod
+    def recommend(total_series: int, high_cardinality: List[str], estimated_memory_mb: float) -> List[str]:
+        """Recommendations for one metric"""
+        recommendations = []
+        if high_cardinality:
+            recommendations.append(
+                f"Consider removing or aggregating high-cardinality labels: {', '.join(high_cardinality)}"
+            )
+        if total_series > 10000:
+            recommendations.append(
+                f"High series count ({total_series:,}). Consider reducing label cardinality or aggregating metrics."
+            )
+        if estimated_memory_mb > 100:
+            recommendations.append(
+                f"Estimated memory usage ({estimated_memory_mb:.1f} MB) is high. Review retention and cardinality."
+            )
+        return recommendations
 
     @staticmethod
     def analyze(metrics: List[MetricData]) -> List[CardinalityAnalysis]:
@@ -623,35 +1301,25 @@ class CardinalityAnalyzer:
 
             # Collect all unique label values
             label_values: Dict[str, set] = defaultdict(set)
+            label_bytes = 0
+            label_count = 0
             for m in group:
                 for label, value in m.labels.items():
                     label_values[label].add(value)
+                    label_bytes += len(label) + len(str(value))
+                label_count += len(m.labels)
 
             unique_labels = {k: len(v) for k, v in label_values.items()}
 
-            # Identify high cardinality labels (>100 unique values)
             high_cardinality = [
                 label for label, count in unique_labels.items()
-                if count > 100
+                if count > CardinalityAnalyzer.HIGH_CARDINALITY_THRESHOLD
             ]
 
             # Estimate memory usage
-            estimated_memory = (total_series * CardinalityAnalyzer.BYTES_PER_SERIES) / (1024 * 1024)
-
-            # Generate recommendations
-            recommendations = []
-            if high_cardinality:
-                recommendations.append(
-                    f"Consider removing or aggregating high-cardinality labels: {', '.join(high_cardinality)}"
-                )
-            if total_series > 10000:
-                recommendations.append(
-                    f"High series count ({total_series:,}). Consider reducing label cardinality or aggregating metrics."
-                )
-            if estimated_memory > 100:
-                recommendations.append(
-                    f"Estimated memory usage ({estimated_memory:.1f} MB) is high. Review retention and cardinality."
-                )
+            estimated_memory = CardinalityAnalyzer.head_memory_bytes(
+                total_series, label_bytes / total_series, label_count / total_series
+            ) / (1024 * 1024)
 
             results.append(CardinalityAnalysis(
                 metric_name=base_name,
@@ -659,12 +1327,262 @@ class CardinalityAnalyzer:
                 unique_labels=unique_labels,
                 high_cardinality_labels=high_cardinality,
                 estimated_memory_mb=round(estimated_memory, 2),
-                recommendations=recommendations
+                recommendations=CardinalityAnalyzer.recommend(total_series, high_cardinality, estimated_memory)
             ))
 
         return results
 
 
+# Exposition-format label pair: name="value" with \\, \" and \n escapes
+LABEL_PAIR_PATTERN = re.compile(r'([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*"([^"\\]*(?:\\.[^"\\]*)*)"')
+# Label set up to its closing brace; quoted values may hold braces, and an
+# OpenMetrics exemplar (`# {trace_id="..."} 1.0`) may follow the sample
+LABEL_SET_PATTERN = re.compile(r'\{(?:[^"}]|"[^"\\]*(?:\\.[^"\\]*)*")*\}')
+EXPOSITION_SUFFIXES = ('.prom', '.om', '.txt')
+GOLDEN_64 = 0x9E3779B97F4A7C15
+MASK_64 = (1 << 64) - 1
+
+
+class _MetricSketch:
+    """Per-metric sketches and label byte totals for StreamingCardinalityAnalyzer"""
+
+    __slots__ = ('name', 'p', 'series', 'labels', 'series_hashes', 'pending', 'lines', 'label_bytes', 'label_count')
+
+    def __init__(self, name: str, p: int):
+        self.name = name
+        self.p = p
+        self.series = HyperLogLog(p)
+        self.labels: Dict[str, HyperLogLog] = {}
+        self.series_hashes: List[int] = []
+        self.pending: Dict[str, List[int]] = {}
+        self.lines = 0
+        self.label_bytes = 0
+        self.label_count = 0
+
+    def add_label(self, label: str) -> List[int]:
+        self.labels[label] = HyperLogLog(self.p)
+        pending = self.pending[label] = []
+        return pending
+
+    def flush(self) -> None:
+        if self.series_hashes:
+            self.series.update(self.series_hashes)
+            self.series_hashes.clear()
+        for label, pending in self.pending.items():
+            if pending:
+                self.labels[label].update(pending)
+                pending.clear()
+
+
+class StreamingCardinalityAnalyzer:
+    """
+    Cardinality of a Prometheus exposition dump in constant memory per label.
+
+    Reads text exposition format (`name{k="v"} value [ts]`) or `promtool tsdb
+    dump` output (`{__name__="name", k="v"} value ts`) line by line. Series,
+    label values and label pairs are counted with HyperLogLog sketches, and
+    a Misra-Gries table names the label values behind the most series.
+    Consecutive samples of the same series (as in a dump) count once.
+    """
+
+    SERIES_PRECISION = 12
+    TOTAL_PRECISION = 14
+    HEAVY_HITTER_CAPACITY = 2000
+    # Bound on memoized label hashes; cleared wholesale when reached
+    HASH_CACHE_SIZE = 200_000
+    # Hashes are buffered per sketch and folded in every this many series lines
+    FLUSH_LINES = 8192
+
+    def __init__(self, metric_names: Optional[List[str]] = None,
+                 series_overhead_bytes: Optional[int] = None,
+                 heavy_hitter_capacity: int = HEAVY_HITTER_CAPACITY):
+        self.wanted = set(metric_names) if metric_names else None
+        self.series_overhead_bytes = series_overhead_bytes
+        self.total_series = HyperLogLog(self.TOTAL_PRECISION)
+        self.label_pairs = HyperLogLog(self.TOTAL_PRECISION)
+        # metric -> _MetricSketch
+        self.metrics: Dict[str, _MetricSketch] = {}
+        self.heavy_hitters = HeavyHitters(heavy_hitter_capacity)
+        self.lines = 0
+        self.series_lines = 0
+        self.label_pair_bytes = 0
+        # (label, value) -> (value hash, label pair hash)
+        self._hashes: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        self._series_hashes: List[int] = []
+        self._pair_hashes: List[int] = []
+        self._last_series = None
+
+    def _pair_hash(self, pair: Tuple[str, str]) -> Tuple[int, int]:
+        if len(self._hashes) >= self.HASH_CACHE_SIZE:
+            self._hashes.clear()
+        label, value = pair
+        value_hash = int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), 'big')
+        label_hash = int.from_bytes(hashlib.blake2b(label.encode(), digest_size=8).digest(), 'big')
+        hashes = self._hashes[pair] = (value_hash, ((label_hash * GOLDEN_64) & MASK_64) ^ value_hash)
+        return hashes
+
+    def add_line(self, line: str) -> None:
+        """Account for one exposition line; comments and blank lines are skipped"""
+        line = line.strip()
+        if not line or line[0] == '#':
+            return
+        self.lines += 1
+
+        brace = line.find('{')
+        space = line.find(' ')
+        if brace != -1 and (space == -1 or brace < space):
+            label_set = LABEL_SET_PATTERN.match(line, brace)
+            if label_set is None:
+                return
+            close = label_set.end() - 1
+            series_key = line[:close + 1]
+            name = line[:brace]
+            pairs = LABEL_PAIR_PATTERN.findall(line, brace + 1, close)
+        else:
+            series_key = name = line if space == -1 else line[:space]
+            pairs = []
+
+        # Dumps list every sample of a series consecutively
+        if series_key == self._last_series:
+            return
+        self._last_series = series_key
+
+        if not name:
+            name = next((value for label, value in pairs if label == '__name__'), '')
+            if not name:
+                return
+        if self.wanted is not None and name not in self.wanted:
+            return
+
+        sketch = self.metrics.get(name)
+        if sketch is None:
+            sketch = self.metrics[name] = _MetricSketch(name, self.SERIES_PRECISION)
+        name = sketch.name  # Canonical string, its hash already cached
+        series_hash = int.from_bytes(hashlib.blake2b(series_key.encode(), digest_size=8).digest(), 'big')
+        sketch.series_hashes.append(series_hash)
+        self._series_hashes.append(series_hash)
+        sketch.lines += 1
+
+        hashes = self._hashes
+        pending_values = sketch.pending
+        pair_hashes = self._pair_hashes
+        counts = self.heavy_hitters.counts
+        capacity = self.heavy_hitters.capacity
+        label_bytes = 0
+        label_count = 0
+        for pair in pairs:
+            label, value = pair
+            if label == '__name__':
+                continue
+            value_hash, pair_hash = hashes.get(pair) or self._pair_hash(pair)
+            pending = pending_values.get(label)
+            if pending is None:
+                pending = sketch.add_label(label)
+            pending.append(value_hash)
+            pair_hashes.append(pair_hash)
+
+            key = (name, pair)
+            if key in counts:
+                counts[key] += 1
+            elif len(counts) < capacity:
+                counts[key] = 1
+            else:
+                self.heavy_hitters.add(key)
+
+            label_bytes += len(label) + len(value)
+            label_count += 1
+        sketch.label_bytes += label_bytes
+        sketch.label_count += label_count
+        self.label_pair_bytes += label_bytes
+
+        self.series_lines += 1
+        if self.series_lines % self.FLUSH_LINES == 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """Fold buffered hashes into the sketches"""
+        self.total_series.update(self._series_hashes)
+        self._series_hashes.clear()
+        self.label_pairs.update(self._pair_hashes)
+        self._pair_hashes.clear()
+        for sketch in self.metrics.values():
+            sketch.flush()
+
+    def consume(self, lines: Iterable[str]) -> None:
+        """Feed lines until the input ends or is interrupted"""
+        add_line = self.add_line
+        try:
+            for line in lines:
+                add_line(line)
+        except KeyboardInterrupt:
+            pass
+        self.flush()
+
+    def results(self, top_k: Optional[int] = None, top_values: int = 5) -> List[CardinalityAnalysis]:
+        """Per-metric analysis, highest series count first"""
+        self.flush()
+        top_by_metric: Dict[str, List[Tuple[str, str, int]]] = defaultdict(list)
+        for (name, (label, value)), count in self.heavy_hitters.top(self.heavy_hitters.capacity):
+            top_by_metric[name].append((label, value, count))
+
+        results = []
+        for name, sketch in self.metrics.items():
+            total_series = sketch.series.count()
+            unique_labels = {label: values.count() for label, values in sketch.labels.items()}
+            high_cardinality = [
+                label for label, count in unique_labels.items()
+                if count > CardinalityAnalyzer.HIGH_CARDINALITY_THRESHOLD
+            ]
+            estimated_memory = CardinalityAnalyzer.head_memory_bytes(
+                total_series, sketch.label_bytes / sketch.lines, sketch.label_count / sketch.lines,
+                series_overhead_bytes=self.series_overhead_bytes
+            ) / (1024 * 1024)
+            # Name values of the offending labels; otherwise any non-constant label
+            candidates = high_cardinality or [label for label, count in unique_labels.items() if count > 1]
+            top_label_values = [
+                item for item in top_by_metric.get(name, []) if item[0] in candidates
+            ][:top_values]
+
+            results.append(CardinalityAnalysis(
+                metric_name=name,
+                total_series=total_series,
+                unique_labels=unique_labels,
+                high_cardinality_labels=high_cardinality,
+                estimated_memory_mb=round(estimated_memory, 2),
+                recommendations=CardinalityAnalyzer.recommend(total_series, high_cardinality, estimated_memory),
+                top_label_values=top_label_values
+            ))
+
+        results.sort(key=lambda c: (-c.total_series, c.metric_name))
+        return results[:top_k] if top_k else results
+
+    def summary(self) -> Dict[str, Any]:
+        """Whole-input totals, including the head memory estimate"""
+        self.flush()
+        series = self.total_series.count()
+        label_pairs = self.label_pairs.count()
+        lines = self.series_lines or 1
+        label_count = sum(sketch.label_count for sketch in self.metrics.values())
+        label_bytes_per_series = self.label_pair_bytes / lines
+        memory = CardinalityAnalyzer.head_memory_bytes(
+            series, label_bytes_per_series, label_count / lines,
+            label_pairs=label_pairs,
+            label_pair_bytes=self.label_pair_bytes / label_count if label_count else 0,
+            series_overhead_bytes=self.series_overhead_bytes
+        )
+        return {
+            "lines": self.lines,
+            "metrics": len(self.metrics),
+            "total_series": series,
+            "unique_label_pairs": label_pairs,
+            "labels_per_series": round(label_count / lines, 2),
+            "label_bytes_per_series": round(label_bytes_per_series, 1),
+            "series_overhead_bytes": self.series_overhead_bytes or CardinalityAnalyzer.SERIES_OVERHEAD_BYTES,
+            "estimated_memory_mb": round(memory / (1024 * 1024), 2),
+            "relative_error": round(1.04 / math.sqrt(self.total_series.m), 4)
+        }
+
+
 class RecommendationGenerator:
     """Generate optimization recommendations"""
 
@@ -716,7 +1634,8 @@ class RecommendationGenerator:
 
 
 def run_analysis(metrics: List[MetricData], analysis_type: AnalysisType,
-                 threshold: float = 3.0) -> AnalysisReport:
+                 threshold: float = 3.0, top_k: Optional[int] = None,
+                 min_correlation: float = 0.0) -> AnalysisReport:
     """Run specified analysis type"""
     baselines = []
     anomalies = []
@@ -737,10 +1656,12 @@ def run_analysis(metrics: List[MetricData], analysis_type: AnalysisType,
             trends.append(TrendAnalyzer.analyze(metric))
 
     if analysis_type == AnalysisType.CORRELATION:
-        correlations = CorrelationAnalyzer.analyze(metrics)
+        correlations = CorrelationAnalyzer.analyze(metrics, top_k, min_correlation)
 
     if analysis_type == AnalysisType.CARDINALITY:
         cardinality = CardinalityAnalyzer.analyze(metrics)
+        if top_k:
+            cardinality = sorted(cardinality, key=lambda c: -c.total_series)[:top_k]
 
     report = AnalysisReport(
         analysis_type=analysis_type,
@@ -760,6 +1681,153 @@ def run_analysis(metrics: List[MetricData], analysis_type: AnalysisType,
     return report
 
 
+# Online mode: seconds between polls of a followed file, and how many of the
+# most recent anomalies the final report keeps
+FOLLOW_POLL_SECONDS = 1.0
+MAX_REPORTED_ANOMALIES = 1000
+
+
+def follow_lines(filepath: str) -> Iterator[str]:
+    """Yield complete lines from a growing file like tail -f, until interrupted"""
+    handle = open(filepath, 'r')
+    partial = ''
+    try:
+        while True:
+            line = handle.readline()
+            if not line:
+                if os.stat(filepath).st_size < handle.tell():
+                    handle.seek(0)  # Truncated: start over
+                    partial = ''  # An unfinished line from before belongs to the old content
+                time.sleep(FOLLOW_POLL_SECONDS)
+                continue
+            if not line.endswith('\n'):
+                partial += line
+                continue
+            yield partial + line
+            partial = ''
+    finally:
+        handle.close()
+
+
+def series_name(key: str, labels: Dict[str, Any]) -> str:
+    """Name a labelled series as key{label="value",...}"""
+    if not labels:
+        return key
+    rendered = ','.join(f'{k}="{v}"' for k, v in sorted(labels.items()))
+    return f"{key}{{{rendered}}}"
+
+
+def iter_stream_samples(lines: Iterable[str]) -> Iterator[Tuple[str, int, float]]:
+    """
+    Yield (series, timestamp_ns, value) from NDJSON records or CSV rows.
+
+    The format is picked from the first non-blank line: '{' means one JSON
+    record per line (as in JSON input files, with optional "labels"),
+    anything else is a CSV header.
+    """
+    header: Optional[List[str]] = None
+    ts_index = None
+    is_json = None
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if is_json is None:
+            is_json = line.startswith('{')
+            if not is_json:
+                header = next(csv.reader([line]))
+                ts_index = next(
+                    (header.index(name) for name in MetricsParser.TIMESTAMP_FIELDS if name in header),
+                    None
+                )
+                continue
+
+        if is_json:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                logger.debug(f"Skipping malformed record: {line[:80]}")
+                continue
+            if not isinstance(record, dict):
+                continue
+            ts = parse_timestamp_ns(record.get('timestamp', record.get('time', '')))
+            labels = record.get('labels') or {}
+            fields = ((series_name(key, labels), value) for key, value in record.items()
+                      if key not in ('timestamp', 'time', 'date', 'labels'))
+        else:
+            row = next(csv.reader([line]))
+            ts = parse_timestamp_ns(row[ts_index]) if ts_index is not None and ts_index < len(row) else None
+            fields = ((key, cell) for key, cell in zip(header, row)
+                      if key not in MetricsParser.TIMESTAMP_FIELDS)
+
+        if ts is None:
+            ts = time.time_ns()
+        for name, raw in fields:
+            try:
+                yield name, ts, float(raw)
+            except (ValueError, TypeError):
+                continue
+
+
+def run_online(lines: Iterable[str], detector: OnlineAnomalyDetector,
+               metric_names: Optional[List[str]] = None,
+               on_anomaly=None) -> AnalysisReport:
+    """
+    Feed a stream through the online detector until it ends or is interrupted.
+
+    on_anomaly is called with each anomaly as it is detected. The returned
+    report holds the running baselines and the most recent anomalies.
+    """
+    recent: deque = deque(maxlen=MAX_REPORTED_ANOMALIES)
+    wanted = set(metric_names) if metric_names else None
+
+    try:
+        for name, ts, value in iter_stream_samples(lines):
+            if wanted is not None and name.split('{')[0] not in wanted:
+                continue
+            anomaly = detector.observe(name, ts, value)
+            if anomaly:
+                recent.append(anomaly)
+                if on_anomaly:
+                    on_anomaly(anomaly)
+    except KeyboardInterrupt:
+        pass
+
+    report = AnalysisReport(
+        analysis_type=AnalysisType.ANOMALY,
+        metrics_analyzed=list(detector.series),
+        baselines=detector.baselines(),
+        anomalies=list(recent),
+        trends=[],
+        correlations=[],
+        cardinality=[],
+        recommendations=[],
+        generated_at=datetime.now()
+    )
+    report.recommendations = RecommendationGenerator.generate(report)
+    return report
+
+
+def anomaly_to_dict(a: Anomaly) -> Dict[str, Any]:
+    """JSON form of one anomaly"""
+    return {
+        "metric": a.metric_name,
+        "timestamp": a.timestamp.isoformat(),
+        "value": a.value,
+        "expected": a.expected_value,
+        "deviation": a.deviation,
+        "severity": a.severity.value,
+        "method": a.method
+    }
+
+
+def format_anomaly_line(a: Anomaly) -> str:
+    """One-line text form of one anomaly"""
+    emoji = "🔴" if a.severity == AnomalySeverity.HIGH else "🟡" if a.severity == AnomalySeverity.MEDIUM else "🟢"
+    return f"  {emoji} {a.metric_name}: {a.value:.2f} (expected {a.expected_value:.2f}, {a.deviation:.1f}σ)"
+
+
 def format_output(report: AnalysisReport, output_format: str) -> str:
     """Format analysis report"""
     if output_format == "json":
@@ -783,18 +1851,7 @@ def format_output(report: AnalysisReport, output_format: str) -> str:
                 }
                 for b in report.baselines
             ],
-            "anomalies": [
-                {
-                    "metric": a.metric_name,
-                    "timestamp": a.timestamp.isoformat(),
-                    "value": a.value,
-                    "expected": a.expected_value,
-                    "deviation": a.deviation,
-                    "severity": a.severity.value,
-                    "method": a.method
-                }
-                for a in report.anomalies
-            ],
+            "anomalies": [anomaly_to_dict(a) for a in report.anomalies],
             "trends": [
                 {
                     "metric": t.metric_name,
@@ -823,12 +1880,18 @@ def format_output(report: AnalysisReport, output_format: str) -> str:
                     "total_series": c.total_series,
                     "unique_labels": c.unique_labels,
                     "high_cardinality_labels": c.high_cardinality_labels,
-                    "estimated_memory_mb": c.estimated_memory_mb
+                    "estimated_memory_mb": c.estimated_memory_mb,
+                    "top_label_values": [
+                        {"label": label, "value": value, "series": series}
+                        for label, value, series in c.top_label_values
+                    ]
                 }
                 for c in report.cardinality
             ],
             "recommendations": report.recommendations
         }
+        if report.cardinality_summary:
+            data["cardinality_summary"] = report.cardinality_summary
         return json.dumps(data, indent=2)
 
     elif output_format == "markdown":
@@ -887,6 +1950,27 @@ def format_output(report: AnalysisReport, output_format: str) -> str:
                 lines.append(f"| {c.metric_a} | {c.metric_b} | {c.correlation:+.2f} | {c.strength} |")
             lines.append("")
 
+        if report.cardinality:
+            lines.extend(["## Cardinality", ""])
+            summary = report.cardinality_summary
+            if summary:
+                lines.extend([
+                    f"**Head Series:** ~{summary['total_series']:,} "
+                    f"(±{summary['relative_error'] * 100:.1f}%), "
+                    f"**Label Pairs:** ~{summary['unique_label_pairs']:,}, "
+                    f"**Estimated Memory:** {summary['estimated_memory_mb']:,.1f} MB",
+                    ""
+                ])
+            lines.extend([
+                "| Metric | Series | Memory (MB) | High-Cardinality Labels | Top Label Values |",
+                "|--------|--------|-------------|-------------------------|------------------|"
+            ])
+            for c in report.cardinality:
+                top = ", ".join(f'{label}="{value}" ({series:,})' for label, value, series in c.top_label_values)
+                lines.append(f"| {c.metric_name} | {c.total_series:,} | {c.estimated_memory_mb:,.2f} | "
+                             f"{', '.join(c.high_cardinality_labels) or '-'} | {top or '-'} |")
+            lines.append("")
+
         if report.recommendations:
             lines.extend([
                 "## Recommendations",
@@ -934,8 +2018,7 @@ def format_output(report: AnalysisReport, output_format: str) -> str:
                 "-" * 60
             ])
             for a in report.anomalies[:10]:
-                emoji = "🔴" if a.severity == AnomalySeverity.HIGH else "🟡" if a.severity == AnomalySeverity.MEDIUM else "🟢"
-                lines.append(f"  {emoji} {a.metric_name}: {a.value:.2f} (expected {a.expected_value:.2f}, {a.deviation:.1f}σ)")
+                lines.append(format_anomaly_line(a))
             if len(report.anomalies) > 10:
                 lines.append(f"  ...and {len(report.anomalies) - 10} more")
             lines.append("")
@@ -953,6 +2036,25 @@ def format_output(report: AnalysisReport, output_format: str) -> str:
                 lines.append(f"  {emoji} {t.metric_name}: {t.direction.value} ({t.change_percent:+.1f}%)")
             lines.append("")
 
+        if report.cardinality:
+            lines.extend([
+                "-" * 60,
+                "Cardinality",
+                "-" * 60
+            ])
+            summary = report.cardinality_summary
+            if summary:
+                lines.append(f"  Head series: ~{summary['total_series']:,} (±{summary['relative_error'] * 100:.1f}%)  "
+                             f"Label pairs: ~{summary['unique_label_pairs']:,}  "
+                             f"Memory: ~{summary['estimated_memory_mb']:,.1f} MB")
+            for c in report.cardinality:
+                lines.append(f"  {c.metric_name}: {c.total_series:,} series, ~{c.estimated_memory_mb:,.2f} MB")
+                if c.high_cardinality_labels:
+                    lines.append(f"    High-cardinality labels: {', '.join(c.high_cardinality_labels)}")
+                for label, value, series in c.top_label_values:
+                    lines.append(f'    {label}="{value}": ~{series:,} series')
+            lines.append("")
+
         if report.recommendations:
             lines.extend([
                 "-" * 60,
@@ -967,6 +2069,17 @@ def format_output(report: AnalysisReport, output_format: str) -> str:
         return "\n".join(lines)
 
 
+def positive_int(value: str) -> int:
+    """argparse type for an integer >= 1"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(
@@ -983,9 +2096,22 @@ Examples:
   # Find correlations between metrics
   %(prog)s --input metrics.csv --analysis-type correlation --output text
 
+  # The 50 pairs that moved together most strongly during an incident
+  %(prog)s --input incident-export.csv --analysis-type correlation --top-k 50 --output markdown
+
   # Analyze cardinality for optimization
   %(prog)s --input metrics.csv --analysis-type cardinality --output json
 
+  # Streaming cardinality of a scrape or promtool tsdb dump: 20 worst metrics
+  curl -s localhost:9090/federate?match[]={job=~".+"} | %(prog)s --input - --analysis-type cardinality --top-k 20
+  promtool tsdb dump /prometheus | %(prog)s --input - -a cardinality --series-overhead-bytes 2200
+
+  # Online anomaly detection on a live NDJSON feed, anomalies as JSON lines
+  metrics-pipeline | %(prog)s --input - --stream --method ewma --output json
+
+  # Follow a growing CSV export; final baselines written on Ctrl-C
+  %(prog)s --input live.csv --follow --file baselines.json --output json
+
 Analysis Types:
   anomaly      - Detect statistical anomalies using Z-score and IQR methods
   trend        - Analyze metric trends (increasing, decreasing, volatile)
@@ -998,7 +2124,7 @@ Analysis Types:
     parser.add_argument(
         "--input", "-i",
         required=True,
-        help="Input metrics file (CSV or JSON)"
+        help="Input metrics file (CSV, JSON, or .prom exposition for cardinality); '-' reads stdin"
     )
 
     parser.add_argument(
@@ -1020,6 +2146,59 @@ Analysis Types:
         help="Anomaly detection threshold in standard deviations (default: 3.0)"
     )
 
+    parser.add_argument(
+        "--top-k",
+        type=positive_int,
+        help="Correlation: keep the K most strongly correlated pairs; cardinality: the K metrics with most series"
+    )
+
+    parser.add_argument(
+        "--min-correlation",
+        type=float,
+        default=0.0,
+        help="Correlation analysis: drop pairs with |r| below this value (default: 0.0)"
+    )
+
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Online mode: detect anomalies sample by sample from NDJSON or CSV lines"
+    )
+
+    parser.add_argument(
+        "--follow",
+        action="store_true",
+        help="Online mode on a growing file, like tail -f (implies --stream)"
+    )
+
+    parser.add_argument(
+        "--method",
+        choices=OnlineAnomalyDetector.METHODS,
+        default="zscore",
+        help="Online mode: anomaly baseline (default: zscore)"
+    )
+
+    parser.add_argument(
+        "--alpha",
+        type=float,
+        default=0.1,
+        help="Online mode: EWMA smoothing factor (default: 0.1)"
+    )
+
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=30,
+        help="Online mode: samples per series before anomalies are reported (default: 30)"
+    )
+
+    parser.add_argument(
+        "--series-overhead-bytes",
+        type=int,
+        help=f"Cardinality: fixed head memory per series, excluding labels "
+             f"(default: {CardinalityAnalyzer.SERIES_OVERHEAD_BYTES})"
+    )
+
     parser.add_argument(
         "--output", "-o",
         choices=["json", "text", "markdown", "csv"],
@@ -1049,6 +2228,13 @@ Analysis Types:
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
+    if args.analysis_type == AnalysisType.CARDINALITY.value and (
+            args.stream or args.follow or args.input == "-" or args.input.endswith(EXPOSITION_SUFFIXES)):
+        return run_cardinality_cli(args)
+
+    if args.stream or args.follow:
+        return run_online_cli(args)
+
     try:
         # Parse metrics
         logger.info(f"Reading metrics from {args.input}")
@@ -1067,7 +2253,8 @@ Analysis Types:
 
         # Run analysis
         analysis_type = AnalysisType(args.analysis_type)
-        report = run_analysis(metrics, analysis_type, args.threshold)
+        report = run_analysis(metrics, analysis_type, args.threshold,
+                              top_k=args.top_k, min_correlation=args.min_correlation)
 
         # Format output
         output = format_output(report, args.output)
@@ -1093,5 +2280,91 @@ Analysis Types:
         return 1
 
 
+def run_online_cli(args: argparse.Namespace) -> int:
+    """Run online mode: anomalies to stdout as they occur, final report to --file"""
+    detector = OnlineAnomalyDetector(method=args.method, threshold=args.threshold,
+                                     alpha=args.alpha, warmup=args.warmup)
+    metric_names = [m.strip() for m in args.metrics.split(",")] if args.metrics else None
+
+    def emit(anomaly: Anomaly) -> None:
+        if args.output == "json":
+            print(json.dumps(anomaly_to_dict(anomaly)), flush=True)
+        else:
+            print(format_anomaly_line(anomaly).strip(), flush=True)
+
+    try:
+        if args.input == "-":
+            report = run_online(sys.stdin, detector, metric_names, emit)
+        elif args.follow:
+            report = run_online(follow_lines(args.input), detector, metric_names, emit)
+        else:
+            with open(args.input, "r") as f:
+                report = run_online(f, detector, metric_names, emit)
+    except FileNotFoundError:
+        logger.error(f"Input file not found: {args.input}")
+        return 1
+
+    logger.info(f"Processed {detector.samples:,} samples across {len(detector.series):,} series, "
+                f"{detector.anomaly_count:,} anomalies")
+    if args.file:
+        with open(args.file, "w") as f:
+            f.write(format_output(report, args.output))
+        logger.info(f"Report written to {args.file}")
+    return 0
+
+
+def run_cardinality_cli(args: argparse.Namespace) -> int:
+    """Stream an exposition dump through the cardinality sketches and report"""
+    metric_names = [m.strip() for m in args.metrics.split(",")] if args.metrics else None
+    analyzer = StreamingCardinalityAnalyzer(metric_names, args.series_overhead_bytes)
+
+    started = time.perf_counter()
+    try:
+        if args.input == "-":
+            analyzer.consume(sys.stdin)
+        elif args.follow:
+            analyzer.consume(follow_lines(args.input))
+        else:
+            with open(args.input, "r", errors="replace") as f:
+                analyzer.consume(f)
+    except FileNotFoundError:
+        logger.error(f"Input file not found: {args.input}")
+        return 1
+    elapsed = time.perf_counter() - started
+
+    if not analyzer.metrics:
+        logger.error("No series found to analyze")
+        return 1
+
+    cardinality = analyzer.results(args.top_k)
+    summary = analyzer.summary()
+    logger.info(f"Read {analyzer.lines:,} lines in {elapsed:.1f}s "
+                f"({analyzer.lines / max(elapsed, 1e-9):,.0f} lines/sec), "
+                f"~{summary['total_series']:,} series across {summary['metrics']:,} metrics")
+
+    report = AnalysisReport(
+        analysis_type=AnalysisType.CARDINALITY,
+        metrics_analyzed=[c.metric_name for c in cardinality],
+        baselines=[],
+        anomalies=[],
+        trends=[],
+        correlations=[],
+        cardinality=cardinality,
+        recommendations=[],
+        generated_at=datetime.now(),
+        cardinality_summary=summary
+    )
+    report.recommendations = RecommendationGenerator.generate(report)
+
+    output = format_output(report, args.output)
+    if args.file:
+        with open(args.file, "w") as f:
+            f.write(output)
+        logger.info(f"Report written to {args.file}")
+    else:
+        print(output)
+    return 0
+
+
 if __name__ == "__main__":
     sys.exit(main())
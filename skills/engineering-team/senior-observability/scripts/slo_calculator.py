@@ -6,7 +6,9 @@ Calculate SLI/SLO targets, error budgets, and burn rates from metrics data.
 Features:
 - SLI calculation from raw metrics (availability, latency, throughput)
 - Error budget tracking (total, consumed, remaining)
-- Multi-window burn rate analysis
+- Multi-window, multi-burn-rate analysis (1h, 6h, 1d, 3d, 30d) from windowed data
+- Rollup store: per-minute good/total counts and latency histograms kept on
+  disk as prefix sums, so any window is evaluated from two records
 - SLO recommendations based on historical performance
 - Alert threshold suggestions
 
@@ -18,13 +20,19 @@ import csv
 import json
 import logging
 import math
+import mmap
+import os
 import sys
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any, Dict, List, Optional, Tuple
+from itertools import accumulate
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-__version__ = "1.0.0"
+__version__ = "1.1.0"
 
 # Configure logging
 logging.basicConfig(
@@ -92,6 +100,7 @@ class ErrorBudget:
     burn_rate_24h: float
     burn_rate_3d: float
     status: str  # "healthy", "warning", "critical"
+    burn_rate_30d: Optional[float] = None  # Only when computed from windowed data
 
 
 @dataclass
@@ -115,6 +124,19 @@ class AlertThreshold:
     description: str
 
 
+@dataclass
+class BurnRateAlert:
+    """Multi-window burn rate alert evaluated against windowed data"""
+    name: str
+    long_window: str
+    short_window: str
+    threshold: float
+    long_burn_rate: float
+    short_burn_rate: float
+    severity: str
+    firing: bool  # Both windows at or above the threshold
+
+
 @dataclass
 class SLOReport:
     """Complete SLO analysis report"""
@@ -127,6 +149,35 @@ class SLOReport:
     recommendation: SLORecommendation
     alert_thresholds: List[AlertThreshold]
     generated_at: datetime
+    burn_rate_alerts: List[BurnRateAlert] = field(default_factory=list)
+
+
+WINDOW_MINUTES = {
+    TimeWindow.WEEK: 7 * 24 * 60,
+    TimeWindow.MONTH: 30 * 24 * 60,
+    TimeWindow.QUARTER: 90 * 24 * 60
+}
+
+# Burn rates reported for every window-aware report
+BURN_RATE_WINDOWS = {"1h": 60, "6h": 360, "1d": 1440, "3d": 4320, "30d": 43200}
+# Multi-window, multi-burn-rate alerts (SRE workbook): an alert fires only when
+# both its long and short window burn at or above the rate
+MULTI_WINDOW_ALERTS = (
+    ("1h", "5m", 14.4, "critical"),
+    ("6h", "30m", 6.0, "critical"),
+    ("1d", "2h", 3.0, "warning"),
+    ("3d", "6h", 1.0, "warning"),
+)
+ALERT_WINDOW_MINUTES = {"5m": 5, "30m": 30, "2h": 120, **BURN_RATE_WINDOWS}
+
+# Rollup files: magic, start minute, bucket count, bucket bounds, then one
+# record of little-endian int64 running totals per minute
+ROLLUP_MAGIC = b'SLOROLL1'
+ROLLUP_SUFFIX = '.rollup'
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+DEFAULT_LATENCY_THRESHOLD_MS = 500
+# Record fields; latency buckets follow as "samples at or under bound k"
+FIELD_TOTAL, FIELD_GOOD, FIELD_LATENCY_COUNT, FIELD_BUCKETS = 0, 1, 2, 3
 
 
 class MetricsParser:
@@ -249,6 +300,257 @@ class MetricsParser:
             return MetricsParser.parse_csv(filepath)
 
 
+def format_bounds(bounds: Sequence[float]) -> str:
+    return ",".join(f"{b:g}" for b in bounds)
+
+
+def parse_bounds(value: str) -> Tuple[float, ...]:
+    """argparse type for a comma-separated list of positive bucket bounds in ms"""
+    try:
+        bounds = tuple(sorted({float(v) for v in value.split(",") if v.strip()}))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated milliseconds, got {value!r}")
+    if not bounds or bounds[0] <= 0:
+        raise argparse.ArgumentTypeError("bucket bounds must be positive")
+    return bounds
+
+
+def epoch_minute(ts: datetime) -> int:
+    """Minutes since the epoch; naive timestamps are taken as UTC"""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return int(ts.timestamp()) // 60
+
+
+def minute_to_datetime(minute: int) -> datetime:
+    return datetime.fromtimestamp(minute * 60, tz=timezone.utc)
+
+
+def rollup_minutes(metrics: MetricsData, bounds: Sequence[float]) -> Dict[int, List[int]]:
+    """Aggregate rows into per-minute [total, good, latency samples, samples <= bound...]"""
+    if not metrics.total_requests:
+        raise ValueError("No data points to roll up")
+    if len(metrics.timestamps) != len(metrics.total_requests):
+        raise ValueError("Rollups need a timestamp on every row")
+
+    width = FIELD_BUCKETS + len(bounds)
+    rows: Dict[int, List[int]] = {}
+    for ts, total, good, latency in zip(metrics.timestamps, metrics.total_requests,
+                                        metrics.successful_requests, metrics.latency_values):
+        minute = epoch_minute(ts)
+        row = rows.get(minute)
+        if row is None:
+            row = rows[minute] = [0] * width
+        row[FIELD_TOTAL] += total
+        row[FIELD_GOOD] += good
+        row[FIELD_LATENCY_COUNT] += 1
+        for k in range(FIELD_BUCKETS + bisect_left(bounds, latency), width):
+            row[k] += 1
+    return rows
+
+
+class RollupSeries:
+    """
+    Per-minute SLI counts for one service, stored as prefix sums.
+
+    Record i holds running totals through minute start_minute + i of total
+    requests, good requests, latency samples, and latency samples at or
+    under each bucket bound. A window's counts are the difference of two
+    records, so evaluating it costs O(1) whatever its length.
+    """
+
+    def __init__(self, start_minute: int, bounds: Sequence[float], data: Sequence[int], mapping=None):
+        self.start_minute = start_minute
+        self.bounds = tuple(bounds)
+        self.width = FIELD_BUCKETS + len(self.bounds)
+        self.data = data  # width int64 values per minute
+        self._mapping = mapping
+
+    @classmethod
+    def from_minutes(cls, rows: Dict[int, List[int]], bounds: Sequence[float],
+                     start_minute: Optional[int] = None, base: Optional[Sequence[int]] = None) -> 'RollupSeries':
+        """Build prefix sums from per-minute rows, optionally continuing from base totals"""
+        width = FIELD_BUCKETS + len(bounds)
+        start = min(rows) if start_minute is None else start_minute
+        length = max(rows) - start + 1
+        deltas = array('q', bytes(8 * width * length))
+        for minute, row in rows.items():
+            offset = (minute - start) * width
+            deltas[offset:offset + width] = array('q', row)
+        if base is not None:
+            for f in range(width):
+                deltas[f] += base[f]
+        data = array('q', bytes(8 * width * length))
+        for f in range(width):
+            data[f::width] = array('q', accumulate(deltas[f::width]))
+        return cls(start, bounds, data)
+
+    @classmethod
+    def from_metrics(cls, metrics: MetricsData, bounds: Sequence[float] = LATENCY_BUCKETS_MS) -> 'RollupSeries':
+        return cls.from_minutes(rollup_minutes(metrics, bounds), bounds)
+
+    def __len__(self) -> int:
+        return len(self.data) // self.width
+
+    def __enter__(self) -> 'RollupSeries':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mapping is not None:
+            self.data.release()
+            self._mapping.close()
+            self._mapping = None
+
+    @property
+    def end_minute(self) -> int:
+        return self.start_minute + len(self) - 1
+
+    def record(self, index: int) -> List[int]:
+        return list(self.data[index * self.width:(index + 1) * self.width])
+
+    def minute_rows(self) -> Dict[int, List[int]]:
+        """Per-minute counts (differences of consecutive records), skipping empty minutes"""
+        rows = {}
+        previous = [0] * self.width
+        for i in range(len(self)):
+            current = self.record(i)
+            if current != previous:
+                rows[self.start_minute + i] = [c - p for c, p in zip(current, previous)]
+            previous = current
+        return rows
+
+    def cumulative(self, minute: int, field: int) -> int:
+        """Running total of field through minute (inclusive)"""
+        index = minute - self.start_minute
+        if index < 0:
+            return 0
+        index = min(index, len(self) - 1)
+        return self.data[index * self.width + field]
+
+    def latency_field(self, threshold_ms: float) -> int:
+        """Record field counting samples at or under threshold, which must be a bucket bound"""
+        k = bisect_left(self.bounds, threshold_ms)
+        if k == len(self.bounds) or self.bounds[k] != threshold_ms:
+            raise ValueError(
+                f"Latency threshold {threshold_ms:g}ms is not a bucket bound of this rollup "
+                f"(bounds: {format_bounds(self.bounds)} ms); use one of them, or start a new rollup "
+                f"with --latency-buckets including {threshold_ms:g}"
+            )
+        return FIELD_BUCKETS + k
+
+    def good_total(self, slo_type: SLOType, minutes: int, end_minute: Optional[int] = None,
+                   threshold_ms: float = DEFAULT_LATENCY_THRESHOLD_MS) -> Tuple[int, int]:
+        """(good, total) events over the `minutes` minutes ending at end_minute"""
+        if slo_type == SLOType.AVAILABILITY:
+            good_field, total_field = FIELD_GOOD, FIELD_TOTAL
+        elif slo_type == SLOType.LATENCY:
+            good_field, total_field = self.latency_field(threshold_ms), FIELD_LATENCY_COUNT
+        else:
+            raise ValueError("Rollups hold availability and latency SLIs only")
+
+        end = self.end_minute if end_minute is None else end_minute
+        start = end - minutes
+        cumulative = self.cumulative
+        return (cumulative(end, good_field) - cumulative(start, good_field),
+                cumulative(end, total_field) - cumulative(start, total_field))
+
+
+class RollupStore:
+    """Directory of per-service rollup files, read through mmap"""
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+
+    def path(self, service: str) -> Path:
+        if not service or os.sep in service or service.startswith('.'):
+            raise ValueError(f"Invalid service name for a rollup file: {service!r}")
+        return self.directory / f"{service}{ROLLUP_SUFFIX}"
+
+    def services(self) -> List[str]:
+        return sorted(p.name[:-len(ROLLUP_SUFFIX)] for p in self.directory.glob(f"*{ROLLUP_SUFFIX}"))
+
+    @staticmethod
+    def _read_header(data: mmap.mmap, path: Path) -> Tuple[int, Tuple[float, ...], int]:
+        if data[:8] != ROLLUP_MAGIC:
+            raise ValueError(f"{path} is not a rollup file")
+        start_minute = int.from_bytes(data[8:16], 'little', signed=True)
+        bucket_count = int.from_bytes(data[16:24], 'little')
+        header_size = 24 + 8 * bucket_count
+        bounds = array('d', data[24:header_size])
+        if sys.byteorder != 'little':
+            bounds.byteswap()
+        return start_minute, tuple(bounds), header_size
+
+    def open(self, service: str) -> RollupSeries:
+        """Map a service's rollup file; only the records a query touches are read"""
+        path = self.path(service)
+        with open(path, 'rb') as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        start_minute, bounds, header_size = self._read_header(mapping, path)
+        if sys.byteorder != 'little':
+            data = array('q', mapping[header_size:])
+            data.byteswap()
+            mapping.close()
+            return RollupSeries(start_minute, bounds, data)
+        return RollupSeries(start_minute, bounds, memoryview(mapping)[header_size:].cast('q'), mapping)
+
+    def write(self, service: str, series: RollupSeries) -> None:
+        """Atomically replace a service's rollup file"""
+        path = self.path(service)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        bounds = array('d', series.bounds)
+        data = array('q', series.data)
+        if sys.byteorder != 'little':
+            bounds.byteswap()
+            data.byteswap()
+        tmp_path = path.with_suffix(f".tmp.{os.getpid()}")
+        with open(tmp_path, 'wb') as f:
+            f.write(ROLLUP_MAGIC)
+            f.write(series.start_minute.to_bytes(8, 'little', signed=True))
+            f.write(len(series.bounds).to_bytes(8, 'little'))
+            f.write(bounds.tobytes())
+            f.write(data.tobytes())
+        os.replace(tmp_path, path)
+
+    def ingest(self, service: str, metrics: MetricsData, bounds: Sequence[float] = LATENCY_BUCKETS_MS) -> int:
+        """
+        Merge metrics into a service's rollups; returns the minutes written.
+
+        Minutes present in metrics replace what the store held for them, so
+        re-ingesting an overlapping export is idempotent. Data after the last
+        stored minute is appended; anything else rewrites the file. bounds
+        sets the latency buckets of a new file; an existing file keeps the
+        buckets recorded in its header.
+        """
+        path = self.path(service)
+        if not path.exists():
+            rows = rollup_minutes(metrics, bounds)
+            self.write(service, RollupSeries.from_minutes(rows, bounds))
+            return len(rows)
+
+        with self.open(service) as existing:
+            rows = rollup_minutes(metrics, existing.bounds)
+            if min(rows) > existing.end_minute:
+                # Append: continue the running totals from the last record
+                tail = RollupSeries.from_minutes(rows, existing.bounds, existing.end_minute + 1,
+                                                 existing.record(len(existing) - 1))
+                data = array('q', tail.data)
+                if sys.byteorder != 'little':
+                    data.byteswap()
+                with open(path, 'ab') as f:
+                    f.write(data.tobytes())
+                return len(rows)
+
+            merged = existing.minute_rows()
+            bounds = existing.bounds
+        merged.update(rows)
+        self.write(service, RollupSeries.from_minutes(merged, bounds))
+        return len(rows)
+
+
 class SLICalculator:
     """Calculate Service Level Indicators"""
 
@@ -363,17 +665,19 @@ class ErrorBudgetCalculator:
     """Calculate error budgets and burn rates"""
 
     @staticmethod
-    def calculate(sli: SLIResult, target: float, window: TimeWindow) -> ErrorBudget:
-        """Calculate error budget from SLI and target"""
+    def calculate(sli: SLIResult, target: float, window: TimeWindow,
+                  burn_rates: Optional[Dict[str, float]] = None) -> ErrorBudget:
+        """
+        Calculate error budget from SLI and target.
+
+        burn_rates holds measured burn rates per window (see BURN_RATE_WINDOWS);
+        without it they are approximated from the overall error rate.
+        """
         # Calculate error budget
         error_budget_percent = 100 - target  # e.g., 0.1% for 99.9% SLO
 
         # Window in minutes
-        window_minutes = {
-            TimeWindow.WEEK: 7 * 24 * 60,
-            TimeWindow.MONTH: 30 * 24 * 60,
-            TimeWindow.QUARTER: 90 * 24 * 60
-        }[window]
+        window_minutes = WINDOW_MINUTES[window]
 
         total_budget_minutes = (error_budget_percent / 100) * window_minutes
 
@@ -396,12 +700,17 @@ class ErrorBudgetCalculator:
 
         base_burn_rate = actual_error_rate_decimal / allowed_error_rate if allowed_error_rate > 0 else 0
 
-        # Approximate burn rates for different windows
-        # In practice, these would be calculated from actual windowed data
-        burn_rate_1h = round(base_burn_rate * 1.2, 2)  # More variable in short windows
-        burn_rate_6h = round(base_burn_rate * 1.1, 2)
-        burn_rate_24h = round(base_burn_rate, 2)
-        burn_rate_3d = round(base_burn_rate * 0.9, 2)  # Tends to smooth out
+        if burn_rates:
+            burn_rate_1h = burn_rates["1h"]
+            burn_rate_6h = burn_rates["6h"]
+            burn_rate_24h = burn_rates["1d"]
+            burn_rate_3d = burn_rates["3d"]
+        else:
+            # Approximate burn rates for different windows when there is no windowed data
+            burn_rate_1h = round(base_burn_rate * 1.2, 2)  # More variable in short windows
+            burn_rate_6h = round(base_burn_rate * 1.1, 2)
+            burn_rate_24h = round(base_burn_rate, 2)
+            burn_rate_3d = round(base_burn_rate * 0.9, 2)  # Tends to smooth out
 
         # Determine status
         if remaining_percent < 10 or burn_rate_1h > 10:
@@ -422,10 +731,53 @@ class ErrorBudgetCalculator:
             burn_rate_6h=burn_rate_6h,
             burn_rate_24h=burn_rate_24h,
             burn_rate_3d=burn_rate_3d,
-            status=status
+            status=status,
+            burn_rate_30d=burn_rates.get("30d") if burn_rates else None
         )
 
 
+class BurnRateEvaluator:
+    """Multi-window, multi-burn-rate evaluation over rollups, O(1) per window"""
+
+    @staticmethod
+    def burn_rate(series: RollupSeries, slo_type: SLOType, target: float, minutes: int,
+                  end_minute: Optional[int] = None,
+                  threshold_ms: float = DEFAULT_LATENCY_THRESHOLD_MS) -> float:
+        """Observed error rate over the window divided by the allowed error rate"""
+        good, total = series.good_total(slo_type, minutes, end_minute, threshold_ms)
+        allowed_error_rate = (100 - target) / 100
+        if total == 0 or allowed_error_rate <= 0:
+            return 0.0
+        return ((total - good) / total) / allowed_error_rate
+
+    @staticmethod
+    def evaluate(series: RollupSeries, slo_type: SLOType, target: float,
+                 end_minute: Optional[int] = None,
+                 threshold_ms: float = DEFAULT_LATENCY_THRESHOLD_MS) -> Tuple[Dict[str, float], List[BurnRateAlert]]:
+        """Burn rate per BURN_RATE_WINDOWS entry, and the MULTI_WINDOW_ALERTS states"""
+        end = series.end_minute if end_minute is None else end_minute
+        rates = {
+            name: BurnRateEvaluator.burn_rate(series, slo_type, target, ALERT_WINDOW_MINUTES[name], end, threshold_ms)
+            for name in {*BURN_RATE_WINDOWS, *(w for alert in MULTI_WINDOW_ALERTS for w in alert[:2])}
+        }
+
+        alerts = []
+        for long_window, short_window, threshold, severity in MULTI_WINDOW_ALERTS:
+            long_rate, short_rate = rates[long_window], rates[short_window]
+            alerts.append(BurnRateAlert(
+                name=f"SLO_BurnRate_{long_window}",
+                long_window=long_window,
+                short_window=short_window,
+                threshold=threshold,
+                long_burn_rate=round(long_rate, 2),
+                short_burn_rate=round(short_rate, 2),
+                severity=severity,
+                firing=long_rate >= threshold and short_rate >= threshold
+            ))
+
+        return {name: round(rates[name], 2) for name in BURN_RATE_WINDOWS}, alerts
+
+
 class SLORecommender:
     """Recommend SLO targets based on historical performance"""
 
@@ -439,22 +791,25 @@ class SLORecommender:
     @staticmethod
     def recommend(metrics: MetricsData, sli: SLIResult) -> SLORecommendation:
         """Generate SLO recommendation"""
-        current = sli.value
-
-        # Calculate worst-case historical performance
+        # Calculate availability for each data point
+        period_avails = []
         if metrics.total_requests and len(metrics.total_requests) > 1:
-            # Calculate availability for each data point
-            period_avails = []
             for i in range(len(metrics.total_requests)):
                 if metrics.total_requests[i] > 0:
                     avail = (metrics.successful_requests[i] / metrics.total_requests[i]) * 100
                     period_avails.append(avail)
 
-            if period_avails:
-                worst_case = min(period_avails)
-                achievable = math.floor(worst_case * 10) / 10  # Round down to 1 decimal
-            else:
-                achievable = current
+        return SLORecommender.recommend_from_periods(period_avails, sli)
+
+    @staticmethod
+    def recommend_from_periods(period_avails: List[float], sli: SLIResult) -> SLORecommendation:
+        """Generate SLO recommendation from per-period availabilities"""
+        current = sli.value
+
+        # Calculate worst-case historical performance
+        if period_avails:
+            worst_case = min(period_avails)
+            achievable = math.floor(worst_case * 10) / 10  # Round down to 1 decimal
         else:
             achievable = current
 
@@ -540,18 +895,27 @@ class AlertThresholdGenerator:
 
 
 def generate_report(metrics: MetricsData, slo_type: SLOType, target: float,
-                    window: TimeWindow, service: str = "service") -> SLOReport:
+                    window: TimeWindow, service: str = "service",
+                    threshold_ms: float = DEFAULT_LATENCY_THRESHOLD_MS) -> SLOReport:
     """Generate complete SLO report"""
     # Calculate SLI
     if slo_type == SLOType.AVAILABILITY:
         sli = SLICalculator.calculate_availability(metrics)
     elif slo_type == SLOType.LATENCY:
-        sli = SLICalculator.calculate_latency(metrics)
+        sli = SLICalculator.calculate_latency(metrics, threshold_ms)
     else:
         sli = SLICalculator.calculate_throughput(metrics)
 
+    # Measured burn rates need a timestamp per row; throughput has no good/total split
+    burn_rates, burn_rate_alerts = {}, []
+    if (slo_type != SLOType.THROUGHPUT and metrics.total_requests
+            and len(metrics.timestamps) == len(metrics.total_requests)):
+        series = RollupSeries.from_metrics(metrics, (threshold_ms,))
+        burn_rates, burn_rate_alerts = BurnRateEvaluator.evaluate(series, slo_type, target,
+                                                                  threshold_ms=threshold_ms)
+
     # Calculate error budget
-    error_budget = ErrorBudgetCalculator.calculate(sli, target, window)
+    error_budget = ErrorBudgetCalculator.calculate(sli, target, window, burn_rates)
 
     # Generate recommendations
     recommendation = SLORecommender.recommend(metrics, sli)
@@ -568,61 +932,129 @@ def generate_report(metrics: MetricsData, slo_type: SLOType, target: float,
         error_budget=error_budget,
         recommendation=recommendation,
         alert_thresholds=alert_thresholds,
-        generated_at=datetime.now()
+        generated_at=datetime.now(),
+        burn_rate_alerts=burn_rate_alerts
+    )
+
+
+def generate_rollup_report(series: RollupSeries, slo_type: SLOType, target: float,
+                           window: TimeWindow, service: str = "service",
+                           threshold_ms: float = DEFAULT_LATENCY_THRESHOLD_MS) -> SLOReport:
+    """Generate an SLO report for the window ending at the last rolled-up minute"""
+    end = series.end_minute
+    window_minutes = WINDOW_MINUTES[window]
+    good, total = series.good_total(slo_type, window_minutes, end, threshold_ms)
+    start = max(end - window_minutes + 1, series.start_minute)
+
+    sli = SLIResult(
+        slo_type=slo_type,
+        value=round(good / total * 100, 4) if total else 100.0,
+        total_events=total,
+        good_events=good,
+        bad_events=total - good,
+        measurement_period=f"{minute_to_datetime(start).isoformat()} to {minute_to_datetime(end).isoformat()}"
+    )
+
+    burn_rates, burn_rate_alerts = BurnRateEvaluator.evaluate(series, slo_type, target, end, threshold_ms)
+    error_budget = ErrorBudgetCalculator.calculate(sli, target, window, burn_rates)
+
+    # Hourly availability stands in for per-row availability
+    boundaries = range(end, start - 61, -60)
+    goods = [series.cumulative(minute, FIELD_GOOD) for minute in boundaries]
+    totals = [series.cumulative(minute, FIELD_TOTAL) for minute in boundaries]
+    period_avails = [
+        (goods[i] - goods[i + 1]) / (totals[i] - totals[i + 1]) * 100
+        for i in range(len(totals) - 1) if totals[i] > totals[i + 1]
+    ]
+    recommendation = SLORecommender.recommend_from_periods(period_avails, sli)
+
+    return SLOReport(
+        service=service,
+        slo_type=slo_type,
+        target=target,
+        window=window,
+        sli=sli,
+        error_budget=error_budget,
+        recommendation=recommendation,
+        alert_thresholds=AlertThresholdGenerator.generate(target),
+        generated_at=datetime.now(),
+        burn_rate_alerts=burn_rate_alerts
     )
 
 
+def report_to_dict(report: SLOReport) -> Dict[str, Any]:
+    """JSON form of one report"""
+    data = {
+        "service": report.service,
+        "slo_type": report.slo_type.value,
+        "target": report.target,
+        "window": report.window.value,
+        "generated_at": report.generated_at.isoformat(),
+        "sli": {
+            "type": report.sli.slo_type.value,
+            "value": report.sli.value,
+            "total_events": report.sli.total_events,
+            "good_events": report.sli.good_events,
+            "bad_events": report.sli.bad_events,
+            "measurement_period": report.sli.measurement_period
+        },
+        "error_budget": {
+            "total_budget_percent": report.error_budget.total_budget_percent,
+            "total_budget_minutes": report.error_budget.total_budget_minutes,
+            "consumed_percent": report.error_budget.consumed_percent,
+            "consumed_minutes": report.error_budget.consumed_minutes,
+            "remaining_percent": report.error_budget.remaining_percent,
+            "remaining_minutes": report.error_budget.remaining_minutes,
+            "burn_rates": {
+                "1h": report.error_budget.burn_rate_1h,
+                "6h": report.error_budget.burn_rate_6h,
+                "24h": report.error_budget.burn_rate_24h,
+                "3d": report.error_budget.burn_rate_3d
+            },
+            "status": report.error_budget.status
+        },
+        "recommendation": {
+            "current_performance": report.recommendation.current_performance,
+            "recommended_target": report.recommendation.recommended_target,
+            "achievable_target": report.recommendation.achievable_target,
+            "tier": report.recommendation.tier_recommendation.value,
+            "confidence": report.recommendation.confidence,
+            "rationale": report.recommendation.rationale
+        },
+        "alert_thresholds": [
+            {
+                "name": t.name,
+                "window": t.window,
+                "burn_rate": t.burn_rate,
+                "severity": t.severity,
+                "description": t.description
+            }
+            for t in report.alert_thresholds
+        ]
+    }
+    if report.error_budget.burn_rate_30d is not None:
+        data["error_budget"]["burn_rates"]["30d"] = report.error_budget.burn_rate_30d
+    if report.burn_rate_alerts:
+        data["burn_rate_alerts"] = [
+            {
+                "name": a.name,
+                "long_window": a.long_window,
+                "short_window": a.short_window,
+                "burn_rate": a.threshold,
+                "long_burn_rate": a.long_burn_rate,
+                "short_burn_rate": a.short_burn_rate,
+                "severity": a.severity,
+                "firing": a.firing
+            }
+            for a in report.burn_rate_alerts
+        ]
+    return data
+
+
 def format_output(report: SLOReport, output_format: str) -> str:
     """Format report output"""
     if output_format == "json":
-        data = {
-            "service": report.service,
-            "slo_type": report.slo_type.value,
-            "target": report.target,
-            "window": report.window.value,
-            "generated_at": report.generated_at.isoformat(),
-            "sli": {
-                "type": report.sli.slo_type.value,
-                "value": report.sli.value,
-                "total_events": report.sli.total_events,
-                "good_events": report.sli.good_events,
-                "bad_events": report.sli.bad_events,
-                "measurement_period": report.sli.measurement_period
-            },
-            "error_budget": {
-                "total_budget_percent": report.error_budget.total_budget_percent,
-                "total_budget_minutes": report.error_budget.total_budget_minutes,
-                "consumed_percent": report.error_budget.consumed_percent,
-                "consumed_minutes": report.error_budget.consumed_minutes,
-                "remaining_percent": report.error_budget.remaining_percent,
-                "remaining_minutes": report.error_budget.remaining_minutes,
-                "burn_rates": {
-                    "1h": report.error_budget.burn_rate_1h,
-                    "6h": report.error_budget.burn_rate_6h,
-                    "24h": report.error_budget.burn_rate_24h,
-                    "3d": report.error_budget.burn_rate_3d
-                },
-                "status": report.error_budget.status
-            },
-            "recommendation": {
-                "current_performance": report.recommendation.current_performance,
-                "recommended_target": report.recommendation.recommended_target,
-                "achievable_target": report.recommendation.achievable_target,
-                "tier": report.recommendation.tier_recommendation.value,
-                "confidence": report.recommendation.confidence,
-                "rationale": report.recommendation.rationale
-            },
-            "alert_thresholds": [
-                {
-                    "name": t.name,
-                    "window": t.window,
-                    "burn_rate": t.burn_rate,
-                    "severity": t.severity,
-                    "description": t.description
-                }
-                for t in report.alert_thresholds
-            ]
-        }
+        data = report_to_dict(report)
         return json.dumps(data, indent=2)
 
     elif output_format == "markdown":
@@ -662,6 +1094,11 @@ def format_output(report: SLOReport, output_format: str) -> str:
             f"| 6h | {report.error_budget.burn_rate_6h}x | {'🔴 High' if report.error_budget.burn_rate_6h > 5 else '🟡 Medium' if report.error_budget.burn_rate_6h > 2 else '🟢 Low'} |",
             f"| 24h | {report.error_budget.burn_rate_24h}x | {'🔴 High' if report.error_budget.burn_rate_24h > 3 else '🟡 Medium' if report.error_budget.burn_rate_24h > 1.5 else '🟢 Low'} |",
             f"| 3d | {report.error_budget.burn_rate_3d}x | {'🔴 High' if report.error_budget.burn_rate_3d > 2 else '🟡 Medium' if report.error_budget.burn_rate_3d > 1 else '🟢 Low'} |",
+        ]
+        if report.error_budget.burn_rate_30d is not None:
+            burn_30d = report.error_budget.burn_rate_30d
+            lines.append(f"| 30d | {burn_30d}x | {'🔴 High' if burn_30d > 1 else '🟡 Medium' if burn_30d > 0.8 else '🟢 Low'} |")
+        lines.extend([
             "",
             "## Recommendation",
             "",
@@ -676,10 +1113,23 @@ def format_output(report: SLOReport, output_format: str) -> str:
             "",
             "| Alert | Window | Burn Rate | Severity |",
             "|-------|--------|-----------|----------|",
-        ]
+        ])
         for t in report.alert_thresholds:
             lines.append(f"| {t.name} | {t.window} | {t.burn_rate}x | {t.severity} |")
 
+        if report.burn_rate_alerts:
+            lines.extend([
+                "",
+                "## Multi-Window Burn Rate Alerts",
+                "",
+                "| Alert | Long Window | Short Window | Threshold | Long | Short | State |",
+                "|-------|-------------|--------------|-----------|------|-------|-------|",
+            ])
+            for a in report.burn_rate_alerts:
+                state = f"🔴 FIRING ({a.severity})" if a.firing else "🟢 OK"
+                lines.append(f"| {a.name} | {a.long_window} | {a.short_window} | {a.threshold}x | "
+                             f"{a.long_burn_rate}x | {a.short_burn_rate}x | {state} |")
+
         return "\n".join(lines)
 
     elif output_format == "csv":
@@ -700,6 +1150,8 @@ def format_output(report: SLOReport, output_format: str) -> str:
             f"status,{report.error_budget.status}",
             f"recommended_target,{report.recommendation.recommended_target}"
         ]
+        if report.error_budget.burn_rate_30d is not None:
+            lines.append(f"burn_rate_30d,{report.error_budget.burn_rate_30d}")
         return "\n".join(lines)
 
     else:  # text
@@ -738,6 +1190,14 @@ def format_output(report: SLOReport, output_format: str) -> str:
             f"  6h window:      {report.error_budget.burn_rate_6h}x",
             f"  24h window:     {report.error_budget.burn_rate_24h}x",
             f"  3d window:      {report.error_budget.burn_rate_3d}x",
+        ]
+        if report.error_budget.burn_rate_30d is not None:
+            lines.append(f"  30d window:     {report.error_budget.burn_rate_30d}x")
+        for a in report.burn_rate_alerts:
+            if a.firing:
+                lines.append(f"  🔴 {a.name} firing ({a.severity}): {a.long_window} at {a.long_burn_rate}x "
+                             f"and {a.short_window} at {a.short_burn_rate}x >= {a.threshold}x")
+        lines.extend([
             "",
             "-" * 60,
             "Recommendation",
@@ -750,7 +1210,59 @@ def format_output(report: SLOReport, output_format: str) -> str:
             f"  {report.recommendation.rationale}",
             "",
             "=" * 60
+        ])
+        return "\n".join(lines)
+
+
+def format_summary(reports: List[SLOReport], output_format: str) -> str:
+    """Format one line per service for a multi-service rollup report"""
+    windows = list(BURN_RATE_WINDOWS)
+
+    def burn_rates(report: SLOReport) -> List[float]:
+        budget = report.error_budget
+        return [budget.burn_rate_1h, budget.burn_rate_6h, budget.burn_rate_24h,
+                budget.burn_rate_3d, budget.burn_rate_30d]
+
+    def firing(report: SLOReport) -> str:
+        return ", ".join(a.name for a in report.burn_rate_alerts if a.firing)
+
+    if output_format == "json":
+        return json.dumps([report_to_dict(r) for r in reports], indent=2)
+
+    elif output_format == "csv":
+        lines = ["service,sli,target,budget_remaining_percent,status,"
+                 + ",".join(f"burn_rate_{w}" for w in windows) + ",firing"]
+        for r in reports:
+            lines.append(f"{r.service},{r.sli.value},{r.target},{r.error_budget.remaining_percent},"
+                         f"{r.error_budget.status},{','.join(str(b) for b in burn_rates(r))},\"{firing(r)}\"")
+        return "\n".join(lines)
+
+    elif output_format == "markdown":
+        lines = [
+            f"# SLO Summary ({len(reports)} services)",
+            "",
+            "| Service | SLI | Target | Budget Left | Status | " + " | ".join(windows) + " | Firing |",
+            "|---------|-----|--------|-------------|--------|" + "|".join("-----" for _ in windows) + "|--------|"
+        ]
+        for r in reports:
+            lines.append(f"| {r.service} | {r.sli.value}% | {r.target}% | {r.error_budget.remaining_percent}% | "
+                         f"{r.error_budget.status} | " + " | ".join(f"{b}x" for b in burn_rates(r))
+                         + f" | {firing(r) or '-'} |")
+        return "\n".join(lines)
+
+    else:  # text
+        name_width = max([len(r.service) for r in reports] + [7])
+        lines = [
+            "=" * 60,
+            f"SLO Summary ({len(reports)} services)",
+            "=" * 60,
+            f"{'Service':<{name_width}}  {'SLI':>9}  {'Budget':>7}  " + "  ".join(f"{w:>6}" for w in windows),
         ]
+        for r in reports:
+            emoji = "🟢" if r.error_budget.status == "healthy" else "🟡" if r.error_budget.status == "warning" else "🔴"
+            lines.append(f"{r.service:<{name_width}}  {r.sli.value:>8}%  {r.error_budget.remaining_percent:>6}%  "
+                         + "  ".join(f"{b:>5}x" for b in burn_rates(r)) + f"  {emoji} {firing(r)}")
+        lines.append("=" * 60)
         return "\n".join(lines)
 
 
@@ -770,6 +1282,12 @@ Examples:
   # Generate text report with service name
   %(prog)s --input metrics.csv --service payment-api --target 99.9 --output text
 
+  # Add an export to the per-minute rollup store, then report from the store
+  %(prog)s --input export.csv --service payment-api --rollup-dir slo-rollups --window 90d
+
+  # 90-day summary across every service in the store
+  %(prog)s --rollup-dir slo-rollups --all-services --window 90d --output markdown
+
 Input File Format (CSV):
   Required columns: timestamp, total_requests, successful_requests
   Optional columns: failed_requests, latency_p99, throughput
@@ -781,8 +1299,7 @@ Input File Format (JSON):
 
     parser.add_argument(
         "--input", "-i",
-        required=True,
-        help="Input metrics file (CSV or JSON)"
+        help="Input metrics file (CSV or JSON); required unless reading from --rollup-dir"
     )
 
     parser.add_argument(
@@ -812,6 +1329,32 @@ Input File Format (JSON):
         help="SLO time window (default: 30d)"
     )
 
+    parser.add_argument(
+        "--latency-threshold",
+        type=float,
+        default=DEFAULT_LATENCY_THRESHOLD_MS,
+        help=f"Latency SLO: requests at or under this many ms are good (default: {DEFAULT_LATENCY_THRESHOLD_MS})"
+    )
+
+    parser.add_argument(
+        "--latency-buckets",
+        type=parse_bounds,
+        help="Latency bucket bounds in ms for new rollup files, comma-separated "
+             f"(default: {format_bounds(LATENCY_BUCKETS_MS)}); --latency-threshold is always added. "
+             "Latency SLIs from a rollup need the threshold to be one of its bounds"
+    )
+
+    parser.add_argument(
+        "--rollup-dir",
+        help="Per-minute rollup store; --input is merged into it for --service and the report is read from it"
+    )
+
+    parser.add_argument(
+        "--all-services",
+        action="store_true",
+        help="With --rollup-dir: summarize every service in the store"
+    )
+
     parser.add_argument(
         "--output", "-o",
         choices=["json", "text", "markdown", "csv"],
@@ -838,29 +1381,40 @@ Input File Format (JSON):
 
     args = parser.parse_args()
 
+    if not args.input and not args.rollup_dir:
+        parser.error("--input is required unless reading from --rollup-dir")
+    if args.all_services and not args.rollup_dir:
+        parser.error("--all-services requires --rollup-dir")
+    if args.latency_buckets and not (args.rollup_dir and args.input):
+        parser.error("--latency-buckets applies when ingesting --input into --rollup-dir")
+
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
     try:
-        # Parse metrics
-        logger.info(f"Reading metrics from {args.input}")
-        metrics = MetricsParser.parse_file(args.input)
-        logger.info(f"Loaded {len(metrics.timestamps)} data points")
-
-        # Generate report
         slo_type = SLOType(args.slo_type)
         window = TimeWindow(args.window)
 
-        report = generate_report(
-            metrics=metrics,
-            slo_type=slo_type,
-            target=args.target,
-            window=window,
-            service=args.service
-        )
+        if args.rollup_dir:
+            output = run_rollup(args, slo_type, window)
+        else:
+            # Parse metrics
+            logger.info(f"Reading metrics from {args.input}")
+            metrics = MetricsParser.parse_file(args.input)
+            logger.info(f"Loaded {len(metrics.timestamps)} data points")
+
+            # Generate report
+            report = generate_report(
+                metrics=metrics,
+                slo_type=slo_type,
+                target=args.target,
+                window=window,
+                service=args.service,
+                threshold_ms=args.latency_threshold
+            )
 
-        # Format output
-        output = format_output(report, args.output)
+            # Format output
+            output = format_output(report, args.output)
 
         # Write output
         if args.file:
@@ -872,8 +1426,8 @@ Input File Format (JSON):
 
         return 0
 
-    except FileNotFoundError:
-        logger.error(f"Input file not found: {args.input}")
+    except FileNotFoundError as e:
+        logger.error(f"Input file not found: {e.filename or args.input}")
         return 1
     except Exception as e:
         logger.error(f"Error calculating SLO: {e}")
@@ -883,5 +1437,37 @@ Input File Format (JSON):
         return 1
 
 
+def run_rollup(args: argparse.Namespace, slo_type: SLOType, window: TimeWindow) -> str:
+    """Merge --input into the rollup store if given, then report from the store"""
+    store = RollupStore(args.rollup_dir)
+
+    if args.input:
+        bounds = tuple(sorted({*(args.latency_buckets or LATENCY_BUCKETS_MS), args.latency_threshold}))
+        if args.latency_buckets and store.path(args.service).exists():
+            with store.open(args.service) as existing:
+                if existing.bounds != bounds:
+                    raise ValueError(f"Rollup for {args.service} already uses latency buckets "
+                                     f"{format_bounds(existing.bounds)} ms; --latency-buckets only "
+                                     f"applies to new rollup files")
+        logger.info(f"Reading metrics from {args.input}")
+        metrics = MetricsParser.parse_file(args.input)
+        minutes = store.ingest(args.service, metrics, bounds)
+        logger.info(f"Rolled up {len(metrics.total_requests)} data points into {minutes} minutes for {args.service}")
+
+    services = store.services() if args.all_services else [args.service]
+    if not services:
+        raise FileNotFoundError(args.rollup_dir)
+
+    reports = []
+    for service in services:
+        with store.open(service) as series:
+            reports.append(generate_rollup_report(series, slo_type, args.target, window,
+                                                  service, args.latency_threshold))
+
+    if args.all_services:
+        return format_summary(reports, args.output)
+    return format_output(reports[0], args.output)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -0,0 +1,60 @@
+"""Tests for metrics_analyzer.py"""
+
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from metrics_analyzer import StreamingCardinalityAnalyzer, follow_lines
+
+
+class TestStreamingCardinality:
+    """Test exposition parsing in StreamingCardinalityAnalyzer."""
+
+    def test_exemplars_are_not_labels(self):
+        """Test OpenMetrics exemplars do not add series or labels."""
+        lines = [
+            f'http_requests_total{{path="/p{series}"}} {sample} # {{trace_id="t{series}-{sample}"}} 1.0'
+            for series in range(100)
+            for sample in range(5)
+        ]
+        analyzer = StreamingCardinalityAnalyzer()
+        analyzer.consume(lines)
+
+        [result] = analyzer.results()
+        assert result.total_series == pytest.approx(100, abs=2)
+        assert set(result.unique_labels) == {"path"}
+
+    def test_braces_in_label_values(self):
+        """Test a quoted brace does not end the label set."""
+        analyzer = StreamingCardinalityAnalyzer()
+        analyzer.consume(['up{job="a}b",instance="x"} 1', 'up{job="c",instance="y"} 1'])
+
+        [result] = analyzer.results()
+        assert set(result.unique_labels) == {"job", "instance"}
+
+
+class TestFollowLines:
+    """Test tailing a growing file."""
+
+    def test_truncation_drops_partial_line(self, tmp_path):
+        """Test an unfinished line from before a truncation is not glued to the new content."""
+        path = tmp_path / "metrics.csv"
+        path.write_text("timestamp,value\n1,unfinish")
+
+        def truncate(seconds):
+            path.write_text("timestamp,value\n")
+
+        lines = follow_lines(str(path))
+        with patch("metrics_analyzer.time.sleep", side_effect=truncate):
+            assert next(lines) == "timestamp,value\n"
+            assert next(lines) == "timestamp,value\n"
+        lines.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])